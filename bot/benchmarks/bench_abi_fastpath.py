@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+CPU benchmark: web3 ContractFunction.call() vs the precomputed-selector fast path
+
+Both paths talk to an in-process provider that answers instantly with a
+canned ABI-encoded result, so the timings are pure client-side CPU:
+encoding, middleware, dispatch and decoding.
+
+Usage:
+    cd bot && python benchmarks/bench_abi_fastpath.py [calls]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from eth_abi import encode
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from clients.abi_fastpath import ContractFastPath, FastCaller
+from clients.fast_http_provider import strip_unused_middlewares
+
+ABI_DIR = Path(__file__).parent.parent / "abis"
+CONTRACT = "0x" + "a" * 40
+USER = "0x" + "b" * 40  # subgraph ids are lowercase
+
+CALLS = [
+    ("LendingPool", "getHealthFactor", ["uint256"], [95]),
+    ("LendingPool", "getPosition", ["(uint256,uint256,uint256,uint256)"], [(1, 10**18, 0, 0)]),
+    ("OracleAggregator", "getPrice", ["uint256"], [2000 * 10**8]),
+]
+
+
+class CannedProvider(BaseProvider):
+    def __init__(self, result):
+        self.response = {"jsonrpc": "2.0", "id": 0, "result": result}
+
+    def make_request(self, method, params):
+        return self.response
+
+    def is_connected(self, show_traceback=False):
+        return True
+
+
+def bench(fn, calls):
+    for _ in range(100):
+        fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(f"Per-call client CPU (µs), {calls} calls each")
+    print(f"  {'function':<18}{'ContractFunction':>18}{'fast path':>12}{'speedup':>10}")
+
+    for contract_name, function, types, values in CALLS:
+        abi = json.load(open(ABI_DIR / f"{contract_name}.json"))["abi"]
+        provider = CannedProvider("0x" + encode(types, values).hex())
+
+        w3 = Web3(provider)
+        strip_unused_middlewares(w3)
+        contract = w3.eth.contract(address=Web3.to_checksum_address(CONTRACT), abi=abi)
+        fast = ContractFastPath(CONTRACT, abi)
+        caller = FastCaller(provider)
+
+        legacy_us = bench(
+            lambda: getattr(contract.functions, function)(Web3.to_checksum_address(USER)).call(),
+            calls
+        )
+        fast_us = bench(lambda: caller.call(fast, function, [USER]), calls)
+        print(f"  {function:<18}{legacy_us:>18.1f}{fast_us:>12.1f}{legacy_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
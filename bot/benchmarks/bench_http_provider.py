@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: web3 HTTPProvider vs FastHTTPProvider
+
+Starts a local stub JSON-RPC server answering eth_call / eth_blockNumber
+with fixed payloads, then issues the same w3.eth.call() from N threads
+through:
+  - Web3(HTTPProvider) with the default middleware stack (v2.0 setup)
+  - Web3(FastHTTPProvider) with the unused middlewares stripped
+
+Usage:
+    cd bot && python benchmarks/bench_http_provider.py [calls] [threads]
+"""
+
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from web3 import Web3
+
+from clients.fast_http_provider import FastHTTPProvider, strip_unused_middlewares
+
+# getPosition-sized answer: 4 x uint256
+RESULT = "0x" + "00" * 31 + "01" + "00" * 31 + "02" + "00" * 31 + "03" + "00" * 31 + "04"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        requests = request if isinstance(request, list) else [request]
+        responses = [
+            {"jsonrpc": "2.0", "id": r["id"], "result": "0x10" if r["method"] == "eth_blockNumber" else RESULT}
+            for r in requests
+        ]
+        body = json.dumps(responses if isinstance(request, list) else responses[0]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(w3, calls, threads):
+    tx = {"to": "0x" + "11" * 20, "data": "0x" + "ab" * 36}
+
+    def one(_):
+        w3.eth.call(tx)
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(50)))  # warm up connections
+        start = time.perf_counter()
+        list(pool.map(one, range(calls)))
+        return time.perf_counter() - start
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+
+    legacy = Web3(Web3.HTTPProvider(url))
+    fast = Web3(FastHTTPProvider(url, pool_size=threads))
+    strip_unused_middlewares(fast)
+
+    legacy_time = run(legacy, calls, threads)
+    fast_time = run(fast, calls, threads)
+    server.shutdown()
+
+    print(f"{calls} eth_call over {threads} threads against a local stub server")
+    print(f"  HTTPProvider (default middlewares): {legacy_time:.3f}s  ({calls / legacy_time:,.0f} calls/s)")
+    print(f"  FastHTTPProvider (stripped):        {fast_time:.3f}s  ({calls / fast_time:,.0f} calls/s)")
+    print(f"  Speedup: {legacy_time / fast_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: Decimal vs integer fixed-point liquidation profit math
+
+Compares the v2.0 Decimal implementation of ProfitCalculator (reproduced
+below) against the v3.0 scaled-integer path, without any RPC.
+
+Usage:
+    cd bot && python benchmarks/bench_profit_calculator.py [count]
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config
+from services.profit_calculator import ProfitCalculator
+
+
+def legacy_quote(collateral_usd, borrowed_usd, asset_count, gas_price_wei, eth_price):
+    """v2.0 _calculate_multi_asset_profit / _estimate_multi_asset_gas_cost math"""
+    collateral_usd_decimal = Decimal(collateral_usd) / Decimal(10**Config.USD_DECIMALS)
+    debt_usd_decimal = Decimal(borrowed_usd) / Decimal(10**Config.USD_DECIMALS)
+
+    liquidation_bonus_usd = debt_usd_decimal * Decimal(Config.LIQUIDATION_BONUS)
+    total_seized_usd = debt_usd_decimal + liquidation_bonus_usd
+    if total_seized_usd > collateral_usd_decimal:
+        total_seized_usd = collateral_usd_decimal
+        liquidation_bonus_usd = total_seized_usd - debt_usd_decimal
+
+    gas_price_gwei = Decimal(gas_price_wei) / Decimal(10**9)
+    estimated_gas_units = 300000 + (asset_count * 50000)
+    eth_price_decimal = Decimal(eth_price) / Decimal(10**Config.USD_DECIMALS)
+    gas_cost_eth = (gas_price_gwei * Decimal(estimated_gas_units)) / Decimal(10**9)
+    gas_cost_usd = gas_cost_eth * eth_price_decimal
+
+    net_profit_usd = liquidation_bonus_usd - gas_cost_usd
+    return net_profit_usd >= Decimal(Config.MIN_PROFIT_USD), net_profit_usd
+
+
+def main(count: int = 100000):
+    rng = random.Random(42)
+    eth_price = 3_000 * 10**8
+    gas_price_wei = 20 * 10**9
+    rows = [
+        (rng.randint(10**9, 10**14), rng.randint(10**9, 10**14), rng.randint(1, 3))
+        for _ in range(count)
+    ]
+
+    calculator = ProfitCalculator(Mock())
+    min_profit = calculator.min_profit_usd
+
+    start = time.perf_counter()
+    for collateral, debt, assets in rows:
+        legacy_quote(collateral, debt, assets, gas_price_wei, eth_price)
+    legacy_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for collateral, debt, assets in rows:
+        calculator.quote("0x", collateral, debt, assets, gas_price_wei, eth_price, min_profit)
+    integer_s = time.perf_counter() - start
+
+    print(f"positions:        {count}")
+    print(f"Decimal (v2.0):   {legacy_s * 1e3:8.1f} ms  ({legacy_s / count * 1e6:.2f} us/position)")
+    print(f"Integer (v3.0):   {integer_s * 1e3:8.1f} ms  ({integer_s / count * 1e6:.2f} us/position)")
+    print(f"speedup:          {legacy_s / integer_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,12 @@
+from .engine import ReplayEngine, ReplayReport, StrategySettings
+from .stream import ReplayBlock, generate_scenario, load_stream, save_stream
+
+__all__ = [
+    "ReplayEngine",
+    "ReplayReport",
+    "StrategySettings",
+    "ReplayBlock",
+    "generate_scenario",
+    "load_stream",
+    "save_stream"
+]
@@ -0,0 +1,61 @@
+"""
+Replay a block stream through the bot and compare strategy settings.
+
+Usage:
+    cd bot/src && python -m backtest [--stream blocks.jsonl] [--users 200] [--blocks 600]
+        [--interval 1,5,10] [--no-events] [--min-profit 5] [--competitor-delay 3]
+
+Without --stream a synthetic scenario is generated (--save writes it out
+as JSON Lines so it can be replayed again). One report per interval.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.engine import ReplayEngine, StrategySettings
+from backtest.stream import generate_scenario, load_stream, save_stream
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m backtest", description="LendForge liquidation bot replay")
+    parser.add_argument("--stream", help="Recorded stream (JSON Lines, one block per line)")
+    parser.add_argument("--save", help="Write the generated stream to this path")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--blocks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--interval", default="5", help="Comma-separated monitor intervals (blocks) to compare")
+    parser.add_argument("--no-events", action="store_true", help="Disable oracle event re-evaluation")
+    parser.add_argument("--min-profit", type=float, default=None, help="MIN_PROFIT_USD")
+    parser.add_argument("--wallet-eth", type=float, default=100.0)
+    parser.add_argument("--competitor-delay", type=int, default=3, help="Blocks before a rival liquidates (-1 = none)")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        blocks = load_stream(args.stream)
+    else:
+        blocks = generate_scenario(users=args.users, blocks=args.blocks, seed=args.seed)
+        if args.save:
+            save_stream(blocks, args.save)
+
+    reports = []
+    for interval in (int(i) for i in args.interval.split(",")):
+        settings = StrategySettings(
+            name=f"interval={interval}{'' if not args.no_events else ',no-events'}",
+            monitor_interval_blocks=interval,
+            event_driven=not args.no_events,
+            wallet_eth=args.wallet_eth,
+            competitor_delay_blocks=None if args.competitor_delay < 0 else args.competitor_delay,
+        )
+        if args.min_profit is not None:
+            settings.min_profit_usd = args.min_profit
+        reports.append(ReplayEngine(blocks, settings).run().to_dict())
+
+    print(json.dumps(reports, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+# bot/src/backtest/chain.py - v1.0 - In-memory LendForge contracts and the client doubles the bot runs against
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from backtest.stream import BORROW, DEFAULT_ASSETS, DEPOSIT, PRICE, REPAY, WITHDRAW, ReplayBlock
+from clients.nonce_manager import NonceManager
+from clients.web3_client import LiquidationSimulation
+from config import Config
+from models.address import Address, AddressMap
+from models.position_snapshot import HF_MAX, HF_PRECISION, PositionSnapshot, calculate_health_factor
+from services.profit_calculator import gas_cost_usd, liquidation_bonus_usd, usd_from_wei
+
+WEI_PER_ETH = 10**18
+LIQUIDATION_GAS = 350_000  # Gas a mined liquidate() is charged in a replay
+
+
+class SimulatedPosition:
+    __slots__ = ("collateral", "borrowed_wei", "opened_block", "updated_block")
+
+    def __init__(self, block: int):
+        self.collateral: Dict[Address, int] = {}
+        self.borrowed_wei = 0
+        self.opened_block = block
+        self.updated_block = block
+
+
+class SimulatedChain:
+    """
+    LendingPool + CollateralManager + OracleAggregator state, advanced one
+    ReplayBlock at a time, with the same integer math as the contracts
+    (_convertToUSD, convertETHtoUSD, calculateHealthFactor, liquidate()).
+    """
+
+    def __init__(self, assets: Optional[Dict[str, Dict]] = None, wallet_wei: int = 100 * WEI_PER_ETH):
+        self.assets = AddressMap({Address(a): c for a, c in (assets or DEFAULT_ASSETS).items()})
+        self.prices: Dict[Address, int] = AddressMap()
+        self.positions: Dict[Address, SimulatedPosition] = AddressMap()
+        self.block_number = 0
+        self.timestamp = 0
+        self.gas_price_wei = 20 * 10**9
+        self.wallet_wei = wallet_wei
+        self.nonce = 0
+        # user -> who cleared the debt ("bot" / "competitor"), until they borrow again
+        self.liquidated_by: Dict[Address, str] = AddressMap()
+
+    def apply(self, block: ReplayBlock):
+        self.block_number = block.number
+        self.timestamp = block.timestamp
+        if block.gas_price_wei:
+            self.gas_price_wei = block.gas_price_wei
+
+        for event in block.events:
+            kind = event["type"]
+            if kind == PRICE:
+                self.prices[Address(event["asset"])] = event["price"]
+                continue
+
+            user = Address(event["user"])
+            position = self.positions.get(user)
+            if position is None:
+                position = self.positions[user] = SimulatedPosition(block.number)
+            position.updated_block = block.number
+            if kind == DEPOSIT:
+                asset = Address(event["asset"])
+                position.collateral[asset] = position.collateral.get(asset, 0) + event["amount"]
+            elif kind == WITHDRAW:
+                asset = Address(event["asset"])
+                position.collateral[asset] = max(0, position.collateral.get(asset, 0) - event["amount"])
+            elif kind == BORROW:
+                if position.borrowed_wei == 0:
+                    position.opened_block = block.number
+                position.borrowed_wei += event["amount"]
+                self.liquidated_by.pop(user, None)
+            elif kind == REPAY:
+                position.borrowed_wei = max(0, position.borrowed_wei - event["amount"])
+
+    # ===== VIEWS =====
+
+    def decimals(self, asset: str) -> int:
+        config = self.assets.get(asset)
+        return config["decimals"] if config else 18
+
+    def symbol(self, asset: str) -> str:
+        config = self.assets.get(asset)
+        return config["symbol"] if config else "UNKNOWN"
+
+    def collaterals(self, user: str) -> List[Tuple[Address, int]]:
+        position = self.positions.get(user)
+        if position is None:
+            return []
+        return [(asset, amount) for asset, amount in position.collateral.items() if amount > 0]
+
+    def collateral_usd(self, user: str) -> int:
+        """CollateralManager.getCollateralValueUSD"""
+        return sum(
+            amount * self.prices.get(asset, 0) // 10**self.decimals(asset)
+            for asset, amount in self.collaterals(user)
+        )
+
+    def borrowed_wei(self, user: str) -> int:
+        position = self.positions.get(user)
+        return position.borrowed_wei if position else 0
+
+    def debt_usd(self, user: str) -> int:
+        return usd_from_wei(self.borrowed_wei(user), self.prices.get(Config.ETH_ADDRESS, 0))
+
+    def health_factor(self, user: str) -> int:
+        return calculate_health_factor(self.collateral_usd(user), self.debt_usd(user))
+
+    def is_liquidatable(self, user: str) -> bool:
+        return self.borrowed_wei(user) > 0 and self.health_factor(user) < HF_PRECISION
+
+    def liquidatable_users(self) -> List[Address]:
+        return [user for user, position in self.positions.items() if position.borrowed_wei and self.is_liquidatable(user)]
+
+    def active_users(self) -> List[Address]:
+        return [user for user, position in self.positions.items() if position.borrowed_wei > 0]
+
+    # ===== LIQUIDATION =====
+
+    def liquidation_revert_reason(self, user: str) -> Optional[str]:
+        """liquidate(user) revert reason at the current state, None if it succeeds"""
+        if self.borrowed_wei(user) == 0:
+            return "NoDebt"
+        if not self.is_liquidatable(user):
+            return "HealthyPosition"
+        return None
+
+    def liquidation_bonus_usd(self, user: str) -> int:
+        """Bonus liquidate(user) would pay now (seizure capped by the collateral)"""
+        debt_usd = self.debt_usd(user)
+        return min(debt_usd + liquidation_bonus_usd(debt_usd), self.collateral_usd(user)) - debt_usd
+
+    def liquidate(self, user: str, liquidator: str) -> Tuple[int, int]:
+        """Clear the debt; returns (debt_usd, seized_usd) - the seizure is capped by the collateral"""
+        debt_usd = self.debt_usd(user)
+        seized_usd = min(debt_usd + liquidation_bonus_usd(debt_usd), self.collateral_usd(user))
+        self.positions[user].borrowed_wei = 0
+        self.liquidated_by[Address(user)] = liquidator
+        return debt_usd, seized_usd
+
+
+class _OracleWatcherStub:
+    """OracleEventWatcher surface the bot reads: prices never enter emergency in a replay"""
+
+    emergency_mode = False
+    log_watcher = None
+
+    def stats(self) -> Dict:
+        return {"emergency_mode": False}
+
+
+class _PositionWatcherStub:
+    """PositionEventWatcher surface: closed = liquidated since the last borrow"""
+
+    log_watcher = None
+
+    def __init__(self, chain: SimulatedChain):
+        self.chain = chain
+
+    def is_closed(self, user_address: str) -> bool:
+        return user_address in self.chain.liquidated_by
+
+    def stats(self) -> Dict:
+        return {"closed_positions": len(self.chain.liquidated_by)}
+
+
+class SimulatedWeb3Client:
+    """
+    Stands in for Web3Client: every read is answered from a SimulatedChain
+    and liquidations execute against it immediately (included in the
+    current block), paying the replayed gas price.
+    """
+
+    def __init__(self, chain: SimulatedChain):
+        self.chain = chain
+        self.account = SimpleNamespace(address=Address("0x" + "c" * 40))
+        self.nonce_manager = NonceManager(lambda: self.chain.nonce)
+        self.oracle_watcher = _OracleWatcherStub()
+        self.position_watcher = _PositionWatcherStub(chain)
+        self.pending_txs: Dict[str, Dict] = {}
+        self.last_gas_price_wei: Optional[int] = None
+        # Outcome of every liquidation the bot sent: (block, user, debt_usd, seized_usd, gas_usd)
+        self.liquidations: List[Tuple[int, Address, int, int, int]] = []
+        self.reverted = 0
+
+    # ===== READS =====
+
+    def get_position_onchain(self, user_address: str) -> Tuple[int, int, int]:
+        position = self.chain.positions.get(user_address)
+        updated = position.updated_block if position else 0
+        return self.chain.collateral_usd(user_address), self.chain.borrowed_wei(user_address), updated
+
+    def get_health_factor(self, user_address: str) -> int:
+        return self.chain.health_factor(user_address)
+
+    def convert_borrowed_to_usd(self, borrowed_wei: int) -> int:
+        return usd_from_wei(borrowed_wei, self.chain.prices.get(Config.ETH_ADDRESS, 0))
+
+    def get_user_collaterals(self, user_address: str) -> List[Dict]:
+        return [
+            {"asset": asset, "amount": amount, "symbol": self.chain.symbol(asset)}
+            for asset, amount in self.chain.collaterals(user_address)
+        ]
+
+    def get_collateral_value_usd(self, user_address: str) -> int:
+        return self.chain.collateral_usd(user_address)
+
+    def get_asset_price(self, asset: str) -> int:
+        return self.chain.prices.get(asset, 0)
+
+    def get_position_snapshot(self, user_address: str) -> PositionSnapshot:
+        return PositionSnapshot(
+            user_address,
+            self.chain.block_number,
+            self.chain.borrowed_wei(user_address),
+            self.chain.collateral_usd(user_address),
+            tuple(self.chain.collaterals(user_address)),
+            self.chain.prices.get(Config.ETH_ADDRESS, 0),
+            self.chain.gas_price_wei
+        )
+
+    def estimate_gas_price(self) -> int:
+        self.last_gas_price_wei = self.chain.gas_price_wei
+        return self.chain.gas_price_wei
+
+    def get_wallet_balance_wei(self) -> int:
+        return self.chain.wallet_wei
+
+    def get_wallet_balance(self) -> Decimal:
+        return Decimal(self.chain.wallet_wei) / Decimal(WEI_PER_ETH)
+
+    def get_rpc_stats(self) -> List[Dict]:
+        return []
+
+    # ===== LIQUIDATION =====
+
+    def simulate_liquidation(self, user_address: str, debt_amount: int, block_number=None) -> LiquidationSimulation:
+        reason = self.chain.liquidation_revert_reason(user_address)
+        return LiquidationSimulation(user_address, self.chain.block_number, reverted=reason is not None, reason=reason)
+
+    def sign_liquidation_tx(self, user_address: str, debt_amount: int, gas_price_wei: Optional[int] = None,
+                            nonce: Optional[int] = None):
+        raw = f"{Address(user_address)}:{debt_amount}:{gas_price_wei or self.chain.gas_price_wei}:{nonce}"
+        return SimpleNamespace(raw_transaction=raw.encode())
+
+    def execute_liquidation(self, user_address: str, debt_amount: int, gas_price_wei: Optional[int] = None) -> Optional[str]:
+        nonce = self.nonce_manager.peek()
+        signed = self.sign_liquidation_tx(user_address, debt_amount, gas_price_wei, nonce)
+        return self.send_signed_liquidation(signed.raw_transaction, nonce)
+
+    def send_signed_liquidation(self, raw_transaction: bytes, nonce: int) -> Optional[str]:
+        user, debt_amount, gas_price_wei, _ = raw_transaction.decode().split(":")
+        debt_amount, gas_price_wei = int(debt_amount), int(gas_price_wei)
+        eth_price = self.chain.prices.get(Config.ETH_ADDRESS, 0)
+        gas_wei = LIQUIDATION_GAS * gas_price_wei
+
+        self.chain.nonce = nonce + 1
+        self.nonce_manager.advance(nonce)
+        self.chain.wallet_wei -= gas_wei
+        if self.chain.liquidation_revert_reason(user) is not None or debt_amount < self.chain.borrowed_wei(user):
+            self.reverted += 1
+            return None
+
+        debt_usd, seized_usd = self.chain.liquidate(user, "bot")
+        # The seized collateral is credited at its USD value so capital recycles
+        self.chain.wallet_wei += (seized_usd * WEI_PER_ETH // eth_price if eth_price else 0) - debt_amount
+        self.liquidations.append(
+            (self.chain.block_number, Address(user), debt_usd, seized_usd, gas_cost_usd(LIQUIDATION_GAS, gas_price_wei, eth_price))
+        )
+        return f"0x{self.chain.block_number:08x}{nonce:056x}"
+
+
+class SimulatedGraphClient:
+    """
+    Stands in for GraphClient: the subgraph view of the chain, lagging
+    lag_blocks behind it (positions opened more recently are not indexed
+    yet) and answering the monitor's active-positions query with its
+    orderBy updatedAt / first: page_size window.
+    """
+
+    def __init__(self, chain: SimulatedChain, lag_blocks: int = 2, page_size: int = 100):
+        self.chain = chain
+        self.lag_blocks = lag_blocks
+        self.page_size = page_size
+        self.client = SimpleNamespace(execute=self._execute)
+
+    def _indexed_positions(self) -> List[Dict]:
+        horizon = self.chain.block_number - self.lag_blocks
+        rows = []
+        for user, position in self.chain.positions.items():
+            if position.borrowed_wei == 0 or position.opened_block > horizon:
+                continue
+            hf = self.chain.health_factor(user)
+            rows.append({
+                "id": user.lowercase,
+                "user": {"id": user.lowercase},
+                "totalCollateralUSD": str(self.chain.collateral_usd(user)),
+                "borrowed": str(position.borrowed_wei),
+                "healthFactor": str(Decimal(min(hf, HF_MAX)) / 100) if hf != HF_MAX else "999999",
+                "status": "ACTIVE",
+                "updatedAt": str(position.updated_block),
+            })
+        rows.sort(key=lambda row: int(row["updatedAt"]), reverse=True)
+        return rows
+
+    def _execute(self, query, variable_values=None) -> Dict:
+        return {"positions": self._indexed_positions()[:self.page_size]}
+
+    def get_risky_positions(self, threshold: float = None) -> List:
+        return []
+
+    def get_global_metrics(self) -> Dict:
+        return {"activePositions": len(self.chain.active_users())}
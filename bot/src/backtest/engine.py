@@ -0,0 +1,232 @@
+# bot/src/backtest/engine.py - v1.0 - Replays a block stream through PositionMonitor + Liquidator
+import logging
+import statistics
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from backtest.chain import WEI_PER_ETH, SimulatedChain, SimulatedGraphClient, SimulatedWeb3Client
+from backtest.stream import ReplayBlock
+from config import Config
+from models.address import Address, AddressMap
+from services.liquidator import Liquidator
+from services.position_monitor import PositionMonitor
+from services.profit_calculator import ProfitCalculator, usd_to_decimal
+from utils.logger import logger
+
+
+@dataclass
+class StrategySettings:
+    """One strategy configuration to replay (Config values are swapped in for the run)"""
+    name: str = "default"
+    monitor_interval_blocks: int = 5  # Full monitor_cycle every N blocks (60s at 12s blocks)
+    event_driven: bool = True  # reevaluate_exposed() on oracle price updates
+    min_profit_usd: float = field(default_factory=lambda: Config.MIN_PROFIT_USD)
+    max_gas_price_gwei: int = field(default_factory=lambda: Config.MAX_GAS_PRICE_GWEI)
+    presign_hf_band: float = field(default_factory=lambda: Config.PRESIGN_HF_BAND)
+    gas_budget_eth: float = field(default_factory=lambda: Config.LIQUIDATION_GAS_BUDGET_ETH)
+    wallet_eth: float = 100.0
+    competitor_delay_blocks: Optional[int] = 3  # A rival takes what is left after N blocks (None = no rival)
+    graph_lag_blocks: int = 2
+    graph_page_size: int = 100  # first: N in the monitor's active-positions query
+
+    def config_overrides(self) -> Dict:
+        return {
+            "MIN_PROFIT_USD": self.min_profit_usd,
+            "MAX_GAS_PRICE_GWEI": self.max_gas_price_gwei,
+            "PRESIGN_HF_BAND": self.presign_hf_band,
+            "LIQUIDATION_GAS_BUDGET_ETH": self.gas_budget_eth,
+            "ORACLE_MIRROR_ENABLED": False,  # Providers are not part of a replay stream
+            "WALLET_BALANCE_MAX_AGE_SECONDS": 0,
+        }
+
+
+@contextmanager
+def _config_overrides(values: Dict):
+    saved = {name: getattr(Config, name) for name in values}
+    for name, value in values.items():
+        setattr(Config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+
+
+@contextmanager
+def _log_level(level: int):
+    saved = logger.level
+    logger.setLevel(level)
+    try:
+        yield
+    finally:
+        logger.setLevel(saved)
+
+
+class Opportunity:
+    """One stretch of blocks during which a user could be liquidated"""
+
+    __slots__ = ("user", "first_block", "detected_block", "closed_block", "closed_by", "debt_usd", "bonus_usd")
+
+    def __init__(self, user: Address, first_block: int, debt_usd: int, bonus_usd: int):
+        self.user = user
+        self.first_block = first_block
+        self.detected_block: Optional[int] = None  # First liquidation attempt by the bot
+        self.closed_block: Optional[int] = None
+        self.closed_by: Optional[str] = None  # "bot" / "competitor" / "recovered" (HF back above 1.0)
+        self.debt_usd = debt_usd
+        self.bonus_usd = bonus_usd
+
+
+class _ReplayLiquidator(Liquidator):
+    """Liquidator that tells the engine when it first goes after a user"""
+
+    def __init__(self, web3_client, profit_calculator, on_attempt):
+        super().__init__(web3_client, profit_calculator)
+        self._on_attempt = on_attempt
+
+    def attempt_liquidation(self, position) -> bool:
+        self._on_attempt(position.user_address)
+        return super().attempt_liquidation(position)
+
+
+def _percentile(values: List[int], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return float(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))])
+
+
+class ReplayEngine:
+    """
+    Feeds a block stream into the real PositionMonitor / Liquidator /
+    ProfitCalculator through SimulatedWeb3Client and SimulatedGraphClient.
+
+    Per block: apply the events, record which users became liquidatable
+    (the ground truth), run the bot the way the scheduler would (oracle
+    re-evaluation on price updates, a full cycle every
+    monitor_interval_blocks), then let a competitor take any opportunity
+    older than competitor_delay_blocks. Nothing sleeps, so a replay runs
+    as fast as the bot's own code.
+    """
+
+    def __init__(self, blocks: List[ReplayBlock], settings: Optional[StrategySettings] = None,
+                 assets: Optional[Dict[str, Dict]] = None, block_time: int = 12):
+        self.blocks = blocks
+        self.settings = settings or StrategySettings()
+        self.assets = assets
+        self.block_time = block_time
+
+    def run(self, quiet: bool = True) -> "ReplayReport":
+        settings = self.settings
+        with _config_overrides(settings.config_overrides()), _log_level(logging.ERROR if quiet else logger.level):
+            chain = SimulatedChain(self.assets, wallet_wei=int(settings.wallet_eth * WEI_PER_ETH))
+            web3_client = SimulatedWeb3Client(chain)
+            graph_client = SimulatedGraphClient(chain, settings.graph_lag_blocks, settings.graph_page_size)
+            open_opportunities: Dict[Address, Opportunity] = AddressMap()
+            opportunities: List[Opportunity] = []
+
+            def on_attempt(user: str):
+                opportunity = open_opportunities.get(user)
+                if opportunity is not None and opportunity.detected_block is None:
+                    opportunity.detected_block = chain.block_number
+
+            liquidator = _ReplayLiquidator(web3_client, ProfitCalculator(web3_client), on_attempt)
+            monitor = PositionMonitor(graph_client, web3_client, liquidator)
+
+            start = time.perf_counter()
+            for index, block in enumerate(self.blocks):
+                chain.apply(block)
+                liquidator.ledger.invalidate()
+
+                # Ground truth: who can be liquidated at this block
+                for user in chain.liquidatable_users():
+                    if user not in open_opportunities:
+                        debt_usd = chain.debt_usd(user)
+                        opportunity = Opportunity(user, block.number, debt_usd, chain.liquidation_bonus_usd(user))
+                        open_opportunities[user] = opportunity
+                        opportunities.append(opportunity)
+
+                # The bot: oracle-event path, then the periodic cycle
+                price_assets = block.price_assets()
+                if settings.event_driven and price_assets and index > 0:
+                    monitor.reevaluate_exposed(price_assets)
+                if index % max(1, settings.monitor_interval_blocks) == 0:
+                    monitor.monitor_cycle()
+
+                # Competitor, then close what is no longer open
+                for user, opportunity in list(open_opportunities.items()):
+                    if (
+                        settings.competitor_delay_blocks is not None
+                        and chain.is_liquidatable(user)
+                        and block.number - opportunity.first_block >= settings.competitor_delay_blocks
+                    ):
+                        chain.liquidate(user, "competitor")
+                    if not chain.is_liquidatable(user):
+                        opportunity.closed_block = block.number
+                        opportunity.closed_by = chain.liquidated_by.get(user, "recovered")
+                        del open_opportunities[user]
+            wall_seconds = time.perf_counter() - start
+
+        return ReplayReport(settings, len(self.blocks), wall_seconds, len(self.blocks) * self.block_time,
+                            opportunities, web3_client, liquidator.get_metrics())
+
+
+class ReplayReport:
+    """Detection latency, missed liquidations and profit of one replayed strategy"""
+
+    def __init__(self, settings: StrategySettings, blocks: int, wall_seconds: float, simulated_seconds: int,
+                 opportunities: List[Opportunity], web3_client: SimulatedWeb3Client, metrics: Dict):
+        self.settings = settings
+        self.blocks = blocks
+        self.wall_seconds = wall_seconds
+        self.simulated_seconds = simulated_seconds
+        self.opportunities = opportunities
+        self.metrics = metrics
+
+        self.liquidations = web3_client.liquidations
+        self.reverted = web3_client.reverted
+        self.won = [o for o in opportunities if o.closed_by == "bot"]
+        self.missed = [o for o in opportunities if o.closed_by in ("competitor", None)]
+        self.detection_latencies = [o.detected_block - o.first_block for o in opportunities if o.detected_block is not None]
+        self.liquidation_latencies = [o.closed_block - o.first_block for o in self.won]
+
+    @property
+    def realized_profit_usd(self) -> int:
+        """Bonus actually seized minus gas paid, 8 decimals (contract math, not the bot's estimate)"""
+        return sum(seized - debt - gas for _, _, debt, seized, gas in self.liquidations)
+
+    @property
+    def missed_bonus_usd(self) -> int:
+        """Bonus left to others on missed opportunities (underwater positions pay none)"""
+        return sum(max(o.bonus_usd, 0) for o in self.missed)
+
+    def to_dict(self) -> Dict:
+        latencies = self.detection_latencies
+        return {
+            "strategy": asdict(self.settings),
+            "blocks": self.blocks,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "speedup": round(self.simulated_seconds / self.wall_seconds, 1) if self.wall_seconds else None,
+            "opportunities": len(self.opportunities),
+            "liquidated_by_bot": len(self.won),
+            "missed": len(self.missed),
+            "missed_to_competitor": sum(1 for o in self.missed if o.closed_by == "competitor"),
+            "missed_profitable": sum(1 for o in self.missed if o.bonus_usd > 0),
+            "recovered": sum(1 for o in self.opportunities if o.closed_by == "recovered"),
+            "capture_rate": round(len(self.won) / len(self.opportunities), 4) if self.opportunities else None,
+            "detection_latency_blocks": {
+                "mean": round(statistics.mean(latencies), 2) if latencies else None,
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "max": max(latencies) if latencies else None,
+            },
+            "liquidation_latency_blocks_mean": (
+                round(statistics.mean(self.liquidation_latencies), 2) if self.liquidation_latencies else None
+            ),
+            "reverted_transactions": self.reverted,
+            "realized_profit_usd": float(usd_to_decimal(self.realized_profit_usd)),
+            "missed_bonus_usd": float(usd_to_decimal(self.missed_bonus_usd)),
+            "bot_metrics": self.metrics,
+        }
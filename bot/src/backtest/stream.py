@@ -0,0 +1,130 @@
+# bot/src/backtest/stream.py - v1.0 - Block-by-block event / price streams for replays
+import json
+import random
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from models.address import Address
+
+# Event types (the LendingPool / CollateralManager / OracleAggregator effects a replay needs)
+PRICE = "price"  # {"asset", "price"} OracleAggregator.PriceUpdated (8 decimals)
+DEPOSIT = "deposit"  # {"user", "asset", "amount"} CollateralManager deposit (native decimals)
+WITHDRAW = "withdraw"  # {"user", "asset", "amount"}
+BORROW = "borrow"  # {"user", "amount"} LendingPool.Borrowed (Wei ETH)
+REPAY = "repay"  # {"user", "amount"} LendingPool.Repaid (Wei ETH)
+EVENT_TYPES = (PRICE, DEPOSIT, WITHDRAW, BORROW, REPAY)
+
+_INT_FIELDS = ("price", "amount")
+
+# Generated scenarios: ETH (debt asset), a stablecoin and a volatile token
+USDC_ADDRESS = Address("0x" + "5" * 40)
+WBTC_ADDRESS = Address("0x" + "b" * 40)
+DEFAULT_ASSETS = {
+    Config.ETH_ADDRESS: {"symbol": "ETH", "decimals": 18},
+    USDC_ADDRESS: {"symbol": "USDC", "decimals": 6},
+    WBTC_ADDRESS: {"symbol": "WBTC", "decimals": 8},
+}
+
+
+class ReplayBlock:
+    """One block of a stream: header fields plus the events it contains"""
+
+    __slots__ = ("number", "timestamp", "gas_price_wei", "events")
+
+    def __init__(self, number: int, timestamp: int, gas_price_wei: int, events: Optional[List[Dict]] = None):
+        self.number = number
+        self.timestamp = timestamp
+        self.gas_price_wei = gas_price_wei
+        self.events = events or []
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ReplayBlock":
+        events = []
+        for event in data.get("events", []):
+            if event["type"] not in EVENT_TYPES:
+                raise ValueError(f"Unknown replay event type: {event['type']}")
+            # uint256 amounts may be recorded as strings
+            events.append({k: int(v) if k in _INT_FIELDS else v for k, v in event.items()})
+        return cls(int(data["block"]), int(data.get("timestamp", 0)), int(data.get("gas_price_wei", 0)), events)
+
+    def to_dict(self) -> Dict:
+        return {
+            "block": self.number,
+            "timestamp": self.timestamp,
+            "gas_price_wei": self.gas_price_wei,
+            "events": [{k: str(v) if k in _INT_FIELDS else v for k, v in e.items()} for e in self.events],
+        }
+
+    def price_assets(self) -> List[str]:
+        return [event["asset"] for event in self.events if event["type"] == PRICE]
+
+
+def load_stream(path: str) -> List[ReplayBlock]:
+    """JSON Lines, one block per line (see ReplayBlock.to_dict)"""
+    with open(path, encoding="utf-8") as f:
+        return [ReplayBlock.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def save_stream(blocks: Iterable[ReplayBlock], path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        for block in blocks:
+            f.write(json.dumps(block.to_dict()) + "\n")
+
+
+def generate_scenario(
+    users: int = 200,
+    blocks: int = 600,
+    seed: int = 42,
+    shocks: Optional[Dict[str, float]] = None,
+    shock_block: Optional[int] = None,
+    volatility_bps: int = 30,
+    price_update_blocks: int = 10,
+    eth_price_usd: float = 3_000.0,
+    gas_price_gwei: float = 20.0,
+    block_time: int = 12,
+    start_block: int = 1
+) -> List[ReplayBlock]:
+    """
+    Synthetic market: users open ETH-debt positions against USDC / WBTC
+    collateral at HF 1.02-2.0, prices random-walk every block (published
+    like an oracle every price_update_blocks) and the shocks
+    ({asset: percent}) hit at shock_block (default: mid-stream).
+    Debt is ETH, so an ETH rally is what pushes stablecoin borrowers under.
+    """
+    rng = random.Random(seed)
+    shocks = {Config.ETH_ADDRESS: 25.0, WBTC_ADDRESS: -20.0} if shocks is None else shocks
+    shock_block = start_block + blocks // 2 if shock_block is None else shock_block
+    prices = {
+        Config.ETH_ADDRESS: int(eth_price_usd * 10**8),
+        USDC_ADDRESS: 10**8,
+        WBTC_ADDRESS: 60_000 * 10**8,
+    }
+    volatile = [Config.ETH_ADDRESS, WBTC_ADDRESS]
+    gas_price_wei = int(gas_price_gwei * 10**9)
+
+    # Genesis block: prices and every position
+    events = [{"type": PRICE, "asset": asset, "price": price} for asset, price in prices.items()]
+    for i in range(users):
+        user = Address("0x" + f"{i + 1:040x}")
+        asset = USDC_ADDRESS if rng.random() < 0.6 else WBTC_ADDRESS
+        collateral_usd = rng.randint(1_000, 200_000) * 10**8
+        decimals = DEFAULT_ASSETS[asset]["decimals"]
+        amount = collateral_usd * 10**decimals // prices[asset]
+        target_hf = rng.uniform(1.02, 2.0)
+        debt_usd = int(collateral_usd * 0.83 / target_hf)
+        events.append({"type": DEPOSIT, "user": user, "asset": asset, "amount": amount})
+        events.append({"type": BORROW, "user": user, "amount": debt_usd * 10**18 // prices[Config.ETH_ADDRESS]})
+    stream = [ReplayBlock(start_block, 0, gas_price_wei, events)]
+
+    for number in range(start_block + 1, start_block + blocks):
+        events = []
+        for asset in volatile:
+            move = rng.gauss(0, volatility_bps / 10_000)
+            if number == shock_block:
+                move += shocks.get(asset, 0.0) / 100
+            prices[asset] = max(1, int(prices[asset] * (1 + move)))
+            if number == shock_block or (number - start_block) % price_update_blocks == 0:
+                events.append({"type": PRICE, "asset": asset, "price": prices[asset]})
+        gas = max(10**9, int(gas_price_wei * (1 + rng.gauss(0, 0.05))))
+        stream.append(ReplayBlock(number, (number - start_block) * block_time, gas, events))
+    return stream
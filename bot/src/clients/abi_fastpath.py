@@ -0,0 +1,241 @@
+# bot/src/clients/abi_fastpath.py - v1.0 - Precomputed-selector eth_call layer
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+from web3.exceptions import BadFunctionCallOutput, ContractLogicError
+
+from models.address import Address, address_to_bytes
+
+# One eth_call in a batch: (contract, function name, args)
+FastCall = Tuple["ContractFastPath", str, Sequence[Any]]
+
+
+def _abi_type(param: Dict) -> str:
+    """Canonical type string, tuples expanded: (uint256,uint256)[]"""
+    abi_type = param["type"]
+    if abi_type.startswith("tuple"):
+        inner = ",".join(_abi_type(component) for component in param.get("components", []))
+        return f"({inner}){abi_type[len('tuple'):]}"
+    return abi_type
+
+
+def _has_address(abi_type: str) -> bool:
+    return "address" in abi_type
+
+
+def _checksum_addresses(value: Any) -> Any:
+    """eth_abi returns lowercase addresses; ContractFunction returns checksummed ones"""
+    if isinstance(value, str):
+        return Address(value)
+    if isinstance(value, (tuple, list)):
+        return type(value)(_checksum_addresses(v) for v in value)
+    return value
+
+
+def format_block(block_identifier: Any) -> str:
+    if isinstance(block_identifier, int):
+        return hex(block_identifier)
+    if isinstance(block_identifier, (bytes, bytearray)):
+        return "0x" + bytes(block_identifier).hex()
+    return block_identifier or "latest"
+
+
+class AbiFunction:
+    """One ABI function with its selector and canonical types resolved once"""
+
+    __slots__ = (
+        "name", "selector", "input_types", "output_types",
+        "_address_inputs", "_checksum_outputs", "_list_outputs",
+    )
+
+    def __init__(self, entry: Dict):
+        self.name = entry["name"]
+        self.input_types = [_abi_type(p) for p in entry.get("inputs", [])]
+        self.output_types = [_abi_type(p) for p in entry.get("outputs", [])]
+        signature = f"{self.name}({','.join(self.input_types)})"
+        self.selector = keccak(text=signature)[:4]
+        # eth_abi re-validates checksum strings (one keccak each); raw bytes skip that
+        self._address_inputs = [i for i, t in enumerate(self.input_types) if t == "address"]
+        self._checksum_outputs = [_has_address(t) for t in self.output_types]
+        self._list_outputs = [t.endswith("]") for t in self.output_types]
+
+    def encode_input(self, args: Sequence[Any]) -> str:
+        if self._address_inputs:
+            args = list(args)
+            for i in self._address_inputs:
+                if isinstance(args[i], str):
+                    args[i] = address_to_bytes(args[i])
+        return "0x" + (self.selector + encode(self.input_types, args)).hex()
+
+    def decode_input(self, data: bytes) -> List[Any]:
+        """Arguments of raw calldata (selector included), addresses interned"""
+        if data[:4] != self.selector:
+            raise ValueError(f"Calldata is not a {self.name}() call")
+        return [
+            _checksum_addresses(value) if _has_address(abi_type) else value
+            for abi_type, value in zip(self.input_types, decode(self.input_types, data[4:]))
+        ]
+
+    def decode_output(self, data: bytes) -> Any:
+        """Same shape as ContractFunction.call(): arrays as lists, structs as tuples"""
+        if not data and self.output_types:
+            raise BadFunctionCallOutput(f"{self.name}() returned no data (no contract at address?)")
+        values = []
+        for value, needs_checksum, is_list in zip(
+            decode(self.output_types, data), self._checksum_outputs, self._list_outputs
+        ):
+            if needs_checksum:
+                value = _checksum_addresses(value)
+            values.append(list(value) if is_list else value)
+        return values[0] if len(values) == 1 else values
+
+
+class AbiEvent:
+    """One ABI event with its topic hash and data types resolved once"""
+
+    __slots__ = ("name", "topic", "_indexed", "_data_names", "_data_types")
+
+    def __init__(self, entry: Dict):
+        self.name = entry["name"]
+        inputs = entry.get("inputs", [])
+        signature = f"{self.name}({','.join(_abi_type(p) for p in inputs)})"
+        self.topic = "0x" + keccak(text=signature).hex()
+        self._indexed = [(p["name"], _abi_type(p)) for p in inputs if p.get("indexed")]
+        self._data_names = [p["name"] for p in inputs if not p.get("indexed")]
+        self._data_types = [_abi_type(p) for p in inputs if not p.get("indexed")]
+
+    def decode_log(self, log: Dict) -> Dict[str, Any]:
+        """Arguments of a raw eth_getLogs entry, addresses interned"""
+        args = {}
+        for (name, abi_type), topic in zip(self._indexed, log["topics"][1:]):
+            value = decode([abi_type], bytes.fromhex(topic[2:]))[0]
+            args[name] = _checksum_addresses(value) if _has_address(abi_type) else value
+        data = bytes.fromhex(log.get("data", "0x")[2:])
+        for name, abi_type, value in zip(self._data_names, self._data_types, decode(self._data_types, data)):
+            args[name] = _checksum_addresses(value) if _has_address(abi_type) else value
+        return args
+
+
+class ContractFastPath:
+    """Selectors and codecs for one deployed contract"""
+
+    def __init__(self, address: str, abi: List[Dict]):
+        self.address = address
+        self.functions: Dict[str, AbiFunction] = {}
+        # topic0 -> event
+        self.events: Dict[str, AbiEvent] = {}
+        for entry in abi:
+            if entry.get("type") == "event" and not entry.get("anonymous"):
+                event = AbiEvent(entry)
+                self.events[event.topic] = event
+
+        names = [entry.get("name") for entry in abi if entry.get("type") == "function"]
+        for entry in abi:
+            if entry.get("type") != "function":
+                continue
+            # Overloads need argument-based dispatch - leave them to web3
+            if names.count(entry["name"]) > 1:
+                continue
+            self.functions[entry["name"]] = AbiFunction(entry)
+
+    @classmethod
+    def from_abi_file(cls, address: str, path: str) -> "ContractFastPath":
+        with open(path) as f:
+            return cls(address, json.load(f)["abi"])
+
+    def at(self, address: str) -> "ContractFastPath":
+        """Same ABI at another address (codecs are shared, not rebuilt)"""
+        clone = object.__new__(ContractFastPath)
+        clone.address = address
+        clone.functions = self.functions
+        clone.events = self.events
+        return clone
+
+    def has(self, name: str) -> bool:
+        return name in self.functions
+
+    def has_event(self, name: str) -> bool:
+        return any(event.name == name for event in self.events.values())
+
+    def event_topics(self, *names: str) -> List[str]:
+        """topic0 of each named event (KeyError for unknown names)"""
+        by_name = {event.name: event.topic for event in self.events.values()}
+        return [by_name[name] for name in names]
+
+    def decode_log(self, log: Dict) -> Tuple[str, Dict[str, Any]]:
+        """(event name, args) for a raw log emitted by this contract"""
+        event = self.events[log["topics"][0].lower()]
+        return event.name, event.decode_log(log)
+
+    def call_params(self, name: str, args: Sequence[Any], block_identifier: Any = "latest") -> list:
+        """eth_call params for name(*args)"""
+        return [
+            {"to": self.address, "data": self.functions[name].encode_input(args)},
+            format_block(block_identifier),
+        ]
+
+    def decode_response(self, name: str, response: Dict) -> Any:
+        """Decode an eth_call JSON-RPC response, raising like web3 on reverts"""
+        error = response.get("error")
+        if error is not None:
+            message = error.get("message", "execution reverted") if isinstance(error, dict) else str(error)
+            data = error.get("data") if isinstance(error, dict) else None
+            if isinstance(data, dict):
+                data = data.get("data")
+            raise ContractLogicError(message, data=data)
+        result = response.get("result") or "0x"
+        return self.functions[name].decode_output(bytes.fromhex(result[2:]))
+
+
+class FastCaller:
+    """
+    eth_call straight on the provider: precomputed selector, eth_abi codec,
+    no web3 middleware or ContractFunction dispatch.
+
+    call_many() sends a whole list as one JSON-RPC batch when the provider
+    supports make_batch_request (FastHTTPProvider, RpcPool).
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def call(self, contract: ContractFastPath, name: str, args: Sequence[Any] = (), block_identifier: Any = "latest") -> Any:
+        response = self.provider.make_request("eth_call", contract.call_params(name, args, block_identifier))
+        return contract.decode_response(name, response)
+
+    def call_many(
+        self,
+        calls: Sequence[FastCall],
+        block_identifier: Any = "latest",
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """
+        Args:
+            calls: (contract, function name, args) triples
+            block_identifier: Block every call is pinned to
+            return_exceptions: Put per-call errors in the result list instead of raising
+
+        Returns:
+            Decoded results in the order of `calls`
+        """
+        requests = [
+            ("eth_call", contract.call_params(name, args, block_identifier))
+            for contract, name, args in calls
+        ]
+        make_batch_request = getattr(self.provider, "make_batch_request", None)
+        if make_batch_request is not None:
+            responses = make_batch_request(requests)
+        else:
+            responses = [self.provider.make_request(method, params) for method, params in requests]
+
+        results = []
+        for (contract, name, _), response in zip(calls, responses):
+            try:
+                results.append(contract.decode_response(name, response))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
@@ -0,0 +1,186 @@
+# bot/src/clients/asset_registry.py - v1.0 - CollateralManager asset configs, loaded once and kept current from events
+import threading
+from typing import Dict, Iterator, List, Optional, Set, Union
+
+from clients.abi_fastpath import ContractFastPath, FastCaller
+from clients.log_watcher import LogWatcher
+from config import Config
+from models.address import Address, address_to_bytes
+from utils.logger import logger
+
+
+class AssetConfig:
+    """CollateralManager.CollateralConfig for one asset"""
+
+    __slots__ = (
+        "address", "symbol", "ltv", "liquidation_threshold",
+        "liquidation_penalty", "decimals", "enabled", "scale",
+    )
+
+    def __init__(
+        self,
+        address: Address,
+        symbol: str,
+        ltv: int,
+        liquidation_threshold: int,
+        liquidation_penalty: int,
+        decimals: int,
+        enabled: bool = True
+    ):
+        self.address = address
+        self.symbol = symbol
+        self.ltv = ltv
+        self.liquidation_threshold = liquidation_threshold
+        self.liquidation_penalty = liquidation_penalty
+        self.decimals = decimals
+        self.enabled = enabled
+        self.scale = 10**decimals  # CollateralManager._convertToUSD divisor
+
+    @classmethod
+    def from_onchain(cls, address: str, config: tuple) -> "AssetConfig":
+        """getAssetConfig() tuple: (ltv, liquidationThreshold, liquidationPenalty, decimals, enabled, symbol)"""
+        ltv, threshold, penalty, decimals, enabled, symbol = config
+        return cls(Address(address), symbol, ltv, threshold, penalty, decimals, enabled)
+
+    @classmethod
+    def from_config(cls, address: str, config: Dict) -> "AssetConfig":
+        """Config.COLLATERAL_CONFIGS entry (offline fallback)"""
+        return cls(
+            Address(address),
+            config.get("symbol", "UNKNOWN"),
+            config.get("ltv", 0),
+            config.get("liquidation_threshold", 0),
+            config.get("liquidation_penalty", 0),
+            config.get("decimals", 18),
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "symbol": self.symbol,
+            "ltv": self.ltv,
+            "liquidation_threshold": self.liquidation_threshold,
+            "liquidation_penalty": self.liquidation_penalty,
+            "decimals": self.decimals,
+            "enabled": self.enabled,
+        }
+
+
+class AssetRegistry:
+    """
+    Every collateral asset CollateralManager supports, keyed by its raw
+    20-byte address (the PositionBook key), so hot lookups never hash or
+    normalise an address string.
+
+    load() reads getSupportedAssets and then all getAssetConfig calls in
+    one batch. AssetAdded / AssetConfigUpdated / AssetEnabled logs (driven
+    by block heads) re-read the touched assets. Until the first load the
+    registry answers from Config.COLLATERAL_CONFIGS.
+    """
+
+    EVENTS = ("AssetAdded", "AssetConfigUpdated", "AssetEnabled")
+
+    def __init__(self):
+        self._by_key: Dict[bytes, AssetConfig] = {}
+        self.loaded = False
+        self.caller: Optional[FastCaller] = None
+        self.contract: Optional[ContractFastPath] = None
+        self.log_watcher: Optional[LogWatcher] = None
+        self._touched: Set[Address] = set()
+        self._lock = threading.Lock()
+
+    def attach(self, caller: FastCaller, provider, contract: ContractFastPath):
+        self.caller = caller
+        self.contract = contract
+        events = [name for name in self.EVENTS if contract.has_event(name)]
+        self.log_watcher = LogWatcher(provider, contract, events, self._handle) if events else None
+
+    # ===== LOADING =====
+
+    def load(self, block_identifier="latest") -> int:
+        """Read every supported asset's config; returns the number of assets"""
+        assets = self.caller.call(self.contract, "getSupportedAssets", [], block_identifier)
+        configs = self._read(assets, block_identifier)
+        with self._lock:
+            self._by_key = {config.address.raw: config for config in configs}
+            self.loaded = True
+        logger.info(
+            f"Asset registry loaded | assets={', '.join(f'{c.symbol}({c.decimals})' for c in configs)}"
+        )
+        return len(configs)
+
+    def _read(self, assets: List[str], block_identifier="latest") -> List[AssetConfig]:
+        results = self.caller.call_many(
+            [(self.contract, "getAssetConfig", [asset]) for asset in assets],
+            block_identifier,
+            return_exceptions=True
+        )
+        configs = []
+        for asset, result in zip(assets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to read asset config | asset={asset[:10]}... | error={result}")
+                continue
+            configs.append(AssetConfig.from_onchain(asset, result))
+        return configs
+
+    def on_head(self, head_number: int) -> Set[Address]:
+        """Process CollateralManager asset logs up to head_number; returns the assets re-read"""
+        if self.log_watcher is None:
+            return set()
+        self.log_watcher.poll(head_number)
+
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        if touched:
+            configs = self._read(sorted(touched), head_number)
+            with self._lock:
+                for config in configs:
+                    self._by_key[config.address.raw] = config
+            logger.info(f"Asset registry refreshed | {', '.join(f'{c.symbol}: {c.to_dict()}' for c in configs)}")
+        return touched
+
+    def _handle(self, name: str, args: Dict, log: Dict):
+        with self._lock:
+            self._touched.add(args["asset"])
+
+    # ===== LOOKUPS =====
+
+    def get(self, asset: Union[str, bytes]) -> Optional[AssetConfig]:
+        config = self._by_key.get(asset if isinstance(asset, bytes) else address_to_bytes(asset))
+        if config is None and not self.loaded:
+            fallback = Config.COLLATERAL_CONFIGS.get(asset)
+            if fallback is not None:
+                return AssetConfig.from_config(asset, fallback)
+        return config
+
+    def decimals(self, asset: Union[str, bytes], default: int = 18) -> int:
+        config = self.get(asset)
+        return config.decimals if config is not None else default
+
+    def symbol(self, asset: Union[str, bytes]) -> str:
+        config = self.get(asset)
+        return config.symbol if config is not None else "UNKNOWN"
+
+    def addresses(self, enabled_only: bool = True) -> List[Address]:
+        return [config.address for config in self if config.enabled or not enabled_only]
+
+    def __iter__(self) -> Iterator[AssetConfig]:
+        if not self.loaded:
+            return iter([AssetConfig.from_config(a, c) for a, c in Config.COLLATERAL_CONFIGS.items()])
+        return iter(list(self._by_key.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_key) if self.loaded else len(Config.COLLATERAL_CONFIGS)
+
+    def __contains__(self, asset: Union[str, bytes]) -> bool:
+        return self.get(asset) is not None
+
+    def stats(self) -> Dict:
+        return {
+            "loaded": self.loaded,
+            "last_block": self.log_watcher.last_block if self.log_watcher else None,
+            "assets": {config.address: config.to_dict() for config in self},
+        }
+
+
+# Shared by the Web3 client (loading, events) and every consumer (lookups)
+asset_registry = AssetRegistry()
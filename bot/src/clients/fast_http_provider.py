@@ -0,0 +1,141 @@
+# bot/src/clients/fast_http_provider.py - v1.0 - Lean keep-alive JSON-RPC HTTP provider
+import itertools
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from web3.providers.base import JSONBaseProvider
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+from utils.logger import logger
+
+# web3 middlewares the bot never relies on: ENS names, gas price strategies,
+# gas estimation for build_transaction (gas is always set), PoA/chainId validation.
+# "abi" (request formatting) and "attrdict" (receipt.status) are kept.
+UNUSED_MIDDLEWARES = ("name_to_address", "gas_price_strategy", "gas_estimate", "validation")
+
+
+def _default(obj: Any):
+    """orjson fallback for web3 types that can reach a request"""
+    if isinstance(obj, (bytes, bytearray, HexBytes)):
+        return "0x" + bytes(obj).hex()
+    if isinstance(obj, AttributeDict):
+        return dict(obj)
+    raise TypeError(f"Cannot JSON-encode {type(obj).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode()
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def strip_unused_middlewares(w3):
+    """Remove UNUSED_MIDDLEWARES from a Web3 instance (missing ones are skipped)"""
+    for name in UNUSED_MIDDLEWARES:
+        try:
+            w3.middleware_onion.remove(name)
+        except ValueError:
+            pass
+
+
+class FastHTTPProvider(JSONBaseProvider):
+    """
+    JSON-RPC over one pooled keep-alive requests.Session.
+
+    Replaces web3's HTTPProvider on the bot's hot path: orjson (when
+    installed) instead of the generic JSON encoder/decoder, a connection
+    pool sized to the number of threads issuing requests, proxy settings
+    read once, optional gzip responses, and no retry middleware (RpcPool
+    fails over instead).
+    """
+
+    _middlewares = ()
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        pool_size: int = 10,
+        timeout: float = 10,
+        gzip: bool = False
+    ):
+        super().__init__()
+        self.endpoint_uri = endpoint_uri
+        self.timeout = timeout
+        self._ids = itertools.count()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip" if gzip else "identity",
+        })
+        # Resolve proxy env vars once instead of on every request
+        self.session.proxies = requests.utils.get_environ_proxies(endpoint_uri)
+        self.session.trust_env = False
+
+    def __str__(self) -> str:
+        return f"RPC connection {self.endpoint_uri}"
+
+    def _post(self, body: bytes) -> Any:
+        response = self.session.post(self.endpoint_uri, data=body, timeout=self.timeout)
+        response.raise_for_status()
+        return loads(response.content)
+
+    def make_request(self, method, params: Any) -> Dict:
+        return self._post(dumps({
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self._ids),
+        }))
+
+    def make_batch_request(self, calls: Sequence[Tuple[str, Any]]) -> List[Dict]:
+        """
+        Send several requests in one JSON-RPC batch.
+
+        Returns the raw responses in the order of `calls` (JSON-RPC errors
+        are returned as-is, per request).
+        """
+        if not calls:
+            return []
+        ids = [next(self._ids) for _ in calls]
+
+        responses = self._post(dumps([
+            {"jsonrpc": "2.0", "method": method, "params": params or [], "id": request_id}
+            for request_id, (method, params) in zip(ids, calls)
+        ]))
+        if not isinstance(responses, list):
+            # Node rejected the batch as a whole
+            return [responses] * len(calls)
+
+        by_id = {response.get("id"): response for response in responses}
+        return [
+            by_id.get(request_id, {"error": {"code": -32603, "message": "Missing batch response"}})
+            for request_id in ids
+        ]
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            response = self.make_request("web3_clientVersion", [])
+        except Exception as e:
+            if show_traceback:
+                raise
+            logger.debug(f"RPC not reachable: {e}")
+            return False
+        return "result" in response
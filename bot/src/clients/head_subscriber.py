@@ -0,0 +1,196 @@
+# bot/src/clients/head_subscriber.py - v1.0 - Block head feed (WebSocket newHeads, HTTP polling fallback)
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+try:
+    from websockets.sync.client import connect as ws_connect
+except ImportError:  # websockets < 11: HTTP polling only
+    ws_connect = None
+
+from utils.logger import logger
+
+
+class BlockHead:
+    """A new chain head as seen by the bot"""
+
+    __slots__ = ("number", "hash", "received_at")
+
+    def __init__(self, number: int, block_hash: Optional[str] = None, received_at: Optional[float] = None):
+        self.number = number
+        self.hash = block_hash
+        self.received_at = received_at if received_at is not None else time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"BlockHead(number={self.number}, hash={(self.hash or '')[:10]})"
+
+
+class HeadSubscriber:
+    """
+    Runs on_head(head) once per new block.
+
+    Heads come from an `eth_subscribe newHeads` WebSocket when ws_url is
+    set, or from polling eth_blockNumber every poll_interval seconds. While
+    the WebSocket is down (or silent for stall_seconds) the subscriber polls
+    and reconnects after reconnect_seconds.
+
+    on_head runs on a single worker thread. Heads that arrive while it is
+    busy are coalesced: the next run gets the latest head only, so a slow
+    cycle never builds a backlog of stale blocks.
+    """
+
+    def __init__(
+        self,
+        on_head: Callable[[BlockHead], None],
+        fetch_block_number: Callable[[], int],
+        ws_url: Optional[str] = None,
+        poll_interval: float = 2.0,
+        reconnect_seconds: float = 5.0,
+        stall_seconds: float = 30.0,
+        connect: Optional[Callable] = None
+    ):
+        self.on_head = on_head
+        self.fetch_block_number = fetch_block_number
+        self.ws_url = ws_url
+        self.poll_interval = poll_interval
+        self.reconnect_seconds = reconnect_seconds
+        self.stall_seconds = stall_seconds
+        self._connect = connect or ws_connect
+
+        self._cond = threading.Condition()
+        self._latest: Optional[BlockHead] = None
+        self._processed: Optional[BlockHead] = None
+        self._stop = threading.Event()
+        self._threads = []
+
+        self.source = None
+        self.heads_received = 0
+        self.cycles_run = 0
+        self.heads_coalesced = 0
+        self.last_lag_ms: Optional[float] = None
+        self.last_cycle_ms: Optional[float] = None
+
+    # ===== LIFECYCLE =====
+
+    def start(self):
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run_source, name="head-source", daemon=True),
+            threading.Thread(target=self._run_worker, name="head-worker", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Head subscriber started | websocket={'yes' if self._ws_enabled else 'no'}")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    @property
+    def _ws_enabled(self) -> bool:
+        return bool(self.ws_url) and self._connect is not None
+
+    # ===== HEAD INTAKE =====
+
+    def publish(self, head: BlockHead) -> bool:
+        """Offer a head from any source; stale and duplicate heads are dropped"""
+        with self._cond:
+            latest = self._latest
+            if latest is not None:
+                if head.number < latest.number:
+                    return False
+                if head.number == latest.number and (head.hash is None or head.hash == latest.hash):
+                    return False
+            self._latest = head
+            self.heads_received += 1
+            self._cond.notify()
+        return True
+
+    def _run_source(self):
+        while not self._stop.is_set():
+            if self._ws_enabled:
+                try:
+                    self._consume_websocket()
+                except Exception as e:
+                    logger.warning(f"newHeads subscription lost, polling | error={e}")
+                if not self._stop.is_set():
+                    self._poll_for(self.reconnect_seconds)
+            else:
+                self._poll_for(float("inf"))
+
+    def _consume_websocket(self):
+        with self._connect(self.ws_url) as ws:
+            ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+            self.source = "websocket"
+            last_message = time.monotonic()
+
+            while not self._stop.is_set():
+                try:
+                    message = ws.recv(timeout=1.0)
+                except TimeoutError:
+                    if time.monotonic() - last_message > self.stall_seconds:
+                        raise TimeoutError(f"No head for {self.stall_seconds:.0f}s")
+                    continue
+
+                last_message = time.monotonic()
+                data = json.loads(message)
+                if "error" in data:
+                    raise ConnectionError(f"eth_subscribe rejected: {data['error']}")
+                header = (data.get("params") or {}).get("result")
+                if header and "number" in header:
+                    self.publish(BlockHead(int(header["number"], 16), header.get("hash"), last_message))
+
+    def _poll_for(self, seconds: float):
+        self.source = "polling"
+        deadline = time.monotonic() + seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            try:
+                self.publish(BlockHead(int(self.fetch_block_number())))
+            except Exception as e:
+                logger.debug(f"Block number poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+    # ===== WORKER =====
+
+    def _next_head(self) -> Optional[BlockHead]:
+        with self._cond:
+            while not self._stop.is_set() and self._latest is self._processed:
+                self._cond.wait()
+            if self._stop.is_set():
+                return None
+            head = self._latest
+            if self._processed is not None and head.number > self._processed.number + 1:
+                self.heads_coalesced += head.number - self._processed.number - 1
+            self._processed = head
+            return head
+
+    def _run_worker(self):
+        while True:
+            head = self._next_head()
+            if head is None:
+                return
+
+            start = time.monotonic()
+            self.last_lag_ms = (start - head.received_at) * 1000
+            try:
+                self.on_head(head)
+            except Exception as e:
+                logger.error(f"Block cycle failed | block={head.number} | error={e}")
+            self.last_cycle_ms = (time.monotonic() - start) * 1000
+            self.cycles_run += 1
+
+    def stats(self) -> Dict:
+        latest = self._latest
+        return {
+            "source": self.source,
+            "last_block": latest.number if latest else None,
+            "heads_received": self.heads_received,
+            "cycles_run": self.cycles_run,
+            "heads_coalesced": self.heads_coalesced,
+            "last_lag_ms": round(self.last_lag_ms, 1) if self.last_lag_ms is not None else None,
+            "last_cycle_ms": round(self.last_cycle_ms, 1) if self.last_cycle_ms is not None else None,
+        }
@@ -0,0 +1,60 @@
+# bot/src/clients/liquidator_wallet.py - v1.0 - Extra liquidator key with its own nonce chain
+from typing import Optional
+
+from eth_account import Account
+
+from clients.nonce_manager import NonceManager
+from utils.logger import logger
+
+
+class LiquidatorWallet:
+    """
+    An additional liquidator account sharing the Web3Client's RPC pool and
+    contracts. It exposes the client's liquidation calls (simulate, sign,
+    execute, send), so the Liquidator drives any wallet the same way it
+    drives the primary one, which is the Web3Client itself.
+    """
+
+    def __init__(self, web3_client, private_key: str):
+        self.web3_client = web3_client
+        self.account = Account.from_key(private_key)
+        self.nonce_manager = NonceManager(
+            lambda: web3_client.w3.eth.get_transaction_count(self.account.address, "pending")
+        )
+
+    def __repr__(self) -> str:
+        return f"LiquidatorWallet({self.account.address})"
+
+    def get_wallet_balance_wei(self) -> int:
+        return self.web3_client.w3.eth.get_balance(self.account.address)
+
+    def simulate_liquidation(self, user_address: str, debt_amount: int, block_number: int):
+        return self.web3_client.simulate_liquidation(
+            user_address, debt_amount, block_number, sender=self.account.address
+        )
+
+    def sign_liquidation_tx(
+        self,
+        user_address: str,
+        debt_amount: int,
+        gas_price_wei: Optional[int] = None,
+        nonce: Optional[int] = None
+    ):
+        if nonce is None:
+            nonce = self.nonce_manager.peek()
+        tx = self.web3_client.build_liquidation_tx(
+            user_address, debt_amount, gas_price_wei, nonce, sender=self.account.address
+        )
+        return self.account.sign_transaction(tx)
+
+    def execute_liquidation(self, user_address: str, debt_amount: int, gas_price_wei: Optional[int] = None) -> Optional[str]:
+        try:
+            nonce = self.nonce_manager.peek()
+            signed_tx = self.sign_liquidation_tx(user_address, debt_amount, gas_price_wei, nonce)
+        except Exception as e:
+            logger.error(f"Liquidation execution failed | wallet={self.account.address[:10]}...: {e}")
+            return None
+        return self.send_signed_liquidation(signed_tx.raw_transaction, nonce)
+
+    def send_signed_liquidation(self, raw_transaction: bytes, nonce: int) -> Optional[str]:
+        return self.web3_client.send_signed_liquidation(raw_transaction, nonce, wallet=self)
@@ -0,0 +1,98 @@
+# bot/src/clients/log_watcher.py - v1.0 - Gap-free contract log feed driven by block heads
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+from clients.abi_fastpath import ContractFastPath
+from utils.logger import logger
+
+
+class LogWatcher:
+    """
+    Fetches a contract's logs for every new head with one eth_getLogs over
+    (last block seen, head], so no block is skipped when heads are
+    coalesced or the feed reconnects. Longer gaps (a warm restart after an
+    outage) are paged in max_block_range chunks.
+
+    Each matching log is decoded with the contract's precomputed event
+    topics and handed to handler(name, args, log) in chain order.
+    """
+
+    def __init__(
+        self,
+        provider,
+        contract: ContractFastPath,
+        event_names: Sequence[str],
+        handler: Callable[[str, Dict, Dict], None],
+        max_block_range: int = 2000
+    ):
+        self.provider = provider
+        self.contract = contract
+        self.topics = contract.event_topics(*event_names)
+        self.handler = handler
+        self.max_block_range = max_block_range
+        self.last_block: Optional[int] = None
+        self.logs_seen = 0
+        self._lock = threading.Lock()
+
+    def resume_from(self, block_number: int):
+        """Catch up from a checkpoint instead of starting at the first head"""
+        with self._lock:
+            if self.last_block is None:
+                self.last_block = block_number
+
+    def poll(self, head_number: int) -> int:
+        """
+        Process logs up to head_number. The first call only sets the
+        starting point (no history replay).
+
+        Returns:
+            Number of logs handled
+        """
+        with self._lock:
+            if self.last_block is None:
+                self.last_block = head_number
+                return 0
+            if head_number <= self.last_block:
+                return 0
+
+            logs = []
+            start = from_block = self.last_block + 1
+            pages = (head_number - start) // self.max_block_range + 1
+            if pages > 1:
+                logger.info(
+                    f"Log catch-up | {self.contract.address[:10]}... | blocks {start}-{head_number} | pages={pages}"
+                )
+            while from_block <= head_number:
+                to_block = min(from_block + self.max_block_range - 1, head_number)
+                try:
+                    logs.extend(self._get_logs(from_block, to_block))
+                except Exception:
+                    if from_block == start:
+                        raise
+                    # Keep the pages already fetched, the next head resumes after them
+                    logger.warning(f"Log catch-up stopped at block {from_block - 1}, resuming on the next head")
+                    break
+                self.last_block = to_block
+                from_block = to_block + 1
+
+        for log in logs:
+            try:
+                name, args = self.contract.decode_log(log)
+                self.handler(name, args, log)
+            except Exception as e:
+                logger.error(f"Failed to handle log | tx={log.get('transactionHash', '')[:10]}... | error={e}")
+        self.logs_seen += len(logs)
+        return len(logs)
+
+    def _get_logs(self, from_block: int, to_block: int) -> List[Dict]:
+        response = self.provider.make_request("eth_getLogs", [{
+            "address": self.contract.address,
+            "topics": [self.topics],
+            "fromBlock": hex(from_block),
+            "toBlock": hex(to_block),
+        }])
+        if "error" in response:
+            raise ValueError(f"eth_getLogs failed: {response['error']}")
+        logs = [log for log in response.get("result") or [] if not log.get("removed")]
+        logs.sort(key=lambda log: (int(log["blockNumber"], 16), int(log["logIndex"], 16)))
+        return logs
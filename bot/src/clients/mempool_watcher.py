@@ -0,0 +1,247 @@
+# bot/src/clients/mempool_watcher.py - v1.0 - Pending oracle price updates and competitor liquidations
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    from websockets.sync.client import connect as ws_connect
+except ImportError:  # websockets < 11: no mempool feed
+    ws_connect = None
+
+from clients.abi_fastpath import AbiFunction, ContractFastPath
+from models.address import Address, AddressMap
+from utils.logger import logger
+
+# ManualPriceProvider, the Mock*PriceProvider contracts and MockChainlinkFeed
+# all move their price with setPrice(int256)
+SET_PRICE = AbiFunction({
+    "type": "function",
+    "name": "setPrice",
+    "inputs": [{"name": "_price", "type": "int256"}],
+    "outputs": [],
+})
+
+# (contract address, asset, "primary" | "fallback")
+PriceSource = Tuple[str, Address, str]
+
+
+class PendingCall:
+    """A decoded call sitting in the mempool"""
+
+    __slots__ = ("tx_hash", "sender", "to", "name", "args", "seen_at")
+
+    def __init__(self, tx_hash: str, sender: Optional[str], to: str, name: str, args: list):
+        self.tx_hash = tx_hash
+        self.sender = sender
+        self.to = to
+        self.name = name
+        self.args = args
+        self.seen_at = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"PendingCall({self.name}, tx={(self.tx_hash or '')[:10]}..., from={(self.sender or '')[:10]}...)"
+
+
+class MempoolWatcher:
+    """
+    Decodes pending transactions from an `eth_subscribe newPendingTransactions`
+    WebSocket and reports the two kinds the bot can act on before they land:
+
+    - setPrice(int256) on a price source (provider or Chainlink feed):
+      on_price(asset, role, price)
+    - LendingPool.liquidate(user) sent by anyone but us: on_liquidation(user)
+
+    Full transaction objects are requested; nodes that only announce hashes
+    (anvil, most public endpoints) are served with one eth_getTransactionByHash
+    per hash. Price sources are re-read from price_sources every
+    sources_ttl seconds so provider changes in the registry are followed.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        fetch_transaction: Callable[[str], Optional[Dict]],
+        on_price: Optional[Callable[[Address, str, int], None]] = None,
+        on_liquidation: Optional[Callable[[Address], None]] = None,
+        price_sources: Optional[Callable[[], Iterable[PriceSource]]] = None,
+        ignore_senders: Iterable[str] = (),
+        sources_ttl: float = 300,
+        reconnect_seconds: float = 5.0,
+        connect: Optional[Callable] = None
+    ):
+        self.ws_url = ws_url
+        self.fetch_transaction = fetch_transaction
+        self.on_price = on_price
+        self.on_liquidation = on_liquidation
+        self.price_sources = price_sources
+        self.ignore_senders = {Address(sender) for sender in ignore_senders}
+        self.sources_ttl = sources_ttl
+        self.reconnect_seconds = reconnect_seconds
+        self._connect = connect or ws_connect
+
+        # contract address -> (asset, role)
+        self._sources: Dict[Address, Tuple[Address, str]] = AddressMap()
+        self._sources_loaded_at: Optional[float] = None
+        self._lending_pool: Optional[ContractFastPath] = None
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.connected = False
+        self.transactions_seen = 0
+        self.price_updates = 0
+        self.competitor_liquidations = 0
+
+    # ===== TARGETS =====
+
+    def watch_price_source(self, address: str, asset: str, role: str):
+        self._sources[address] = (Address(asset), role)
+
+    def watch_liquidations(self, lending_pool: ContractFastPath):
+        self._lending_pool = lending_pool
+
+    def _refresh_sources(self):
+        if self.price_sources is None:
+            return
+        if self._sources_loaded_at is not None and time.monotonic() - self._sources_loaded_at < self.sources_ttl:
+            return
+        self._sources_loaded_at = time.monotonic()
+        try:
+            sources = list(self.price_sources())
+        except Exception as e:
+            logger.warning(f"Failed to load price sources for the mempool watcher: {e}")
+            return
+        self._sources.clear()
+        for address, asset, role in sources:
+            self.watch_price_source(address, asset, role)
+
+    # ===== LIFECYCLE =====
+
+    def start(self):
+        if self._connect is None:
+            logger.warning("Mempool watcher needs websockets >= 11, not started")
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mempool-watcher", daemon=True)
+        self._thread.start()
+        logger.info("Mempool watcher started")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._consume_websocket()
+            except Exception as e:
+                logger.warning(f"newPendingTransactions subscription lost | error={e}")
+            self.connected = False
+            self._stop.wait(self.reconnect_seconds)
+
+    def _consume_websocket(self):
+        with self._connect(self.ws_url) as ws:
+            ws.send(json.dumps({
+                "jsonrpc": "2.0", "id": 1, "method": "eth_subscribe",
+                "params": ["newPendingTransactions", True]
+            }))
+            while not self._stop.is_set():
+                try:
+                    message = ws.recv(timeout=1.0)
+                except TimeoutError:
+                    continue
+
+                data = json.loads(message)
+                if "error" in data:
+                    if data.get("id") == 1:
+                        # No full-transaction flag on this node: hashes only
+                        ws.send(json.dumps({
+                            "jsonrpc": "2.0", "id": 2, "method": "eth_subscribe",
+                            "params": ["newPendingTransactions"]
+                        }))
+                        continue
+                    raise ConnectionError(f"eth_subscribe rejected: {data['error']}")
+                if "id" in data:
+                    self.connected = True
+                    continue
+
+                tx = (data.get("params") or {}).get("result")
+                if isinstance(tx, str):
+                    if not self._first_sighting(tx):
+                        continue
+                    tx = self.fetch_transaction(tx)
+                elif isinstance(tx, dict) and not self._first_sighting(tx.get("hash")):
+                    continue
+                if tx:
+                    self.handle_transaction(tx)
+
+    def _first_sighting(self, tx_hash: Optional[str]) -> bool:
+        """Nodes re-announce replaced and re-gossiped transactions"""
+        if tx_hash is None:
+            return True
+        if tx_hash in self._seen:
+            return False
+        self._seen[tx_hash] = None
+        if len(self._seen) > 10000:
+            self._seen.popitem(last=False)
+        return True
+
+    # ===== DECODING =====
+
+    def handle_transaction(self, tx: Dict) -> Optional[PendingCall]:
+        """Decode one pending transaction and dispatch it; None if irrelevant"""
+        self.transactions_seen += 1
+        to = tx.get("to")
+        data = tx.get("input") or tx.get("data") or "0x"
+        if not to or len(data) < 10:
+            return None
+        self._refresh_sources()
+
+        try:
+            calldata = bytes.fromhex(data[2:])
+            source = self._sources.get(to)
+            if source is not None and calldata[:4] == SET_PRICE.selector:
+                call = PendingCall(tx.get("hash"), tx.get("from"), to, "setPrice", SET_PRICE.decode_input(calldata))
+                self._dispatch_price(source, call)
+                return call
+
+            pool = self._lending_pool
+            if pool is not None and Address(to) == Address(pool.address) and pool.has("liquidate"):
+                liquidate = pool.functions["liquidate"]
+                if calldata[:4] == liquidate.selector:
+                    call = PendingCall(tx.get("hash"), tx.get("from"), to, "liquidate", liquidate.decode_input(calldata))
+                    self._dispatch_liquidation(call)
+                    return call
+        except Exception as e:
+            logger.debug(f"Undecodable pending transaction {tx.get('hash')}: {e}")
+        return None
+
+    def _dispatch_price(self, source: Tuple[Address, str], call: PendingCall):
+        asset, role = source
+        price = call.args[0]
+        self.price_updates += 1
+        logger.info(f"Pending {role} price update | asset={asset[:10]}... | price={price} | {call}")
+        if self.on_price is not None:
+            self.on_price(asset, role, price)
+
+    def _dispatch_liquidation(self, call: PendingCall):
+        if call.sender is not None and Address(call.sender) in self.ignore_senders:
+            return
+        user = call.args[0]
+        self.competitor_liquidations += 1
+        logger.info(f"Competitor liquidation pending | user={user[:10]}... | {call}")
+        if self.on_liquidation is not None:
+            self.on_liquidation(user)
+
+    def stats(self) -> Dict:
+        return {
+            "connected": self.connected,
+            "price_sources": len(self._sources),
+            "transactions_seen": self.transactions_seen,
+            "price_updates": self.price_updates,
+            "competitor_liquidations": self.competitor_liquidations,
+        }
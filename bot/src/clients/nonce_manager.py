@@ -0,0 +1,58 @@
+# bot/src/clients/nonce_manager.py - v1.0 - Locally tracked account nonce
+import threading
+from typing import Callable, Optional
+
+from utils.logger import logger
+
+
+class NonceManager:
+    """
+    Next nonce for the liquidator account, tracked locally.
+
+    Read once with eth_getTransactionCount('pending') and advanced as
+    transactions are broadcast. After a send error (nonce too low,
+    replaced, dropped...) invalidate() makes the next peek() re-read it.
+
+    A floor (restored from the last run) guards against an endpoint whose
+    'pending' count has not seen our latest broadcasts yet.
+    """
+
+    def __init__(self, fetch_nonce: Callable[[], int]):
+        self._fetch_nonce = fetch_nonce
+        self._nonce: Optional[int] = None
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[int]:
+        """Last known next nonce (None until read)"""
+        return self._nonce
+
+    def set_floor(self, nonce: int):
+        with self._lock:
+            self._floor = max(self._floor, nonce)
+
+    def resync(self) -> int:
+        nonce = max(self._fetch_nonce(), self._floor)
+        with self._lock:
+            self._nonce = nonce
+        logger.debug(f"Nonce resynced | nonce={nonce}")
+        return nonce
+
+    def invalidate(self):
+        with self._lock:
+            self._nonce = None
+
+    def peek(self) -> int:
+        """Nonce the next transaction will use"""
+        with self._lock:
+            nonce = self._nonce
+        if nonce is None:
+            return self.resync()
+        return nonce
+
+    def advance(self, used_nonce: int):
+        """Record that a transaction with used_nonce was accepted by the node"""
+        with self._lock:
+            if self._nonce is None or used_nonce >= self._nonce:
+                self._nonce = used_nonce + 1
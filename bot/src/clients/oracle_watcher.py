@@ -0,0 +1,160 @@
+# bot/src/clients/oracle_watcher.py - v1.0 - OracleAggregator event feed (prices, deviations, emergency mode)
+import threading
+import time
+from typing import Callable, Dict, Optional, Set
+
+from clients.abi_fastpath import ContractFastPath
+from clients.log_watcher import LogWatcher
+from models.address import Address, AddressMap
+from utils.logger import logger
+
+# OracleAggregator.CACHE_DURATION: how long the contract itself serves a cached price
+PRICE_CACHE_SECONDS = 5 * 60
+
+
+class OraclePrice:
+    """Last price the aggregator settled on for an asset (PriceUpdated)"""
+
+    __slots__ = ("price", "source", "updated_at", "block_number")
+
+    def __init__(self, price: int, source: str, updated_at: int, block_number: int):
+        self.price = price  # 8 decimals
+        self.source = source
+        self.updated_at = updated_at  # block timestamp
+        self.block_number = block_number
+
+    def to_dict(self) -> Dict:
+        return {
+            "price": self.price,
+            "source": self.source,
+            "updated_at": self.updated_at,
+            "block": self.block_number,
+        }
+
+
+class OracleEventWatcher:
+    """
+    Keeps the bot's view of OracleAggregator in sync from its events
+    instead of polling:
+
+    - PriceUpdated refreshes the price snapshot
+    - DeviationWarning / CriticalDeviation record the deviation
+    - FallbackUsed only marks the asset as changed
+    - EmergencyModeSet flips the emergency flag
+
+    Events only report changes, so the emergency flag is seeded with an
+    on-chain read (read_emergency_mode) on the first head, and read again on
+    the first head after a failed log poll, when a flip may have been missed.
+
+    Assets touched in a block are passed to on_assets_changed once the
+    block's logs are processed, so exposed users can be re-evaluated at once.
+    """
+
+    EVENTS = ("PriceUpdated", "DeviationWarning", "CriticalDeviation", "FallbackUsed", "EmergencyModeSet")
+
+    def __init__(
+        self,
+        provider,
+        contract: ContractFastPath,
+        on_assets_changed: Optional[Callable[[Set[Address]], None]] = None,
+        read_emergency_mode: Optional[Callable[[], bool]] = None
+    ):
+        events = [name for name in self.EVENTS if contract.has_event(name)]
+        self.log_watcher = LogWatcher(provider, contract, events, self._handle) if events else None
+        self.on_assets_changed = on_assets_changed
+        self.read_emergency_mode = read_emergency_mode
+
+        self.prices: Dict[Address, OraclePrice] = AddressMap()
+        self.deviations: Dict[Address, int] = AddressMap()  # Last reported deviation (bps)
+        self.emergency_mode: Optional[bool] = None  # None until seeded or seen in a log
+        self.emergency_reason: Optional[str] = None
+        self.event_counts: Dict[str, int] = {}
+
+        self._seeded = False  # emergency_mode read on-chain since the last gap
+        self._changed: Set[Address] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def is_live(self) -> bool:
+        """True once heads are being processed (the cached state is trustworthy)"""
+        return self.log_watcher is not None and self.log_watcher.last_block is not None
+
+    def on_head(self, head_number: int) -> Set[Address]:
+        """Process the oracle logs up to head_number; returns the assets that changed"""
+        if self.log_watcher is None:
+            return set()
+        try:
+            self.log_watcher.poll(head_number)
+        except Exception:
+            self._seeded = False  # The flag may flip in the logs we could not read
+            raise
+        if not self._seeded:
+            self._seed_emergency_mode()
+
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        if changed and self.on_assets_changed is not None:
+            self.on_assets_changed(changed)
+        return changed
+
+    def _seed_emergency_mode(self):
+        if self.read_emergency_mode is None:
+            return
+        try:
+            enabled = bool(self.read_emergency_mode())
+        except Exception as e:
+            logger.error(f"Failed to read oracle emergency mode: {e}")
+            return
+        if enabled and self.emergency_mode is not True:
+            logger.warning("Oracle emergency mode is ON (read on-chain)")
+        self.emergency_mode = enabled
+        self._seeded = True
+
+    def _handle(self, name: str, args: Dict, log: Dict):
+        self.event_counts[name] = self.event_counts.get(name, 0) + 1
+
+        if name == "EmergencyModeSet":
+            self.emergency_mode = args["enabled"]
+            self.emergency_reason = args["reason"]
+            logger.warning(f"Oracle emergency mode {'ON' if args['enabled'] else 'OFF'} | reason={args['reason']}")
+            return
+
+        asset = args["asset"]
+        if name == "PriceUpdated":
+            self.prices[asset] = OraclePrice(
+                args["price"], args["source"], args["timestamp"], int(log["blockNumber"], 16)
+            )
+        elif name in ("DeviationWarning", "CriticalDeviation"):
+            self.deviations[asset] = args["deviationBps"]
+            logger.warning(
+                f"Oracle {name} | asset={asset[:10]}... | primary={args['primaryPrice']} | "
+                f"fallback={args['fallbackPrice']} | deviation={args['deviationBps']}bps"
+            )
+        with self._lock:
+            self._changed.add(asset)
+
+    def price_of(self, asset) -> Optional[OraclePrice]:
+        return self.prices.get(asset)
+
+    def fresh_price(self, asset, max_age_seconds: float = PRICE_CACHE_SECONDS) -> Optional[int]:
+        """
+        Last PriceUpdated price for asset while the feed is live and the
+        price is no older than the aggregator's own cache window; None
+        otherwise (read getPrice on-chain instead).
+        """
+        if not self.is_live:
+            return None
+        price = self.prices.get(asset)
+        if price is None or time.time() - price.updated_at > max_age_seconds:
+            return None
+        return price.price
+
+    def stats(self) -> Dict:
+        return {
+            "live": self.is_live,
+            "last_block": self.log_watcher.last_block if self.log_watcher else None,
+            "emergency_mode": self.emergency_mode,
+            "prices": {asset: price.to_dict() for asset, price in self.prices.items()},
+            "deviations_bps": dict(self.deviations),
+            "events": dict(self.event_counts),
+        }
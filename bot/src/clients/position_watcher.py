@@ -0,0 +1,99 @@
+# bot/src/clients/position_watcher.py - v1.0 - LendingPool event feed (liquidations, repayments, new debt)
+from typing import Callable, Dict, Iterable, Optional
+
+from clients.abi_fastpath import ContractFastPath
+from clients.log_watcher import LogWatcher
+from models.address import Address, AddressMap
+from utils.logger import logger
+
+
+class PositionEventWatcher:
+    """
+    Follows LendingPool events that change whether a user can be liquidated,
+    ahead of the subgraph:
+
+    - Liquidated: debt cleared by a liquidator -> on_position_closed
+    - Repaid with remainingDebt == 0 -> on_position_closed
+    - Repaid with debt left -> on_debt_changed(user, remaining_wei, block)
+    - Borrowed: the user has debt again, forget the closed flag
+
+    Closed users are kept (with the block they closed at) until they borrow
+    again, so attempts on them can be refused without an RPC round trip.
+    """
+
+    EVENTS = ("Liquidated", "Repaid", "Borrowed")
+
+    def __init__(
+        self,
+        provider,
+        contract: ContractFastPath,
+        on_position_closed: Optional[Callable[[Address, int], None]] = None,
+        on_debt_changed: Optional[Callable[[Address, int, int], None]] = None,
+        our_addresses: Iterable[str] = ()
+    ):
+        events = [name for name in self.EVENTS if contract.has_event(name)]
+        self.log_watcher = LogWatcher(provider, contract, events, self._handle) if events else None
+        self.on_position_closed = on_position_closed
+        self.on_debt_changed = on_debt_changed
+        # Every liquidator wallet we send from (primary key and pool keys)
+        self.our_addresses = {Address(address) for address in our_addresses}
+
+        # user -> block the debt was cleared at
+        self.closed: Dict[Address, int] = AddressMap()
+        self.liquidations_seen = 0
+        self.liquidations_by_others = 0
+        self.repayments_seen = 0
+
+    def on_head(self, head_number: int) -> int:
+        """Process the LendingPool logs up to head_number; returns logs handled"""
+        if self.log_watcher is None:
+            return 0
+        return self.log_watcher.poll(head_number)
+
+    def is_closed(self, user_address: str) -> bool:
+        return user_address in self.closed
+
+    def _handle(self, name: str, args: Dict, log: Dict):
+        block = int(log["blockNumber"], 16)
+
+        if name == "Borrowed":
+            self.closed.pop(args["user"], None)
+            return
+
+        if name == "Liquidated":
+            # LendingPool emits Liquidated(msg.sender, user, ...) against the
+            # declared (user, liquidator) order: "liquidator" holds the borrower
+            user, liquidator = args["liquidator"], args["user"]
+            self.liquidations_seen += 1
+            ours = liquidator in self.our_addresses
+            if not ours:
+                self.liquidations_by_others += 1
+            logger.info(
+                f"Position liquidated | user={user[:10]}... | by={'us' if ours else liquidator[:10] + '...'} | "
+                f"debt={args['debtRepaid'] / 10**18:.4f} ETH | block={block}"
+            )
+            self._close(user, block)
+            return
+
+        # Repaid
+        self.repayments_seen += 1
+        user, remaining = args["user"], args["remainingDebt"]
+        if remaining == 0:
+            logger.info(f"Position repaid in full | user={user[:10]}... | block={block}")
+            self._close(user, block)
+        elif self.on_debt_changed is not None:
+            self.on_debt_changed(user, remaining, block)
+
+    def _close(self, user: Address, block: int):
+        self.closed[user] = block
+        if self.on_position_closed is not None:
+            self.on_position_closed(user, block)
+
+    def stats(self) -> Dict:
+        return {
+            "last_block": self.log_watcher.last_block if self.log_watcher else None,
+            "closed_positions": len(self.closed),
+            "liquidations_seen": self.liquidations_seen,
+            "liquidations_by_others": self.liquidations_by_others,
+            "repayments_seen": self.repayments_seen,
+        }
@@ -0,0 +1,177 @@
+# bot/src/clients/presigned_tx_cache.py - v1.0 - Warm liquidation transactions
+import math
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+from models.address import address_to_bytes
+from utils.logger import logger
+
+
+class FeeTiers:
+    """
+    Geometric gas price ladder: tier k pays ceil(base * ratio**k) Wei.
+
+    Pre-signed transactions are priced at the tier covering the market
+    gas price, so small fee moves within a tier do not force a re-sign.
+    """
+
+    def __init__(self, base_wei: int, ratio: float):
+        if base_wei <= 0 or ratio <= 1:
+            raise ValueError("Fee tiers need base_wei > 0 and ratio > 1")
+        self.base_wei = base_wei
+        self.ratio = ratio
+
+    def price_of(self, tier: int) -> int:
+        return math.ceil(self.base_wei * self.ratio**tier)
+
+    def tier_of(self, gas_price_wei: int) -> int:
+        """Lowest tier whose price is >= gas_price_wei"""
+        if gas_price_wei <= self.base_wei:
+            return 0
+        tier = max(math.ceil(math.log(gas_price_wei / self.base_wei, self.ratio)), 0)
+        # Float log can land one tier off either way
+        while self.price_of(tier) < gas_price_wei:
+            tier += 1
+        while tier > 0 and self.price_of(tier - 1) >= gas_price_wei:
+            tier -= 1
+        return tier
+
+
+class PresignedTx:
+    """A signed liquidate() transaction ready for send_raw_transaction"""
+
+    __slots__ = ("user_address", "nonce", "fee_tier", "gas_price_wei", "value_wei", "raw_transaction")
+
+    def __init__(
+        self,
+        user_address: str,
+        nonce: int,
+        fee_tier: int,
+        gas_price_wei: int,
+        value_wei: int,
+        raw_transaction: bytes
+    ):
+        self.user_address = user_address
+        self.nonce = nonce
+        self.fee_tier = fee_tier
+        self.gas_price_wei = gas_price_wei
+        self.value_wei = value_wei
+        self.raw_transaction = raw_transaction
+
+    def __repr__(self) -> str:
+        return (
+            f"PresignedTx(user={self.user_address[:8]}..., nonce={self.nonce}, "
+            f"tier={self.fee_tier}, value={self.value_wei / 10**18:.4f} ETH)"
+        )
+
+
+class PresignedTxCache:
+    """
+    Pre-built, pre-signed liquidation transactions keyed by (user, nonce, fee tier).
+
+    warm() is called each cycle for positions close to liquidation; an
+    entry is re-signed only when the debt, the account nonce or the fee
+    tier changed. Every entry is signed for the current nonce, so once one
+    is broadcast the others miss on lookup and are re-signed next cycle.
+
+    No entry is signed, or handed out, above max_gas_price_wei (the
+    MAX_GAS_PRICE_GWEI cap the cold path enforces): tier prices round up,
+    so a market price under the cap can still land on a tier over it.
+    """
+
+    def __init__(self, web3_client, fee_tiers: FeeTiers, max_gas_price_wei: Optional[int] = None):
+        self.web3_client = web3_client
+        self.fee_tiers = fee_tiers
+        self.max_gas_price_wei = max_gas_price_wei
+        self._entries: Dict[Tuple[bytes, int, int], PresignedTx] = {}
+        self._key_by_user: Dict[bytes, Tuple[bytes, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _over_cap(self, gas_price_wei: int) -> bool:
+        return self.max_gas_price_wei is not None and gas_price_wei > self.max_gas_price_wei
+
+    def _key(self, user_address: str, gas_price_wei: int) -> Tuple[bytes, int, int]:
+        return (
+            address_to_bytes(user_address),
+            self.web3_client.nonce_manager.peek(),
+            self.fee_tiers.tier_of(gas_price_wei)
+        )
+
+    def warm(self, user_address: str, debt_wei: int, gas_price_wei: int) -> Optional[PresignedTx]:
+        """Make sure a signed transaction exists for the current debt, nonce and fee tier"""
+        try:
+            key = self._key(user_address, gas_price_wei)
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and entry.value_wei == debt_wei:
+                return entry
+
+            _, nonce, tier = key
+            gas_price = self.fee_tiers.price_of(tier)
+            if self._over_cap(gas_price):
+                self.discard(user_address)
+                logger.debug(f"Not pre-signing {user_address[:10]}...: tier price {gas_price / 10**9:.2f} gwei over the cap")
+                return None
+            signed = self.web3_client.sign_liquidation_tx(user_address, debt_wei, gas_price, nonce)
+            entry = PresignedTx(user_address, nonce, tier, gas_price, debt_wei, signed.raw_transaction)
+
+            with self._lock:
+                self._drop(key[0])
+                self._entries[key] = entry
+                self._key_by_user[key[0]] = key
+
+            logger.debug(f"Pre-signed liquidation | {entry}")
+            return entry
+
+        except Exception as e:
+            logger.error(f"Failed to pre-sign liquidation for {user_address}: {e}")
+            return None
+
+    def get(self, user_address: str, debt_wei: int, gas_price_wei: int) -> Optional[PresignedTx]:
+        """Signed transaction matching the current nonce, fee tier and debt, if warm"""
+        key = self._key(user_address, gas_price_wei)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry.value_wei != debt_wei or self._over_cap(entry.gas_price_wei):
+            return None
+        return entry
+
+    def take(self, user_address: str, gas_price_wei: Optional[int] = None) -> Optional[PresignedTx]:
+        """
+        Remove and return the user's signed transaction if it still holds the
+        current nonce and pays at least gas_price_wei (when known) but not
+        over the cap, whatever the debt: the hot path sends it as signed.
+        """
+        user = address_to_bytes(user_address)
+        nonce = self.web3_client.nonce_manager.peek()
+        with self._lock:
+            key = self._key_by_user.get(user)
+            if key is None or key[1] != nonce:
+                return None
+            entry = self._entries[key]
+            if gas_price_wei is not None and entry.gas_price_wei < gas_price_wei:
+                return None
+            if self._over_cap(entry.gas_price_wei):
+                self._drop(user)
+                return None
+            self._drop(user)
+        return entry
+
+    def discard(self, user_address: str):
+        with self._lock:
+            self._drop(address_to_bytes(user_address))
+
+    def retain(self, user_addresses: Iterable[str]):
+        """Drop entries for users no longer in the pre-sign band"""
+        keep = {address_to_bytes(user) for user in user_addresses}
+        with self._lock:
+            for user in [user for user in self._key_by_user if user not in keep]:
+                self._drop(user)
+
+    def _drop(self, user: bytes):
+        key = self._key_by_user.pop(user, None)
+        if key is not None:
+            self._entries.pop(key, None)
@@ -0,0 +1,341 @@
+# bot/src/clients/rpc_pool.py - v1.0 - Latency-scored multi-endpoint RPC provider
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.providers.base import BaseProvider
+
+from clients.fast_http_provider import FastHTTPProvider
+from utils.logger import logger
+
+
+class RpcEndpoint:
+    """One RPC URL with its rolling latency / error statistics"""
+
+    def __init__(self, url: str, provider: BaseProvider, window: int = 128):
+        self.url = url
+        self.provider = provider
+        self._latencies = deque(maxlen=window)  # seconds, successful requests only
+        self._outcomes = deque(maxlen=window)  # True = transport error
+        self._lock = threading.Lock()
+
+        self.consecutive_errors = 0
+        self.ejected_until = 0.0
+        self.eject_count = 0
+        self.probing = False
+
+        # Broadcast race: accepted our tx first / that tx was then mined
+        self.broadcast_wins = 0
+        self.inclusion_wins = 0
+
+    @property
+    def name(self) -> str:
+        """URL without path (API keys live there)"""
+        url = str(self.url)
+        return url.split("/")[2] if "//" in url else url
+
+    def record(self, latency: float, error: bool):
+        with self._lock:
+            self._outcomes.append(error)
+            if error:
+                self.consecutive_errors += 1
+            else:
+                self._latencies.append(latency)
+                self.consecutive_errors = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if not samples:
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(0.50)
+
+    @property
+    def p99(self) -> Optional[float]:
+        return self.percentile(0.99)
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            outcomes = list(self._outcomes)
+        return sum(outcomes) / len(outcomes) if outcomes else 0.0
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._outcomes)
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+    def reset(self):
+        with self._lock:
+            self._outcomes.clear()
+            self.consecutive_errors = 0
+
+    def stats(self) -> Dict:
+        p50, p99 = self.p50, self.p99
+        return {
+            "endpoint": self.name,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "samples": self.sample_count,
+            "ejected": self.is_ejected(time.monotonic()),
+            "eject_count": self.eject_count,
+            "broadcast_wins": self.broadcast_wins,
+            "inclusion_wins": self.inclusion_wins,
+        }
+
+
+class RpcPool(BaseProvider):
+    """
+    web3 provider routing each request to the fastest healthy endpoint.
+
+    - Endpoints are ranked by rolling p50 latency (untried ones first).
+    - A read still running hedge_after_ms after it reached the wire (time
+      spent queued for a worker does not count) is duplicated to the next
+      endpoint; the first successful answer wins.
+    - Transport failures fail over to the next endpoint. An endpoint with
+      max_consecutive_errors in a row, or an error rate above
+      max_error_rate, is ejected and re-probed in the background with
+      exponential backoff.
+
+    JSON-RPC error responses (reverts...) are answers, not endpoint failures.
+    """
+
+    # Methods that are not safe or not useful to duplicate
+    NO_HEDGE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+    # Node already holds the tx (another endpoint propagated it first)
+    ALREADY_KNOWN_ERRORS = ("already known", "known transaction", "already imported")
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        hedge_after_ms: float = 250,
+        max_error_rate: float = 0.25,
+        max_consecutive_errors: int = 3,
+        eject_seconds: float = 15,
+        request_timeout: float = 10,
+        pool_size: int = 10,
+        gzip: bool = False,
+        provider_factory: Optional[Callable[[str], BaseProvider]] = None
+    ):
+        if not urls:
+            raise ValueError("RpcPool needs at least one RPC URL")
+
+        provider_factory = provider_factory or (
+            lambda url: FastHTTPProvider(url, pool_size=pool_size, timeout=request_timeout, gzip=gzip)
+        )
+        self.endpoints = [RpcEndpoint(url, provider_factory(url)) for url in urls]
+        self.hedge_after = hedge_after_ms / 1000 if hedge_after_ms else None
+        self.max_error_rate = max_error_rate
+        self.max_consecutive_errors = max_consecutive_errors
+        self.eject_seconds = eject_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, 2 * len(self.endpoints)),
+            thread_name_prefix="rpc"
+        )
+        # Broadcasts never queue behind hedged reads or health probes
+        self._broadcast_executor = ThreadPoolExecutor(
+            max_workers=max(4, 4 * len(self.endpoints)),
+            thread_name_prefix="rpc-broadcast"
+        )
+        self._first_acceptor: "OrderedDict[bytes, RpcEndpoint]" = OrderedDict()
+        self._acceptor_lock = threading.Lock()
+
+    # ===== ROUTING =====
+
+    def ranked(self) -> List[RpcEndpoint]:
+        """Healthy endpoints fastest first, then ejected ones as a last resort"""
+        now = time.monotonic()
+        healthy = [e for e in self.endpoints if not e.is_ejected(now)]
+        ejected = [e for e in self.endpoints if e.is_ejected(now)]
+        healthy.sort(key=lambda e: e.p50 if e.p50 is not None else 0.0)
+        ejected.sort(key=lambda e: e.ejected_until)
+        return healthy + ejected
+
+    def make_request(self, method, params: Any) -> Dict:
+        self._probe_due_endpoints()
+        ranked = self.ranked()
+
+        hedge = self.hedge_after is not None and len(ranked) > 1 and method not in self.NO_HEDGE_METHODS
+        if hedge:
+            return self._hedged_request(ranked, method, params)
+
+        last_error = None
+        for endpoint in ranked:
+            try:
+                return self._timed_request(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _hedged_request(self, ranked: List[RpcEndpoint], method, params) -> Dict:
+        started = threading.Event()
+
+        def primary():
+            started.set()
+            return self._timed_request(ranked[0], method, params)
+
+        first = self._executor.submit(primary)
+        pending = {first}
+        remaining = iter(ranked[1:])
+        last_error = None
+
+        # The hedge clock starts when the primary is on the wire: a read still
+        # queued behind other callers' reads is not slow, and a backup would only add load
+        while not started.wait(self.hedge_after) and not first.done():
+            pass
+        done, pending = wait(pending, timeout=self.hedge_after, return_when=FIRST_COMPLETED)
+        while True:
+            for future in done:
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+
+            # Primary slow or failed: bring in the next endpoint
+            backup = next(remaining, None)
+            if backup is not None:
+                pending.add(self._executor.submit(self._timed_request, backup, method, params))
+            if not pending:
+                raise last_error or ConnectionError(f"No RPC endpoint answered {method}")
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    def make_batch_request(self, calls: Sequence) -> List[Dict]:
+        """One JSON-RPC batch on the fastest healthy endpoint, failing over on transport errors"""
+        last_error = None
+        for endpoint in self.ranked():
+            try:
+                return self._timed(endpoint, lambda: endpoint.provider.make_batch_request(calls))
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _timed_request(self, endpoint: RpcEndpoint, method, params) -> Dict:
+        return self._timed(endpoint, lambda: endpoint.provider.make_request(method, params))
+
+    def _timed(self, endpoint: RpcEndpoint, request: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        try:
+            response = request()
+        except Exception as e:
+            endpoint.record(time.monotonic() - start, error=True)
+            self._maybe_eject(endpoint, e)
+            raise
+        endpoint.record(time.monotonic() - start, error=False)
+        return response
+
+    # ===== BROADCAST =====
+
+    def broadcast_raw_transaction(self, raw_transaction: bytes) -> HexBytes:
+        """
+        Send a signed transaction to every endpoint at once.
+
+        Returns the transaction hash as soon as one endpoint accepts it; the
+        other sends keep running in the background to widen propagation.
+        Raises ValueError with the node error if every endpoint rejects it.
+        """
+        tx_hash = Web3.keccak(raw_transaction)
+        params = ["0x" + bytes(raw_transaction).hex()]
+
+        now = time.monotonic()
+        targets = [e for e in self.endpoints if not e.is_ejected(now)] or self.endpoints
+        futures = {
+            self._broadcast_executor.submit(self._timed_request, endpoint, "eth_sendRawTransaction", params): endpoint
+            for endpoint in targets
+        }
+
+        rejections, transport_errors = [], []
+        for future in as_completed(futures):
+            endpoint = futures[future]
+            try:
+                response = future.result()
+            except Exception as e:
+                transport_errors.append(e)
+                continue
+
+            error = response.get("error")
+            if error is None or self._is_already_known(error):
+                self._record_acceptance(tx_hash, endpoint)
+                logger.debug(f"Broadcast accepted first by {endpoint.name} | tx_hash={tx_hash.hex()[:10]}...")
+                return tx_hash
+            rejections.append(error)
+
+        # A node's verdict (nonce too low, underpriced...) says more than a timeout
+        errors = rejections + transport_errors
+        raise ValueError(errors[0] if errors else "No RPC endpoint accepted the transaction")
+
+    def _is_already_known(self, error) -> bool:
+        message = str(error.get("message", "") if isinstance(error, dict) else error).lower()
+        return any(known in message for known in self.ALREADY_KNOWN_ERRORS)
+
+    def _record_acceptance(self, tx_hash: bytes, endpoint: RpcEndpoint):
+        endpoint.broadcast_wins += 1
+        with self._acceptor_lock:
+            self._first_acceptor[bytes(tx_hash)] = endpoint
+            while len(self._first_acceptor) > 256:
+                self._first_acceptor.popitem(last=False)
+
+    def record_inclusion(self, tx_hash: bytes):
+        """Credit the endpoint that accepted a now-mined transaction first"""
+        with self._acceptor_lock:
+            endpoint = self._first_acceptor.pop(bytes(tx_hash), None)
+        if endpoint is not None:
+            endpoint.inclusion_wins += 1
+            logger.info(f"Transaction included | first accepted by {endpoint.name}")
+
+    # ===== EJECTION / RE-PROBE =====
+
+    def _maybe_eject(self, endpoint: RpcEndpoint, error: Exception):
+        too_many_errors = endpoint.consecutive_errors >= self.max_consecutive_errors
+        error_rate_high = endpoint.sample_count >= 20 and endpoint.error_rate > self.max_error_rate
+        now = time.monotonic()
+        if (too_many_errors or error_rate_high) and not endpoint.is_ejected(now):
+            endpoint.eject_count += 1
+            backoff = self.eject_seconds * 2 ** min(endpoint.eject_count - 1, 5)
+            endpoint.ejected_until = now + backoff
+            logger.warning(
+                f"RPC endpoint ejected | {endpoint.name} | error_rate={endpoint.error_rate:.2f} | "
+                f"retry_in={backoff:.0f}s | last_error={error}"
+            )
+
+    def _probe_due_endpoints(self):
+        now = time.monotonic()
+        for endpoint in self.endpoints:
+            if endpoint.ejected_until and not endpoint.is_ejected(now) and not endpoint.probing:
+                endpoint.probing = True
+                self._executor.submit(self._probe, endpoint)
+
+    def _probe(self, endpoint: RpcEndpoint):
+        try:
+            endpoint.provider.make_request("eth_blockNumber", [])
+            endpoint.reset()
+            endpoint.ejected_until = 0.0
+            endpoint.eject_count = 0
+            logger.info(f"RPC endpoint reinstated | {endpoint.name}")
+        except Exception as e:
+            endpoint.eject_count += 1
+            backoff = self.eject_seconds * 2 ** min(endpoint.eject_count - 1, 5)
+            endpoint.ejected_until = time.monotonic() + backoff
+            logger.debug(f"RPC endpoint still failing | {endpoint.name} | retry_in={backoff:.0f}s | {e}")
+        finally:
+            endpoint.probing = False
+
+    # ===== PROVIDER API =====
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(endpoint.provider.is_connected(show_traceback) for endpoint in self.endpoints)
+
+    def stats(self) -> List[Dict]:
+        return [endpoint.stats() for endpoint in self.endpoints]
@@ -1,7 +1,10 @@
 # bot/src/clients/web3_client.py - v2.0 - Multi-collateral support
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import Tuple, Optional, List, Dict
+from typing import Callable, Tuple, Optional, List, Dict
 from web3 import Web3
 from web3.exceptions import ContractLogicError
 from eth_account import Account
@@ -10,11 +13,61 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config import Config
+from clients.nonce_manager import NonceManager
+from clients.liquidator_wallet import LiquidatorWallet
+from clients.rpc_pool import RpcPool
+from clients.fast_http_provider import strip_unused_middlewares
+from clients.abi_fastpath import ContractFastPath, FastCaller
+from clients.asset_registry import asset_registry
+from clients.oracle_watcher import OracleEventWatcher
+from clients.position_watcher import PositionEventWatcher
+from models.position_snapshot import PositionSnapshot
+from models.address import Address, address_to_bytes
 from utils.logger import logger
 
+
+class LiquidationSimulation:
+    """Outcome of an eth_call of liquidate(user) at the pending block"""
+
+    __slots__ = ("user_address", "block_number", "reverted", "reason")
+
+    def __init__(self, user_address: str, block_number: int, reverted: bool, reason: Optional[str] = None):
+        self.user_address = user_address
+        self.block_number = block_number
+        self.reverted = reverted
+        self.reason = reason  # Custom error name or revert string
+
+    def __repr__(self) -> str:
+        outcome = f"revert({self.reason})" if self.reverted else "ok"
+        return f"LiquidationSimulation(user={self.user_address[:8]}..., block={self.block_number}, {outcome})"
+
+
+def error_selectors(abi: List[Dict]) -> Dict[str, str]:
+    """Custom error selector (0x + 4 bytes hex) -> error name"""
+    selectors = {}
+    for entry in abi:
+        if entry.get("type") != "error":
+            continue
+        signature = f"{entry['name']}({','.join(i['type'] for i in entry.get('inputs', []))})"
+        selectors["0x" + bytes(Web3.keccak(text=signature)[:4]).hex()] = entry["name"]
+    return selectors
+
+
 class Web3Client:
+    RECEIPT_TIMEOUT_SECONDS = 180
+
     def __init__(self):
-        self.w3 = Web3(Web3.HTTPProvider(Config.SEPOLIA_RPC_URL))
+        self.rpc_pool = RpcPool(
+            Config.RPC_URLS or [Config.SEPOLIA_RPC_URL],
+            hedge_after_ms=Config.RPC_HEDGE_AFTER_MS,
+            max_error_rate=Config.RPC_MAX_ERROR_RATE,
+            eject_seconds=Config.RPC_EJECT_SECONDS,
+            request_timeout=Config.RPC_REQUEST_TIMEOUT,
+            pool_size=Config.RPC_POOL_SIZE,
+            gzip=Config.RPC_GZIP
+        )
+        self.w3 = Web3(self.rpc_pool)
+        strip_unused_middlewares(self.w3)
         
         if not self.w3.is_connected():
             raise ConnectionError("Failed to connect to Sepolia RPC")
@@ -45,18 +98,98 @@ class Web3Client:
             abi=oracle_aggregator_abi
         )
         
+        # Hot-path eth_call layer: selectors precomputed from the same ABIs
+        self.fast_caller = FastCaller(self.rpc_pool)
+        self.fast_lending_pool = ContractFastPath(Config.LENDING_POOL_ADDRESS, lending_pool_abi)
+        self.fast_collateral_manager = ContractFastPath(Config.COLLATERAL_MANAGER_ADDRESS, collateral_manager_abi)
+        self.fast_oracle_aggregator = ContractFastPath(Config.ORACLE_AGGREGATOR_ADDRESS, oracle_aggregator_abi)
+
+        # Collateral asset configs: one batched read now, then AssetAdded/Updated/Enabled events
+        asset_registry.attach(self.fast_caller, self.rpc_pool, self.fast_collateral_manager)
+        try:
+            asset_registry.load()
+        except Exception as e:
+            logger.warning(f"Asset registry load failed, using COLLATERAL_CONFIGS: {e}")
+
+        # Oracle prices / emergency flag kept current from events (driven by block heads)
+        self.oracle_watcher = OracleEventWatcher(
+            self.rpc_pool,
+            self.fast_oracle_aggregator,
+            read_emergency_mode=self._read_oracle_emergency_mode
+        )
+
+        # liquidate() can revert with errors from any of the three contracts
+        self.error_selectors = {}
+        for abi in (oracle_aggregator_abi, collateral_manager_abi, lending_pool_abi):
+            self.error_selectors.update(error_selectors(abi))
+        self._revert_cache: Dict[Tuple[bytes, int], LiquidationSimulation] = {}
+        self._revert_cache_lock = threading.Lock()
+
         # Setup account
         self.account = Account.from_key(Config.PRIVATE_KEY)
+        self.nonce_manager = NonceManager(
+            lambda: self.w3.eth.get_transaction_count(self.account.address, "pending")
+        )
+        # More keys = parallel nonce chains; this client stays the primary wallet
+        self.extra_wallets = [LiquidatorWallet(self, key) for key in Config.LIQUIDATOR_POOL_PRIVATE_KEYS]
+        # Broadcast liquidations awaiting a receipt: tx_hash -> {nonce, raw, sent_at}
+        self.pending_txs: Dict[str, Dict] = {}
+        self._pending_lock = threading.Lock()
+        # Receipts are awaited off the sending thread; on_receipt(tx_hash, status) hears the outcome
+        # (True mined, False reverted, None no receipt within RECEIPT_TIMEOUT_SECONDS)
+        self.on_receipt: Optional[Callable[[str, Optional[bool]], None]] = None
+        self._receipt_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="receipts")
+        # Last gas price read from the node, the fallback when the read fails
+        self.last_gas_price_wei: Optional[int] = None
+        # Liquidations / repayments by anyone, ahead of the subgraph (driven by block heads)
+        self.position_watcher = PositionEventWatcher(
+            self.rpc_pool, self.fast_lending_pool,
+            our_addresses=[self.account.address] + [wallet.account.address for wallet in self.extra_wallets]
+        )
         logger.info(f"Web3Client initialized | wallet={self.account.address}")
     
+    # ===== HOT-PATH CALLS =====
+
+    def _call(self, contract, fast: ContractFastPath, name: str, *args, block_identifier="latest"):
+        """
+        eth_call name(*args) through the precomputed-selector fast path,
+        or through web3's ContractFunction when the ABI lacks the function.
+        Address arguments may be any spelling (subgraph ids are lowercase).
+        """
+        if fast.has(name):
+            return self.fast_caller.call(fast, name, args, block_identifier)
+        args = [Address(a) if isinstance(a, str) else a for a in args]
+        return getattr(contract.functions, name)(*args).call(block_identifier=block_identifier)
+
+    def call_many(self, calls: List[Tuple], block_identifier="latest") -> List:
+        """
+        Several hot-path calls pinned to one block, sent as one JSON-RPC batch.
+
+        Args:
+            calls: (contract, fast_contract, function name, args) tuples
+        """
+        if all(fast.has(name) for _, fast, name, _ in calls):
+            return self.fast_caller.call_many(
+                [(fast, name, args) for _, fast, name, args in calls],
+                block_identifier
+            )
+        return [
+            self._call(contract, fast, name, *args, block_identifier=block_identifier)
+            for contract, fast, name, args in calls
+        ]
+
     # ===== NEW METHODS FOR MULTI-COLLATERAL =====
 
     def get_asset_price(self, asset_address: str) -> int:
-        """Get price for any supported asset via OracleAggregator"""
+        """
+        Get price for any supported asset via OracleAggregator: the price
+        from its last PriceUpdated event while fresh, else getPrice() on-chain
+        """
+        price = self.oracle_watcher.fresh_price(asset_address)
+        if price is not None:
+            return price
         try:
-            price = self.oracle_aggregator.functions.getPrice(
-                Web3.to_checksum_address(asset_address)
-            ).call()
+            price = self._call(self.oracle_aggregator, self.fast_oracle_aggregator, "getPrice", asset_address)
             logger.debug(f"Price for {asset_address[:10]}...: ${price / 10**8}")
             return price
         except Exception as e:
@@ -66,9 +199,9 @@ class Web3Client:
     def get_user_collaterals(self, user_address: str) -> List[Dict]:
         """Get all collateral assets for a user"""
         try:
-            assets, amounts, _ = self.collateral_manager.functions.getUserCollaterals(
-                Web3.to_checksum_address(user_address)
-            ).call()
+            assets, amounts, _ = self._call(
+                self.collateral_manager, self.fast_collateral_manager, "getUserCollaterals", user_address
+            )
 
             collaterals = []
             for i, asset in enumerate(assets):
@@ -76,7 +209,7 @@ class Web3Client:
                     collaterals.append({
                         "asset": asset,
                         "amount": amounts[i],
-                        "symbol": Config.COLLATERAL_CONFIGS.get(asset, {}).get("symbol", "UNKNOWN")
+                        "symbol": asset_registry.symbol(asset)
                     })
 
             return collaterals
@@ -88,9 +221,9 @@ class Web3Client:
     def get_collateral_value_usd(self, user_address: str) -> int:
         """Get total USD value of user's collateral"""
         try:
-            value_usd = self.collateral_manager.functions.getCollateralValueUSD(
-                Web3.to_checksum_address(user_address)
-            ).call()
+            value_usd = self._call(
+                self.collateral_manager, self.fast_collateral_manager, "getCollateralValueUSD", user_address
+            )
             return value_usd
         except Exception as e:
             logger.error(f"Failed to get collateral value USD: {e}")
@@ -100,7 +233,7 @@ class Web3Client:
         """Get maximum borrowable amount for user"""
         try:
             max_borrow = self.collateral_manager.functions.getMaxBorrowValue(
-                Web3.to_checksum_address(user_address)
+                Address(user_address)
             ).call()
             return max_borrow
         except Exception as e:
@@ -111,9 +244,7 @@ class Web3Client:
         """Get position data from both contracts"""
         try:
             # Get borrowed amount from LendingPool
-            position = self.lending_pool.functions.getPosition(
-                Web3.to_checksum_address(user_address)
-            ).call()
+            position = self._call(self.lending_pool, self.fast_lending_pool, "getPosition", user_address)
 
             _, borrowed, last_update, _ = position
 
@@ -174,14 +305,63 @@ class Web3Client:
 
     def get_health_factor(self, user_address: str) -> int:
         try:
-            hf = self.lending_pool.functions.getHealthFactor(
-                Web3.to_checksum_address(user_address)
-            ).call()
+            hf = self._call(self.lending_pool, self.fast_lending_pool, "getHealthFactor", user_address)
             return hf
         except Exception as e:
             logger.error(f"Failed to get health factor: {e}")
             return 999999
     
+    def get_position_snapshot(
+        self,
+        user_address: str,
+        block_identifier=None,
+        gas_price_wei: Optional[int] = None
+    ) -> Optional[PositionSnapshot]:
+        """
+        Read everything a liquidation attempt needs at one pinned block.
+
+        Args:
+            user_address: Borrower address
+            block_identifier: Block to read at (defaults to the latest block number)
+            gas_price_wei: Gas price already read for this block (defaults to a fresh read)
+
+        Returns:
+            PositionSnapshot, or None if any read fails
+        """
+        try:
+            block = self.w3.eth.block_number if block_identifier is None else block_identifier
+
+            # One batch round trip for the four reads
+            position, collateral_usd, (assets, amounts, _), eth_price = self.call_many([
+                (self.lending_pool, self.fast_lending_pool, "getPosition", (user_address,)),
+                (self.collateral_manager, self.fast_collateral_manager, "getCollateralValueUSD", (user_address,)),
+                (self.collateral_manager, self.fast_collateral_manager, "getUserCollaterals", (user_address,)),
+                (self.oracle_aggregator, self.fast_oracle_aggregator, "getPrice", (Config.ETH_ADDRESS,)),
+            ], block_identifier=block)
+            _, borrowed_wei, _, _ = position
+
+            snapshot = PositionSnapshot(
+                user_address=user_address,
+                block_number=block,
+                borrowed_wei=borrowed_wei,
+                collateral_usd=collateral_usd,
+                collaterals=tuple(
+                    (asset, amount) for asset, amount in zip(assets, amounts) if amount > 0
+                ),
+                eth_price=eth_price,
+                gas_price_wei=self.estimate_gas_price() if gas_price_wei is None else gas_price_wei
+            )
+
+            logger.debug(
+                f"Position snapshot | user={user_address[:10]}... | block={block} | "
+                f"HF={snapshot.health_factor} | borrowed={borrowed_wei}"
+            )
+            return snapshot
+
+        except Exception as e:
+            logger.error(f"Failed to snapshot position {user_address}: {e}")
+            return None
+
     def estimate_gas_price(self) -> int:
         try:
             gas_price = self.w3.eth.gas_price
@@ -193,30 +373,115 @@ class Web3Client:
                     f"(max: {Config.MAX_GAS_PRICE_GWEI})"
                 )
             
+            self.last_gas_price_wei = gas_price
             return gas_price
             
         except Exception as e:
             logger.error(f"Failed to estimate gas price: {e}")
-            return 20 * 10**9  # Fallback 20 gwei
+            return self.last_gas_price_wei or 20 * 10**9  # Fallback: last seen, else 20 gwei
     
-    def build_liquidation_tx(self, user_address: str, debt_amount: int) -> dict:
-        user_checksum = Web3.to_checksum_address(user_address)
+    def build_liquidation_tx(
+        self,
+        user_address: str,
+        debt_amount: int,
+        gas_price_wei: Optional[int] = None,
+        nonce: Optional[int] = None,
+        sender: Optional[str] = None
+    ) -> dict:
+        user_checksum = Address(user_address)
+        if gas_price_wei is None:
+            gas_price_wei = self.estimate_gas_price()
+        if nonce is None:
+            nonce = self.nonce_manager.peek()
         
         tx = self.lending_pool.functions.liquidate(user_checksum).build_transaction({
-            'from': self.account.address,
+            'from': sender or self.account.address,
             'value': debt_amount,
             'gas': 500000,
-            'gasPrice': self.estimate_gas_price(),
-            'nonce': self.w3.eth.get_transaction_count(self.account.address),
+            'gasPrice': gas_price_wei,
+            'nonce': nonce,
             'chainId': 11155111  # Sepolia
         })
         
         return tx
+
+    def simulate_liquidation(
+        self,
+        user_address: str,
+        debt_amount: int,
+        block_number: int,
+        sender: Optional[str] = None
+    ) -> LiquidationSimulation:
+        """
+        eth_call liquidate(user) with the real sender and value at the pending block.
+
+        Reverts are cached per (user, block_number) so a doomed attempt is
+        simulated at most once per block. A failed RPC is not a revert:
+        the result is then reported as not reverted and the send proceeds.
+
+        Args:
+            user_address: Borrower to liquidate
+            debt_amount: msg.value (Wei)
+            block_number: Head block the attempt is based on (cache key)
+            sender: Liquidator wallet sending it (defaults to the primary account)
+        """
+        key = (address_to_bytes(user_address), block_number)
+        with self._revert_cache_lock:
+            cached = self._revert_cache.get(key)
+        if cached is not None:
+            logger.debug(f"Known revert, skipping simulation | {cached}")
+            return cached
+
+        try:
+            self.lending_pool.functions.liquidate(
+                Address(user_address)
+            ).call({
+                'from': sender or self.account.address,
+                'value': debt_amount,
+                'gas': 500000
+            }, block_identifier='pending')
+            return LiquidationSimulation(user_address, block_number, reverted=False)
+
+        except ContractLogicError as e:
+            simulation = LiquidationSimulation(
+                user_address, block_number, reverted=True, reason=self.decode_revert(e)
+            )
+            with self._revert_cache_lock:
+                # Only the current block's outcomes can be hit again
+                for stale in [k for k in self._revert_cache if k[1] < block_number]:
+                    del self._revert_cache[stale]
+                self._revert_cache[key] = simulation
+            logger.warning(f"Liquidation simulation reverted | {simulation}")
+            return simulation
+
+        except Exception as e:
+            logger.error(f"Liquidation simulation failed: {e}")
+            return LiquidationSimulation(user_address, block_number, reverted=False)
+
+    def decode_revert(self, error: ContractLogicError) -> str:
+        """Custom error name for ABI errors, else the revert string"""
+        data = error.data
+        if isinstance(data, str) and data[:10] in self.error_selectors:
+            return self.error_selectors[data[:10]]
+        message = str(error.message or error)
+        return message.replace("execution reverted: ", "")
+
+    def sign_liquidation_tx(
+        self,
+        user_address: str,
+        debt_amount: int,
+        gas_price_wei: Optional[int] = None,
+        nonce: Optional[int] = None
+    ):
+        """Build and sign liquidate(user) without broadcasting it"""
+        tx = self.build_liquidation_tx(user_address, debt_amount, gas_price_wei, nonce)
+        return self.account.sign_transaction(tx)
     
     def execute_liquidation(
         self, 
         user_address: str, 
-        debt_amount: int
+        debt_amount: int,
+        gas_price_wei: Optional[int] = None
     ) -> Optional[str]:
         try:
             logger.info(
@@ -224,53 +489,163 @@ class Web3Client:
                 f"debt=${debt_amount / 10**Config.USD_DECIMALS:.2f}"
             )
             
-            tx = self.build_liquidation_tx(user_address, debt_amount)
-            
-            # Sign transaction
-            signed_tx = self.account.sign_transaction(tx)
+            nonce = self.nonce_manager.peek()
+            signed_tx = self.sign_liquidation_tx(user_address, debt_amount, gas_price_wei, nonce)
             
-            # FIX: Correct attribute name (underscore not camelCase)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            logger.error(f"Liquidation execution failed: {e}")
+            return None
+
+        return self.send_signed_liquidation(signed_tx.raw_transaction, nonce)
+
+    def send_signed_liquidation(
+        self,
+        raw_transaction: bytes,
+        nonce: int,
+        wallet: Optional[LiquidatorWallet] = None
+    ) -> Optional[str]:
+        """
+        Broadcast a signed liquidation (wallet: None = primary account) and
+        return its hash at once; the receipt is awaited on a background
+        thread and reported to on_receipt, so the caller (the head worker)
+        never blocks on block inclusion.
+        """
+        nonce_manager = self.nonce_manager if wallet is None else wallet.nonce_manager
+        sender = self.account.address if wallet is None else wallet.account.address
+        try:
+            # Same signed tx to every endpoint; returns on the first acceptance
+            tx_hash = self.rpc_pool.broadcast_raw_transaction(raw_transaction)
+            nonce_manager.advance(nonce)
             tx_hash_hex = tx_hash.hex()
+            self._track_pending(tx_hash_hex, nonce, raw_transaction, sender)
             
-            logger.info(f"Liquidation tx sent | tx_hash={tx_hash_hex[:10]}...")
+            logger.info(f"Liquidation tx sent | tx_hash={tx_hash_hex[:10]}... | wallet={sender[:10]}...")
             
-            # Wait for confirmation
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=180)
-            
-            if receipt.status == 1:
+        except Exception as e:
+            # Nonce too low / replacement underpriced: re-read before the next tx
+            nonce_manager.invalidate()
+            logger.error(f"Liquidation broadcast failed: {e}")
+            return None
+
+        self._receipt_executor.submit(self._await_receipt, tx_hash, nonce_manager)
+        return tx_hash_hex
+
+    def _await_receipt(self, tx_hash, nonce_manager: NonceManager):
+        tx_hash_hex = tx_hash.hex()
+        status = None
+        try:
+            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=self.RECEIPT_TIMEOUT_SECONDS)
+            self._untrack_pending(tx_hash_hex)
+            status = receipt.status == 1
+            if status:
+                self.rpc_pool.record_inclusion(tx_hash)
                 logger.info(f"Liquidation confirmed | tx_hash={tx_hash_hex}")
-                return tx_hash_hex
             else:
-                logger.error(f"Liquidation failed | tx_hash={tx_hash_hex}")
-                return None
-                
-        except ContractLogicError as e:
-            logger.error(f"Contract reverted: {e}")
-            return None
+                logger.error(f"Liquidation reverted | tx_hash={tx_hash_hex}")
         except Exception as e:
-            logger.error(f"Liquidation execution failed: {e}")
-            return None
+            # Still tracked (maybe in a mempool); the next send re-reads the pending nonce
+            nonce_manager.invalidate()
+            logger.error(f"No receipt for liquidation | tx_hash={tx_hash_hex} | error={e}")
+
+        if self.on_receipt is not None:
+            try:
+                self.on_receipt(tx_hash_hex, status)
+            except Exception as e:
+                logger.error(f"Receipt handler failed | tx_hash={tx_hash_hex[:10]}... | error={e}")
+
+    def _track_pending(self, tx_hash_hex: str, nonce: int, raw_transaction: bytes, sender: str):
+        with self._pending_lock:
+            self.pending_txs[tx_hash_hex] = {
+                "from": sender,
+                "nonce": nonce,
+                "raw": bytes(raw_transaction).hex(),
+                "sent_at": time.time(),
+            }
+
+    def _untrack_pending(self, tx_hash_hex: str):
+        # Timed-out sends stay tracked: still in a mempool, checked on restart
+        with self._pending_lock:
+            self.pending_txs.pop(tx_hash_hex, None)
+
+    def restore_pending_txs(self, entries: Dict[str, Dict]) -> int:
+        """
+        Liquidations broadcast by the previous run that had no receipt yet:
+        drop the mined ones, re-broadcast the rest (a node that still holds
+        one answers "already known") and keep them tracked.
+
+        Returns:
+            Number of transactions still pending
+        """
+        restored = 0
+        for tx_hash_hex, entry in entries.items():
+            try:
+                receipt = self.w3.eth.get_transaction_receipt(tx_hash_hex)
+            except Exception:
+                receipt = None
+            if receipt is not None:
+                logger.info(f"Pending liquidation mined while stopped | tx_hash={tx_hash_hex[:10]}... | status={receipt.status}")
+                continue
+            try:
+                self.rpc_pool.broadcast_raw_transaction(bytes.fromhex(entry["raw"]))
+            except Exception as e:
+                # Nonce consumed by another tx, or the tx is no longer valid
+                logger.warning(f"Dropped pending liquidation | tx_hash={tx_hash_hex[:10]}... | error={e}")
+                continue
+            self.nonce_manager_of(entry.get("from")).set_floor(entry["nonce"] + 1)
+            with self._pending_lock:
+                self.pending_txs[tx_hash_hex] = dict(entry)
+            restored += 1
+        if entries:
+            logger.info(f"Restored pending liquidations | pending={restored}/{len(entries)}")
+        return restored
     
+    def nonce_manager_of(self, sender: Optional[str]) -> NonceManager:
+        """Nonce chain of a liquidator address (the primary one when unknown)"""
+        for wallet in self.extra_wallets:
+            if sender is not None and Address(sender) == Address(wallet.account.address):
+                return wallet.nonce_manager
+        return self.nonce_manager
+
     def get_wallet_balance(self) -> Decimal:
-        balance_wei = self.w3.eth.get_balance(self.account.address)
+        balance_wei = self.get_wallet_balance_wei()
         return Decimal(balance_wei) / Decimal(10**18)
 
+    def get_wallet_balance_wei(self) -> int:
+        return self.w3.eth.get_balance(self.account.address)
+
+    def get_rpc_stats(self) -> List[Dict]:
+        """Latency / error statistics per RPC endpoint"""
+        return self.rpc_pool.stats()
+
     # ===== ORACLE METHODS =====
 
     def get_oracle_emergency_mode(self) -> bool:
-        """Check if oracle is in emergency mode"""
+        """
+        Check if oracle is in emergency mode.
+
+        Served by the oracle watcher once it is live (seeded on-chain on its
+        first head, then kept by EmergencyModeSet events); read on-chain before that.
+        """
+        watcher = self.oracle_watcher
+        if watcher.is_live and watcher.emergency_mode is not None:
+            return watcher.emergency_mode
         try:
-            return self.oracle_aggregator.functions.emergencyMode().call()
+            emergency_mode = self._read_oracle_emergency_mode()
+            if watcher.is_live:
+                watcher.emergency_mode = emergency_mode
+            return emergency_mode
         except Exception as e:
             logger.error(f"Failed to get oracle emergency mode: {e}")
             return False
 
+    def _read_oracle_emergency_mode(self) -> bool:
+        return self._call(self.oracle_aggregator, self.fast_oracle_aggregator, "emergencyMode")
+
     def get_cached_price(self, asset_address: str) -> Optional[Dict]:
         """Get cached price info for asset"""
         try:
             price, updated_at, source = self.oracle_aggregator.functions.getCachedPrice(
-                Web3.to_checksum_address(asset_address)
+                Address(asset_address)
             ).call()
             return {
                 "price": price,
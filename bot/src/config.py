@@ -3,6 +3,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from models.address import Address, AddressMap
+
 # Load .env from project root (go up two levels from src/)
 project_root = Path(__file__).parent.parent.parent
 load_dotenv(project_root / ".env")
@@ -10,7 +12,31 @@ load_dotenv(project_root / ".env")
 class Config:
     # Blockchain
     SEPOLIA_RPC_URL = os.getenv("SEPOLIA_RPC_URL")
+    # Extra endpoints for the RPC pool (comma separated); SEPOLIA_RPC_URL is always first
+    RPC_URLS = list(dict.fromkeys(
+        url.strip()
+        for url in [SEPOLIA_RPC_URL or ""] + os.getenv("RPC_URLS", "").split(",")
+        if url.strip()
+    ))
+    RPC_HEDGE_AFTER_MS = float(os.getenv("RPC_HEDGE_AFTER_MS", "250"))  # 0 = no hedged reads
+    RPC_MAX_ERROR_RATE = float(os.getenv("RPC_MAX_ERROR_RATE", "0.25"))
+    RPC_EJECT_SECONDS = float(os.getenv("RPC_EJECT_SECONDS", "15"))
+    RPC_REQUEST_TIMEOUT = float(os.getenv("RPC_REQUEST_TIMEOUT", "10"))
+    RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "10"))  # Keep-alive connections per endpoint (scheduler threads)
+    RPC_GZIP = os.getenv("RPC_GZIP", "false").lower() == "true"
+    # Block-synchronous monitor cycles: newHeads over WebSocket, eth_blockNumber polling otherwise
+    BLOCK_SYNC_ENABLED = os.getenv("BLOCK_SYNC_ENABLED", "true").lower() == "true"
+    WS_RPC_URL = os.getenv("WS_RPC_URL")
+    HEAD_POLL_INTERVAL_SECONDS = float(os.getenv("HEAD_POLL_INTERVAL_SECONDS", "2"))
+    # Pending setPrice() / competitor liquidate() from newPendingTransactions (WebSocket only)
+    MEMPOOL_WATCH_ENABLED = os.getenv("MEMPOOL_WATCH_ENABLED", "false").lower() == "true"
+    MEMPOOL_WS_URL = os.getenv("MEMPOOL_WS_URL") or WS_RPC_URL
+    MEMPOOL_PENDING_TTL_SECONDS = float(os.getenv("MEMPOOL_PENDING_TTL_SECONDS", "60"))
+    POSITION_STORE_PATH = os.getenv("POSITION_STORE_PATH", "")  # Opt-in warm restarts, e.g. ../data/bot_state.db
+    CYCLE_ARCHIVE_PATH = os.getenv("CYCLE_ARCHIVE_PATH", "")  # Opt-in: grows 64 B/position/cycle, no rotation
     PRIVATE_KEY = os.getenv("LIQUIDATOR_PRIVATE_KEY")  # Use liquidator key, not deployer
+    # Extra liquidator keys (comma-separated): one nonce chain and balance each, alongside PRIVATE_KEY
+    LIQUIDATOR_POOL_PRIVATE_KEYS = [key.strip() for key in os.getenv("LIQUIDATOR_POOL_PRIVATE_KEYS", "").split(",") if key.strip()]
 
     # ===== NEW CONTRACTS (v3.1) =====
     LENDING_POOL_ADDRESS = os.getenv("LENDING_POOL_ADDRESS")  # v3.0
@@ -36,12 +62,29 @@ class Config:
     
     # Bot Configuration
     MONITOR_INTERVAL_SECONDS = int(os.getenv("MONITOR_INTERVAL_SECONDS", "60"))
+    MONITOR_SHARDS = int(os.getenv("MONITOR_SHARDS", "1"))  # Worker processes evaluating positions (1 = in-process)
+    # Replicas sharing the wallet: sqlite:///path or redis://host (empty = single instance)
+    COORDINATION_URL = os.getenv("COORDINATION_URL", "")
+    COORDINATION_SHARDS = int(os.getenv("COORDINATION_SHARDS", "64"))
+    COORDINATION_LEASE_SECONDS = float(os.getenv("COORDINATION_LEASE_SECONDS", "10"))
+    INSTANCE_ID = os.getenv("INSTANCE_ID")  # Defaults to host-pid-random
     MIN_PROFIT_USD = float(os.getenv("MIN_PROFIT_USD", "5.0"))
     MAX_GAS_PRICE_GWEI = int(os.getenv("MAX_GAS_PRICE_GWEI", "50"))
     HEALTH_FACTOR_THRESHOLD = float(os.getenv("HEALTH_FACTOR_THRESHOLD", "1.0"))
     
     # Liquidator
     LIQUIDATOR_WALLET = os.getenv("LIQUIDATOR_WALLET")
+    WALLET_GAS_RESERVE_ETH = float(os.getenv("WALLET_GAS_RESERVE_ETH", "0.01"))  # Never committed to liquidations
+    WALLET_BALANCE_MAX_AGE_SECONDS = int(os.getenv("WALLET_BALANCE_MAX_AGE_SECONDS", "60"))
+    LIQUIDATION_GAS_BUDGET_ETH = float(os.getenv("LIQUIDATION_GAS_BUDGET_ETH", "0"))  # Per cycle, 0 = no cap
+
+    # Pre-signed liquidation transactions for positions below this HF (0 = disabled)
+    PRESIGN_HF_BAND = float(os.getenv("PRESIGN_HF_BAND", "1.05"))
+    PRESIGN_FEE_TIER_BASE_GWEI = float(os.getenv("PRESIGN_FEE_TIER_BASE_GWEI", "1"))
+    PRESIGN_FEE_TIER_RATIO = float(os.getenv("PRESIGN_FEE_TIER_RATIO", "1.125"))  # One EIP-1559 base fee step
+
+    # Predict the next oracle update from the providers (needs PRICE_REGISTRY_ADDRESS)
+    ORACLE_MIRROR_ENABLED = os.getenv("ORACLE_MIRROR_ENABLED", "true").lower() == "true"
     
     # Logging
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -59,16 +102,18 @@ class Config:
     ORACLE_AGGREGATOR_ABI_PATH = "abis/OracleAggregator.json"
     PRICE_REGISTRY_ABI_PATH = "abis/PriceRegistry.json"
     LFTKN_ABI_PATH = "abis/LFTKN.json"
+    PRICE_PROVIDER_ABI_PATH = "abis/PriceProvider.json"  # IPriceProvider (Chainlink / Uniswap TWAP / manual)
 
     # ===== DEPRECATED - REMOVE =====
     # ORACLE_ABI_PATH = "../out/SimpleOracle.sol/SimpleOracle.json"  # OLD
     
     # ===== NEW MULTI-COLLATERAL CONSTANTS =====
     # Asset addresses for collateral tracking
-    ETH_ADDRESS = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"  # Placeholder for ETH
+    ETH_ADDRESS = Address("0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE")  # Placeholder for ETH
 
-    # Collateral configs (LTV ratios)
-    COLLATERAL_CONFIGS = {
+    # Collateral configs (LTV ratios), looked up by any spelling of the asset address.
+    # Offline fallback only: at runtime clients.asset_registry reads them from CollateralManager
+    COLLATERAL_CONFIGS = AddressMap({
         ETH_ADDRESS: {
             "symbol": "ETH",
             "ltv": 66,  # 66% LTV
@@ -76,10 +121,11 @@ class Config:
             "decimals": 18
         },
         # Will be populated with actual USDC/DAI addresses from env
-    }
+    })
 
     # Constants
     LIQUIDATION_BONUS = 0.10  # 10%
+    LIQUIDATION_BONUS_PERCENT = 10  # DataTypes.LIQUIDATION_BONUS (integer math)
     ETH_DECIMALS = 18
     USD_DECIMALS = 8  # Chainlink standard
     
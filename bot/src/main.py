@@ -1,6 +1,7 @@
 # bot/src/main.py - v2.0 - Flask app with modular job scheduler
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
+import atexit
 import sys
 
 from config import Config
@@ -9,6 +10,10 @@ from clients.web3_client import Web3Client
 from services.profit_calculator import ProfitCalculator
 from services.liquidator import Liquidator
 from services.position_monitor import PositionMonitor
+from services.position_store import PositionStore
+from services.cycle_archive import CycleArchive
+from services.shard_pool import ShardedEvaluator
+from services.coordinator import InstanceCoordinator, make_backend
 from scheduler import BotScheduler
 from utils.logger import logger
 
@@ -39,8 +44,24 @@ def initialize_services():
         
         # Initialize services
         profit_calculator = ProfitCalculator(web3_client)
-        liquidator = Liquidator(web3_client, profit_calculator)
+        liquidator = Liquidator(web3_client, profit_calculator, web3_client.extra_wallets)
         monitor = PositionMonitor(graph_client, web3_client, liquidator)
+
+        # Replicas: shard leases and the transaction leader, settled before anything is read or sent
+        if Config.COORDINATION_URL:
+            coordinator = InstanceCoordinator(make_backend(Config.COORDINATION_URL), Config.INSTANCE_ID)
+            monitor.attach_coordinator(coordinator)
+            coordinator.start()
+            atexit.register(coordinator.stop)  # Hand shards and leadership over now, not at lease expiry
+
+        # Warm restart from the last snapshot
+        if Config.POSITION_STORE_PATH:
+            monitor.attach_store(PositionStore(Config.POSITION_STORE_PATH))
+            monitor.restore()
+        if Config.CYCLE_ARCHIVE_PATH:
+            monitor.attach_archive(CycleArchive(Config.CYCLE_ARCHIVE_PATH))
+        if Config.MONITOR_SHARDS > 1:
+            monitor.attach_sharded(ShardedEvaluator(Config.MONITOR_SHARDS))
         
         logger.info("All services initialized successfully")
         
@@ -85,6 +106,19 @@ def trigger_monitor():
         logger.error(f"Manual monitor trigger failed: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route("/stress-test", methods=["POST"])
+def stress_test():
+    grid = (request.get_json(silent=True) or {}).get("shocks")
+    if not isinstance(grid, dict) or not grid:
+        return jsonify({"error": "Body must be {\"shocks\": {\"ETH\": [-30, -20, -10]}}"}), 400
+    try:
+        return jsonify(monitor.stress_test(grid))
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        logger.error(f"Stress test failed: {e}")
+        return jsonify({"error": str(e)}), 500
+
 @app.route("/risky-positions", methods=["GET"])
 def risky_positions():
     try:
@@ -0,0 +1,122 @@
+# bot/src/models/address.py - v1.0 - Interned Ethereum addresses
+from typing import Dict, Union
+
+from eth_utils import to_checksum_address
+
+AddressLike = Union[str, bytes, bytearray]
+
+# Every spelling seen so far (lowercase, checksum, raw bytes...) -> its Address
+_interned: Dict[object, "Address"] = {}
+
+
+def address_to_bytes(address: AddressLike) -> bytes:
+    """Canonical 20-byte form of a hex (any case) or raw address"""
+    if isinstance(address, Address):
+        return address.raw
+    if isinstance(address, (bytes, bytearray)):
+        if len(address) != 20:
+            raise ValueError(f"Invalid address length: {len(address)}")
+        return bytes(address)
+    raw = bytes.fromhex(address[2:] if address[:2] in ("0x", "0X") else address)
+    if len(raw) != 20:
+        raise ValueError(f"Invalid address: {address}")
+    return raw
+
+
+class Address(str):
+    """
+    Interned address: the string value is the checksum form, with the
+    20-byte and lowercase forms computed once alongside it.
+
+    Address(x) returns the same object for every spelling of an address
+    (subgraph lowercase, checksum, raw bytes), so the keccak behind the
+    checksum runs once per address per process. It compares and hashes
+    like its 20-byte form: equal to another Address or to those bytes,
+    never to a raw hex string (normalise with Address() first), so equal
+    objects always hash equal.
+    """
+
+    def __new__(cls, value: AddressLike) -> "Address":
+        if value.__class__ is cls:
+            return value
+        key = bytes(value) if isinstance(value, bytearray) else value
+        address = _interned.get(key)
+        if address is not None:
+            return address
+
+        raw = address_to_bytes(value)
+        address = _interned.get(raw)
+        if address is None:
+            address = super().__new__(cls, to_checksum_address(raw))
+            address.raw = raw
+            address.lowercase = "0x" + raw.hex()
+            address._hash = hash(raw)
+            _interned[raw] = address
+        _interned[key] = address
+        return address
+
+    @property
+    def checksum(self) -> str:
+        """Plain str for libraries that type-check their input"""
+        return str.__str__(self)
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, Address):
+            return self.raw == other.raw
+        if isinstance(other, bytes):
+            return self.raw == other
+        if isinstance(other, str):
+            return False
+        return NotImplemented
+
+    def __ne__(self, other) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Address({str.__repr__(self)})"
+
+
+class AddressMap(dict):
+    """dict keyed by Address: lookups accept any spelling of the address"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        return super().__getitem__(Address(key))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(Address(key), value)
+
+    def __delitem__(self, key):
+        super().__delitem__(Address(key))
+
+    def __contains__(self, key) -> bool:
+        try:
+            return super().__contains__(Address(key))
+        except (ValueError, TypeError, AttributeError):
+            return False
+
+    def get(self, key, default=None):
+        try:
+            key = Address(key)
+        except (ValueError, TypeError, AttributeError):
+            return default
+        return super().get(key, default)
+
+    def pop(self, key, *default):
+        return super().pop(Address(key), *default)
+
+    def setdefault(self, key, default=None):
+        return super().setdefault(Address(key), default)
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
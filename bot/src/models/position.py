@@ -1,43 +1,108 @@
-# bot/src/models/position.py - v1.0 - Position data model
-from dataclasses import dataclass
+# bot/src/models/position.py - v2.0 - Compact position record (__slots__)
 from decimal import Decimal
-from typing import Optional
+from typing import Optional, Union
+
+from models.address import Address
+
+_DECIMAL_ONE = Decimal("1.0")
+
 
-@dataclass
 class Position:
-    user_address: str
-    collateral_amount: int  # USD with 8 decimals (multi-collateral total)
-    borrowed: int  # USD with 8 decimals
-    health_factor: Decimal
-    status: str
-
-    # Legacy field for backward compatibility
-    collateral: Optional[int] = None  # Deprecated
-    collateral_ratio: Optional[int] = None  # Deprecated
-    
-    # Calculated fields
-    collateral_usd: Optional[Decimal] = None
-    liquidation_bonus_usd: Optional[Decimal] = None
-    expected_profit_usd: Optional[Decimal] = None
-    gas_cost_usd: Optional[Decimal] = None
-    is_profitable: Optional[bool] = None
-    
+    """
+    Single position record.
+
+    Uses __slots__ instead of a dataclass so each instance carries no
+    per-object __dict__. The subgraph health factor is kept as the raw
+    string and only parsed into Decimal the first time it is read.
+    user_address is an interned Address (checksum computed once per user).
+    """
+
+    __slots__ = (
+        "user_address",
+        "collateral_amount",  # USD with 8 decimals (multi-collateral total)
+        "borrowed",  # USD with 8 decimals
+        "_health_factor",
+        "status",
+        # Legacy fields for backward compatibility
+        "collateral",  # Deprecated
+        "collateral_ratio",  # Deprecated
+        # Calculated fields
+        "collateral_usd",
+        "liquidation_bonus_usd",
+        "expected_profit_usd",
+        "gas_cost_usd",
+        "is_profitable",
+        "wallet_lane",  # Lane the planner funded it from (dispatch hint, not compared)
+    )
+
+    _FIELDS = (
+        "user_address", "collateral_amount", "borrowed", "health_factor", "status",
+        "collateral", "collateral_ratio", "collateral_usd", "liquidation_bonus_usd",
+        "expected_profit_usd", "gas_cost_usd", "is_profitable",
+    )
+
+    def __init__(
+        self,
+        user_address: Union[Address, str, bytes],
+        collateral_amount: int,
+        borrowed: int,
+        health_factor: Union[Decimal, str, int, float],
+        status: str,
+        collateral: Optional[int] = None,
+        collateral_ratio: Optional[int] = None,
+        collateral_usd: Optional[Decimal] = None,
+        liquidation_bonus_usd: Optional[Decimal] = None,
+        expected_profit_usd: Optional[Decimal] = None,
+        gas_cost_usd: Optional[Decimal] = None,
+        is_profitable: Optional[bool] = None,
+        wallet_lane: Optional[int] = None,
+    ):
+        self.user_address = Address(user_address)
+        self.collateral_amount = collateral_amount
+        self.borrowed = borrowed
+        self._health_factor = health_factor
+        self.status = status
+        self.collateral = collateral
+        self.collateral_ratio = collateral_ratio
+        self.collateral_usd = collateral_usd
+        self.liquidation_bonus_usd = liquidation_bonus_usd
+        self.expected_profit_usd = expected_profit_usd
+        self.gas_cost_usd = gas_cost_usd
+        self.is_profitable = is_profitable
+        self.wallet_lane = wallet_lane
+
+    @property
+    def health_factor(self) -> Decimal:
+        hf = self._health_factor
+        if not isinstance(hf, Decimal):
+            hf = Decimal(hf)
+            self._health_factor = hf
+        return hf
+
+    @health_factor.setter
+    def health_factor(self, value: Union[Decimal, str, int, float]):
+        self._health_factor = value
+
     @classmethod
     def from_graph_response(cls, data: dict) -> "Position":
         return cls(
             user_address=data["user"]["id"],
             collateral_amount=int(data.get("totalCollateralUSD", data.get("collateral", 0))),
             borrowed=int(data["borrowed"]),
-            health_factor=Decimal(data["healthFactor"]),
+            health_factor=data["healthFactor"],  # Parsed lazily
             status=data["status"],
             # Legacy fields for backward compatibility
             collateral=int(data.get("collateral", 0)),
             collateral_ratio=int(data.get("collateralRatio", 0))
         )
-    
+
+    def to_position(self) -> "Position":
+        """Compatibility shim shared with PositionView"""
+        return self
+
     def is_liquidatable(self) -> bool:
-        return self.health_factor < Decimal("1.0")
-    
+        return self.health_factor < _DECIMAL_ONE
+
     def collateral_usd_decimal(self) -> Decimal:
         """Get collateral value in USD (multi-collateral total)"""
         return Decimal(self.collateral_amount) / Decimal(10**8)
@@ -50,10 +115,17 @@ class Position:
 
     def borrowed_usd_decimal(self) -> Decimal:
         return Decimal(self.borrowed) / Decimal(10**8)
-    
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self._FIELDS)
+
+    __hash__ = None
+
     def __repr__(self) -> str:
         return (
             f"Position(user={self.user_address[:8]}..., "
             f"HF={self.health_factor:.2f}, "
             f"debt=${self.borrowed_usd_decimal():.2f})"
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,405 @@
+# bot/src/models/position_book.py - v1.0 - Struct-of-arrays position book
+from array import array
+from decimal import Decimal
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from models.address import Address, address_to_bytes
+from models.position import Position
+
+INT64_MAX = 2**63 - 1
+GWEI = 10**9
+
+# Contract health factor format: 100 = 1.00 (HealthCalculator PRECISION)
+HF_SCALE = 100
+# getHealthFactor() returns type(uint256).max when debt == 0
+HF_INFINITE = INT64_MAX
+
+# Subgraph PositionStatus enum
+STATUSES = ["INACTIVE", "ACTIVE", "REPAID", "LIQUIDATED"]
+_STATUS_CODES = {name: code for code, name in enumerate(STATUSES)}
+
+
+def parse_health_factor(value: str) -> int:
+    """
+    Parse a subgraph BigDecimal health factor ("1.2345") into contract
+    units (HF * 100, truncated) without going through Decimal.
+    """
+    whole, _, frac = str(value).partition(".")
+    if "e" in whole.lower() or "e" in frac.lower():
+        scaled = int(Decimal(value) * HF_SCALE)
+    else:
+        scaled = int(whole or "0") * HF_SCALE + int((frac + "00")[:2])
+    return min(scaled, HF_INFINITE)
+
+
+class IntColumn:
+    """
+    Integer column stored as a packed int64 array.
+
+    uint256 values that do not fit in int64 (e.g. large Wei amounts) are
+    kept exactly in a per-row overflow table, with the buffer saturated at
+    the int64 bounds for those rows. Indexing and iteration return exact
+    values; view() is the zero-copy buffer, exact while is_compact.
+    """
+
+    __slots__ = ("_data", "_overflow")
+
+    def __init__(self, size: int = 0):
+        self._data = array("q", bytes(8 * size))
+        self._overflow: Dict[int, int] = {}
+
+    @property
+    def is_compact(self) -> bool:
+        """True while every value fits in the int64 buffer"""
+        return not self._overflow
+
+    @property
+    def overflow(self) -> Dict[int, int]:
+        """row -> exact value, for the rows saturated in view()"""
+        return self._overflow
+
+    def _index(self, index: int) -> int:
+        return index + len(self._data) if index < 0 else index
+
+    def _store(self, index: int, value: int) -> int:
+        """Value to write in the buffer at index; out-of-range values go to the overflow table"""
+        if -INT64_MAX - 1 <= value <= INT64_MAX:
+            if self._overflow:
+                self._overflow.pop(index, None)
+            return value
+        self._overflow[index] = value
+        return INT64_MAX if value > 0 else -INT64_MAX - 1
+
+    def append(self, value: int):
+        self._data.append(self._store(len(self._data), value))
+
+    def pop(self) -> int:
+        value = self[-1]
+        if self._overflow:
+            self._overflow.pop(len(self._data) - 1, None)
+        self._data.pop()
+        return value
+
+    def __getitem__(self, index: int) -> int:
+        if self._overflow:
+            exact = self._overflow.get(self._index(index))
+            if exact is not None:
+                return exact
+        return self._data[index]
+
+    def __setitem__(self, index: int, value: int):
+        index = self._index(index)
+        if not 0 <= index < len(self._data):
+            raise IndexError(index)
+        self._data[index] = self._store(index, value)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[int]:
+        if not self._overflow:
+            return iter(self._data)
+        overflow = self._overflow
+        return (overflow.get(row, value) for row, value in enumerate(self._data))
+
+    def view(self) -> memoryview:
+        """memoryview over the int64 buffer (overflow rows saturated)"""
+        return memoryview(self._data)
+
+
+class PositionView:
+    """
+    Zero-copy view of one row of a PositionBook.
+
+    Exposes the same read attributes as Position so it can be passed to
+    code written against the record type; use to_position() where a
+    mutable Position is required (e.g. Liquidator.attempt_liquidation).
+    """
+
+    __slots__ = ("_book", "row")
+
+    def __init__(self, book: "PositionBook", row: int):
+        self._book = book
+        self.row = row
+
+    @property
+    def user_address(self) -> str:
+        return self._book.user_address(self.row)
+
+    @property
+    def address_bytes(self) -> bytes:
+        return self._book._keys[self.row]
+
+    @property
+    def health_factor_raw(self) -> int:
+        return self._book.health_factor[self.row]
+
+    @property
+    def health_factor(self) -> Decimal:
+        raw = self.health_factor_raw
+        if raw >= HF_INFINITE:
+            return Decimal("999.99")
+        return Decimal(raw) / Decimal(HF_SCALE)
+
+    @property
+    def collateral_amount(self) -> int:
+        return self._book.collateral_usd[self.row]
+
+    @property
+    def borrowed(self) -> int:
+        """USD (8 decimals) once priced on-chain, else the subgraph's Wei amount (as Position)"""
+        if self._book.usd_priced[self.row]:
+            return self._book.borrowed_usd[self.row]
+        return self._book.borrowed_wei[self.row]
+
+    @property
+    def borrowed_wei(self) -> int:
+        return self._book.borrowed_wei[self.row]
+
+    @property
+    def status(self) -> str:
+        return STATUSES[self._book.status[self.row]]
+
+    @property
+    def block(self) -> int:
+        return self._book.block[self.row]
+
+    def is_liquidatable(self) -> bool:
+        return self.health_factor_raw < HF_SCALE
+
+    def to_position(self) -> Position:
+        return Position(
+            user_address=self.user_address,
+            collateral_amount=self.collateral_amount,
+            borrowed=self.borrowed,
+            health_factor=self.health_factor,
+            status=self.status
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"PositionView(row={self.row}, user={self.user_address[:8]}..., "
+            f"HF={self.health_factor:.2f})"
+        )
+
+
+class PositionBook:
+    """
+    Struct-of-arrays store for the whole position universe.
+
+    One packed column per numeric field instead of one object per
+    position. Users are indexed by their interned 20-byte address;
+    rows are kept dense (removal swaps the last row into the hole).
+    """
+
+    NUMERIC_COLUMNS = ("health_factor", "collateral_usd", "borrowed_usd", "borrowed_wei", "borrowed_gwei", "block")
+
+    def __init__(self):
+        self._index: Dict[bytes, int] = {}
+        self._keys: List[bytes] = []
+
+        self.health_factor = IntColumn()  # Contract units (100 = 1.00)
+        self.collateral_usd = IntColumn()  # USD with 8 decimals
+        self.borrowed_usd = IntColumn()  # USD with 8 decimals
+        self.borrowed_wei = IntColumn()  # Wei ETH (uint256-safe)
+        self.borrowed_gwei = IntColumn()  # Same debt in gwei (floor): int64 up to 9.2B ETH, for array math
+        self.block = IntColumn()  # Block the row was last evaluated at
+        self.status = array("b")
+        # 1 once borrowed_usd was written; subgraph rows only carry Wei
+        self.usd_priced = array("b")
+
+        # Per-asset collateral amounts (native decimals), keyed by 20-byte asset address
+        self._collateral: Dict[bytes, IntColumn] = {}
+
+        # Users whose row changed / was removed since the store last saved
+        self._changed: Set[bytes] = set()
+        self._removed: Set[bytes] = set()
+
+    # ===== ROW MANAGEMENT =====
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, address: Union[str, bytes]) -> bool:
+        return address_to_bytes(address) in self._index
+
+    def row_of(self, address: Union[str, bytes]) -> Optional[int]:
+        return self._index.get(address_to_bytes(address))
+
+    def _add_row(self, key: bytes) -> int:
+        row = len(self._keys)
+        self._index[key] = row
+        self._keys.append(key)
+        for name in self.NUMERIC_COLUMNS:
+            getattr(self, name).append(0)
+        self.status.append(_STATUS_CODES["ACTIVE"])
+        self.usd_priced.append(0)
+        for column in self._collateral.values():
+            column.append(0)
+        return row
+
+    def upsert(
+        self,
+        user_address: Union[str, bytes],
+        health_factor: Optional[int] = None,
+        collateral_usd: Optional[int] = None,
+        borrowed_usd: Optional[int] = None,
+        borrowed_wei: Optional[int] = None,
+        status: Optional[str] = None,
+        block: Optional[int] = None
+    ) -> int:
+        """Insert or update a row; only the given fields are written"""
+        key = address_to_bytes(user_address)
+        row = self._index.get(key)
+        changed = row is None
+        if row is None:
+            row = self._add_row(key)
+
+        if health_factor is not None:
+            changed |= self._write(self.health_factor, row, min(health_factor, HF_INFINITE))
+        if collateral_usd is not None:
+            changed |= self._write(self.collateral_usd, row, collateral_usd)
+        if borrowed_usd is not None:
+            changed |= self._write(self.borrowed_usd, row, borrowed_usd)
+            changed |= self._write(self.usd_priced, row, 1)
+        if borrowed_wei is not None:
+            changed |= self._write(self.borrowed_wei, row, borrowed_wei)
+            self.borrowed_gwei[row] = borrowed_wei // GWEI
+        if status is not None:
+            changed |= self._write(self.status, row, self._status_code(status))
+        if block is not None:
+            changed |= self._write(self.block, row, block)
+        if changed:
+            self._changed.add(key)
+        return row
+
+    @staticmethod
+    def _write(column, row: int, value: int) -> bool:
+        if column[row] == value:
+            return False
+        column[row] = value
+        return True
+
+    def add_graph_response(self, data: dict) -> int:
+        """Ingest one subgraph Position entity (borrowed is Wei ETH)"""
+        return self.upsert(
+            data["user"]["id"],
+            health_factor=parse_health_factor(data["healthFactor"]),
+            collateral_usd=int(data.get("totalCollateralUSD", 0)),
+            borrowed_wei=int(data["borrowed"]),
+            status=data["status"]
+        )
+
+    @classmethod
+    def from_graph_response(cls, positions: List[dict]) -> "PositionBook":
+        book = cls()
+        for data in positions:
+            book.add_graph_response(data)
+        return book
+
+    def remove(self, user_address: Union[str, bytes]) -> bool:
+        key = address_to_bytes(user_address)
+        row = self._index.pop(key, None)
+        if row is None:
+            return False
+        self._changed.discard(key)
+        self._removed.add(key)
+
+        last = len(self._keys) - 1
+        columns = [getattr(self, name) for name in self.NUMERIC_COLUMNS]
+        columns.append(self.status)
+        columns.append(self.usd_priced)
+        columns.extend(self._collateral.values())
+
+        if row != last:
+            moved = self._keys[last]
+            self._keys[row] = moved
+            self._index[moved] = row
+            for column in columns:
+                column[row] = column[last]
+
+        self._keys.pop()
+        for column in columns:
+            column.pop()
+        return True
+
+    @staticmethod
+    def _status_code(status: str) -> int:
+        code = _STATUS_CODES.get(status)
+        if code is None:
+            raise ValueError(f"Unknown position status: {status}")
+        return code
+
+    # ===== COLLATERAL =====
+
+    def set_collateral(self, row: int, asset: Union[str, bytes], amount: int):
+        key = address_to_bytes(asset)
+        column = self._collateral.get(key)
+        if column is None:
+            column = IntColumn(len(self._keys))
+            self._collateral[key] = column
+        if self._write(column, row, amount):
+            self._changed.add(self._keys[row])
+
+    # ===== CHANGE TRACKING =====
+
+    def changes(self) -> Tuple[Set[bytes], Set[bytes]]:
+        """(changed, removed) user keys since the last mark_saved()"""
+        return set(self._changed), set(self._removed)
+
+    def mark_saved(self, changed: Set[bytes], removed: Set[bytes]):
+        self._changed -= changed
+        self._removed -= removed
+
+    def collateral_column(self, asset: Union[str, bytes]) -> Optional[IntColumn]:
+        return self._collateral.get(address_to_bytes(asset))
+
+    def collateral_assets(self) -> List[bytes]:
+        return list(self._collateral.keys())
+
+    # ===== ACCESS =====
+
+    def user_address(self, row: int) -> Address:
+        return Address(self._keys[row])
+
+    def key(self, row: int) -> bytes:
+        """20-byte address of a row"""
+        return self._keys[row]
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of a numeric column (values beyond int64 saturated, see IntColumn)"""
+        if name not in self.NUMERIC_COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name).view()
+
+    def view(self, row: int) -> PositionView:
+        if not 0 <= row < len(self._keys):
+            raise IndexError(row)
+        return PositionView(self, row)
+
+    def __iter__(self) -> Iterator[PositionView]:
+        for row in range(len(self._keys)):
+            yield PositionView(self, row)
+
+    def liquidatable_rows(self, threshold: int = HF_SCALE) -> List[int]:
+        """Rows with HF below threshold (contract units) and outstanding debt"""
+        hf = self.health_factor.view()
+        debt = self.borrowed_wei.view()
+        return [row for row in range(len(self._keys)) if hf[row] < threshold and debt[row] > 0]
+
+    def rows_with_debt(self) -> List[int]:
+        debt = self.borrowed_wei.view()
+        return [row for row in range(len(self._keys)) if debt[row] > 0]
+
+    def rows_holding(self, asset: Union[str, bytes]) -> List[int]:
+        """Rows with outstanding debt and a non-zero balance of asset as collateral"""
+        column = self.collateral_column(asset)
+        if column is None:
+            return []
+        amounts = column.view()
+        debt = self.borrowed_wei.view()
+        return [row for row in range(len(self._keys)) if amounts[row] > 0 and debt[row] > 0]
+
+    def to_positions(self) -> List[Position]:
+        """Compatibility shim for callers still working on Position lists"""
+        return [view.to_position() for view in self]
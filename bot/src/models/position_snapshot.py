@@ -0,0 +1,57 @@
+# bot/src/models/position_snapshot.py - v1.0 - Immutable per-attempt position state
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+# HealthCalculator constants (contracts/libraries/HealthCalculator.sol)
+LIQUIDATION_THRESHOLD = 83
+HF_PRECISION = 100  # 100 = HF 1.00
+HF_MAX = 2**256 - 1  # type(uint256).max when debt == 0
+
+
+def calculate_health_factor(collateral_usd: int, debt_usd: int) -> int:
+    """HealthCalculator.calculateHealthFactor (contract units, 100 = 1.00)"""
+    if debt_usd == 0:
+        return HF_MAX
+    adjusted_collateral = (collateral_usd * LIQUIDATION_THRESHOLD) // 100
+    return (adjusted_collateral * HF_PRECISION) // debt_usd
+
+
+@dataclass(frozen=True)
+class PositionSnapshot:
+    """
+    Everything a liquidation attempt needs, read once at a pinned block.
+
+    Carried through verify, profit, gas check, sizing and tx build so
+    none of those steps goes back to the RPC node.
+    """
+    user_address: str
+    block_number: int
+    borrowed_wei: int  # LendingPool.getPosition().borrowedAmount
+    collateral_usd: int  # CollateralManager.getCollateralValueUSD (8 decimals)
+    collaterals: Tuple[Tuple[str, int], ...]  # (asset, amount) with amount > 0
+    eth_price: int  # OracleAggregator.getPrice(ETH) (8 decimals)
+    gas_price_wei: int
+
+    @property
+    def debt_usd(self) -> int:
+        """HealthCalculator.convertETHtoUSD"""
+        return (self.borrowed_wei * self.eth_price) // 10**18
+
+    @property
+    def health_factor(self) -> int:
+        """Same value getHealthFactor() returns at block_number"""
+        return calculate_health_factor(self.collateral_usd, self.debt_usd)
+
+    @property
+    def asset_count(self) -> int:
+        return len(self.collaterals)
+
+    def is_liquidatable(self) -> bool:
+        return self.borrowed_wei > 0 and self.health_factor < HF_PRECISION
+
+    def collateral_list(self, registry=None) -> List[Dict]:
+        """Same shape as Web3Client.get_user_collaterals() (symbols from an AssetRegistry)"""
+        return [
+            {"asset": asset, "amount": amount, "symbol": registry.symbol(asset) if registry else "UNKNOWN"}
+            for asset, amount in self.collaterals
+        ]
@@ -2,6 +2,10 @@ import atexit
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
+from config import Config
+from clients.asset_registry import asset_registry
+from clients.head_subscriber import HeadSubscriber
+from clients.mempool_watcher import MempoolWatcher
 from utils.logger import logger
 from jobs import run_health_monitor, run_liquidation_check, run_price_sync
 import jobs.health_monitor as health_monitor_module
@@ -11,6 +15,11 @@ import jobs.price_sync as price_sync_module
 class BotScheduler:
     def __init__(self):
         self.scheduler = BackgroundScheduler()
+        self.head_subscriber = None
+        self.mempool_watcher = None
+        self._web3_client = None
+        self._monitor = None
+        self._liquidator = None
         self._job_stats = {
             "health_monitor": {"runs": 0, "errors": 0, "last_run": None},
             "liquidation_check": {"runs": 0, "errors": 0, "last_run": None},
@@ -23,6 +32,14 @@ class BotScheduler:
         health_monitor_module.set_monitor(monitor)
         liquidation_check_module.set_clients(graph_client, web3_client, liquidator)
         price_sync_module.set_web3_client(web3_client)
+        self._web3_client = web3_client
+        self._monitor = monitor
+        self._liquidator = liquidator
+        # Oracle price changes re-evaluate the exposed users straight away
+        web3_client.oracle_watcher.on_assets_changed = monitor.reevaluate_exposed
+        # Positions liquidated / repaid by others leave the candidate set before the subgraph catches up
+        web3_client.position_watcher.on_position_closed = monitor.drop_closed_position
+        web3_client.position_watcher.on_debt_changed = monitor.apply_repayment
 
         logger.info("Dependencies injected successfully")
 
@@ -40,6 +57,22 @@ class BotScheduler:
             self._job_stats[job_name]["errors"] += 1
             logger.error(f"[SCHEDULER] Job {job_name} failed: {e}")
 
+    def _on_block(self, head):
+        try:
+            asset_registry.on_head(head.number)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Asset config refresh failed | block={head.number} | error={e}")
+        try:
+            self._web3_client.position_watcher.on_head(head.number)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] LendingPool event processing failed | block={head.number} | error={e}")
+        try:
+            self._web3_client.oracle_watcher.on_head(head.number)
+        except Exception as e:
+            logger.error(f"[SCHEDULER] Oracle event processing failed | block={head.number} | error={e}")
+        if Config.BLOCK_SYNC_ENABLED:
+            self._wrapped_job("health_monitor", run_health_monitor)
+
     def start(self, intervals: dict = None):
         if intervals is None:
             intervals = {
@@ -48,13 +81,27 @@ class BotScheduler:
                 "price_sync": 300
             }
 
-        self.scheduler.add_job(
-            func=lambda: self._wrapped_job("health_monitor", run_health_monitor),
-            trigger=IntervalTrigger(seconds=intervals["health_monitor"]),
-            id="health_monitor",
-            name="Health Monitor",
-            replace_existing=True
-        )
+        if self._web3_client is not None:
+            # Every new block: asset, LendingPool and oracle events first, then (block sync) one health monitor cycle
+            self.head_subscriber = HeadSubscriber(
+                on_head=self._on_block,
+                fetch_block_number=lambda: self._web3_client.w3.eth.block_number,
+                ws_url=Config.WS_RPC_URL,
+                poll_interval=Config.HEAD_POLL_INTERVAL_SECONDS
+            )
+            self.head_subscriber.start()
+
+        if Config.MEMPOOL_WATCH_ENABLED and self._web3_client is not None:
+            self._start_mempool_watcher()
+
+        if self.head_subscriber is None or not Config.BLOCK_SYNC_ENABLED:
+            self.scheduler.add_job(
+                func=lambda: self._wrapped_job("health_monitor", run_health_monitor),
+                trigger=IntervalTrigger(seconds=intervals["health_monitor"]),
+                id="health_monitor",
+                name="Health Monitor",
+                replace_existing=True
+            )
 
         self.scheduler.add_job(
             func=lambda: self._wrapped_job("liquidation_check", run_liquidation_check),
@@ -76,13 +123,41 @@ class BotScheduler:
 
         logger.info("=" * 60)
         logger.info("Scheduler started successfully")
-        logger.info(f"  - health_monitor: every {intervals['health_monitor']}s")
+        if self.head_subscriber is not None and Config.BLOCK_SYNC_ENABLED:
+            logger.info("  - health_monitor: every new block")
+        else:
+            logger.info(f"  - health_monitor: every {intervals['health_monitor']}s")
         logger.info(f"  - liquidation_check: every {intervals['liquidation_check']}s")
         logger.info(f"  - price_sync: every {intervals['price_sync']}s")
         logger.info("=" * 60)
 
         atexit.register(self.shutdown)
 
+    def _start_mempool_watcher(self):
+        if not Config.MEMPOOL_WS_URL:
+            logger.warning("MEMPOOL_WATCH_ENABLED needs MEMPOOL_WS_URL or WS_RPC_URL, mempool watcher not started")
+            return
+
+        web3_client = self._web3_client
+        mirror = self._monitor.oracle_mirror if self._monitor is not None else None
+        if self._liquidator is not None:
+            our_senders = [lane.address for lane in self._liquidator.wallets.lanes]
+        else:
+            our_senders = [web3_client.account.address]
+        self.mempool_watcher = MempoolWatcher(
+            ws_url=Config.MEMPOOL_WS_URL,
+            fetch_transaction=lambda tx_hash: web3_client.rpc_pool.make_request(
+                "eth_getTransactionByHash", [tx_hash]
+            ).get("result"),
+            # Pending prices need the oracle mirror; competitor liquidations do not
+            on_price=self._monitor.apply_pending_price if mirror is not None else None,
+            on_liquidation=self._liquidator.mark_contested if self._liquidator is not None else None,
+            price_sources=mirror.price_sources if mirror is not None else None,
+            ignore_senders=our_senders
+        )
+        self.mempool_watcher.watch_liquidations(web3_client.fast_lending_pool)
+        self.mempool_watcher.start()
+
     def get_status(self) -> dict:
         jobs = []
         for job in self.scheduler.get_jobs():
@@ -95,10 +170,18 @@ class BotScheduler:
         return {
             "scheduler_running": self.scheduler.running,
             "jobs": jobs,
-            "job_stats": self._job_stats
+            "job_stats": self._job_stats,
+            "head_subscriber": self.head_subscriber.stats() if self.head_subscriber else None,
+            "mempool_watcher": self.mempool_watcher.stats() if self.mempool_watcher else None
         }
 
     def shutdown(self):
+        if self.head_subscriber is not None:
+            self.head_subscriber.stop()
+            self.head_subscriber = None
+        if self.mempool_watcher is not None:
+            self.mempool_watcher.stop()
+            self.mempool_watcher = None
         if self.scheduler.running:
             logger.info("Shutting down scheduler...")
             self.scheduler.shutdown()
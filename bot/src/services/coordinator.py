@@ -0,0 +1,329 @@
+# bot/src/services/coordinator.py - v1.0 - Shard leases and leader election across bot replicas
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+from config import Config
+from services.shard_pool import shard_of
+from utils.logger import logger
+
+try:
+    import redis
+except ImportError:  # optional: SQLite backend only
+    redis = None
+
+LEADER_LEASE = "leader"
+INSTANCE_PREFIX = "instance:"
+SHARD_PREFIX = "shard:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS handoffs (
+    user TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    posted_at REAL NOT NULL
+);
+"""
+
+
+class SqliteLeaseBackend:
+    """
+    Leases in one SQLite file, for replicas on the same host (or a shared
+    volume with working locks). Each acquire is a single UPSERT, so SQLite's
+    file lock makes it atomic between processes. Expiry uses wall-clock time.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        """Take or renew name for ttl seconds; False while someone else holds it"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO leases (name, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at < ?",
+                (name, owner, now + ttl, now)
+            )
+            return cursor.rowcount == 1
+
+    def release(self, name: str, owner: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def leases(self, prefix: str) -> Dict[str, str]:
+        """Live leases whose name starts with prefix: name -> owner"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, owner FROM leases WHERE name LIKE ? AND expires_at >= ?",
+                (prefix + "%", time.time())
+            ).fetchall()
+        return dict(rows)
+
+    def push_candidates(self, users: Iterable[str], owner: str):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO handoffs (user, owner, posted_at) VALUES (?, ?, ?)",
+                [(user, owner, now) for user in users]
+            )
+
+    def take_candidates(self, max_age: float) -> List[str]:
+        """Every handed-off user posted within max_age seconds, removing them all"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                users = [user for (user,) in self._conn.execute(
+                    "SELECT user FROM handoffs WHERE posted_at >= ?", (time.time() - max_age,)
+                )]
+                self._conn.execute("DELETE FROM handoffs")
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return users
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisLeaseBackend:
+    """
+    Leases as Redis keys with a PX expiry, for replicas on different hosts.
+    Works against anything that speaks the Redis protocol and EVAL.
+    """
+
+    _ACQUIRE = """
+        local owner = redis.call('GET', KEYS[1])
+        if not owner or owner == ARGV[1] then
+            redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+            return 1
+        end
+        return 0
+    """
+    _RELEASE = """
+        if redis.call('GET', KEYS[1]) == ARGV[1] then
+            return redis.call('DEL', KEYS[1])
+        end
+        return 0
+    """
+
+    def __init__(self, url: str, namespace: str = "lendforge:"):
+        if redis is None:
+            raise ImportError("COORDINATION_URL is a Redis URL but the redis package is not installed")
+        self.url = url
+        self.namespace = namespace
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._acquire = self._client.register_script(self._ACQUIRE)
+        self._release = self._client.register_script(self._RELEASE)
+
+    def acquire(self, name: str, owner: str, ttl: float) -> bool:
+        return self._acquire(keys=[self.namespace + name], args=[owner, int(ttl * 1000)]) == 1
+
+    def release(self, name: str, owner: str):
+        self._release(keys=[self.namespace + name], args=[owner])
+
+    def leases(self, prefix: str) -> Dict[str, str]:
+        keys = list(self._client.scan_iter(match=self.namespace + prefix + "*"))
+        if not keys:
+            return {}
+        owners = self._client.mget(keys)
+        return {key[len(self.namespace):]: owner for key, owner in zip(keys, owners) if owner is not None}
+
+    def push_candidates(self, users: Iterable[str], owner: str):
+        now = time.time()
+        mapping = {user: now for user in users}
+        if mapping:
+            self._client.zadd(self.namespace + "handoffs", mapping)
+
+    def take_candidates(self, max_age: float) -> List[str]:
+        key = self.namespace + "handoffs"
+        pipe = self._client.pipeline(transaction=True)
+        pipe.zrangebyscore(key, time.time() - max_age, "+inf")
+        pipe.delete(key)
+        users, _ = pipe.execute()
+        return users
+
+    def close(self):
+        self._client.close()
+
+
+def make_backend(url: str):
+    """redis:// / rediss:// URL, or sqlite:///path (a bare path is SQLite too)"""
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisLeaseBackend(url)
+    return SqliteLeaseBackend(url[len("sqlite:///"):] if url.startswith("sqlite:///") else url)
+
+
+class InstanceCoordinator:
+    """
+    Lets N replicas sharing one wallet split the work:
+
+    - every instance heartbeats an instance lease; the live set decides
+      which of the fixed shards (address hash, as in shard_pool) each one
+      scans, and the instance takes a lease on each shard before scanning it
+    - one instance holds the leader lease and is the only one that signs
+      and submits; the others hand their candidates over through the backend
+
+    Leases last lease_ttl seconds and are renewed every lease_ttl / 3, so a
+    dead leader or a dead scanner is replaced within about lease_ttl.
+    Leadership is dropped locally as soon as the lease could have expired,
+    even if the backend cannot be reached.
+    """
+
+    def __init__(
+        self,
+        backend,
+        instance_id: Optional[str] = None,
+        shards: Optional[int] = None,
+        lease_ttl: Optional[float] = None
+    ):
+        self.backend = backend
+        self.instance_id = instance_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.shards = shards or Config.COORDINATION_SHARDS
+        self.lease_ttl = lease_ttl or Config.COORDINATION_LEASE_SECONDS
+        self.on_leadership_change: Optional[Callable[[bool], None]] = None
+
+        self._owned: FrozenSet[int] = frozenset()
+        self._leader_until = 0.0
+        self._was_leader = False
+        self.instances: List[str] = []
+        self.last_heartbeat: Optional[float] = None
+        self.heartbeat_errors = 0
+        self.handed_off = 0
+        self.taken_over = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # ===== LEASES =====
+
+    @property
+    def is_leader(self) -> bool:
+        return time.monotonic() < self._leader_until
+
+    @property
+    def owned_shards(self) -> FrozenSet[int]:
+        return self._owned
+
+    def owns(self, user_address: str) -> bool:
+        return shard_of(user_address, self.shards) in self._owned
+
+    def heartbeat(self):
+        """Renew this instance, contend for the leader lease, rebalance shard leases"""
+        backend, me, ttl = self.backend, self.instance_id, self.lease_ttl
+        started = time.monotonic()
+        try:
+            backend.acquire(INSTANCE_PREFIX + me, me, ttl)
+            if backend.acquire(LEADER_LEASE, me, ttl):
+                self._leader_until = started + ttl
+            else:
+                self._leader_until = 0.0
+
+            instances = sorted(set(backend.leases(INSTANCE_PREFIX).values()) | {me})
+            position = instances.index(me)
+            owned = set()
+            for shard in range(self.shards):
+                name = f"{SHARD_PREFIX}{shard}"
+                if shard % len(instances) == position:
+                    if backend.acquire(name, me, ttl):
+                        owned.add(shard)
+                elif shard in self._owned:
+                    backend.release(name, me)
+
+            if owned != self._owned or instances != self.instances:
+                logger.info(
+                    f"Coordination | instance={me} | instances={len(instances)} | "
+                    f"shards={len(owned)}/{self.shards} | leader={self.is_leader}"
+                )
+            self._owned = frozenset(owned)
+            self.instances = instances
+            self.last_heartbeat = time.time()
+        except Exception as e:
+            self.heartbeat_errors += 1
+            logger.error(f"Coordination heartbeat failed: {e}")
+
+        leader = self.is_leader
+        if leader != self._was_leader:
+            self._was_leader = leader
+            logger.warning(f"Coordination | instance={me} {'became' if leader else 'lost'} transaction leader")
+            if self.on_leadership_change is not None:
+                self.on_leadership_change(leader)
+
+    def start(self):
+        """First heartbeat now (so the first cycle knows its shards), then every lease_ttl / 3"""
+        self.heartbeat()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="coordination-heartbeat", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.lease_ttl / 3):
+            self.heartbeat()
+
+    def stop(self):
+        """Stop heartbeating and hand everything back right away"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.lease_ttl)
+        try:
+            for shard in self._owned:
+                self.backend.release(f"{SHARD_PREFIX}{shard}", self.instance_id)
+            self.backend.release(LEADER_LEASE, self.instance_id)
+            self.backend.release(INSTANCE_PREFIX + self.instance_id, self.instance_id)
+        except Exception as e:
+            logger.error(f"Failed to release coordination leases: {e}")
+        self._owned = frozenset()
+        self._leader_until = 0.0
+
+    # ===== CANDIDATE HAND-OFF =====
+
+    def hand_off(self, user_address: str):
+        """A follower found a liquidatable user: the leader re-reads and submits"""
+        try:
+            self.backend.push_candidates([user_address], self.instance_id)
+            self.handed_off += 1
+        except Exception as e:
+            logger.error(f"Failed to hand off candidate {user_address[:10]}...: {e}")
+
+    def take_candidates(self) -> List[str]:
+        """Leader only: users handed off since the last call (older than a lease are stale)"""
+        if not self.is_leader:
+            return []
+        try:
+            users = self.backend.take_candidates(max_age=self.lease_ttl)
+        except Exception as e:
+            logger.error(f"Failed to take handed-off candidates: {e}")
+            return []
+        self.taken_over += len(users)
+        return users
+
+    def stats(self) -> Dict:
+        return {
+            "instance_id": self.instance_id,
+            "leader": self.is_leader,
+            "instances": len(self.instances),
+            "owned_shards": len(self._owned),
+            "shards": self.shards,
+            "lease_seconds": self.lease_ttl,
+            "last_heartbeat": self.last_heartbeat,
+            "heartbeat_errors": self.heartbeat_errors,
+            "handed_off": self.handed_off,
+            "taken_over": self.taken_over,
+        }
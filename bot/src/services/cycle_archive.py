@@ -0,0 +1,189 @@
+# bot/src/services/cycle_archive.py - v1.0 - Append-only memory-mapped archive of every evaluated book
+import mmap
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from models.position_book import IntColumn, PositionBook
+
+# What the monitor did with a row in a cycle
+DECISION_HEALTHY = 0  # HF above the pre-sign band
+DECISION_WATCH = 1  # Inside PRESIGN_HF_BAND, liquidation pre-signed
+DECISION_LIQUIDATABLE = 2  # HF < 1.0 but not planned (unprofitable / over budget)
+DECISION_ATTEMPTED = 3  # Planned, liquidation failed or was refused
+DECISION_LIQUIDATED = 4  # Liquidated by us
+DECISIONS = ["HEALTHY", "WATCH", "LIQUIDATABLE", "ATTEMPTED", "LIQUIDATED"]
+
+# One fixed-width 64-byte record per (cycle, position). Amounts are int64:
+# USD keeps its 8 decimals (saturating at INT64_MAX), debt is stored in
+# gwei since Wei ETH overflows int64 past ~9.2 ETH.
+RECORD_DTYPE = np.dtype([
+    ("user", "S20"),
+    ("decision", "u1"),
+    ("status", "u1"),
+    ("reserved", "V2"),
+    ("block", "<i8"),
+    ("health_factor", "<i8"),
+    ("collateral_usd", "<i8"),
+    ("borrowed_usd", "<i8"),
+    ("borrowed_gwei", "<i8"),
+])
+
+# One entry per cycle; records of a cycle are contiguous
+INDEX_DTYPE = np.dtype([
+    ("cycle", "<i8"),
+    ("block", "<i8"),
+    ("timestamp", "<f8"),
+    ("first", "<i8"),
+    ("count", "<i8"),
+])
+
+def _int64_column(values: IntColumn) -> np.ndarray:
+    """int64 ndarray over a book column (zero-copy; values beyond int64 are saturated there)"""
+    return np.frombuffer(values.view(), dtype=np.int64)
+
+
+def read_archive(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Open an archive read-only (e.g. from a post-mortem notebook while the
+    bot keeps appending). Returns (records, index) as memory-mapped arrays.
+    """
+    index_path = path + ".idx"
+    index = np.fromfile(index_path, dtype=INDEX_DTYPE) if os.path.exists(index_path) else np.zeros(0, INDEX_DTYPE)
+    count = int(index["first"][-1] + index["count"][-1]) if len(index) else 0
+    if count == 0:
+        return np.zeros(0, RECORD_DTYPE), index
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,)), index
+
+
+class CycleArchive:
+    """
+    Append-only archive of the book as evaluated in each monitor cycle,
+    so post-mortems and backtests scan arrays instead of parsing logs.
+
+    Records live in a memory-mapped file grown in chunks; the small
+    .idx file (cycle, block, timestamp, first record, count) is appended
+    after a cycle's records are flushed, so it alone decides what is
+    valid: a crash mid-cycle leaves unindexed bytes that the next append
+    overwrites. Fields are read as columns: records()["health_factor"].
+    """
+
+    def __init__(self, path: str, chunk_records: int = 65536):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.chunk_records = chunk_records
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._index = np.fromfile(self.index_path, dtype=INDEX_DTYPE) if os.path.exists(self.index_path) \
+            else np.zeros(0, INDEX_DTYPE)
+        self._count = int(self._index["first"][-1] + self._index["count"][-1]) if len(self._index) else 0
+
+        self._file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        self._index_file = open(self.index_path, "ab")
+        self._map: Optional[mmap.mmap] = None
+        self._capacity = 0
+        self._lock = threading.Lock()
+        self.last_append_ms: Optional[float] = None
+        self._remap(max(os.fstat(self._file.fileno()).st_size // RECORD_DTYPE.itemsize, self._count))
+
+    def _remap(self, capacity: int):
+        # The old map is dropped, not closed: arrays returned by records()
+        # keep it alive until they are released
+        self._map = None
+        self._capacity = capacity
+        if capacity:
+            self._file.truncate(capacity * RECORD_DTYPE.itemsize)
+            self._map = mmap.mmap(self._file.fileno(), capacity * RECORD_DTYPE.itemsize)
+
+    def close(self):
+        with self._lock:
+            self._map = None
+            self._file.close()
+            self._index_file.close()
+
+    # ===== WRITE =====
+
+    def append_cycle(
+        self,
+        book: PositionBook,
+        block: int,
+        decisions: Optional[Dict[int, int]] = None,
+        cycle: Optional[int] = None
+    ) -> int:
+        """
+        Archive every row of book. decisions maps row -> DECISION_* (rows
+        left out are HEALTHY); rows never read at a block get block.
+
+        Returns:
+            Number of records written
+        """
+        start = time.monotonic()
+        n = len(book)
+        records = np.zeros(n, RECORD_DTYPE)
+        if n:
+            records["user"] = np.frombuffer(b"".join(book.key(row) for row in range(n)), dtype="S20")
+            records["status"] = np.frombuffer(book.status, dtype=np.int8)
+            row_blocks = _int64_column(book.block)
+            records["block"] = np.where(row_blocks > 0, row_blocks, block)
+            records["health_factor"] = _int64_column(book.health_factor)
+            records["collateral_usd"] = _int64_column(book.collateral_usd)
+            records["borrowed_usd"] = _int64_column(book.borrowed_usd)
+            records["borrowed_gwei"] = _int64_column(book.borrowed_gwei)
+            for row, decision in (decisions or {}).items():
+                records["decision"][row] = decision
+
+        with self._lock:
+            first = self._count
+            if first + n > self._capacity:
+                self._remap(max(first + n, self._capacity + self.chunk_records))
+            if n:
+                size = RECORD_DTYPE.itemsize
+                self._map[first * size:(first + n) * size] = records.tobytes()
+                self._map.flush()
+
+            entry = np.zeros(1, INDEX_DTYPE)
+            entry[0] = (len(self._index) if cycle is None else cycle, block, time.time(), first, n)
+            self._index_file.write(entry.tobytes())
+            self._index_file.flush()
+            self._index = np.concatenate([self._index, entry])
+            self._count = first + n
+
+        self.last_append_ms = (time.monotonic() - start) * 1000
+        return n
+
+    # ===== READ =====
+
+    def cycles(self) -> np.ndarray:
+        return self._index
+
+    def records(self, from_block: Optional[int] = None, to_block: Optional[int] = None) -> np.ndarray:
+        """Records of the cycles whose block is in [from_block, to_block] (zero-copy)"""
+        with self._lock:
+            if self._count == 0:
+                return np.zeros(0, RECORD_DTYPE)
+            blocks = self._index["block"]
+            lo = 0 if from_block is None else int(np.searchsorted(blocks, from_block, side="left"))
+            hi = len(blocks) if to_block is None else int(np.searchsorted(blocks, to_block, side="right"))
+            if lo >= hi:
+                return np.zeros(0, RECORD_DTYPE)
+            first = int(self._index["first"][lo])
+            last = int(self._index["first"][hi - 1] + self._index["count"][hi - 1])
+            return np.frombuffer(self._map, dtype=RECORD_DTYPE, count=last - first, offset=first * RECORD_DTYPE.itemsize)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "cycles": len(self._index),
+            "records": self._count,
+            "last_block": int(self._index["block"][-1]) if len(self._index) else None,
+            "size_bytes": self._capacity * RECORD_DTYPE.itemsize,
+            "last_append_ms": round(self.last_append_ms, 1) if self.last_append_ms is not None else None,
+        }
@@ -0,0 +1,187 @@
+# bot/src/services/liquidation_planner.py - v1.0 - Capital-constrained liquidation planning
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from utils.logger import logger
+
+
+class LiquidationCandidate:
+    """One liquidatable position with the capital it ties up and its expected profit"""
+
+    __slots__ = ("user_address", "borrowed_wei", "gas_cost_wei", "net_profit_usd", "position", "lane")
+
+    def __init__(
+        self,
+        user_address: str,
+        borrowed_wei: int,
+        gas_cost_wei: int,
+        net_profit_usd: int,
+        position=None
+    ):
+        self.user_address = user_address
+        self.borrowed_wei = borrowed_wei  # msg.value required by liquidate()
+        self.gas_cost_wei = gas_cost_wei
+        self.net_profit_usd = net_profit_usd  # USD with 8 decimals
+        self.position = position
+        self.lane: Optional[int] = None  # Wallet lane the plan funds it from
+
+    @property
+    def capital_wei(self) -> int:
+        return self.borrowed_wei + self.gas_cost_wei
+
+    def __repr__(self) -> str:
+        return (
+            f"LiquidationCandidate(user={self.user_address[:8]}..., "
+            f"capital={self.capital_wei / 10**18:.4f} ETH, "
+            f"profit=${self.net_profit_usd / 10**8:.2f})"
+        )
+
+
+class LiquidationPlanner:
+    """
+    Picks the set of liquidations that maximises total net profit under
+    the wallet balance (0/1 knapsack over required capital).
+
+    liquidate() is paid from one wallet, so with several wallets each lane
+    is a separate knapsack: lanes are filled largest first, each from the
+    candidates the previous lanes left over.
+
+    Capital is discretised into `resolution` buckets with weights rounded
+    up, so every plan is affordable; the DP answer is compared against a
+    profit-density greedy pass and the better of the two is kept.
+    """
+
+    def __init__(self, resolution: int = 1000):
+        self.resolution = resolution
+
+    def plan(
+        self,
+        candidates: Sequence[LiquidationCandidate],
+        available_wei: int,
+        gas_budget_wei: Optional[int] = None
+    ) -> List[LiquidationCandidate]:
+        """
+        Args:
+            candidates: Liquidation candidates (unprofitable ones are ignored)
+            available_wei: Wallet balance usable for liquidations
+            gas_budget_wei: Optional cap on total gas spent by the plan
+
+        Returns:
+            Selected candidates, most profitable first (execution order)
+        """
+        return self.plan_lanes(candidates, [available_wei], gas_budget_wei)
+
+    def plan_lanes(
+        self,
+        candidates: Sequence[LiquidationCandidate],
+        lane_balances: Sequence[int],
+        gas_budget_wei: Optional[int] = None
+    ) -> List[LiquidationCandidate]:
+        """
+        plan() across several wallets: a candidate must fit in one lane.
+        Each selected candidate gets the index of the lane funding it.
+        """
+        remaining = [c for c in candidates if c.net_profit_usd > 0]
+        selected = []
+        for lane in sorted(range(len(lane_balances)), key=lambda i: lane_balances[i], reverse=True):
+            chosen = self._fill(remaining, lane_balances[lane])
+            for c in chosen:
+                c.lane = lane
+            selected.extend(chosen)
+            chosen_ids = {id(c) for c in chosen}
+            remaining = [c for c in remaining if id(c) not in chosen_ids]
+            if not remaining:
+                break
+
+        if gas_budget_wei is not None:
+            selected = self._fit_gas_budget(selected, gas_budget_wei)
+
+        selected = sorted(selected, key=lambda c: c.net_profit_usd, reverse=True)
+
+        logger.info(
+            f"Liquidation plan | candidates={len(candidates)} | selected={len(selected)} | "
+            f"capital={sum(c.capital_wei for c in selected) / 10**18:.4f} ETH | "
+            f"available={sum(lane_balances) / 10**18:.4f} ETH | lanes={len(lane_balances)} | "
+            f"profit=${self._total_profit(selected) / 10**8:.2f}"
+        )
+        return selected
+
+    def _fill(
+        self,
+        candidates: Sequence[LiquidationCandidate],
+        available_wei: int
+    ) -> List[LiquidationCandidate]:
+        """Most profitable subset of candidates that one wallet of available_wei can fund"""
+        eligible = [c for c in candidates if c.capital_wei <= available_wei]
+        if not eligible:
+            return []
+        if sum(c.capital_wei for c in eligible) <= available_wei:
+            return eligible
+        return max(
+            self._knapsack(eligible, available_wei),
+            self._greedy(eligible, available_wei),
+            key=self._total_profit
+        )
+
+    @staticmethod
+    def _total_profit(selected: Sequence[LiquidationCandidate]) -> int:
+        return sum(c.net_profit_usd for c in selected)
+
+    @staticmethod
+    def _greedy(
+        candidates: Sequence[LiquidationCandidate],
+        available_wei: int
+    ) -> List[LiquidationCandidate]:
+        """Highest profit per Wei of capital first"""
+        selected = []
+        remaining = available_wei
+        for c in sorted(candidates, key=lambda c: c.net_profit_usd / c.capital_wei, reverse=True):
+            if c.capital_wei <= remaining:
+                selected.append(c)
+                remaining -= c.capital_wei
+        return selected
+
+    def _knapsack(
+        self,
+        candidates: Sequence[LiquidationCandidate],
+        available_wei: int
+    ) -> List[LiquidationCandidate]:
+        unit = -(-available_wei // self.resolution)  # ceil
+        capacity = available_wei // unit
+        weights = [-(-c.capital_wei // unit) for c in candidates]
+        profits = np.array([c.net_profit_usd for c in candidates], dtype=np.float64)
+
+        # best[w] = max profit using at most w buckets; one vector op per candidate
+        best = np.zeros(capacity + 1, dtype=np.float64)
+        take = np.zeros((len(candidates), capacity + 1), dtype=np.bool_)
+        for i, weight in enumerate(weights):
+            if weight > capacity:
+                continue
+            with_item = best[:capacity + 1 - weight] + profits[i]
+            improved = with_item > best[weight:]
+            take[i, weight:] = improved
+            best[weight:] = np.where(improved, with_item, best[weight:])
+
+        selected = []
+        w = capacity
+        for i in range(len(candidates) - 1, -1, -1):
+            if take[i, w]:
+                selected.append(candidates[i])
+                w -= weights[i]
+        return selected
+
+    @staticmethod
+    def _fit_gas_budget(
+        selected: List[LiquidationCandidate],
+        gas_budget_wei: int
+    ) -> List[LiquidationCandidate]:
+        """Drop the lowest profit-per-gas liquidations until gas fits the budget"""
+        ranked = sorted(selected, key=lambda c: c.net_profit_usd / max(c.gas_cost_wei, 1), reverse=True)
+        kept = []
+        spent = 0
+        for c in ranked:
+            if spent + c.gas_cost_wei <= gas_budget_wei:
+                kept.append(c)
+                spent += c.gas_cost_wei
+        return kept
@@ -1,8 +1,21 @@
 # bot/src/services/liquidator.py - v1.0 - Liquidation execution service
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from config import Config
+from models.address import AddressMap
 from models.position import Position
+from models.position_book import PositionView
+from models.position_snapshot import PositionSnapshot, HF_PRECISION
 from clients.web3_client import Web3Client
+from clients.liquidator_wallet import LiquidatorWallet
+from clients.presigned_tx_cache import FeeTiers, PresignedTxCache
 from services.profit_calculator import ProfitCalculator
+from services.liquidation_planner import LiquidationPlanner, LiquidationCandidate
+from services.wallet_ledger import WalletLedger, wei_from_eth
+from services.wallet_dispatcher import WalletDispatcher, WalletLane
 from utils.logger import logger, log_liquidation, log_liquidation_failed
 
 class LiquidationMetrics:
@@ -12,47 +25,239 @@ class LiquidationMetrics:
         self.failed_liquidations = 0
         self.total_profit_usd = 0.0
         self.total_gas_spent_usd = 0.0
+        # Failed attempts on positions already liquidated or repaid by the time we got there
+        self.wasted_attempts = 0
+        # Attempts refused up front because a LendingPool event closed the position
+        self.avoided_attempts = 0
+        # Attempts on different wallet lanes record from worker threads
+        self._lock = threading.Lock()
     
     def record_success(self, profit: float, gas: float):
-        self.total_liquidations += 1
-        self.successful_liquidations += 1
-        self.total_profit_usd += profit
-        self.total_gas_spent_usd += gas
+        with self._lock:
+            self.total_liquidations += 1
+            self.successful_liquidations += 1
+            self.total_profit_usd += profit
+            self.total_gas_spent_usd += gas
     
-    def record_failure(self):
-        self.total_liquidations += 1
-        self.failed_liquidations += 1
+    def record_reverted(self, profit: float):
+        """A liquidation counted at broadcast reverted on-chain: its profit never came, its gas did"""
+        with self._lock:
+            self.successful_liquidations -= 1
+            self.failed_liquidations += 1
+            self.total_profit_usd -= profit
+
+    def record_failure(self, wasted: bool = False):
+        with self._lock:
+            self.total_liquidations += 1
+            self.failed_liquidations += 1
+            if wasted:
+                self.wasted_attempts += 1
+
+    def record_avoided(self):
+        with self._lock:
+            self.avoided_attempts += 1
+
+    STATE_FIELDS = (
+        "total_liquidations", "successful_liquidations", "failed_liquidations",
+        "total_profit_usd", "total_gas_spent_usd", "wasted_attempts", "avoided_attempts",
+    )
+
+    def to_state(self) -> dict:
+        with self._lock:
+            return {name: getattr(self, name) for name in self.STATE_FIELDS}
+
+    def restore(self, state: dict):
+        with self._lock:
+            for name in self.STATE_FIELDS:
+                if name in state:
+                    setattr(self, name, state[name])
     
     def get_summary(self) -> dict:
-        return {
-            "total_liquidations": self.total_liquidations,
-            "successful": self.successful_liquidations,
-            "failed": self.failed_liquidations,
-            "total_profit_usd": round(self.total_profit_usd, 2),
-            "total_gas_spent_usd": round(self.total_gas_spent_usd, 2),
-            "net_profit_usd": round(self.total_profit_usd - self.total_gas_spent_usd, 2)
-        }
+        with self._lock:
+            total = self.total_liquidations
+            return {
+                "total_liquidations": total,
+                "successful": self.successful_liquidations,
+                "failed": self.failed_liquidations,
+                "total_profit_usd": round(self.total_profit_usd, 2),
+                "total_gas_spent_usd": round(self.total_gas_spent_usd, 2),
+                "net_profit_usd": round(self.total_profit_usd - self.total_gas_spent_usd, 2),
+                "wasted_attempts": self.wasted_attempts,
+                "wasted_attempt_rate": round(self.wasted_attempts / total, 4) if total else 0.0,
+                "avoided_attempts": self.avoided_attempts
+            }
 
 class Liquidator:
-    def __init__(self, web3_client: Web3Client, profit_calculator: ProfitCalculator):
+    def __init__(
+        self,
+        web3_client: Web3Client,
+        profit_calculator: ProfitCalculator,
+        extra_wallets: Iterable[LiquidatorWallet] = ()
+    ):
         self.web3_client = web3_client
         self.profit_calculator = profit_calculator
         self.metrics = LiquidationMetrics()
+        self.planner = LiquidationPlanner()
+        self.ledger = WalletLedger(
+            web3_client.get_wallet_balance_wei,
+            reserve_wei=wei_from_eth(Config.WALLET_GAS_RESERVE_ETH),
+            max_age_seconds=Config.WALLET_BALANCE_MAX_AGE_SECONDS
+        )
+        # Primary wallet first; each extra key is a lane with its own nonce chain and ledger
+        self.wallets = WalletDispatcher([WalletLane(web3_client, self.ledger)] + [
+            WalletLane(wallet, WalletLedger(
+                wallet.get_wallet_balance_wei,
+                reserve_wei=wei_from_eth(Config.WALLET_GAS_RESERVE_ETH),
+                max_age_seconds=Config.WALLET_BALANCE_MAX_AGE_SECONDS
+            ))
+            for wallet in extra_wallets
+        ])
+        self.presigned = PresignedTxCache(
+            web3_client,
+            FeeTiers(
+                int(Decimal(str(Config.PRESIGN_FEE_TIER_BASE_GWEI)) * 10**9),
+                Config.PRESIGN_FEE_TIER_RATIO
+            ),
+            max_gas_price_wei=Config.MAX_GAS_PRICE_GWEI * 10**9
+        )
+        # user -> expiry of a competitor's pending liquidate(user)
+        self._contested = AddressMap()
+        # Users with an attempt under way (full cycles and event re-evaluations overlap)
+        self._attempting = AddressMap()
+        self._attempting_lock = threading.Lock()
+        # Set when replicas share the wallet: only the leader signs and submits
+        self.coordinator = None
+        # Broadcast liquidations until their receipt: tx_hash -> (position, lane, expected profit)
+        self._broadcast: Dict[str, Tuple[Position, WalletLane, float]] = {}
+        self._broadcast_lock = threading.Lock()
+        web3_client.on_receipt = self._on_receipt
+
+    @property
+    def submits(self) -> bool:
+        return self.coordinator is None or self.coordinator.is_leader
+
+    def plan_liquidations(self, candidates: List[LiquidationCandidate]) -> List[LiquidationCandidate]:
+        """Select the most profitable candidates the wallets can fund, each from a single lane"""
+        try:
+            lane_balances = self.wallets.lane_balances()
+        except Exception as e:
+            logger.error(f"Failed to read wallet balance for planning: {e}")
+            return []
+
+        gas_budget_wei = wei_from_eth(Config.LIQUIDATION_GAS_BUDGET_ETH) or None
+        return self.planner.plan_lanes(candidates, lane_balances, gas_budget_wei)
     
-    def attempt_liquidation(self, position: Position) -> bool:
+    def warm_presigned(self, targets: Iterable[Tuple[str, int]], gas_price_wei: int) -> int:
+        """
+        Keep signed liquidations ready for positions near the threshold.
+
+        Args:
+            targets: (user_address, borrowed_wei) inside the pre-sign HF band
+            gas_price_wei: Current market gas price
+
+        Returns:
+            Number of warm transactions
+        """
+        targets = [(user, debt_wei) for user, debt_wei in targets if not self.is_contested(user)]
+        if not self.submits:
+            targets = []  # Our nonces belong to the leader
+        self.presigned.retain(user for user, _ in targets)
+        return sum(
+            1 for user, debt_wei in targets
+            if self.presigned.warm(user, debt_wei, gas_price_wei) is not None
+        )
+
+    def mark_contested(self, user_address: str, ttl: Optional[float] = None):
+        """
+        A competitor's liquidate(user) is pending: once it lands ours would
+        revert, so drop the signed tx and stand back until ttl runs out.
+        """
+        ttl = Config.MEMPOOL_PENDING_TTL_SECONDS if ttl is None else ttl
+        self._contested[user_address] = time.monotonic() + ttl
+        self.presigned.discard(user_address)
+
+    def is_contested(self, user_address: str) -> bool:
+        expires = self._contested.get(user_address)
+        if expires is None:
+            return False
+        if time.monotonic() >= expires:
+            self._contested.pop(user_address, None)
+            return False
+        return True
+
+    def attempt_liquidations(self, positions: List[Union[Position, PositionView]]) -> List[bool]:
+        """Attempt each liquidation; with several wallets they run side by side, one per lane"""
+        if len(self.wallets) == 1 or len(positions) < 2:
+            return [self.attempt_liquidation(position) for position in positions]
+        workers = min(len(self.wallets), len(positions))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="liquidation") as pool:
+            return list(pool.map(self.attempt_liquidation, positions))
+
+    def attempt_liquidation(self, position: Union[Position, PositionView]) -> bool:
+        user = position.user_address
+        with self._attempting_lock:
+            if user in self._attempting:
+                logger.info(f"Liquidation already in progress | user={user[:10]}...")
+                return False
+            self._attempting[user] = True
+        try:
+            return self._attempt_liquidation(position)
+        finally:
+            with self._attempting_lock:
+                self._attempting.pop(user, None)
+
+    def _attempt_liquidation(self, position: Union[Position, PositionView]) -> bool:
+        # Book rows are read-only views; the steps below annotate the record
+        position = position.to_position()
+
+        # Another replica holds the leader lease: it re-reads and submits
+        if not self.submits:
+            self.coordinator.hand_off(position.user_address)
+            logger.info(f"Handed off liquidation to the leader | user={position.user_address[:10]}...")
+            return False
+
         logger.info(
             f"Attempting liquidation | user={position.user_address[:10]}... | "
             f"HF={position.health_factor:.2f}"
         )
-        
-        # Step 1: Verify position is still liquidatable on-chain
-        if not self._verify_liquidatable(position):
-            log_liquidation_failed(position.user_address, "Not liquidatable on-chain")
+
+        # liquidate() is notInEmergency; the flag comes from oracle events, no RPC
+        if self.web3_client.oracle_watcher.emergency_mode is True:
+            log_liquidation_failed(position.user_address, "Oracle emergency mode")
+            return False
+
+        # A competitor's liquidate() for this user is already in the mempool
+        if self.is_contested(position.user_address):
+            log_liquidation_failed(position.user_address, "Competitor liquidation pending")
+            return False
+
+        # Liquidated or repaid in full (LendingPool events) - nothing left to take
+        if self.web3_client.position_watcher.is_closed(position.user_address) is True:
+            log_liquidation_failed(position.user_address, "Position already closed on-chain")
+            self.metrics.record_avoided()
+            return False
+
+        # Hot path: the monitor has just read and scored this position, a warm transaction goes out as signed
+        if position.is_profitable:
+            hot = self._send_presigned(position)
+            if hot is not None:
+                return hot
+
+        # Step 1: Read the position once at a pinned block; every step below uses it
+        snapshot = self.web3_client.get_position_snapshot(position.user_address)
+        if snapshot is None:
+            log_liquidation_failed(position.user_address, "Failed to read position on-chain")
             self.metrics.record_failure()
             return False
+
+        # Step 2: Verify position is still liquidatable on-chain
+        if not self._verify_liquidatable(position, snapshot):
+            log_liquidation_failed(position.user_address, "Not liquidatable on-chain")
+            self.metrics.record_failure(wasted=snapshot.borrowed_wei == 0)
+            return False
         
-        # Step 2: Calculate profitability
-        is_profitable, expected_profit = self.profit_calculator.calculate_profit(position)
+        # Step 3: Calculate profitability
+        is_profitable, expected_profit = self.profit_calculator.calculate_profit(position, snapshot)
         
         if not is_profitable:
             log_liquidation_failed(
@@ -62,26 +267,105 @@ class Liquidator:
             self.metrics.record_failure()
             return False
         
-        # Step 3: Check gas price
-        if not self.profit_calculator.check_gas_price_acceptable():
+        # Step 4: Check gas price
+        if not self.profit_calculator.check_gas_price_acceptable(snapshot.gas_price_wei):
             log_liquidation_failed(position.user_address, "Gas price too high")
             self.metrics.record_failure()
             return False
         
-        # Step 4: Check wallet balance
-        debt_amount = self.profit_calculator.calculate_liquidation_amount(position)
-        if not self._check_wallet_balance(debt_amount):
+        # Step 5: Reserve a wallet that can fund it (fewest liquidations in flight)
+        debt_amount = self.profit_calculator.calculate_liquidation_amount(position, snapshot)
+        lane = self.wallets.reserve(debt_amount, position.wallet_lane)
+        if lane is None:
+            logger.error(
+                f"Insufficient balance | required={debt_amount / 10**18:.4f} ETH | "
+                f"wallets={len(self.wallets)}"
+            )
             log_liquidation_failed(position.user_address, "Insufficient wallet balance")
             self.metrics.record_failure()
             return False
-        
-        # Step 5: Execute liquidation
-        tx_hash = self.web3_client.execute_liquidation(
-            position.user_address,
-            debt_amount
-        )
-        
+
+        sent = False
+        try:
+            # Step 6: Dry-run liquidate() at the pending block; a revert costs no gas here
+            simulation = lane.client.simulate_liquidation(
+                position.user_address,
+                debt_amount,
+                snapshot.block_number
+            )
+            if simulation.reverted:
+                self.presigned.discard(position.user_address)
+                log_liquidation_failed(position.user_address, f"Simulation reverted: {simulation.reason}")
+                self.metrics.record_failure(wasted=simulation.reason == "NoDebt")
+                return False
+
+            # Step 7: Execute liquidation (pre-signed tx when warm; those use the primary nonce chain)
+            sent = True
+            with lane.send_lock:
+                presigned = None
+                if lane is self.wallets.primary:
+                    presigned = self.presigned.get(position.user_address, debt_amount, snapshot.gas_price_wei)
+                if presigned is not None:
+                    self.presigned.discard(position.user_address)
+                    tx_hash = lane.client.send_signed_liquidation(
+                        presigned.raw_transaction,
+                        presigned.nonce
+                    )
+                else:
+                    tx_hash = lane.client.execute_liquidation(
+                        position.user_address,
+                        debt_amount,
+                        snapshot.gas_price_wei
+                    )
+        finally:
+            self.wallets.release(lane, debt_amount, sent)
+
+        return self._record_outcome(position, lane, tx_hash, expected_profit)
+
+    def _send_presigned(self, position: Position) -> Optional[bool]:
+        """
+        Broadcast the warm transaction for a position without re-reading it:
+        the monitor cycle that flagged it read it on-chain and scored it, and
+        warmed the transaction from that read. None when there is no usable
+        warm transaction (the cold path takes over).
+
+        The eth_call simulation (Step 6) runs on the cold path only. It
+        cannot run at warm time, since positions in the pre-sign band are
+        mostly still healthy and liquidate() would revert. Running it here
+        would add an RPC round trip to the path that exists to avoid one. A
+        warm send that reverts costs its gas, bounded by the gas price cap
+        checked here as on the cold path.
+        """
+        lane = self.wallets.primary
+        presigned = self.presigned.take(position.user_address, self.web3_client.last_gas_price_wei)
+        if presigned is not None and not self.profit_calculator.check_gas_price_acceptable(presigned.gas_price_wei):
+            presigned = None
+        if presigned is None or not self.wallets.reserve_lane(lane, presigned.value_wei):
+            return None
+
+        sent = False
+        try:
+            with lane.send_lock:
+                # Another liquidation on this lane may have used the nonce meanwhile
+                if presigned.nonce != lane.client.nonce_manager.peek():
+                    return None
+                sent = True
+                tx_hash = lane.client.send_signed_liquidation(presigned.raw_transaction, presigned.nonce)
+        finally:
+            self.wallets.release(lane, presigned.value_wei, sent)
+
+        return self._record_outcome(position, lane, tx_hash, position.expected_profit_usd or 0)
+
+    def _record_outcome(
+        self,
+        position: Position,
+        lane: WalletLane,
+        tx_hash: Optional[str],
+        expected_profit: Decimal
+    ) -> bool:
         if tx_hash:
+            with self._broadcast_lock:
+                self._broadcast[tx_hash] = (position, lane, float(expected_profit))
             log_liquidation(
                 position.user_address,
                 float(expected_profit),
@@ -89,7 +373,7 @@ class Liquidator:
             )
             self.metrics.record_success(
                 float(expected_profit),
-                float(position.gas_cost_usd)
+                float(position.gas_cost_usd or 0)
             )
 
             # RUSTINE WARNING: Collateral not automatically transferred
@@ -107,17 +391,39 @@ class Liquidator:
 
             return True
         else:
+            # Value is refunded on revert but gas may be spent - resync on next read
+            lane.ledger.invalidate()
             log_liquidation_failed(position.user_address, "Transaction failed")
             self.metrics.record_failure()
             return False
     
-    def _verify_liquidatable(self, position: Position) -> bool:
+    def _on_receipt(self, tx_hash: str, status: Optional[bool]):
+        """Receipt thread: settle a liquidation counted as sent when it was broadcast"""
+        with self._broadcast_lock:
+            entry = self._broadcast.pop(tx_hash, None)
+        if entry is None or status is True:
+            return
+        position, lane, expected_profit = entry
+        # Reverted (value refunded, gas spent) or no receipt yet: resync the balance on next read
+        lane.ledger.invalidate()
+        if status is False:
+            log_liquidation_failed(position.user_address, f"Transaction reverted | tx={tx_hash[:10]}...")
+            self.metrics.record_reverted(expected_profit)
+
+    def _verify_liquidatable(
+        self,
+        position: Position,
+        snapshot: Optional[PositionSnapshot] = None
+    ) -> bool:
         try:
-            hf = self.web3_client.get_health_factor(position.user_address)
+            if snapshot is not None:
+                hf = snapshot.health_factor
+                is_liquidatable = snapshot.is_liquidatable()
+            else:
+                hf = self.web3_client.get_health_factor(position.user_address)
+                is_liquidatable = hf < HF_PRECISION
             hf_decimal = float(hf) / 100.0
             
-            is_liquidatable = hf_decimal < 1.0
-            
             if not is_liquidatable:
                 logger.warning(
                     f"Position no longer liquidatable | "
@@ -130,19 +436,5 @@ class Liquidator:
             logger.error(f"Failed to verify liquidatable status: {e}")
             return False
     
-    def _check_wallet_balance(self, required_amount: int) -> bool:
-        balance = self.web3_client.get_wallet_balance()
-        required_eth = float(required_amount) / 10**18
-        
-        has_balance = float(balance) >= required_eth
-        
-        if not has_balance:
-            logger.error(
-                f"Insufficient balance | required={required_eth:.4f} ETH | "
-                f"available={float(balance):.4f} ETH"
-            )
-        
-        return has_balance
-    
     def get_metrics(self) -> dict:
         return self.metrics.get_summary()
\ No newline at end of file
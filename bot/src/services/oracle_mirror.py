@@ -0,0 +1,321 @@
+# bot/src/services/oracle_mirror.py - v1.0 - Off-chain replica of OracleAggregator price selection
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from clients.abi_fastpath import ContractFastPath
+from clients.asset_registry import asset_registry
+from config import Config
+from models.address import Address, AddressMap
+from models.position_book import PositionBook
+from models.position_snapshot import calculate_health_factor
+from utils.logger import logger
+
+# OracleAggregator constants
+MAX_DEVIATION = 500  # 5%
+CRITICAL_DEVIATION = 1000  # 10%
+BASIS_POINTS = 10000
+
+# Which branch of _updateAndGetPrice produced the price
+SOURCE_PRIMARY = "primary"
+SOURCE_DEVIATION = "fallback_deviation"  # 5-10%: fallback + DeviationWarning
+SOURCE_CRITICAL = "fallback_critical"  # >= 10%: fallback + emergency mode
+SOURCE_PRIMARY_FAILED = "fallback_primary_failed"
+
+# Provider slot in PriceRegistry
+ROLE_PRIMARY = "primary"
+ROLE_FALLBACK = "fallback"
+
+
+def calculate_deviation(price1: int, price2: int) -> int:
+    """OracleAggregator._calculateDeviation (basis points, relative to price1)"""
+    if price1 == 0 or price2 == 0:
+        return BASIS_POINTS
+    return (abs(price1 - price2) * BASIS_POINTS) // price1
+
+
+class PricePrediction:
+    """What the next _updateAndGetPrice(asset) will settle on"""
+
+    __slots__ = (
+        "asset", "price", "source", "deviation_bps",
+        "triggers_emergency", "primary_price", "fallback_price", "block_number",
+    )
+
+    def __init__(
+        self,
+        asset: Address,
+        price: Optional[int],
+        source: Optional[str],
+        deviation_bps: Optional[int],
+        triggers_emergency: bool,
+        primary_price: Optional[int],
+        fallback_price: Optional[int],
+        block_number: Optional[int] = None
+    ):
+        self.asset = asset
+        self.price = price  # None: AllProvidersFailed (the update reverts)
+        self.source = source
+        self.deviation_bps = deviation_bps
+        self.triggers_emergency = triggers_emergency
+        self.primary_price = primary_price
+        self.fallback_price = fallback_price
+        self.block_number = block_number
+
+    @property
+    def reverts(self) -> bool:
+        return self.price is None
+
+    def to_dict(self) -> Dict:
+        return {
+            "price": self.price,
+            "source": self.source,
+            "deviation_bps": self.deviation_bps,
+            "triggers_emergency": self.triggers_emergency,
+            "primary_price": self.primary_price,
+            "fallback_price": self.fallback_price,
+            "block": self.block_number,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"PricePrediction(asset={self.asset[:10]}..., price={self.price}, "
+            f"source={self.source}, deviation={self.deviation_bps})"
+        )
+
+
+def select_price(
+    asset: Address,
+    primary_price: Optional[int],
+    fallback_price: Optional[int],
+    deviation_checks_enabled: bool = True
+) -> PricePrediction:
+    """
+    OracleAggregator._updateAndGetPrice, branch for branch.
+
+    Args:
+        primary_price / fallback_price: Provider getPrice() result, None if
+            the call reverted or there is no fallback provider. Non-positive
+            prices count as failures, as on-chain.
+    """
+    primary = primary_price if primary_price is not None and primary_price > 0 else None
+    fallback = fallback_price if fallback_price is not None and fallback_price > 0 else None
+
+    # Case 1: both available - check deviation and choose
+    if primary is not None and fallback is not None and deviation_checks_enabled:
+        deviation = calculate_deviation(primary, fallback)
+        if deviation >= CRITICAL_DEVIATION:
+            return PricePrediction(asset, fallback, SOURCE_CRITICAL, deviation, True, primary, fallback)
+        if deviation > MAX_DEVIATION:
+            return PricePrediction(asset, fallback, SOURCE_DEVIATION, deviation, False, primary, fallback)
+        return PricePrediction(asset, primary, SOURCE_PRIMARY, deviation, False, primary, fallback)
+
+    # Case 2: only primary (or deviation checks off)
+    if primary is not None:
+        return PricePrediction(asset, primary, SOURCE_PRIMARY, None, False, primary, fallback)
+
+    # Case 3: primary failed, fallback available
+    if fallback is not None:
+        return PricePrediction(asset, fallback, SOURCE_PRIMARY_FAILED, 0, False, primary, fallback)
+
+    # Case 4: AllProvidersFailed
+    return PricePrediction(asset, None, None, None, False, primary, fallback)
+
+
+class OracleMirror:
+    """
+    Predicts the price every asset's next oracle update will produce.
+
+    Provider addresses come from PriceRegistry.getPrimaryProvider /
+    getFallbackProvider, cached for provider_ttl seconds. Each predict()
+    is then a single JSON-RPC batch: every provider's getPrice() plus the
+    aggregator's emergencyMode and deviationChecksEnabled, all at one block.
+
+    Prices seen in pending setPrice() transactions can be layered on top
+    with apply_pending(); they replace the provider's on-chain price until
+    the chain catches up or pending_ttl runs out.
+    """
+
+    def __init__(
+        self,
+        web3_client,
+        assets: Optional[Iterable] = None,
+        provider_ttl: float = 300,
+        pending_ttl: float = 60
+    ):
+        self.web3_client = web3_client
+        self.assets = [Address(a) for a in (assets if assets is not None else asset_registry.addresses())]
+        self.provider_ttl = provider_ttl
+        self.pending_ttl = pending_ttl
+
+        with open(Config.PRICE_REGISTRY_ABI_PATH) as f:
+            self.registry = ContractFastPath(Config.PRICE_REGISTRY_ADDRESS, json.load(f)["abi"])
+        with open(Config.PRICE_PROVIDER_ABI_PATH) as f:
+            self._provider_template = ContractFastPath(None, json.load(f)["abi"])
+
+        # asset -> (primary provider, fallback provider or None)
+        self.providers: Dict[Address, Tuple[Optional[ContractFastPath], Optional[ContractFastPath]]] = AddressMap()
+        self._providers_loaded_at = 0.0
+
+        self.emergency_mode: Optional[bool] = None
+        self.deviation_checks_enabled = True
+        self.last_predictions: Dict[Address, PricePrediction] = AddressMap()
+        # (asset, role) -> (pending provider price, expiry)
+        self._pending: Dict[Tuple[Address, str], Tuple[int, float]] = {}
+
+    def refresh_providers(self):
+        calls = []
+        for asset in self.assets:
+            calls.append((self.registry, "getPrimaryProvider", [asset]))
+            calls.append((self.registry, "getFallbackProvider", [asset]))
+        results = self.web3_client.fast_caller.call_many(calls, return_exceptions=True)
+
+        self.providers.clear()
+        for i, asset in enumerate(self.assets):
+            primary, fallback = results[2 * i], results[2 * i + 1]
+            if isinstance(primary, Exception):
+                # Unknown or disabled asset: the registry (and getPrice) revert
+                continue
+            self.providers[asset] = (
+                self._provider(primary),
+                None if isinstance(fallback, Exception) else self._provider(fallback),
+            )
+        self._providers_loaded_at = time.monotonic()
+
+    def _provider(self, address: str) -> Optional[ContractFastPath]:
+        if int(address, 16) == 0:
+            return None
+        return self._provider_template.at(address)
+
+    def _ensure_providers(self):
+        if not self.providers or time.monotonic() - self._providers_loaded_at > self.provider_ttl:
+            self.refresh_providers()
+
+    def price_sources(self) -> List[Tuple[Address, Address, str]]:
+        """
+        (contract, asset, role) for every contract whose setPrice() moves an
+        asset's provider price: the providers themselves and, for
+        ChainlinkPriceProvider, the feed behind it.
+        """
+        self._ensure_providers()
+        sources, calls = [], []
+        for asset, providers in self.providers.items():
+            for role, provider in zip((ROLE_PRIMARY, ROLE_FALLBACK), providers):
+                if provider is not None:
+                    sources.append((Address(provider.address), asset, role))
+                    calls.append((provider, "feed", []))
+
+        # Providers without a feed() revert; they are their own source
+        feeds = self.web3_client.fast_caller.call_many(calls, return_exceptions=True)
+        for (_, asset, role), feed in zip(list(sources), feeds):
+            if not isinstance(feed, Exception) and int(feed, 16) != 0:
+                sources.append((Address(feed), asset, role))
+        return sources
+
+    def apply_pending(self, asset: str, role: str, price: int):
+        """Use a provider price seen in the mempool until it lands on-chain"""
+        self._pending[(Address(asset), role)] = (price, time.monotonic() + self.pending_ttl)
+
+    def _with_pending(self, asset: Address, role: str, onchain_price: Optional[int]) -> Optional[int]:
+        pending = self._pending.get((asset, role))
+        if pending is None:
+            return onchain_price
+        price, expires = pending
+        if onchain_price == price or time.monotonic() >= expires:
+            # Landed (or dropped from the mempool): the chain is authoritative again
+            self._pending.pop((asset, role), None)
+            return onchain_price
+        return price
+
+    def predict(self, block_identifier="latest") -> Dict[Address, PricePrediction]:
+        self._ensure_providers()
+
+        block_number = block_identifier
+        if not isinstance(block_number, int):
+            block_number = self.web3_client.w3.eth.block_number
+
+        aggregator = self.web3_client.fast_oracle_aggregator
+        calls = [(aggregator, "emergencyMode", []), (aggregator, "deviationChecksEnabled", [])]
+        slots: List[Tuple[Address, int, int]] = []
+        for asset, (primary, fallback) in self.providers.items():
+            primary_slot = fallback_slot = -1
+            if primary is not None:
+                primary_slot = len(calls)
+                calls.append((primary, "getPrice", []))
+            if fallback is not None:
+                fallback_slot = len(calls)
+                calls.append((fallback, "getPrice", []))
+            slots.append((asset, primary_slot, fallback_slot))
+
+        results = self.web3_client.fast_caller.call_many(calls, block_number, return_exceptions=True)
+
+        def price_at(slot: int) -> Optional[int]:
+            if slot < 0 or isinstance(results[slot], Exception):
+                return None
+            return results[slot]
+
+        emergency_mode, checks_enabled = results[0], results[1]
+        if isinstance(emergency_mode, Exception) or isinstance(checks_enabled, Exception):
+            raise ConnectionError(f"Failed to read OracleAggregator state: {emergency_mode} / {checks_enabled}")
+        self.emergency_mode = emergency_mode
+        self.deviation_checks_enabled = checks_enabled
+
+        predictions = AddressMap()
+        for asset, primary_slot, fallback_slot in slots:
+            prediction = select_price(
+                asset,
+                self._with_pending(asset, ROLE_PRIMARY, price_at(primary_slot)),
+                self._with_pending(asset, ROLE_FALLBACK, price_at(fallback_slot)),
+                checks_enabled
+            )
+            prediction.block_number = block_number
+            predictions[asset] = prediction
+            if prediction.triggers_emergency:
+                logger.warning(f"Oracle mirror: next update enters emergency mode | {prediction}")
+            elif prediction.reverts:
+                logger.warning(f"Oracle mirror: all providers failing | asset={asset[:10]}...")
+
+        self.last_predictions = predictions
+        return predictions
+
+    def predicted_prices(self, predictions: Optional[Dict[Address, PricePrediction]] = None) -> Dict[Address, int]:
+        predictions = self.last_predictions if predictions is None else predictions
+        return AddressMap({asset: p.price for asset, p in predictions.items() if p.price is not None})
+
+    def project_health_factors(self, book: PositionBook, prices: Dict[Address, int]) -> Dict[int, int]:
+        """
+        Health factor each book row will have at the predicted prices,
+        from its per-asset collateral amounts (CollateralManager._convertToUSD)
+        and Wei debt. Rows holding an asset without a predicted price are skipped.
+        """
+        eth_price = prices.get(Config.ETH_ADDRESS)
+        if eth_price is None:
+            return {}
+
+        collateral_usd = [0] * len(book)
+        priced = [True] * len(book)
+        for asset_key in book.collateral_assets():
+            amounts = book.collateral_column(asset_key)
+            price = prices.get(asset_key)
+            config = asset_registry.get(asset_key)
+            scale = config.scale if config is not None else 10**18
+            for row in range(len(book)):
+                if amounts[row]:
+                    if price is None:
+                        priced[row] = False
+                    else:
+                        collateral_usd[row] += amounts[row] * price // scale
+
+        debt = book.borrowed_wei
+        return {
+            row: calculate_health_factor(collateral_usd[row], debt[row] * eth_price // 10**18)
+            for row in range(len(book))
+            if priced[row] and debt[row] > 0
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "emergency_mode": self.emergency_mode,
+            "pending_prices": len(self._pending),
+            "predictions": {asset: p.to_dict() for asset, p in self.last_predictions.items()},
+        }
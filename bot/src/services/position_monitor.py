@@ -1,9 +1,23 @@
 # bot/src/services/position_monitor.py - v2.0 - Multi-collateral support
-from typing import List
+import threading
+from typing import Iterable, List, Optional, Tuple
 from clients.graph_client import GraphClient
 from clients.web3_client import Web3Client
 from services.liquidator import Liquidator
 from models.position import Position
+from models.address import Address, AddressMap, address_to_bytes
+from models.position_book import PositionBook, HF_INFINITE, HF_SCALE
+from services.liquidation_planner import LiquidationCandidate
+from services.profit_calculator import usd_to_decimal
+from services.oracle_mirror import OracleMirror
+from services.position_store import PositionStore
+from services.stress_tester import StressTester
+from services.shard_pool import ShardedEvaluator
+from services.coordinator import InstanceCoordinator
+from services.cycle_archive import (
+    CycleArchive, DECISION_WATCH, DECISION_LIQUIDATABLE, DECISION_ATTEMPTED, DECISION_LIQUIDATED
+)
+from clients.asset_registry import asset_registry
 from config import Config
 from utils.logger import logger, log_monitor_cycle
 from decimal import Decimal
@@ -18,8 +32,151 @@ class PositionMonitor:
         self.graph_client = graph_client
         self.web3_client = web3_client
         self.liquidator = liquidator
-    
+        # On-chain state of every active position, refreshed each cycle
+        self.book = PositionBook()
+        # Full cycles and event-driven re-evaluations share the book
+        self._lock = threading.RLock()
+        self.oracle_mirror = None
+        if Config.ORACLE_MIRROR_ENABLED and Config.PRICE_REGISTRY_ADDRESS:
+            self.oracle_mirror = OracleMirror(web3_client, pending_ttl=Config.MEMPOOL_PENDING_TTL_SECONDS)
+        # Snapshot for warm restarts (attached by main when POSITION_STORE_PATH is set)
+        self.store: Optional[PositionStore] = None
+        # Per-cycle record of the evaluated book (attached when CYCLE_ARCHIVE_PATH is set)
+        self.archive: Optional[CycleArchive] = None
+        # Worker processes that evaluate the positions (attached when MONITOR_SHARDS > 1)
+        self.sharded: Optional[ShardedEvaluator] = None
+        # Shard leases and leader election across replicas (attached when COORDINATION_URL is set)
+        self.coordinator: Optional[InstanceCoordinator] = None
+
     def monitor_cycle(self) -> dict:
+        result = self._monitor_cycle()
+        if self.coordinator is not None:
+            result["liquidated_count"] += self._liquidate_handoffs()
+        with self._lock:
+            self._persist()
+        return result
+
+    # ===== WARM RESTART =====
+
+    def attach_store(self, store: PositionStore):
+        self.store = store
+
+    def restore(self) -> int:
+        """
+        Load the last snapshot: book, nonce floor, pending liquidations, gas
+        price and metrics. Event watchers resume from the checkpoint block,
+        so the first head replays only what happened while we were stopped,
+        and positions near the threshold are re-read right away.
+
+        Returns:
+            Number of positions restored
+        """
+        if self.store is None:
+            return 0
+        with self._lock:
+            loaded = self.store.load_book(self.book)
+            state = self.store.load_state()
+            checkpoint = self.store.checkpoint_block
+
+            if state.get("nonce") is not None:
+                self.web3_client.nonce_manager.set_floor(state["nonce"])
+            for address, nonce in state.get("wallet_nonces", {}).items():
+                if nonce is not None:
+                    self.web3_client.nonce_manager_of(address).set_floor(nonce)
+            if state.get("gas_price_wei"):
+                self.web3_client.last_gas_price_wei = state["gas_price_wei"]
+            self.liquidator.metrics.restore(state.get("metrics", {}))
+            self.web3_client.restore_pending_txs(state.get("pending_txs", {}))
+
+            if checkpoint is not None:
+                for watcher in (
+                    asset_registry.log_watcher,
+                    self.web3_client.position_watcher.log_watcher,
+                    self.web3_client.oracle_watcher.log_watcher,
+                ):
+                    if watcher is not None:
+                        watcher.resume_from(max(checkpoint, 0))
+
+            logger.info(f"Warm restart | positions={loaded} | checkpoint_block={checkpoint}")
+
+            band = int(round(Config.PRESIGN_HF_BAND * 100))
+            near = [self.book.user_address(row) for row in self.book.liquidatable_rows(band)]
+        if near:
+            self._reevaluate_users(near, "Warm restart re-evaluation")
+        return loaded
+
+    def attach_archive(self, archive: CycleArchive):
+        self.archive = archive
+
+    def attach_sharded(self, evaluator: ShardedEvaluator):
+        self.sharded = evaluator
+
+    # ===== REPLICAS =====
+
+    def attach_coordinator(self, coordinator: InstanceCoordinator):
+        self.coordinator = coordinator
+        self.liquidator.coordinator = coordinator
+        coordinator.on_leadership_change = self._on_leadership_change
+
+    def _on_leadership_change(self, leader: bool):
+        # The previous leader may have used nonces we never saw; followers keep no signed txs
+        for lane in self.liquidator.wallets.lanes:
+            lane.client.nonce_manager.invalidate()
+        if not leader:
+            self.liquidator.presigned.retain([])
+
+    def _liquidate_handoffs(self) -> int:
+        """Leader: re-read and liquidate the candidates other replicas handed off"""
+        users = self.coordinator.take_candidates()
+        if not users:
+            return 0
+        return self._reevaluate_users(users, "Handed-off candidates")
+
+    def _archive_cycle(self, liquidatable: List[Position], outcomes: dict):
+        """Append this cycle's book and what was decided for each row"""
+        if self.archive is None:
+            return
+        try:
+            band = int(round(Config.PRESIGN_HF_BAND * 100))
+            decisions = {row: DECISION_WATCH for row in self.book.liquidatable_rows(band)}
+            for position in liquidatable:
+                row = self.book.row_of(position.user_address)
+                if row is None:
+                    continue
+                success = outcomes.get(position.user_address)
+                decisions[row] = (
+                    DECISION_LIQUIDATABLE if success is None
+                    else DECISION_LIQUIDATED if success else DECISION_ATTEMPTED
+                )
+            log_watcher = self.web3_client.position_watcher.log_watcher
+            block = log_watcher.last_block if log_watcher is not None else None
+            self.archive.append_cycle(self.book, block or 0, decisions)
+        except Exception as e:
+            logger.error(f"Failed to archive monitor cycle: {e}")
+
+    def _persist(self):
+        if self.store is None:
+            return
+        web3_client = self.web3_client
+        try:
+            log_watcher = web3_client.position_watcher.log_watcher
+            self.store.save(
+                self.book,
+                log_watcher.last_block if log_watcher is not None else None,
+                {
+                    "nonce": web3_client.nonce_manager.current,
+                    "wallet_nonces": {
+                        lane.address: lane.client.nonce_manager.current for lane in self.liquidator.wallets.lanes[1:]
+                    },
+                    "pending_txs": dict(web3_client.pending_txs),
+                    "gas_price_wei": web3_client.last_gas_price_wei,
+                    "metrics": self.liquidator.metrics.to_state(),
+                }
+            )
+        except Exception as e:
+            logger.error(f"Failed to persist position store: {e}")
+
+    def _monitor_cycle(self) -> dict:
         logger.info("=" * 60)
         logger.info("Starting monitor cycle")
         
@@ -31,6 +188,9 @@ class PositionMonitor:
         # FIX: Vérifier toutes les positions ACTIVE avec dette (pas juste risky)
         # Car The Graph peut avoir HF obsolète si prix oracle changé
         all_active_positions = self._get_all_active_positions()
+        if self.coordinator is not None:
+            # Only the shards this replica holds a lease on
+            all_active_positions = [p for p in all_active_positions if self.coordinator.owns(p.user_address)]
         
         if not all_active_positions:
             logger.info("No active positions found")
@@ -39,8 +199,55 @@ class PositionMonitor:
         
         logger.info(f"Found {len(all_active_positions)} active positions to check")
         
+        if self.sharded is not None:
+            liquidatable, seen = self._evaluate_sharded(all_active_positions)
+        else:
+            liquidatable, seen = self._evaluate_positions(all_active_positions)
+
+        with self._lock:
+            self._prune_book(seen)
+            self._warm_presigned()
+            logger.info(f"Liquidatable positions (on-chain HF < 1.0): {len(liquidatable)}")
+
+            # Best affordable set of liquidations, most profitable first
+            planned = self._plan_liquidations(liquidatable)
+        
+        # Attempt liquidations (side by side when there are several wallets). The
+        # book is released: receipts take seconds, event re-evaluations must not wait
+        liquidated_count = 0
+        outcomes = {}
+        
+        for position, success in zip(planned, self.liquidator.attempt_liquidations(planned)):
+            outcomes[position.user_address] = success
+            
+            if success:
+                liquidated_count += 1
+
+        with self._lock:
+            self._archive_cycle(liquidatable, outcomes)
+
+        profitable_count = sum(1 for position in liquidatable if position.is_profitable)
+        
+        # Log summary
+        log_monitor_cycle(len(liquidatable), profitable_count)
+        
+        logger.info(
+            f"Monitor cycle completed | risky={len(liquidatable)} | "
+            f"profitable={profitable_count} | liquidated={liquidated_count}"
+        )
+        logger.info("=" * 60)
+        
+        return {
+            "risky_count": len(liquidatable),
+            "profitable_count": profitable_count,
+            "liquidated_count": liquidated_count
+        }
+    
+    def _evaluate_positions(self, all_active_positions: List[Position]) -> Tuple[List[Position], set]:
+        """Read every position in this process, update the book; (liquidatable, seen keys)"""
         # ENHANCED: Multi-collateral position checking with detailed analysis
         liquidatable = []
+        seen = set()
         for position in all_active_positions:
             try:
                 user_addr = position.user_address
@@ -62,9 +269,22 @@ class PositionMonitor:
                 position.collateral_amount = collateral_usd
                 position.borrowed = borrowed_usd  # Now in USD (8 decimals), not Wei ETH
 
+                with self._lock:
+                    row = self.book.upsert(
+                        user_addr,
+                        health_factor=hf_raw,
+                        collateral_usd=collateral_usd,
+                        borrowed_usd=borrowed_usd,
+                        borrowed_wei=borrowed_wei,
+                        status=position.status
+                    )
+                    for c in user_collaterals:
+                        self.book.set_collateral(row, c['asset'], c['amount'])
+                seen.add(address_to_bytes(user_addr))
+
                 # Enhanced logging with multi-collateral details
                 collateral_summary = ", ".join([
-                    f"{c['symbol']}:{c['amount'] / 10**Config.COLLATERAL_CONFIGS.get(c['asset'], {}).get('decimals', 18):.4f}"
+                    f"{c['symbol']}:{c['amount'] / 10**asset_registry.decimals(c['asset']):.4f}"
                     for c in user_collaterals
                 ]) if user_collaterals else "None"
 
@@ -90,40 +310,254 @@ class PositionMonitor:
             except Exception as e:
                 logger.error(f"Failed to analyze position {position.user_address[:10]}...: {e}")
                 continue
-        
-        logger.info(f"Liquidatable positions (on-chain HF < 1.0): {len(liquidatable)}")
-        
-        # Attempt liquidations
-        profitable_count = 0
-        liquidated_count = 0
-        
-        for position in liquidatable:
-            logger.info(f"Processing {position}")
-            
-            # Attempt liquidation
-            success = self.liquidator.attempt_liquidation(position)
-            
-            if position.is_profitable:
-                profitable_count += 1
-            
-            if success:
-                liquidated_count += 1
-        
-        # Log summary
-        log_monitor_cycle(len(liquidatable), profitable_count)
-        
+
+        return liquidatable, seen
+
+    def _evaluate_sharded(self, all_active_positions: List[Position]) -> Tuple[List[Position], set]:
+        """
+        Read the positions on the shard workers. Every row read is written
+        back to the book, so oracle re-evaluation, /stress-test and the
+        cycle archive see the same book as unsharded mode; users whose read
+        failed keep their last row. Only candidates (HF below the pre-sign
+        band) are turned back into Positions for planning.
+        """
+        band = int(round(Config.PRESIGN_HF_BAND * 100))
+        by_user = AddressMap((position.user_address, position) for position in all_active_positions)
+        evaluation = self.sharded.evaluate(list(by_user), band)
+
+        rows = evaluation.rows
+        for index, user in enumerate(rows.users):
+            with self._lock:
+                row = self.book.upsert(
+                    user,
+                    health_factor=rows.health_factor[index],
+                    collateral_usd=rows.collateral_usd[index],
+                    borrowed_usd=rows.debt_usd[index],
+                    borrowed_wei=rows.borrowed_wei[index],
+                    status=by_user[user].status,
+                    block=rows.block[index]
+                )
+                for asset, amount in rows.collaterals[index]:
+                    self.book.set_collateral(row, asset, amount)
+        seen = {address_to_bytes(user) for user in rows.users}
+        seen.update(address_to_bytes(user) for user in evaluation.failed)
+
+        liquidatable = []
+        for user, hf, collateral_usd, debt_usd, borrowed_wei, collaterals, block in evaluation.candidates:
+            position = by_user[user]
+            position.health_factor = Decimal(hf) / Decimal(100)
+            position.collateral_amount = collateral_usd
+            position.borrowed = debt_usd
+
+            if hf < HF_SCALE and debt_usd > 0:
+                liquidatable.append(position)
+                logger.warning(
+                    f"🚨 [LIQUIDATABLE] Position {user[:10]}... | "
+                    f"HF={position.health_factor:.2f} | "
+                    f"Value=${collateral_usd / 10**Config.USD_DECIMALS:.2f} | "
+                    f"Debt=${debt_usd / 10**Config.USD_DECIMALS:.2f} | "
+                    f"Assets={len(collaterals)}"
+                )
+
         logger.info(
-            f"Monitor cycle completed | risky={len(liquidatable)} | "
-            f"profitable={profitable_count} | liquidated={liquidated_count}"
+            f"Sharded evaluation | shards={self.sharded.shards} | users={evaluation.checked} | "
+            f"rows={len(rows)} | candidates={len(evaluation.candidates)} | failed={len(evaluation.failed)} | "
+            f"wall={evaluation.wall_ms:.0f}ms | slowest_shard={max(evaluation.shard_ms, default=0):.0f}ms"
         )
-        logger.info("=" * 60)
-        
-        return {
-            "risky_count": len(liquidatable),
-            "profitable_count": profitable_count,
-            "liquidated_count": liquidated_count
-        }
-    
+        return liquidatable, seen
+
+    def reevaluate_exposed(self, assets: Iterable) -> int:
+        """
+        Re-read the users exposed to assets whose oracle price just changed
+        and liquidate those now underwater, without waiting for a full cycle.
+        Debt is ETH, so an ETH price change exposes every borrower.
+
+        Returns:
+            Number of successful liquidations
+        """
+        with self._lock:
+            rows = set()
+            for asset in assets:
+                if Address(asset) == Config.ETH_ADDRESS:
+                    rows.update(self.book.rows_with_debt())
+                else:
+                    rows.update(self.book.rows_holding(asset))
+            # Resolved now: rows move once the book is released
+            users = [self.book.user_address(row) for row in sorted(rows)]
+        if not users:
+            return 0
+        return self._reevaluate_users(users, "Oracle-triggered re-evaluation")
+
+    def _reevaluate_users(self, users: List[str], reason: str) -> int:
+        """
+        Re-read users on-chain, update the book and liquidate those underwater.
+        The book lock covers only the row updates and the plan, never the RPC
+        reads or the liquidations.
+        """
+        liquidatable = []
+        for user in users:
+            snapshot = self.web3_client.get_position_snapshot(user)
+            if snapshot is None:
+                continue
+            hf = snapshot.health_factor
+            with self._lock:
+                self.book.upsert(
+                    user,
+                    health_factor=min(hf, HF_INFINITE),
+                    collateral_usd=snapshot.collateral_usd,
+                    borrowed_usd=snapshot.debt_usd,
+                    borrowed_wei=snapshot.borrowed_wei,
+                    block=snapshot.block_number
+                )
+            if snapshot.is_liquidatable():
+                liquidatable.append(Position(
+                    user, snapshot.collateral_usd, snapshot.debt_usd, Decimal(hf) / 100, "ACTIVE"
+                ))
+
+        logger.info(f"{reason} | users={len(users)} | liquidatable={len(liquidatable)}")
+        with self._lock:
+            planned = self._plan_liquidations(liquidatable)
+        return sum(1 for position in planned if self.liquidator.attempt_liquidation(position))
+
+    def drop_closed_position(self, user_address: str, block: int):
+        """Liquidated or repaid in full: out of the book and the pre-signed cache at once"""
+        self.liquidator.presigned.discard(user_address)
+        with self._lock:
+            if self.book.remove(user_address):
+                logger.info(f"Dropped closed position | user={user_address[:10]}... | block={block}")
+
+    def apply_repayment(self, user_address: str, remaining_wei: int, block: int):
+        """
+        Partial repay: scale the row's debt and HF (inverse to debt at
+        unchanged prices) so the candidate set reflects it before the next read.
+        """
+        with self._lock:
+            row = self.book.row_of(user_address)
+            if row is None:
+                return
+            previous_wei = self.book.borrowed_wei[row]
+            if previous_wei <= 0 or remaining_wei <= 0:
+                return
+            hf = self.book.health_factor[row]
+            self.book.upsert(
+                user_address,
+                health_factor=hf if hf >= HF_INFINITE else hf * previous_wei // remaining_wei,
+                borrowed_usd=self.book.borrowed_usd[row] * remaining_wei // previous_wei,
+                borrowed_wei=remaining_wei,
+                block=block
+            )
+            # The warm transaction carries the old debt as its value
+            self.liquidator.presigned.discard(user_address)
+
+    def apply_pending_price(self, asset: str, role: str, price: int):
+        """
+        A provider setPrice() is in the mempool: predict with it and pre-sign
+        for the positions the resulting oracle update would put in the band,
+        so the transactions are ready the moment it lands.
+        """
+        if self.oracle_mirror is None:
+            return
+        self.oracle_mirror.apply_pending(asset, role, price)
+        with self._lock:
+            self._warm_presigned()
+
+    def _prune_book(self, seen: set):
+        """Drop rows for users no longer returned as active"""
+        for key in [key for key in self.book._keys if key not in seen]:
+            self.book.remove(key)
+
+    def _warm_presigned(self):
+        """Pre-sign liquidations for positions inside the PRESIGN_HF_BAND"""
+        band = int(round(Config.PRESIGN_HF_BAND * 100))
+        if band <= 0:
+            return
+
+        try:
+            rows = set(self.book.liquidatable_rows(band)) | set(self._predicted_rows(band))
+            targets = [
+                (self.book.user_address(row), self.book.borrowed_wei[row])
+                for row in sorted(rows)
+            ]
+            gas_price_wei = self.web3_client.estimate_gas_price() if targets else 0
+            warm = self.liquidator.warm_presigned(targets, gas_price_wei)
+            if targets:
+                logger.info(f"Pre-signed liquidations | band=HF<{band / 100:.2f} | warm={warm}/{len(targets)}")
+        except Exception as e:
+            logger.error(f"Failed to warm pre-signed liquidations: {e}")
+
+    def _predicted_rows(self, band: int) -> List[int]:
+        """Rows the next oracle update (OracleMirror) will put below band"""
+        if self.oracle_mirror is None:
+            return []
+        try:
+            mirror = self.oracle_mirror
+            projected = mirror.project_health_factors(self.book, mirror.predicted_prices(mirror.predict()))
+        except Exception as e:
+            logger.warning(f"Oracle mirror prediction failed: {e}")
+            return []
+
+        rows = [row for row, hf in projected.items() if hf < band]
+        entering = [row for row in rows if self.book.health_factor[row] >= band]
+        if entering:
+            logger.info(
+                f"Oracle mirror: {len(entering)} position(s) enter HF<{band / 100:.2f} at the next price update"
+            )
+        return rows
+
+    def _plan_liquidations(self, liquidatable: List[Position]) -> List[Position]:
+        """
+        Score candidates in one vectorised pass, then keep the most
+        profitable set the wallet can fund (LiquidationPlanner).
+        """
+        if not liquidatable:
+            return []
+
+        try:
+            profit_calculator = self.liquidator.profit_calculator
+            eth_price = self.web3_client.get_asset_price(Config.ETH_ADDRESS)
+            fee_quote = profit_calculator.get_fee_quote()
+            scores = profit_calculator.score_batch(
+                self.book,
+                {Config.ETH_ADDRESS: eth_price},
+                fee_quote
+            )
+
+            by_row = {self.book.row_of(p.user_address): p for p in liquidatable}
+            candidates = []
+            for score in scores:
+                row = int(score["row"])
+                position = by_row.get(row)
+                if position is None:
+                    continue
+
+                position.is_profitable = bool(score["is_profitable"])
+                if not position.is_profitable:
+                    continue
+                position.gas_cost_usd = usd_to_decimal(int(score["gas_cost_usd"]))
+                position.expected_profit_usd = usd_to_decimal(int(score["net_profit_usd"]))
+
+                candidates.append(LiquidationCandidate(
+                    position.user_address,
+                    borrowed_wei=self.book.borrowed_wei[row],
+                    gas_cost_wei=fee_quote.gas_units(int(score["asset_count"])) * fee_quote.gas_price_wei,
+                    net_profit_usd=int(score["net_profit_usd"]),
+                    position=position
+                ))
+
+            selected = self.liquidator.plan_liquidations(candidates)
+            if len(selected) < len(candidates):
+                logger.warning(
+                    f"Deferred {len(candidates) - len(selected)} profitable liquidation(s) | "
+                    f"insufficient capital"
+                )
+            for c in selected:
+                c.position.wallet_lane = c.lane
+            return [c.position for c in selected]
+
+        except Exception as e:
+            logger.error(f"Failed to plan liquidations: {e}")
+            return liquidatable
+
     def _get_all_active_positions(self) -> List[Position]:
         """
         Récupère toutes les positions ACTIVE avec dette > 0
@@ -190,12 +624,12 @@ class PositionMonitor:
             # Asset breakdown
             asset_breakdown = []
             for collateral in collaterals:
-                asset_config = Config.COLLATERAL_CONFIGS.get(collateral['asset'], {})
+                asset_config = asset_registry.get(collateral['asset'])
                 asset_breakdown.append({
                     'symbol': collateral['symbol'],
-                    'amount': collateral['amount'] / 10**asset_config.get('decimals', 18),
-                    'ltv': asset_config.get('ltv', 0),
-                    'liquidation_threshold': asset_config.get('liquidation_threshold', 0)
+                    'amount': collateral['amount'] / (asset_config.scale if asset_config else 10**18),
+                    'ltv': asset_config.ltv if asset_config else 0,
+                    'liquidation_threshold': asset_config.liquidation_threshold if asset_config else 0
                 })
 
             return {
@@ -216,6 +650,21 @@ class PositionMonitor:
             logger.error(f"Failed to analyze multi-collateral position {user_address}: {e}")
             return {'error': str(e)}
 
+    def stress_test(self, grid: dict) -> dict:
+        """
+        Price-shock grid ({asset symbol or address: [percent, ...]}) over
+        the current book at the current oracle prices.
+        """
+        with self._lock:
+            assets = {Config.ETH_ADDRESS} | {Address(asset) for asset in self.book.collateral_assets()}
+            prices = {asset: self.web3_client.get_asset_price(asset) for asset in assets}
+            tester = StressTester(self.book, prices, self.web3_client.estimate_gas_price())
+            positions = len(self.book)
+        return {
+            "positions": positions,
+            "scenarios": [result.to_dict() for result in tester.run_grid(grid)]
+        }
+
     def get_status(self) -> dict:
         global_metrics = self.graph_client.get_global_metrics()
         if not global_metrics:
@@ -239,6 +688,16 @@ class PositionMonitor:
             "bot": {
                 "wallet_balance_eth": round(wallet_balance, 4),
                 "liquidations": liquidation_metrics,
+                "wallets": self.liquidator.wallets.stats(),
+                "rpc_endpoints": self.web3_client.get_rpc_stats(),
+                "oracle": self.web3_client.oracle_watcher.stats(),
+                "positions": self.web3_client.position_watcher.stats(),
+                "assets": asset_registry.stats(),
+                "oracle_mirror": self.oracle_mirror.stats() if self.oracle_mirror else None,
+                "store": self.store.stats() if self.store else None,
+                "archive": self.archive.stats() if self.archive else None,
+                "shards": self.sharded.stats() if self.sharded else None,
+                "coordination": self.coordinator.stats() if self.coordinator else None,
                 "config": {
                     "monitor_interval": Config.MONITOR_INTERVAL_SECONDS,
                     "min_profit_usd": Config.MIN_PROFIT_USD,
@@ -0,0 +1,214 @@
+# bot/src/services/position_store.py - v1.0 - SQLite (WAL) snapshot of the bot state for warm restarts
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from models.position_book import PositionBook, STATUSES
+from utils.logger import logger
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS positions (
+    user BLOB PRIMARY KEY,
+    health_factor INTEGER NOT NULL,
+    collateral_usd TEXT NOT NULL,
+    borrowed_usd TEXT NOT NULL,
+    borrowed_wei TEXT NOT NULL,
+    status TEXT NOT NULL,
+    block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS collateral (
+    user BLOB NOT NULL,
+    asset BLOB NOT NULL,
+    amount TEXT NOT NULL,
+    PRIMARY KEY (user, asset)
+);
+"""
+
+
+class PositionStore:
+    """
+    Local snapshot of what the bot knows, so a restart resumes warm:
+
+    - the PositionBook (every row and its per-asset collateral)
+    - the checkpoint block events were processed up to
+    - a JSON state blob: nonce floor, in-flight transactions, last gas
+      price, liquidation metrics
+
+    One SQLite file in WAL mode; save() writes the rows the book marked
+    changed since the previous save in a single transaction (called once
+    per monitor cycle), so readers never see a half-written cycle and a
+    crash loses at most the cycle in progress.
+    Amounts are stored as decimal text: uint256 values overflow INTEGER.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._synced_book: Optional[PositionBook] = None
+        self.saves = 0
+        self.last_save_rows = 0
+        self.last_save_ms: Optional[float] = None
+
+        version = self._meta("schema_version")
+        if version is not None and int(version) != SCHEMA_VERSION:
+            logger.warning(f"Position store schema {version} != {SCHEMA_VERSION}, starting cold")
+            self.clear()
+        self._set_meta("schema_version", str(SCHEMA_VERSION))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ===== META =====
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def checkpoint_block(self) -> Optional[int]:
+        value = self._meta("checkpoint_block")
+        return int(value) if value is not None else None
+
+    @property
+    def saved_at(self) -> Optional[float]:
+        value = self._meta("saved_at")
+        return float(value) if value is not None else None
+
+    # ===== WRITE =====
+
+    def save(self, book: PositionBook, checkpoint_block: Optional[int], state: Dict):
+        """
+        Write the rows changed or removed since the last save (the first
+        save of a run, or a different book, rewrites the whole snapshot)
+        """
+        start = time.monotonic()
+        full = book is not self._synced_book
+        if full:
+            changed, removed = {book.key(row) for row in range(len(book))}, set()
+        else:
+            changed, removed = book.changes()
+        rows = [book.row_of(key) for key in changed]
+        rows = [row for row in rows if row is not None]
+
+        positions = [
+            (
+                book.key(row),
+                book.health_factor[row],
+                str(book.collateral_usd[row]),
+                str(book.borrowed_usd[row]),
+                str(book.borrowed_wei[row]),
+                STATUSES[book.status[row]],
+                book.block[row],
+            )
+            for row in rows
+        ]
+        collateral = []
+        for asset in book.collateral_assets():
+            column = book.collateral_column(asset)
+            collateral.extend(
+                (book.key(row), asset, str(column[row]))
+                for row in rows
+                if column[row]
+            )
+        stale = [(key,) for key in removed | changed]
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if full:
+                    self._conn.execute("DELETE FROM positions")
+                    self._conn.execute("DELETE FROM collateral")
+                else:
+                    self._conn.executemany("DELETE FROM positions WHERE user = ?", [(key,) for key in removed])
+                    self._conn.executemany("DELETE FROM collateral WHERE user = ?", stale)
+                self._conn.executemany("INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?, ?)", positions)
+                self._conn.executemany("INSERT INTO collateral VALUES (?, ?, ?)", collateral)
+                if checkpoint_block is not None:
+                    self._set_meta("checkpoint_block", str(checkpoint_block))
+                self._set_meta("state", json.dumps(state))
+                self._set_meta("saved_at", str(time.time()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if full:
+            changed, removed = book.changes()
+        book.mark_saved(changed, removed)
+        self._synced_book = book
+        self.saves += 1
+        self.last_save_rows = len(positions)
+        self.last_save_ms = (time.monotonic() - start) * 1000
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM positions")
+            self._conn.execute("DELETE FROM collateral")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.execute("COMMIT")
+            self._synced_book = None
+
+    # ===== READ =====
+
+    def load_book(self, book: PositionBook) -> int:
+        """Fill book from the snapshot; returns the number of rows loaded"""
+        warm = len(book) == 0
+        with self._lock:
+            positions = self._conn.execute(
+                "SELECT user, health_factor, collateral_usd, borrowed_usd, borrowed_wei, status, block FROM positions"
+            ).fetchall()
+            collateral = self._conn.execute("SELECT user, asset, amount FROM collateral").fetchall()
+
+        for user, hf, collateral_usd, borrowed_usd, borrowed_wei, status, block in positions:
+            book.upsert(
+                bytes(user),
+                health_factor=hf,
+                collateral_usd=int(collateral_usd),
+                borrowed_usd=int(borrowed_usd),
+                borrowed_wei=int(borrowed_wei),
+                status=status,
+                block=block
+            )
+        for user, asset, amount in collateral:
+            row = book.row_of(bytes(user))
+            if row is not None:
+                book.set_collateral(row, bytes(asset), int(amount))
+        if warm:
+            # The book now mirrors the snapshot: the next save writes only what changes
+            book.mark_saved(*book.changes())
+            self._synced_book = book
+        return len(positions)
+
+    def load_state(self) -> Dict:
+        value = self._meta("state")
+        return json.loads(value) if value else {}
+
+    def stats(self) -> Dict:
+        return {
+            "path": self.path,
+            "checkpoint_block": self.checkpoint_block,
+            "saves": self.saves,
+            "last_save_rows": self.last_save_rows,
+            "last_save_ms": round(self.last_save_ms, 1) if self.last_save_ms is not None else None,
+        }
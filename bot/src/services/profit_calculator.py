@@ -1,140 +1,415 @@
-# bot/src/services/profit_calculator.py - v2.0 - Multi-asset liquidation support
+# bot/src/services/profit_calculator.py - v3.0 - Integer fixed-point profit math
 from decimal import Decimal
-from typing import Tuple
+from typing import Mapping, Optional, Tuple
+import numpy as np
 from config import Config
 from models.position import Position
+from models.address import AddressMap
+from models.position_book import PositionBook, IntColumn, GWEI, HF_SCALE, INT64_MAX
+from models.position_snapshot import PositionSnapshot
 from clients.web3_client import Web3Client
+from clients.asset_registry import asset_registry
 from utils.logger import logger
 
+# All USD amounts below are integers with 8 decimals (Chainlink standard),
+# the same units the contracts use. Decimal only appears at the display boundary.
+USD_UNIT = 10**Config.USD_DECIMALS
+WEI_PER_ETH = 10**Config.ETH_DECIMALS
+
+
+def usd_from_wei(amount_wei: int, eth_price: int) -> int:
+    """HealthCalculator.convertETHtoUSD: (amount * price) / 1e18"""
+    return (amount_wei * eth_price) // WEI_PER_ETH
+
+
+def liquidation_bonus_usd(debt_usd: int) -> int:
+    """LendingPool._calculateLiquidationCollateralUSD bonus: (debt * 10) / 100"""
+    return (debt_usd * Config.LIQUIDATION_BONUS_PERCENT) // 100
+
+
+def gas_cost_usd(gas_units: int, gas_price_wei: int, eth_price: int) -> int:
+    """Gas cost in USD (8 decimals) for gas_units at gas_price_wei"""
+    return usd_from_wei(gas_units * gas_price_wei, eth_price)
+
+
+def usd_to_decimal(amount_usd: int) -> Decimal:
+    """Display boundary: 8-decimal integer USD -> Decimal dollars"""
+    return Decimal(amount_usd) / USD_UNIT
+
+
+def usd_from_float(amount: float) -> int:
+    """Config float dollars -> 8-decimal integer USD"""
+    return int(Decimal(str(amount)) * USD_UNIT)
+
+
+# Ranked output of ProfitCalculator.score_batch (one record per scored row)
+SCORE_DTYPE = np.dtype([
+    ("row", np.int64),
+    ("debt_usd", np.int64),
+    ("bonus_usd", np.int64),
+    ("seized_usd", np.int64),
+    ("gas_cost_usd", np.int64),
+    ("net_profit_usd", np.int64),
+    ("asset_count", np.int64),
+    ("is_profitable", np.bool_),
+])
+
+# Largest debt score_batch prices ($46B): debt + bonus still fits in int64
+MAX_SCORED_DEBT_USD = INT64_MAX // 2
+
+
+def _column_array(column: IntColumn) -> np.ndarray:
+    """int64 ndarray over a book column (zero-copy; values beyond int64 saturated)"""
+    return np.frombuffer(column.view(), dtype=np.int64)
+
+
+def max_scored_eth(eth_price: int) -> int:
+    """Whole ETH of debt at which usd_from_gwei_array stops being exact"""
+    return MAX_SCORED_DEBT_USD // max(eth_price, 1) - 1
+
+
+def usd_from_gwei_array(gwei: np.ndarray, eth_price: int) -> np.ndarray:
+    """
+    floor(gwei * eth_price / 1e9) in int64 without overflowing the product:
+    whole ETH times the price, plus the sub-ETH gwei split in two halves
+    whose products stay below 1e18 (exact for prices up to $900k).
+
+    Raises:
+        OverflowError: a debt is worth MAX_SCORED_DEBT_USD or more
+    """
+    eth, sub = np.divmod(gwei, GWEI)
+    if eth.size and int(eth.max()) >= max_scored_eth(eth_price):
+        raise OverflowError("Debt beyond MAX_SCORED_DEBT_USD cannot be scored in int64")
+    high, low = np.divmod(sub, 10**5)
+    high = high * eth_price  # sub-ETH / 1e5 (< 1e4) * price
+    low = low * eth_price  # < 1e5 * price
+    return eth * eth_price + high // 10**4 + ((high % 10**4) * 10**5 + low) // GWEI
+
+
+class FeeQuote:
+    """Gas price snapshot used to price a whole scoring batch"""
+
+    __slots__ = ("gas_price_wei", "base_gas", "gas_per_asset")
+
+    def __init__(self, gas_price_wei: int, base_gas: int = None, gas_per_asset: int = None):
+        self.gas_price_wei = gas_price_wei
+        self.base_gas = ProfitCalculator.BASE_GAS if base_gas is None else base_gas
+        self.gas_per_asset = ProfitCalculator.GAS_PER_ASSET if gas_per_asset is None else gas_per_asset
+
+    def gas_units(self, asset_count: int) -> int:
+        return self.base_gas + asset_count * self.gas_per_asset
+
+
+class ProfitQuote:
+    """Integer profit breakdown for one liquidation candidate"""
+
+    __slots__ = (
+        "user_address", "collateral_usd", "debt_usd", "bonus_usd", "seized_usd",
+        "gas_cost_usd", "net_profit_usd", "asset_count", "is_profitable",
+    )
+
+    def __init__(
+        self,
+        user_address: str,
+        collateral_usd: int,
+        debt_usd: int,
+        bonus_usd: int,
+        seized_usd: int,
+        gas_cost_usd: int,
+        net_profit_usd: int,
+        asset_count: int,
+        is_profitable: bool
+    ):
+        self.user_address = user_address
+        self.collateral_usd = collateral_usd
+        self.debt_usd = debt_usd
+        self.bonus_usd = bonus_usd
+        self.seized_usd = seized_usd
+        self.gas_cost_usd = gas_cost_usd
+        self.net_profit_usd = net_profit_usd
+        self.asset_count = asset_count
+        self.is_profitable = is_profitable
+
+    def apply_to(self, position: Position):
+        """Store the display (Decimal) values on a Position"""
+        position.collateral_usd = usd_to_decimal(self.collateral_usd)
+        position.liquidation_bonus_usd = usd_to_decimal(self.bonus_usd)
+        position.gas_cost_usd = usd_to_decimal(self.gas_cost_usd)
+        position.expected_profit_usd = usd_to_decimal(self.net_profit_usd)
+        position.is_profitable = self.is_profitable
+
+    def __repr__(self) -> str:
+        return (
+            f"ProfitQuote(user={self.user_address[:8]}..., "
+            f"net=${usd_to_decimal(self.net_profit_usd):.2f}, "
+            f"profitable={self.is_profitable})"
+        )
+
+
 class ProfitCalculator:
+    # Base liquidation gas + additional cost per asset
+    BASE_GAS = 300000
+    GAS_PER_ASSET = 50000  # Extra gas for complex liquidations
+
     def __init__(self, web3_client: Web3Client):
         self.web3_client = web3_client
-    
-    def calculate_profit(self, position: Position) -> Tuple[bool, Decimal]:
-        """Calculate liquidation profit for multi-collateral position"""
+
+    @property
+    def min_profit_usd(self) -> int:
+        return usd_from_float(Config.MIN_PROFIT_USD)
+
+    @classmethod
+    def estimate_gas_units(cls, asset_count: int) -> int:
+        return cls.BASE_GAS + asset_count * cls.GAS_PER_ASSET
+
+    def quote(
+        self,
+        user_address: str,
+        collateral_usd: int,
+        debt_usd: int,
+        asset_count: int,
+        gas_price_wei: int,
+        eth_price: int,
+        min_profit_usd: Optional[int] = None
+    ) -> ProfitQuote:
+        """Pure integer profit calculation - no RPC"""
+        if min_profit_usd is None:
+            min_profit_usd = self.min_profit_usd
+
+        # Liquidation bonus (10% of debt) and total collateral to seize
+        bonus_usd = liquidation_bonus_usd(debt_usd)
+        seized_usd = debt_usd + bonus_usd
+
+        # Cap to available collateral
+        if seized_usd > collateral_usd:
+            seized_usd = collateral_usd
+            bonus_usd = seized_usd - debt_usd
+
+        gas_usd = gas_cost_usd(self.estimate_gas_units(asset_count), gas_price_wei, eth_price)
+        net_profit_usd = bonus_usd - gas_usd
+
+        return ProfitQuote(
+            user_address=user_address,
+            collateral_usd=collateral_usd,
+            debt_usd=debt_usd,
+            bonus_usd=bonus_usd,
+            seized_usd=seized_usd,
+            gas_cost_usd=gas_usd,
+            net_profit_usd=net_profit_usd,
+            asset_count=asset_count,
+            is_profitable=net_profit_usd >= min_profit_usd
+        )
+
+    def calculate_profit(
+        self,
+        position: Position,
+        snapshot: Optional[PositionSnapshot] = None
+    ) -> Tuple[bool, Decimal]:
+        """
+        Calculate liquidation profit for multi-collateral position
+
+        With a snapshot, every input comes from it and no RPC is made.
+        """
         try:
-            return self._calculate_multi_asset_profit(position)
+            return self._calculate_multi_asset_profit(position, snapshot)
         except Exception as e:
             logger.error(f"Failed to calculate profit for {position.user_address}: {e}")
             return False, Decimal("0")
 
-    def _calculate_multi_asset_profit(self, position: Position) -> Tuple[bool, Decimal]:
+    def _calculate_multi_asset_profit(
+        self,
+        position: Position,
+        snapshot: Optional[PositionSnapshot] = None
+    ) -> Tuple[bool, Decimal]:
         """Enhanced profit calculation for multi-collateral liquidation"""
         user_address = position.user_address
 
-        # Get comprehensive position data
-        collaterals = self.web3_client.get_user_collaterals(user_address)
-        total_collateral_usd = self.web3_client.get_collateral_value_usd(user_address)
-        _, borrowed_wei, _ = self.web3_client.get_position_onchain(user_address)
+        if snapshot is not None:
+            collaterals = snapshot.collateral_list(asset_registry)
+            total_collateral_usd = snapshot.collateral_usd
+            eth_price = snapshot.eth_price
+            gas_price_wei = snapshot.gas_price_wei
+            borrowed_wei = snapshot.borrowed_wei
+        else:
+            # Get comprehensive position data
+            collaterals = self.web3_client.get_user_collaterals(user_address)
+            total_collateral_usd = self.web3_client.get_collateral_value_usd(user_address)
+            _, borrowed_wei, _ = self.web3_client.get_position_onchain(user_address)
 
-        # Convert borrowed from Wei ETH to USD (8 decimals)
-        borrowed_usd = self.web3_client.convert_borrowed_to_usd(borrowed_wei)
+            # One ETH price read serves both the debt conversion and the gas cost
+            eth_price = self.web3_client.get_asset_price(Config.ETH_ADDRESS)
+            gas_price_wei = self.web3_client.estimate_gas_price()
 
-        # Convert to decimal USD values
-        collateral_usd_decimal = Decimal(total_collateral_usd) / Decimal(10**Config.USD_DECIMALS)
-        debt_usd_decimal = Decimal(borrowed_usd) / Decimal(10**Config.USD_DECIMALS)
+        borrowed_usd = usd_from_wei(borrowed_wei, eth_price)
 
         logger.info(
             f"Multi-asset profit calc | user={user_address[:10]}... | "
             f"Assets={len(collaterals)} | "
-            f"Collateral=${collateral_usd_decimal:.2f} | "
-            f"Debt=${debt_usd_decimal:.2f}"
+            f"Collateral=${usd_to_decimal(total_collateral_usd):.2f} | "
+            f"Debt=${usd_to_decimal(borrowed_usd):.2f}"
         )
-        
-        # Calculate liquidation bonus (10% of debt in USD)
-        liquidation_bonus_usd = debt_usd_decimal * Decimal(Config.LIQUIDATION_BONUS)
-
-        # Calculate total collateral to seize (debt + bonus)
-        total_seized_usd = debt_usd_decimal + liquidation_bonus_usd
-
-        # Verify sufficient collateral available
-        if total_seized_usd > collateral_usd_decimal:
-            logger.warning(
-                f"Insufficient collateral | Required=${total_seized_usd:.2f} | "
-                f"Available=${collateral_usd_decimal:.2f}"
-            )
-            # Cap to available collateral
-            total_seized_usd = collateral_usd_decimal
-            liquidation_bonus_usd = total_seized_usd - debt_usd_decimal
 
         # Log detailed collateral breakdown
         for collateral in collaterals:
-            asset_config = Config.COLLATERAL_CONFIGS.get(collateral['asset'], {})
-            amount_human = collateral['amount'] / 10**asset_config.get('decimals', 18)
+            asset_config = asset_registry.get(collateral['asset'])
+            if asset_config is None:
+                continue
             logger.debug(
                 f"Asset: {collateral['symbol']} | "
-                f"Amount: {amount_human:.6f} | "
-                f"LTV: {asset_config.get('ltv', 0)}%"
+                f"Amount: {collateral['amount'] / asset_config.scale:.6f} | "
+                f"LTV: {asset_config.ltv}%"
             )
 
-        logger.info(
-            f"Liquidation calculation | "
-            f"Total seized: ${total_seized_usd:.2f} | "
-            f"Bonus: ${liquidation_bonus_usd:.2f}"
+        quote = self.quote(
+            user_address,
+            total_collateral_usd,
+            borrowed_usd,
+            len(collaterals),
+            gas_price_wei,
+            eth_price
         )
-        
-        # Estimate gas cost (higher for multi-asset liquidation)
-        gas_cost_usd = self._estimate_multi_asset_gas_cost(len(collaterals))
-        
-        logger.info(f"Multi-asset gas cost: ${gas_cost_usd:.2f}")
-        
-        # Calculate net profit
-        net_profit_usd = liquidation_bonus_usd - gas_cost_usd
-
-        # Check if profitable
-        is_profitable = net_profit_usd >= Decimal(Config.MIN_PROFIT_USD)
+
+        required_usd = borrowed_usd + liquidation_bonus_usd(borrowed_usd)
+        if required_usd > total_collateral_usd:
+            logger.warning(
+                f"Insufficient collateral | Required=${usd_to_decimal(required_usd):.2f} | "
+                f"Available=${usd_to_decimal(total_collateral_usd):.2f}"
+            )
 
         # Store calculated values in position
-        position.collateral_usd = collateral_usd_decimal
-        position.liquidation_bonus_usd = liquidation_bonus_usd
-        position.gas_cost_usd = gas_cost_usd
-        position.expected_profit_usd = net_profit_usd
-        position.is_profitable = is_profitable
+        quote.apply_to(position)
 
         logger.info(
             f"✓ Multi-asset profit calc | user={user_address[:10]}... | "
-            f"Collateral=${collateral_usd_decimal:.2f} | "
-            f"Debt=${debt_usd_decimal:.2f} | "
-            f"Bonus=${liquidation_bonus_usd:.2f} | "
-            f"Gas=${gas_cost_usd:.2f} | "
-            f"Profit=${net_profit_usd:.2f} | "
-            f"Profitable={is_profitable} | "
+            f"Collateral=${position.collateral_usd:.2f} | "
+            f"Debt=${usd_to_decimal(borrowed_usd):.2f} | "
+            f"Bonus=${position.liquidation_bonus_usd:.2f} | "
+            f"Gas=${position.gas_cost_usd:.2f} | "
+            f"Profit=${position.expected_profit_usd:.2f} | "
+            f"Profitable={quote.is_profitable} | "
             f"Assets={len(collaterals)}"
         )
 
-        return is_profitable, net_profit_usd
-    
-    def _estimate_multi_asset_gas_cost(self, asset_count: int) -> Decimal:
-        """Estimate gas cost for multi-asset liquidation"""
-        gas_price_wei = self.web3_client.estimate_gas_price()
-        gas_price_gwei = Decimal(gas_price_wei) / Decimal(10**9)
+        return quote.is_profitable, position.expected_profit_usd
 
-        # Base liquidation gas + additional cost per asset
-        base_gas = 300000
-        additional_gas_per_asset = 50000  # Extra gas for complex liquidations
-        estimated_gas_units = base_gas + (asset_count * additional_gas_per_asset)
+    def get_fee_quote(self) -> FeeQuote:
+        return FeeQuote(self.web3_client.estimate_gas_price())
 
-        # Get ETH price for USD conversion
-        eth_price_usd = self.web3_client.get_asset_price(Config.ETH_ADDRESS)
-        eth_price_decimal = Decimal(eth_price_usd) / Decimal(10**Config.USD_DECIMALS)
+    def score_batch(
+        self,
+        book: PositionBook,
+        prices: Mapping[str, int],
+        fee_quote: FeeQuote,
+        candidates_only: bool = True
+    ) -> np.ndarray:
+        """
+        Score every row of a PositionBook in one vectorised pass.
 
-        # Calculate cost in ETH
-        gas_cost_eth = (gas_price_gwei * Decimal(estimated_gas_units)) / Decimal(10**9)
+        Args:
+            book: Positions with on-chain collateral_usd and borrowed_wei
+            prices: Asset address -> oracle price (8 decimals); must include ETH
+            fee_quote: Gas price used for every row
+            candidates_only: Only score rows with HF < 1.00 and debt > 0
 
-        # Convert to USD
-        gas_cost_usd = gas_cost_eth * eth_price_decimal
+        Returns:
+            SCORE_DTYPE array ranked by net profit (highest first). The same
+            integer formulas as quote() on int64 columns, debt in gwei, so
+            results match row for row up to sub-gwei debt.
+        """
+        eth_price = self._price_of(prices, Config.ETH_ADDRESS)
+        if candidates_only:
+            hf = _column_array(book.health_factor)
+            rows = np.nonzero((hf < HF_SCALE) & (_column_array(book.borrowed_wei) > 0))[0]
+        else:
+            rows = np.arange(len(book), dtype=np.int64)
+        if rows.size == 0:
+            return np.zeros(0, dtype=SCORE_DTYPE)
+
+        # Debt is scored from the gwei column (sub-gwei Wei is under $0.000002 at $2000/ETH)
+        gwei = _column_array(book.borrowed_gwei)[rows]
+        unscorable = gwei >= max_scored_eth(eth_price) * GWEI
+        if unscorable.any():
+            # No wallet funds a $46B liquidation; such rows are left out rather than saturated
+            logger.warning(f"Skipped {int(unscorable.sum())} row(s) with debt beyond int64 scoring range")
+            rows, gwei = rows[~unscorable], gwei[~unscorable]
+            if rows.size == 0:
+                return np.zeros(0, dtype=SCORE_DTYPE)
+        debt = usd_from_gwei_array(gwei, eth_price)
+        collateral = _column_array(book.collateral_usd)[rows]
+
+        # liquidation_bonus_usd() split so debt * percent cannot overflow
+        percent = Config.LIQUIDATION_BONUS_PERCENT
+        bonus = (debt // 100) * percent + (debt % 100) * percent // 100
+        seized = np.minimum(debt + bonus, collateral)
+        bonus = seized - debt
+
+        asset_counts = self._asset_counts(book)[rows]
+        gas_table = np.array(
+            [
+                gas_cost_usd(fee_quote.gas_units(count), fee_quote.gas_price_wei, eth_price)
+                for count in range(int(asset_counts.max()) + 1)
+            ],
+            dtype=np.int64
+        )
+        gas = gas_table[asset_counts]
+        net = bonus - gas
+
+        scores = np.zeros(rows.size, dtype=SCORE_DTYPE)
+        scores["row"] = rows
+        scores["debt_usd"] = debt
+        scores["bonus_usd"] = bonus
+        scores["seized_usd"] = seized
+        scores["gas_cost_usd"] = gas
+        scores["net_profit_usd"] = net
+        scores["asset_count"] = asset_counts
+        scores["is_profitable"] = net >= self.min_profit_usd
+
+        # Stable sort keeps book order among equal profits
+        return scores[np.argsort(-scores["net_profit_usd"], kind="stable")]
+
+    @staticmethod
+    def _price_of(prices: Mapping[str, int], asset: str) -> int:
+        price = AddressMap(prices).get(asset)
+        if price is None:
+            raise KeyError(f"No price for {asset}")
+        return price
+
+    @staticmethod
+    def _asset_counts(book: PositionBook) -> np.ndarray:
+        """Collateral assets held per row (1 when the book has no breakdown)"""
+        assets = book.collateral_assets()
+        if not assets:
+            return np.ones(len(book), dtype=np.int64)
+        counts = np.zeros(len(book), dtype=np.int64)
+        for asset in assets:
+            counts += _column_array(book.collateral_column(asset)) != 0
+        return counts
+
+    def _estimate_multi_asset_gas_cost(self, asset_count: int) -> Decimal:
+        """Estimate gas cost for multi-asset liquidation"""
+        gas_price_wei = self.web3_client.estimate_gas_price()
+        eth_price = self.web3_client.get_asset_price(Config.ETH_ADDRESS)
+
+        estimated_gas_units = self.estimate_gas_units(asset_count)
+        cost_usd = gas_cost_usd(estimated_gas_units, gas_price_wei, eth_price)
 
         logger.debug(
-            f"Multi-asset gas estimation | price={gas_price_gwei:.2f} gwei | "
-            f"base_units={base_gas} | assets={asset_count} | "
-            f"total_units={estimated_gas_units} | cost=${gas_cost_usd:.2f}"
+            f"Multi-asset gas estimation | price={gas_price_wei / 10**9:.2f} gwei | "
+            f"base_units={self.BASE_GAS} | assets={asset_count} | "
+            f"total_units={estimated_gas_units} | cost=${usd_to_decimal(cost_usd):.2f}"
         )
 
-        return gas_cost_usd
-    
-    def calculate_liquidation_amount(self, position: Position) -> int:
+        return usd_to_decimal(cost_usd)
+
+    def calculate_liquidation_amount(
+        self,
+        position: Position,
+        snapshot: Optional[PositionSnapshot] = None
+    ) -> int:
         """Calculate total debt amount to repay in liquidation (in Wei ETH)"""
         # For multi-collateral, liquidate full debt position
+        if snapshot is not None:
+            return snapshot.borrowed_wei
         _, borrowed_wei, _ = self.web3_client.get_position_onchain(position.user_address)
         return borrowed_wei  # Return Wei ETH for contract call
 
@@ -154,7 +429,7 @@ class ProfitCalculator:
                 'asset_count': len(collaterals),
                 'assets': [{
                     'symbol': c['symbol'],
-                    'amount': c['amount'] / 10**Config.COLLATERAL_CONFIGS.get(c['asset'], {}).get('decimals', 18),
+                    'amount': c['amount'] / 10**asset_registry.decimals(c['asset']),
                     'asset_address': c['asset']
                 } for c in collaterals],
                 'liquidation_bonus_usd': position.liquidation_bonus_usd if hasattr(position, 'liquidation_bonus_usd') else 0,
@@ -164,17 +439,18 @@ class ProfitCalculator:
         except Exception as e:
             logger.error(f"Failed to get liquidation summary: {e}")
             return {'error': str(e)}
-    
-    def check_gas_price_acceptable(self) -> bool:
-        gas_price_wei = self.web3_client.estimate_gas_price()
+
+    def check_gas_price_acceptable(self, gas_price_wei: Optional[int] = None) -> bool:
+        if gas_price_wei is None:
+            gas_price_wei = self.web3_client.estimate_gas_price()
         gas_price_gwei = gas_price_wei / 10**9
-        
+
         acceptable = gas_price_gwei <= Config.MAX_GAS_PRICE_GWEI
-        
+
         if not acceptable:
             logger.warning(
                 f"Gas price too high: {gas_price_gwei:.2f} gwei "
                 f"(max: {Config.MAX_GAS_PRICE_GWEI})"
             )
-        
-        return acceptable
\ No newline at end of file
+
+        return acceptable
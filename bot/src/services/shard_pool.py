@@ -0,0 +1,189 @@
+# bot/src/services/shard_pool.py - v1.0 - Position evaluation sharded by address hash across worker processes
+import multiprocessing
+import time
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from models.address import address_to_bytes
+from models.position_book import HF_INFINITE
+from models.position_snapshot import HF_PRECISION
+
+# (user, health_factor, collateral_usd, debt_usd, borrowed_wei, ((asset, amount), ...), block)
+Candidate = Tuple[str, int, int, int, int, Tuple[Tuple[str, int], ...], int]
+
+# The worker process's own client (RPC session, price / ABI caches), built once by the initializer
+_client = None
+
+
+def shard_of(user_address: str, shards: int) -> int:
+    """Shard of a user: CRC32 of the address bytes, stable across processes and restarts"""
+    return zlib.crc32(address_to_bytes(user_address)) % shards
+
+
+class ShardRows:
+    """
+    Every row a shard read, as columns: a few lists cross the process
+    boundary instead of one tuple per user. Health factors are capped at
+    HF_INFINITE so they pack as int64 like the book column.
+    """
+
+    __slots__ = ("users", "health_factor", "collateral_usd", "debt_usd", "borrowed_wei", "collaterals", "block")
+
+    def __init__(self):
+        self.users: List[str] = []
+        self.health_factor = array("q")
+        self.collateral_usd: List[int] = []
+        self.debt_usd: List[int] = []
+        self.borrowed_wei: List[int] = []
+        self.collaterals: List[Tuple[Tuple[str, int], ...]] = []
+        self.block = array("q")
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def append(self, user: str, snapshot, block: int):
+        self.users.append(user)
+        self.health_factor.append(min(snapshot.health_factor, HF_INFINITE))
+        self.collateral_usd.append(snapshot.collateral_usd)
+        self.debt_usd.append(snapshot.debt_usd)
+        self.borrowed_wei.append(snapshot.borrowed_wei)
+        self.collaterals.append(snapshot.collaterals)
+        self.block.append(block)
+
+    def extend(self, other: "ShardRows"):
+        for name in self.__slots__:
+            getattr(self, name).extend(getattr(other, name))
+
+    def candidate(self, index: int) -> Candidate:
+        return (
+            self.users[index], self.health_factor[index], self.collateral_usd[index], self.debt_usd[index],
+            self.borrowed_wei[index], self.collaterals[index], self.block[index]
+        )
+
+
+def _init_worker(client_factory: Callable):
+    global _client
+    _client = client_factory()
+
+
+def _evaluate_shard(users: List[str], band: int) -> Dict:
+    """
+    Runs in a worker: read every user at one pinned block. Every row comes
+    back as ShardRows columns; candidates (debt and HF below band) are
+    indices into them.
+    """
+    start = time.perf_counter()
+    block = _client.w3.eth.block_number
+    gas_price_wei = _client.estimate_gas_price()
+    rows = ShardRows()
+    candidates: List[int] = []
+    failed: List[str] = []
+    for user in users:
+        snapshot = _client.get_position_snapshot(user, block, gas_price_wei=gas_price_wei)
+        if snapshot is None:
+            failed.append(user)
+            continue
+        if snapshot.borrowed_wei > 0 and snapshot.health_factor < band:
+            candidates.append(len(rows))
+        rows.append(user, snapshot, block)
+    return {
+        "rows": rows,
+        "candidates": candidates,
+        "failed": failed,
+        "checked": len(users),
+        "eval_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+class ShardedEvaluation:
+    """Merged result of one sharded pass"""
+
+    def __init__(self, rows: ShardRows, candidates: List[Candidate], failed: List[str], checked: int,
+                 shard_ms: List[float], wall_ms: float):
+        self.rows = rows
+        self.candidates = candidates
+        self.failed = failed
+        self.checked = checked
+        self.shard_ms = shard_ms
+        self.wall_ms = wall_ms
+
+
+class ShardedEvaluator:
+    """
+    Splits the position universe by address hash across N worker
+    processes, so on-chain reads, ABI decoding and HF math run on every
+    core instead of behind the GIL.
+
+    Each shard has a dedicated single-process pool: the same worker always
+    gets the same users and keeps its own client (RPC session and caches)
+    for the life of the pool. Workers return compact columns for every row
+    they read; the book, the nonce and transaction submission stay with
+    the coordinator.
+    """
+
+    def __init__(self, shards: int, client_factory: Optional[Callable] = None, start_method: str = "spawn"):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        if client_factory is None:
+            from clients.web3_client import Web3Client
+            client_factory = Web3Client
+        self.shards = shards
+        context = multiprocessing.get_context(start_method)
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_worker, initargs=(client_factory,))
+            for _ in range(shards)
+        ]
+        self.passes = 0
+        self.last_evaluation: Optional[ShardedEvaluation] = None
+
+    def split(self, users: List[str]) -> List[List[str]]:
+        shards = [[] for _ in range(self.shards)]
+        for user in users:
+            shards[shard_of(user, self.shards)].append(user)
+        return shards
+
+    def evaluate(self, users: List[str], band: int = HF_PRECISION) -> ShardedEvaluation:
+        """
+        Evaluate users on the workers. Every row read comes back in rows;
+        band is the HF (100 = 1.00) below which a row is also a candidate,
+        and it never drops under the liquidation line.
+        """
+        start = time.perf_counter()
+        band = max(band, HF_PRECISION)
+        futures = [
+            executor.submit(_evaluate_shard, shard, band)
+            for executor, shard in zip(self._executors, self.split(users)) if shard
+        ]
+        rows, candidates, failed, shard_ms, checked = ShardRows(), [], [], [], 0
+        for future in futures:
+            result = future.result()
+            offset = len(rows)
+            rows.extend(result["rows"])
+            candidates.extend(rows.candidate(offset + index) for index in result["candidates"])
+            failed.extend(result["failed"])
+            shard_ms.append(result["eval_ms"])
+            checked += result["checked"]
+
+        evaluation = ShardedEvaluation(rows, candidates, failed, checked, shard_ms, (time.perf_counter() - start) * 1000)
+        self.passes += 1
+        self.last_evaluation = evaluation
+        return evaluation
+
+    def close(self):
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        last = self.last_evaluation
+        return {
+            "shards": self.shards,
+            "passes": self.passes,
+            "last_checked": last.checked if last else None,
+            "last_rows": len(last.rows) if last else None,
+            "last_candidates": len(last.candidates) if last else None,
+            "last_failed": len(last.failed) if last else None,
+            "last_wall_ms": round(last.wall_ms, 1) if last else None,
+            "last_slowest_shard_ms": round(max(last.shard_ms), 1) if last and last.shard_ms else None,
+        }
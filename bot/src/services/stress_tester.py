@@ -0,0 +1,277 @@
+# bot/src/services/stress_tester.py - v1.0 - Per-asset price shock scenarios over the whole position book
+"""
+What happens to the book if ETH moves 30%?
+
+Usage (offline, from the warm-restart snapshot):
+    cd bot/src && python -m services.stress_tester --shock ETH=-30,-20,-10,10,20,30 \\
+        --price ETH=3000 [--shock 0xToken=-50,0] [--store data/bot_state.db] [--gas-gwei 20]
+
+Assets are given by symbol (asset registry) or address. Prices missing
+from --price are read on-chain through Web3Client.
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from clients.asset_registry import asset_registry
+from config import Config
+from models.address import Address
+from models.position_book import GWEI, INT64_MAX, IntColumn, PositionBook
+from models.position_snapshot import LIQUIDATION_THRESHOLD
+from services.profit_calculator import (
+    ProfitCalculator, _column_array, gas_cost_usd, max_scored_eth, usd_from_gwei_array,
+)
+from utils.logger import logger
+
+WEI_PER_ETH = 10**18
+
+
+def _scoring_limit(price: int) -> int:
+    """1e-9 units at which usd_from_gwei_array stops being exact at price"""
+    return min(max_scored_eth(price) * GWEI, INT64_MAX)
+
+
+def _nano_units(column: IntColumn, scale: int) -> np.ndarray:
+    """
+    Collateral amounts in 1e-9 token units (floor), the resolution of the
+    borrowed_gwei column, so both go through usd_from_gwei_array. Amounts
+    too large for int64 are saturated and then skipped as unscorable.
+    """
+    amounts = _column_array(column)
+    if scale < GWEI:
+        factor = GWEI // scale
+        return np.where(amounts > INT64_MAX // factor, INT64_MAX, amounts * factor)
+    divisor = scale // GWEI
+    units = amounts // divisor
+    for row, value in column.overflow.items():
+        units[row] = min(value // divisor, INT64_MAX)
+    return units
+
+
+def resolve_asset(key: str) -> Address:
+    """Asset address from a symbol known to the asset registry, or an address"""
+    if key.startswith(("0x", "0X")):
+        return Address(key)
+    for config in asset_registry:
+        if config.symbol.upper() == key.upper():
+            return config.address
+    raise KeyError(f"Unknown asset symbol: {key}")
+
+
+def shock_price(price: int, percent: float) -> int:
+    """price moved by percent, at basis-point resolution"""
+    return price * int(round((100 + percent) * 100)) // 10_000
+
+
+class StressResult:
+    """Outcome of one scenario over the book"""
+
+    def __init__(self, shocks: Dict[Address, float], liquidatable: int, newly_liquidatable: int,
+                 profitable: int, debt_at_risk_usd: int, expected_bonus_usd: int, bad_debt_positions: int,
+                 bad_debt_usd: int, required_capital_wei: int, eval_ms: float):
+        self.shocks = shocks
+        self.liquidatable = liquidatable
+        self.newly_liquidatable = newly_liquidatable
+        self.profitable = profitable
+        self.debt_at_risk_usd = debt_at_risk_usd
+        self.expected_bonus_usd = expected_bonus_usd
+        self.bad_debt_positions = bad_debt_positions
+        self.bad_debt_usd = bad_debt_usd
+        self.required_capital_wei = required_capital_wei
+        self.eval_ms = eval_ms
+
+    @property
+    def name(self) -> str:
+        moves = [f"{asset_registry.symbol(a)} {pct:+g}%" for a, pct in self.shocks.items() if pct]
+        return " | ".join(moves) or "baseline"
+
+    def to_dict(self) -> Dict:
+        usd = 10**Config.USD_DECIMALS
+        return {
+            "scenario": self.name,
+            "shocks": {asset_registry.symbol(a) if a in asset_registry else a: pct for a, pct in self.shocks.items()},
+            "liquidatable": self.liquidatable,
+            "newly_liquidatable": self.newly_liquidatable,
+            "profitable": self.profitable,
+            "debt_at_risk_usd": round(self.debt_at_risk_usd / usd, 2),
+            "expected_bonus_usd": round(self.expected_bonus_usd / usd, 2),
+            "bad_debt_positions": self.bad_debt_positions,
+            "bad_debt_usd": round(self.bad_debt_usd / usd, 2),
+            "required_capital_eth": round(self.required_capital_wei / WEI_PER_ETH, 6),
+            "eval_ms": round(self.eval_ms, 2),
+        }
+
+
+class StressTester:
+    """
+    Applies per-asset price shocks to a PositionBook and re-derives every
+    row with the contracts' integer math: CollateralManager._convertToUSD
+    per asset, HealthCalculator.convertETHtoUSD for the debt, then
+    calculateHealthFactor and the 10% liquidation bonus capped by the
+    collateral. Each scenario is one pass of int64 NumPy expressions over
+    the book columns, debt from borrowed_gwei and collateral at the same
+    1e-9 resolution (the ProfitCalculator.score_batch split), so results
+    match the per-row math up to sub-gwei amounts.
+
+    Columns are copied at construction, so the book can keep changing.
+    """
+
+    def __init__(self, book: PositionBook, prices: Mapping[str, int], gas_price_wei: int = 0):
+        self.prices: Dict[Address, int] = {Address(asset): price for asset, price in prices.items()}
+        if Config.ETH_ADDRESS not in self.prices:
+            raise ValueError("An ETH price is required (debt is Wei ETH)")
+
+        self.has_debt = _column_array(book.borrowed_wei) > 0
+        self.debt_gwei = _column_array(book.borrowed_gwei).copy()
+        self.assets = []
+        self.asset_counts = np.zeros(len(book), dtype=np.int64)
+        for asset_key in book.collateral_assets():
+            column = book.collateral_column(asset_key)
+            held = _column_array(column) != 0
+            if not held.any():
+                continue
+            asset = Address(asset_key)
+            if asset not in self.prices:
+                raise ValueError(f"No price for collateral asset {asset_registry.symbol(asset)} ({asset})")
+            config = asset_registry.get(asset_key)
+            self.assets.append((asset, _nano_units(column, config.scale if config is not None else 10**18)))
+            self.asset_counts += held
+
+        # liquidate() gas per row, priced once (ProfitCalculator gas model)
+        self.gas_price_wei = gas_price_wei
+        self.gas_wei = (ProfitCalculator.BASE_GAS + self.asset_counts * ProfitCalculator.GAS_PER_ASSET) * gas_price_wei
+
+        self._baseline = self._evaluate({})[2]
+
+    def _evaluate(self, shocks: Mapping[Address, float]):
+        """(collateral_usd, debt_usd, liquidatable mask, ETH price) per row at the shocked prices"""
+        eth_price = shock_price(self.prices[Config.ETH_ADDRESS], shocks.get(Config.ETH_ADDRESS, 0.0))
+        columns = [(self.debt_gwei, eth_price)] + [
+            (units, shock_price(self.prices[asset], shocks.get(asset, 0.0))) for asset, units in self.assets
+        ]
+        unscorable = np.zeros(self.debt_gwei.size, dtype=bool)
+        for units, price in columns:
+            unscorable |= units >= _scoring_limit(price)
+        if unscorable.any():
+            columns = [(np.where(unscorable, 0, units), price) for units, price in columns]
+
+        debt = usd_from_gwei_array(*columns[0])
+        collateral = np.zeros(debt.size, dtype=np.int64)
+        for units, price in columns[1:]:
+            value = usd_from_gwei_array(units, price)
+            full = collateral > INT64_MAX - value
+            if full.any():
+                unscorable |= full
+                value[full] = 0
+            collateral += value
+
+        if unscorable.any():
+            # Same rule as score_batch: left out rather than saturated
+            logger.warning(f"Stress test skipped {int(unscorable.sum())} row(s) beyond int64 scoring range")
+            debt[unscorable] = 0
+            collateral[unscorable] = 0
+
+        # calculateHealthFactor: adjusted * 100 // debt < 100 exactly when adjusted < debt
+        adjusted = (collateral // 100) * LIQUIDATION_THRESHOLD + (collateral % 100) * LIQUIDATION_THRESHOLD // 100
+        return collateral, debt, self.has_debt & (adjusted < debt), eth_price
+
+    def run(self, shocks: Mapping[str, float]) -> StressResult:
+        start = time.perf_counter()
+        shocks = {Address(asset): float(pct) for asset, pct in shocks.items()}
+        collateral, debt, liquidatable, eth_price = self._evaluate(shocks)
+
+        debt_at_risk = debt[liquidatable]
+        collateral_at_risk = collateral[liquidatable]
+        # liquidation_bonus_usd() split so debt * percent cannot overflow
+        percent = Config.LIQUIDATION_BONUS_PERCENT
+        bonus = (debt_at_risk // 100) * percent + (debt_at_risk % 100) * percent // 100
+        seized = np.minimum(debt_at_risk + bonus, collateral_at_risk)
+        bonus = seized - debt_at_risk
+
+        asset_counts = self.asset_counts[liquidatable]
+        gas_table = np.array(
+            [
+                gas_cost_usd(ProfitCalculator.estimate_gas_units(count), self.gas_price_wei, eth_price)
+                for count in range(int(asset_counts.max(initial=0)) + 1)
+            ],
+            dtype=np.int64
+        )
+        gas_usd = gas_table[asset_counts]
+        min_profit = int(round(Config.MIN_PROFIT_USD * 10**Config.USD_DECIMALS))
+        shortfall = debt_at_risk - collateral_at_risk
+        underwater = shortfall > 0
+
+        return StressResult(
+            shocks,
+            liquidatable=int(liquidatable.sum()),
+            newly_liquidatable=int((liquidatable & ~self._baseline).sum()),
+            profitable=int((bonus - gas_usd >= min_profit).sum()),
+            debt_at_risk_usd=int(debt_at_risk.sum()),
+            expected_bonus_usd=int(bonus[bonus > 0].sum()),
+            bad_debt_positions=int(underwater.sum()),
+            bad_debt_usd=int(shortfall[underwater].sum()),
+            required_capital_wei=int(self.debt_gwei[liquidatable].sum()) * GWEI + int(self.gas_wei[liquidatable].sum()),
+            eval_ms=(time.perf_counter() - start) * 1000
+        )
+
+    def run_grid(self, grid: Mapping[str, Iterable[float]]) -> List[StressResult]:
+        """Every combination of the per-asset shock lists (cartesian product)"""
+        assets = [resolve_asset(key) for key in grid]
+        return [
+            self.run(dict(zip(assets, combination)))
+            for combination in itertools.product(*(list(values) for values in grid.values()))
+        ]
+
+
+def _parse_pairs(pairs: Optional[List[str]]) -> Dict[str, str]:
+    result = {}
+    for pair in pairs or []:
+        key, _, value = pair.partition("=")
+        if not value:
+            raise ValueError(f"Expected KEY=VALUE, got {pair}")
+        result[key] = value
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m services.stress_tester", description="Position book price-shock stress test")
+    parser.add_argument("--shock", action="append", required=True, help="ASSET=pct[,pct...] (repeatable)")
+    parser.add_argument("--price", action="append", help="ASSET=usd (repeatable; missing prices are read on-chain)")
+    parser.add_argument("--store", default=Config.POSITION_STORE_PATH, help="Position store snapshot to load the book from")
+    parser.add_argument("--gas-gwei", type=float, default=None, help="Gas price for capital / profit (default: on-chain)")
+    args = parser.parse_args(argv)
+
+    from services.position_store import PositionStore
+    book = PositionBook()
+    store = PositionStore(args.store)
+    store.load_book(book)
+    checkpoint_block = store.checkpoint_block
+    store.close()
+
+    grid = {key: [float(v) for v in values.split(",")] for key, values in _parse_pairs(args.shock).items()}
+    prices: Dict[Union[str, Address], int] = {
+        resolve_asset(key): int(round(float(usd) * 10**Config.USD_DECIMALS))
+        for key, usd in _parse_pairs(args.price).items()
+    }
+    needed = {Config.ETH_ADDRESS} | {Address(asset) for asset in book.collateral_assets()}
+    gas_price_wei = int(args.gas_gwei * 10**9) if args.gas_gwei is not None else None
+    if needed - set(prices) or gas_price_wei is None:
+        from clients.web3_client import Web3Client
+        web3_client = Web3Client()
+        for asset in needed - set(prices):
+            prices[asset] = web3_client.get_asset_price(asset)
+        if gas_price_wei is None:
+            gas_price_wei = web3_client.estimate_gas_price()
+
+    tester = StressTester(book, prices, gas_price_wei)
+    results = [result.to_dict() for result in tester.run_grid(grid)]
+    print(json.dumps({"positions": len(book), "checkpoint_block": checkpoint_block, "scenarios": results}, indent=2))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
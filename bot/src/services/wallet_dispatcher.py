@@ -0,0 +1,117 @@
+# bot/src/services/wallet_dispatcher.py - v1.0 - Liquidations spread across liquidator wallets
+import threading
+from typing import Dict, List, Optional
+
+from services.wallet_ledger import WalletLedger
+
+
+class WalletLane:
+    """
+    One liquidator wallet as the Liquidator uses it: the client that
+    simulates, signs and sends for it (the Web3Client for the primary
+    key, a LiquidatorWallet otherwise) and its balance ledger.
+    """
+
+    def __init__(self, client, ledger: WalletLedger):
+        self.client = client
+        self.ledger = ledger
+        self.in_flight = 0  # Attempts holding this lane (waiting or sending)
+        self.sent = 0
+        # One nonce chain: a lane sends one liquidation at a time, through its receipt
+        self.send_lock = threading.Lock()
+
+    @property
+    def address(self) -> str:
+        return self.client.account.address
+
+
+class WalletDispatcher:
+    """
+    Picks the wallet for each liquidation: among lanes that can fund it,
+    the one with the fewest attempts in flight, then the most capital
+    (the primary lane wins ties, so its pre-signed transactions get used).
+    Lanes never share a nonce chain, so attempts on different lanes run
+    side by side instead of queueing behind one account.
+    """
+
+    def __init__(self, lanes: List[WalletLane]):
+        if not lanes:
+            raise ValueError("WalletDispatcher needs at least one wallet")
+        self.lanes = lanes
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.lanes)
+
+    @property
+    def primary(self) -> WalletLane:
+        return self.lanes[0]
+
+    def available_wei(self) -> int:
+        """Capital across every wallet (gas reserves excluded)"""
+        return sum(self.lane_balances())
+
+    def lane_balances(self) -> List[int]:
+        """Capital per wallet, in lane order: what a single liquidation can draw on"""
+        return [lane.ledger.available_wei() for lane in self.lanes]
+
+    def reserve(self, amount_wei: int, preferred: Optional[int] = None) -> Optional[WalletLane]:
+        """
+        Lane that will send a liquidation of amount_wei, or None if no
+        single wallet can fund it. The amount is debited and the lane
+        counted in flight until release(). preferred is the lane index the
+        planner budgeted it on, used whenever that lane can still fund it.
+        """
+        with self._lock:
+            if preferred is not None and 0 <= preferred < len(self.lanes):
+                lane = self.lanes[preferred]
+                if lane.ledger.available_wei() >= amount_wei:
+                    lane.ledger.debit(amount_wei)
+                    lane.in_flight += 1
+                    return lane
+
+            best, best_key = None, None
+            for index, lane in enumerate(self.lanes):
+                available = lane.ledger.available_wei()
+                if available < amount_wei:
+                    continue
+                key = (lane.in_flight, -available, index)
+                if best_key is None or key < best_key:
+                    best, best_key = lane, key
+            if best is not None:
+                best.ledger.debit(amount_wei)
+                best.in_flight += 1
+            return best
+
+    def reserve_lane(self, lane: WalletLane, amount_wei: int) -> bool:
+        """reserve() on a given lane (a transaction already signed by its key)"""
+        with self._lock:
+            if lane.ledger.available_wei() < amount_wei:
+                return False
+            lane.ledger.debit(amount_wei)
+            lane.in_flight += 1
+            return True
+
+    def release(self, lane: WalletLane, amount_wei: int, sent: bool):
+        """sent=False: the liquidation never went out and its amount is credited back"""
+        with self._lock:
+            lane.in_flight -= 1
+            if sent:
+                lane.sent += 1
+        if not sent:
+            lane.ledger.credit(amount_wei)
+
+    def invalidate(self):
+        for lane in self.lanes:
+            lane.ledger.invalidate()
+
+    def stats(self) -> List[Dict]:
+        return [
+            {
+                "address": lane.address,
+                "in_flight": lane.in_flight,
+                "sent": lane.sent,
+                "nonce": lane.client.nonce_manager.current,
+            }
+            for lane in self.lanes
+        ]
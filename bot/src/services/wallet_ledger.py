@@ -0,0 +1,76 @@
+# bot/src/services/wallet_ledger.py - v1.0 - Locally tracked liquidator balance
+import threading
+import time
+from decimal import Decimal
+from typing import Callable, Optional
+
+from utils.logger import logger
+
+
+def wei_from_eth(amount: float) -> int:
+    """Config float ETH -> Wei"""
+    return int(Decimal(str(amount)) * 10**18)
+
+
+class WalletLedger:
+    """
+    Local view of the liquidator wallet balance (Wei).
+
+    The balance is read from chain once and then decremented locally as
+    liquidation transactions are submitted, instead of polling
+    eth_getBalance before every attempt. It is re-read when older than
+    max_age_seconds or after invalidate() (e.g. a failed or refunded tx).
+    """
+
+    def __init__(
+        self,
+        fetch_balance_wei: Callable[[], int],
+        reserve_wei: int = 0,
+        max_age_seconds: float = 60.0
+    ):
+        self._fetch_balance_wei = fetch_balance_wei
+        self.reserve_wei = reserve_wei
+        self.max_age_seconds = max_age_seconds
+
+        self._balance_wei: Optional[int] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self) -> int:
+        balance = self._fetch_balance_wei()
+        with self._lock:
+            self._balance_wei = balance
+            self._fetched_at = time.monotonic()
+        logger.debug(f"Wallet ledger refreshed | balance={balance / 10**18:.4f} ETH")
+        return balance
+
+    def invalidate(self):
+        with self._lock:
+            self._balance_wei = None
+
+    def balance_wei(self) -> int:
+        with self._lock:
+            balance = self._balance_wei
+            stale = time.monotonic() - self._fetched_at > self.max_age_seconds
+        if balance is None or stale:
+            return self.refresh()
+        return balance
+
+    def available_wei(self) -> int:
+        """Balance usable for liquidations (gas reserve excluded)"""
+        return max(self.balance_wei() - self.reserve_wei, 0)
+
+    def can_afford(self, amount_wei: int) -> bool:
+        return self.available_wei() >= amount_wei
+
+    def debit(self, amount_wei: int):
+        """Record a submitted transaction spending amount_wei"""
+        self.balance_wei()
+        with self._lock:
+            self._balance_wei = max(self._balance_wei - amount_wei, 0)
+
+    def credit(self, amount_wei: int):
+        """Return funds of a transaction that was never broadcast"""
+        with self._lock:
+            if self._balance_wei is not None:
+                self._balance_wei += amount_wei
@@ -0,0 +1,94 @@
+# bot/tests/test_abi_fastpath.py - Precomputed-selector eth_call layer vs web3 ContractFunction
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from eth_abi import encode
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+from clients.abi_fastpath import ContractFastPath, FastCaller
+from models.address import Address
+
+ABI_DIR = Path(__file__).parent.parent / "abis"
+POOL = "0x" + "a" * 40
+USER = "0x" + "b" * 40
+ASSET = Address("0xd3f0c2a6a1e1c5b8c1e9e8b6e1d6f9e7a1c2b3d4")
+
+
+def load_abi(name):
+    return json.load(open(ABI_DIR / f"{name}.json"))["abi"]
+
+
+def result(types, values):
+    return {"jsonrpc": "2.0", "id": 0, "result": "0x" + encode(types, values).hex()}
+
+
+class FakeProvider:
+    def __init__(self, answers):
+        self.answers = answers  # function name -> response
+        self.batches = []
+
+    def _answer(self, params, contract):
+        selector = bytes.fromhex(params[0]["data"][2:10])
+        name = next(f.name for f in contract.functions.values() if f.selector == selector)
+        return self.answers[name]
+
+    def make_batch_request(self, calls):
+        self.batches.append(calls)
+        return [self._answer(params, self.contract) for _, params in calls]
+
+
+class TestContractFastPath:
+
+    def test_call_data_matches_web3(self):
+        abi = load_abi("LendingPool")
+        fast = ContractFastPath(POOL, abi)
+        contract = Web3().eth.contract(address=Web3.to_checksum_address(POOL), abi=abi)
+
+        params = fast.call_params("getHealthFactor", [USER], 1234)
+
+        assert params[0]["data"] == contract.encodeABI(fn_name="getHealthFactor", args=[Web3.to_checksum_address(USER)])
+        assert params[1] == hex(1234)
+
+    def test_decodes_like_contract_function(self):
+        pool = ContractFastPath(POOL, load_abi("LendingPool"))
+        manager = ContractFastPath(POOL, load_abi("CollateralManager"))
+
+        position = pool.decode_response(
+            "getPosition", result(["(uint256,uint256,uint256,uint256)"], [(1, 2, 3, 4)])
+        )
+        assets, amounts, values = manager.decode_response(
+            "getUserCollaterals", result(["address[]", "uint256[]", "uint256[]"], [[ASSET], [5], [6]])
+        )
+
+        assert position == (1, 2, 3, 4)
+        assert assets == [Address(ASSET)] and assets[0].checksum == Web3.to_checksum_address(ASSET) and amounts == [5]
+
+    def test_revert_raises_contract_logic_error_with_data(self):
+        pool = ContractFastPath(POOL, load_abi("LendingPool"))
+        with pytest.raises(ContractLogicError) as exc:
+            pool.decode_response("getHealthFactor", {"error": {"code": 3, "message": "execution reverted", "data": "0x11a3fbc6"}})
+        assert exc.value.data == "0x11a3fbc6"
+
+
+def test_call_many_is_one_batch_in_call_order():
+    pool = ContractFastPath(POOL, load_abi("LendingPool"))
+    provider = FakeProvider({
+        "getHealthFactor": result(["uint256"], [95]),
+        "getPosition": result(["(uint256,uint256,uint256,uint256)"], [(0, 10**18, 0, 0)]),
+    })
+    provider.contract = pool
+
+    hf, position = FastCaller(provider).call_many(
+        [(pool, "getHealthFactor", [USER]), (pool, "getPosition", [USER])], block_identifier=7
+    )
+
+    assert hf == 95 and position[1] == 10**18
+    assert len(provider.batches) == 1
+    assert all(params[1] == "0x7" for _, params in provider.batches[0])
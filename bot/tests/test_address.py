@@ -0,0 +1,75 @@
+# bot/tests/test_address.py - Address interning and AddressMap tests
+
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+from web3 import Web3
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.address import Address, AddressMap, address_to_bytes
+from models.position import Position
+
+LOWER = "0xd3f0c2a6a1e1c5b8c1e9e8b6e1d6f9e7a1c2b3d4"
+CHECKSUM = Web3.to_checksum_address(LOWER)
+
+
+class TestAddress:
+
+    def test_every_spelling_is_the_same_object(self):
+        address = Address(LOWER)
+
+        assert Address(CHECKSUM) is address
+        assert Address(LOWER.upper().replace("0X", "0x")) is address
+        assert Address(bytes.fromhex(LOWER[2:])) is address
+        assert Address(address) is address
+
+    def test_forms(self):
+        address = Address(LOWER)
+
+        assert str(address) == address.checksum == CHECKSUM
+        assert type(address.checksum) is str
+        assert address.lowercase == LOWER
+        assert address_to_bytes(address) is address.raw
+        assert address[:10] == CHECKSUM[:10]
+
+    def test_equality_and_hash(self):
+        address = Address(LOWER)
+
+        raw = bytes.fromhex(LOWER[2:])
+
+        assert address == Address(CHECKSUM) and address == raw
+        assert address != Address("0x" + "0" * 40)
+        # Raw strings are normalised first, never compared: equal objects hash equal
+        assert address != LOWER and address != CHECKSUM and LOWER != address
+        assert hash(address) == hash(raw)
+        assert {raw: 1}[address] == 1 and {address: 1}[raw] == 1
+        assert len({address, Address(CHECKSUM), raw}) == 1
+
+    def test_invalid_address(self):
+        with pytest.raises(ValueError):
+            Address("0x1234")
+
+    def test_survives_pickle(self):
+        assert pickle.loads(pickle.dumps(Address(LOWER))) is Address(LOWER)
+
+    def test_position_interns_user(self):
+        position = Position(LOWER, 1, 2, "1.5", "ACTIVE")
+        assert position.user_address is Address(CHECKSUM)
+
+
+class TestAddressMap:
+
+    def test_lookup_by_any_spelling(self):
+        configs = AddressMap({CHECKSUM: {"symbol": "USDC"}})
+
+        assert configs[LOWER]["symbol"] == "USDC"
+        assert configs.get(bytes.fromhex(LOWER[2:]))["symbol"] == "USDC"
+        assert LOWER in configs and "not an address" not in configs
+        assert configs.get("0x" + "0" * 40, {}) == {}
+
+        configs[LOWER] = {"symbol": "DAI"}
+        assert len(configs) == 1
+        assert list(configs)[0] is Address(LOWER)
@@ -0,0 +1,79 @@
+# bot/tests/test_asset_registry.py - CollateralManager asset configs: batched load, event refresh, fallback
+
+import sys
+from pathlib import Path
+
+from eth_abi import encode
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.abi_fastpath import ContractFastPath
+from clients.asset_registry import AssetRegistry
+from config import Config
+from models.address import Address, address_to_bytes
+
+MANAGER = "0x" + "b" * 40
+ETH = Config.ETH_ADDRESS
+USDC = Address("0x" + "5" * 40)
+
+manager = ContractFastPath.from_abi_file(MANAGER, str(Path(__file__).parent.parent / "abis" / "CollateralManager.json"))
+
+
+class FakeCaller:
+    def __init__(self, configs):
+        self.configs = configs
+        self.batches = []
+
+    def call(self, contract, name, args=(), block_identifier="latest"):
+        assert name == "getSupportedAssets"
+        return list(self.configs)
+
+    def call_many(self, calls, block_identifier="latest", return_exceptions=False):
+        self.batches.append([args[0] for _, _, args in calls])
+        return [self.configs[args[0]] for _, _, args in calls]
+
+
+class LogProvider:
+    def __init__(self):
+        self.logs = []
+
+    def make_request(self, method, params):
+        return {"jsonrpc": "2.0", "id": 1, "result": self.logs}
+
+
+def test_falls_back_to_config_until_loaded():
+    registry = AssetRegistry()
+    assert registry.get(ETH).liquidation_threshold == 83
+    assert registry.symbol("0x" + "7" * 40) == "UNKNOWN"
+
+
+def test_batched_load_and_event_refresh():
+    caller = FakeCaller({
+        ETH: (66, 83, 10, 18, True, "ETH"),
+        USDC: (90, 95, 5, 6, True, "USDC"),
+    })
+    provider = LogProvider()
+    registry = AssetRegistry()
+    registry.attach(caller, provider, manager)
+
+    assert registry.load() == 2
+    assert caller.batches == [[ETH, USDC]]
+    usdc = registry.get(address_to_bytes(USDC))
+    assert (usdc.symbol, usdc.scale, usdc.liquidation_penalty) == ("USDC", 10**6, 5)
+    assert registry.get(USDC.upper().replace("0X", "0x")) is usdc
+
+    registry.on_head(100)
+    caller.configs[USDC] = (80, 85, 5, 6, False, "USDC")
+    provider.logs = [{
+        "address": MANAGER,
+        "topics": manager.event_topics("AssetEnabled") + ["0x" + "0" * 24 + USDC[2:]],
+        "data": "0x" + encode(["bool"], [False]).hex(),
+        "blockNumber": hex(101),
+        "logIndex": "0x0",
+        "transactionHash": "0x" + "f" * 64,
+    }]
+
+    assert registry.on_head(101) == {USDC}
+    assert caller.batches[-1] == [USDC]
+    assert registry.get(USDC).ltv == 80
+    assert registry.addresses() == [ETH]
@@ -0,0 +1,57 @@
+# bot/tests/test_backtest.py - Replay engine: streams, simulated chain and strategy reports
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from backtest import ReplayBlock, ReplayEngine, StrategySettings, generate_scenario, load_stream, save_stream
+from backtest.chain import SimulatedChain
+from backtest.stream import BORROW, DEPOSIT, PRICE, USDC_ADDRESS
+from config import Config
+from models.address import Address
+
+ETH = Config.ETH_ADDRESS
+USER = Address("0x" + "1" * 40)
+
+
+def test_stream_round_trip_and_contract_math(tmp_path):
+    blocks = [
+        ReplayBlock(1, 0, 10**9, [
+            {"type": PRICE, "asset": ETH, "price": 2_000 * 10**8},
+            {"type": PRICE, "asset": USDC_ADDRESS, "price": 10**8},
+            {"type": DEPOSIT, "user": USER, "asset": USDC_ADDRESS, "amount": 10_000 * 10**6},
+            {"type": BORROW, "user": USER, "amount": 4 * 10**18},  # $8,000 vs $8,300 adjusted collateral
+        ]),
+        ReplayBlock(2, 12, 10**9, [{"type": PRICE, "asset": ETH, "price": 2_100 * 10**8}]),
+    ]
+    path = str(tmp_path / "stream.jsonl")
+    save_stream(blocks, path)
+    loaded = load_stream(path)
+    assert loaded[0].events[3]["amount"] == 4 * 10**18
+
+    chain = SimulatedChain()
+    chain.apply(loaded[0])
+    assert chain.health_factor(USER) == 103 and not chain.is_liquidatable(USER)
+    chain.apply(loaded[1])
+    assert chain.health_factor(USER) == 98 and chain.liquidatable_users() == [USER]
+    assert chain.liquidation_bonus_usd(USER) == 840 * 10**8
+
+
+def test_replay_reports_latency_misses_and_profit():
+    blocks = generate_scenario(users=40, blocks=60, seed=7)
+    saved = (Config.MIN_PROFIT_USD, Config.ORACLE_MIRROR_ENABLED)
+
+    reactive = ReplayEngine(blocks, StrategySettings(monitor_interval_blocks=1, competitor_delay_blocks=None)).run()
+    slow = ReplayEngine(blocks, StrategySettings(monitor_interval_blocks=20, event_driven=False)).run()
+
+    assert (Config.MIN_PROFIT_USD, Config.ORACLE_MIRROR_ENABLED) == saved  # overrides are undone
+    fast_report, slow_report = reactive.to_dict(), slow.to_dict()
+    assert fast_report["opportunities"] == slow_report["opportunities"] > 0
+    assert fast_report["liquidated_by_bot"] == len(reactive.liquidations) > 0
+    assert fast_report["realized_profit_usd"] > 0
+    assert slow_report["liquidated_by_bot"] < fast_report["liquidated_by_bot"]
+    assert slow_report["missed_to_competitor"] > 0
+    assert slow_report["detection_latency_blocks"]["max"] is None or (
+        slow_report["detection_latency_blocks"]["max"] >= fast_report["detection_latency_blocks"]["max"]
+    )
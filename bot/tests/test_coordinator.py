@@ -0,0 +1,59 @@
+# bot/tests/test_coordinator.py - Shard leases, leader election and candidate hand-off between replicas
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.position import Position
+from services.coordinator import InstanceCoordinator, SqliteLeaseBackend
+from services.liquidator import Liquidator
+
+USER = "0x" + "1" * 40
+
+
+def make_pair(tmp_path, ttl=0.3):
+    path = str(tmp_path / "coordination.db")
+    a = InstanceCoordinator(SqliteLeaseBackend(path), "a", shards=8, lease_ttl=ttl)
+    b = InstanceCoordinator(SqliteLeaseBackend(path), "b", shards=8, lease_ttl=ttl)
+    return a, b
+
+
+def test_replicas_split_shards_and_elect_one_leader(tmp_path):
+    a, b = make_pair(tmp_path)
+    a.heartbeat()
+    assert a.is_leader and a.owned_shards == frozenset(range(8))
+
+    b.heartbeat()  # a still holds b's half until it rebalances
+    a.heartbeat()
+    b.heartbeat()
+    assert not b.is_leader
+    assert a.owned_shards | b.owned_shards == frozenset(range(8))
+    assert not a.owned_shards & b.owned_shards and len(b.owned_shards) == 4
+
+    # a dies: its leases run out and b takes everything over
+    time.sleep(0.35)
+    b.heartbeat()
+    assert b.is_leader and b.owned_shards == frozenset(range(8))
+
+
+def test_follower_hands_candidates_to_the_leader(tmp_path):
+    a, b = make_pair(tmp_path, ttl=5)
+    a.heartbeat()
+    b.heartbeat()
+    changes = []
+    b.on_leadership_change = changes.append
+
+    web3_client = MagicMock()
+    liquidator = Liquidator(web3_client, MagicMock())
+    liquidator.coordinator = b
+    assert liquidator.attempt_liquidation(Position(USER, 0, 0, "0.9", "ACTIVE")) is False
+    web3_client.send_signed_liquidation.assert_not_called()
+    assert b.take_candidates() == []  # followers never drain the hand-off queue
+    assert a.take_candidates() == [USER] and a.take_candidates() == []
+
+    a.stop()
+    b.heartbeat()
+    assert b.is_leader and changes == [True]
@@ -0,0 +1,54 @@
+# bot/tests/test_cycle_archive.py - Memory-mapped per-cycle book archive: append, index by block, reopen
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.address import address_to_bytes
+from models.position_book import PositionBook
+from services.cycle_archive import (
+    CycleArchive, DECISION_HEALTHY, DECISION_LIQUIDATED, DECISION_WATCH, read_archive
+)
+
+ALICE = "0x" + "1" * 40
+BOB = "0x" + "2" * 40
+ETH = 10**18
+USD = 10**8
+
+
+def make_book():
+    book = PositionBook()
+    book.upsert(ALICE, health_factor=95, collateral_usd=2_000 * USD, borrowed_usd=1_900 * USD, borrowed_wei=20 * ETH)
+    book.upsert(BOB, health_factor=150, borrowed_wei=ETH, block=99)
+    return book
+
+
+def test_cycles_are_scanned_by_block_and_survive_reopen(tmp_path):
+    path = str(tmp_path / "archive" / "cycles.bin")
+    archive = CycleArchive(path, chunk_records=3)  # forces a remap on the second cycle
+    book = make_book()
+
+    assert archive.append_cycle(book, 100, {0: DECISION_LIQUIDATED}) == 2
+    book.remove(ALICE)
+    book.upsert(BOB, health_factor=104)
+    archive.append_cycle(book, 105, {0: DECISION_WATCH})
+
+    records = archive.records()
+    assert len(records) == 3 and len(archive.cycles()) == 2
+    first = records[:2]
+    assert first["user"][0] == address_to_bytes(ALICE)
+    assert list(first["decision"]) == [DECISION_LIQUIDATED, DECISION_HEALTHY]
+    assert list(first["block"]) == [100, 99]
+    assert first["borrowed_gwei"][0] == 20 * 10**9  # beyond int64 in Wei
+
+    later = archive.records(from_block=101)
+    assert list(later["health_factor"]) == [104]
+    assert len(archive.records(from_block=200)) == 0
+    archive.close()
+
+    records, index = read_archive(path)
+    assert len(records) == 3 and list(index["block"]) == [100, 105]
+    reopened = CycleArchive(path)
+    reopened.append_cycle(book, 110)
+    assert len(reopened) == 4 and reopened.records(from_block=110)["user"][0] == address_to_bytes(BOB)
@@ -0,0 +1,58 @@
+# bot/tests/test_fast_http_provider.py - Pooled JSON-RPC provider encoding and batching
+
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from hexbytes import HexBytes
+from web3 import Web3
+
+from clients.fast_http_provider import FastHTTPProvider, dumps, strip_unused_middlewares
+
+
+def fake_post(provider, answer):
+    """Replace the session POST with a function of the decoded request body"""
+    sent = []
+
+    def post(url, data, timeout):
+        request = json.loads(data)
+        sent.append(request)
+        return SimpleNamespace(content=json.dumps(answer(request)).encode(), raise_for_status=lambda: None)
+
+    provider.session.post = post
+    return sent
+
+
+def test_dumps_handles_web3_types():
+    assert json.loads(dumps({"data": HexBytes(b"\x12\x34"), "raw": b"\xff"})) == {"data": "0x1234", "raw": "0xff"}
+
+
+def test_make_request_round_trip():
+    provider = FastHTTPProvider("http://127.0.0.1:8545")
+    sent = fake_post(provider, lambda r: {"jsonrpc": "2.0", "id": r["id"], "result": "0x10"})
+
+    assert provider.make_request("eth_blockNumber", [])["result"] == "0x10"
+    assert sent[0]["method"] == "eth_blockNumber" and sent[0]["params"] == []
+
+
+def test_batch_responses_follow_call_order():
+    provider = FastHTTPProvider("http://127.0.0.1:8545")
+    # Nodes may answer a batch in any order
+    fake_post(provider, lambda batch: [
+        {"jsonrpc": "2.0", "id": r["id"], "result": r["method"]} for r in reversed(batch)
+    ])
+
+    responses = provider.make_batch_request([("eth_chainId", []), ("eth_blockNumber", []), ("eth_gasPrice", [])])
+
+    assert [r["result"] for r in responses] == ["eth_chainId", "eth_blockNumber", "eth_gasPrice"]
+
+
+def test_unused_middlewares_stripped():
+    w3 = Web3(FastHTTPProvider("http://127.0.0.1:8545"))
+    strip_unused_middlewares(w3)
+    strip_unused_middlewares(w3)  # idempotent
+
+    assert set(name for _, name in w3.middleware_onion.middlewares) == {"attrdict", "abi"}
@@ -0,0 +1,108 @@
+# bot/tests/test_head_subscriber.py - Block head feed: dedup, coalescing, WebSocket parsing
+
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.head_subscriber import BlockHead, HeadSubscriber
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class FakeWebSocket:
+    """Sync websockets connection replaying newHeads notifications"""
+
+    def __init__(self, numbers):
+        self.messages = [json.dumps({"jsonrpc": "2.0", "id": 1, "result": "0xsub"})] + [
+            json.dumps({"method": "eth_subscription", "params": {"result": {"number": hex(n), "hash": f"0x{n:064x}"}}})
+            for n in numbers
+        ]
+        self.sent = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def recv(self, timeout=None):
+        if self.messages:
+            return self.messages.pop(0)
+        time.sleep(timeout or 0)
+        raise TimeoutError
+
+
+class TestHeadSubscriber:
+
+    def test_runs_once_per_block_from_polling(self):
+        seen = []
+        block = {"number": 100}
+        subscriber = HeadSubscriber(lambda head: seen.append(head.number), lambda: block["number"], poll_interval=0.01)
+        subscriber.start()
+        try:
+            assert wait_until(lambda: seen == [100])
+            time.sleep(0.05)  # Same block polled again: no new cycle
+            block["number"] = 101
+            assert wait_until(lambda: seen == [100, 101])
+        finally:
+            subscriber.stop()
+
+        assert subscriber.source == "polling"
+        assert subscriber.stats()["cycles_run"] == 2
+
+    def test_slow_cycle_coalesces_to_latest_head(self):
+        release = threading.Event()
+        seen = []
+
+        def on_head(head):
+            seen.append(head.number)
+            release.wait(1)
+
+        subscriber = HeadSubscriber(on_head, lambda: 0)
+        subscriber._threads = [threading.Thread(target=subscriber._run_worker, daemon=True)]
+        subscriber._threads[0].start()
+
+        subscriber.publish(BlockHead(1))
+        assert wait_until(lambda: seen == [1])
+        for number in (2, 3, 4):
+            subscriber.publish(BlockHead(number))
+        release.set()
+
+        assert wait_until(lambda: seen == [1, 4])
+        subscriber.stop()
+        assert subscriber.heads_coalesced == 2
+
+    def test_stale_and_duplicate_heads_dropped(self):
+        subscriber = HeadSubscriber(lambda head: None, lambda: 0)
+        assert subscriber.publish(BlockHead(10, "0xa"))
+        assert not subscriber.publish(BlockHead(9))
+        assert not subscriber.publish(BlockHead(10))
+        assert subscriber.publish(BlockHead(10, "0xb"))  # Reorg at the same height
+
+    def test_websocket_newheads(self):
+        ws = FakeWebSocket([7, 8])
+        seen = []
+        subscriber = HeadSubscriber(
+            lambda head: seen.append(head.number), lambda: 0,
+            ws_url="wss://node", connect=lambda url: ws
+        )
+        subscriber.start()
+        try:
+            assert wait_until(lambda: seen and seen[-1] == 8)
+        finally:
+            subscriber.stop()
+
+        assert ws.sent[0]["method"] == "eth_subscribe" and ws.sent[0]["params"] == ["newHeads"]
+        assert subscriber.source == "websocket"
@@ -0,0 +1,89 @@
+# bot/tests/test_liquidation_planner.py - Capital-constrained planner and wallet ledger tests
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from services.liquidation_planner import LiquidationPlanner, LiquidationCandidate
+from services.wallet_ledger import WalletLedger, wei_from_eth
+
+ETH = 10**18
+USD = 10**8
+
+
+def candidate(i, borrowed_eth, profit_usd, gas_wei=0):
+    return LiquidationCandidate(
+        "0x" + f"{i:040x}", int(borrowed_eth * ETH), gas_wei, int(profit_usd * USD)
+    )
+
+
+class TestLiquidationPlanner:
+
+    def test_everything_affordable_is_selected_by_profit(self):
+        plan = LiquidationPlanner().plan(
+            [candidate(1, 1, 10), candidate(2, 1, 30), candidate(3, 1, -5)],
+            available_wei=10 * ETH
+        )
+        assert [c.net_profit_usd for c in plan] == [30 * USD, 10 * USD]
+
+    def test_knapsack_beats_first_come(self):
+        # Greedy by order or density would take the big one; two small ones pay more
+        candidates = [candidate(1, 6, 60), candidate(2, 5, 40), candidate(3, 5, 40)]
+
+        plan = LiquidationPlanner().plan(candidates, available_wei=10 * ETH)
+
+        assert sum(c.net_profit_usd for c in plan) == 80 * USD
+        assert sum(c.capital_wei for c in plan) <= 10 * ETH
+
+    def test_gas_counts_as_capital(self):
+        plan = LiquidationPlanner().plan(
+            [candidate(1, 1, 10, gas_wei=ETH // 100)],
+            available_wei=ETH
+        )
+        assert plan == []
+
+    def test_gas_budget(self):
+        candidates = [candidate(i, 0.1, 10 * i, gas_wei=ETH // 100) for i in range(1, 4)]
+
+        plan = LiquidationPlanner().plan(candidates, available_wei=10 * ETH, gas_budget_wei=ETH // 50)
+
+        assert [c.net_profit_usd for c in plan] == [30 * USD, 20 * USD]
+
+    def test_each_candidate_fits_in_one_lane(self):
+        # 2 ETH in total, but liquidate() is paid from a single wallet
+        plan = LiquidationPlanner().plan_lanes([candidate(1, 1.5, 50), candidate(2, 1, 10)], [ETH, ETH])
+
+        assert [c.net_profit_usd for c in plan] == [10 * USD]
+
+    def test_lanes_filled_largest_first_from_the_leftovers(self):
+        candidates = [candidate(1, 3, 30), candidate(2, 2, 25), candidate(3, 1, 5)]
+
+        plan = LiquidationPlanner().plan_lanes(candidates, [2 * ETH, 4 * ETH])
+
+        assert {(c.net_profit_usd // USD, c.lane) for c in plan} == {(30, 1), (5, 1), (25, 0)}
+
+
+class TestWalletLedger:
+
+    def test_balance_read_once_then_tracked_locally(self):
+        fetch = Mock(return_value=5 * ETH)
+        ledger = WalletLedger(fetch, reserve_wei=wei_from_eth(0.5), max_age_seconds=3600)
+
+        assert ledger.available_wei() == wei_from_eth(4.5)
+        ledger.debit(2 * ETH)
+        assert ledger.available_wei() == wei_from_eth(2.5)
+        assert ledger.can_afford(2 * ETH)
+        assert not ledger.can_afford(3 * ETH)
+        fetch.assert_called_once()
+
+    def test_invalidate_forces_refresh(self):
+        fetch = Mock(side_effect=[5 * ETH, 4 * ETH])
+        ledger = WalletLedger(fetch, max_age_seconds=3600)
+
+        ledger.debit(2 * ETH)
+        ledger.invalidate()
+
+        assert ledger.balance_wei() == 4 * ETH
+        assert fetch.call_count == 2
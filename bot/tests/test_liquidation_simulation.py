@@ -0,0 +1,124 @@
+# bot/tests/test_liquidation_simulation.py - eth_call dry run of liquidate() before broadcast
+
+import json
+import threading
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from web3.exceptions import ContractCustomError, ContractLogicError
+
+from clients.web3_client import Web3Client, LiquidationSimulation, error_selectors
+from models.position import Position
+from models.position_snapshot import PositionSnapshot
+from services.liquidator import Liquidator
+from services.profit_calculator import ProfitCalculator
+from models.address import Address
+
+ABI_DIR = Path(__file__).parent.parent / "abis"
+ETH = 10**18
+USD = 10**8
+USER = Address("0x" + "1" * 40)
+
+
+def make_client(call):
+    """Web3Client wired to a fake liquidate().call without an RPC connection"""
+    client = Web3Client.__new__(Web3Client)
+    client.error_selectors = error_selectors(json.load(open(ABI_DIR / "LendingPool.json"))["abi"])
+    client._revert_cache = {}
+    client._revert_cache_lock = threading.Lock()
+    client.account = SimpleNamespace(address="0x" + "a" * 40)
+    client.lending_pool = Mock()
+    client.lending_pool.functions.liquidate.return_value.call.side_effect = call
+    return client
+
+
+class TestSimulateLiquidation:
+
+    def test_custom_error_is_decoded_and_cached_per_block(self):
+        call = Mock(side_effect=ContractCustomError("0x6593fd52", data="0x6593fd52"))
+        client = make_client(call)
+
+        first = client.simulate_liquidation(USER, ETH, block_number=10)
+        again = client.simulate_liquidation(USER, ETH, block_number=10)
+
+        assert first.reverted and first.reason == "HealthyPosition"
+        assert again is first
+        assert call.call_count == 1
+
+        # New block: state may have changed, simulate again
+        client.simulate_liquidation(USER, ETH, block_number=11)
+        assert call.call_count == 2
+        assert list(client._revert_cache) == [(bytes.fromhex("1" * 40), 11)]
+
+    def test_revert_string_and_success(self):
+        client = make_client(Mock(side_effect=ContractLogicError("execution reverted: Paused")))
+        assert client.simulate_liquidation(USER, ETH, 1).reason == "Paused"
+
+        client = make_client(Mock(return_value=[]))
+        assert not client.simulate_liquidation(USER, ETH, 1).reverted
+
+    def test_rpc_failure_does_not_block_the_send(self):
+        client = make_client(Mock(side_effect=TimeoutError("rpc down")))
+        simulation = client.simulate_liquidation(USER, ETH, 1)
+
+        assert not simulation.reverted
+        assert client._revert_cache == {}
+
+
+def test_liquidator_skips_broadcast_on_simulated_revert():
+    web3_client = Mock()
+    web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+    web3_client.get_position_snapshot.return_value = PositionSnapshot(
+        USER, 5, ETH, 2_300 * USD, (("0x" + "e" * 40, ETH),), 2_000 * USD, 10 * 10**9
+    )
+    web3_client.simulate_liquidation.return_value = LiquidationSimulation(
+        USER, 5, reverted=True, reason="OracleEmergencyMode"
+    )
+    liquidator = Liquidator(web3_client, ProfitCalculator(web3_client))
+
+    assert not liquidator.attempt_liquidation(Position(USER, "0.95", 0, 0, "ACTIVE"))
+    web3_client.simulate_liquidation.assert_called_once_with(USER, ETH, 5)
+    web3_client.execute_liquidation.assert_not_called()
+    web3_client.send_signed_liquidation.assert_not_called()
+
+
+def test_send_returns_at_broadcast_and_settles_on_the_receipt_thread():
+    from concurrent.futures import ThreadPoolExecutor
+    from hexbytes import HexBytes
+    from clients.nonce_manager import NonceManager
+
+    client = make_client(Mock())
+    client.nonce_manager = NonceManager(lambda: 5)
+    client.pending_txs, client._pending_lock = {}, threading.Lock()
+    client._receipt_executor = ThreadPoolExecutor(max_workers=1)
+    client.rpc_pool = Mock()
+    client.rpc_pool.broadcast_raw_transaction.return_value = HexBytes("0x" + "ab" * 32)
+    mined = threading.Event()
+    client.w3 = Mock()
+    client.w3.eth.wait_for_transaction_receipt.side_effect = lambda tx_hash, timeout: (
+        mined.wait(5), SimpleNamespace(status=0)
+    )[1]
+    client.get_wallet_balance_wei = Mock(return_value=10 * ETH)
+    client.oracle_watcher = Mock(emergency_mode=False)
+    client.position_watcher = Mock()
+    client.position_watcher.is_closed.return_value = False
+    liquidator = Liquidator(client, Mock())
+    settled = threading.Event()
+    on_receipt = client.on_receipt
+    client.on_receipt = lambda tx_hash, status: (on_receipt(tx_hash, status), settled.set())
+
+    tx_hash = client.send_signed_liquidation(b"\x01", 5)
+    # Back on the caller's thread before any receipt: the nonce is already the next one
+    assert tx_hash == "0x" + "ab" * 32 and client.nonce_manager.peek() == 6 and tx_hash in client.pending_txs
+    liquidator._record_outcome(Position(USER, 0, 0, "0.9", "ACTIVE"), liquidator.wallets.primary, tx_hash, 10)
+    assert liquidator.metrics.successful_liquidations == 1
+
+    mined.set()
+    assert settled.wait(5)
+    assert tx_hash not in client.pending_txs
+    assert (liquidator.metrics.successful_liquidations, liquidator.metrics.failed_liquidations) == (0, 1)
+    client._receipt_executor.shutdown()
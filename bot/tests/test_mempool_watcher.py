@@ -0,0 +1,158 @@
+# bot/tests/test_mempool_watcher.py - Pending setPrice() / liquidate() decoding and reactions
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.abi_fastpath import ContractFastPath
+from clients.mempool_watcher import MempoolWatcher, SET_PRICE
+from models.position import Position
+from services.liquidator import Liquidator
+from services.profit_calculator import ProfitCalculator
+from models.address import Address
+
+ABI_DIR = Path(__file__).parent.parent / "abis"
+USD = 10**8
+ASSET = Address("0x" + "e" * 40)
+PROVIDER = "0x" + "1" * 40
+FEED = "0x" + "2" * 40
+POOL = "0x" + "3" * 40
+OURS = "0x" + "a" * 40
+RIVAL = "0x" + "b" * 40
+USER = Address("0x" + "c" * 40)
+
+LENDING_POOL = ContractFastPath.from_abi_file(POOL, ABI_DIR / "LendingPool.json")
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def make_watcher(**kwargs):
+    watcher = MempoolWatcher(
+        "ws://node", fetch_transaction=Mock(), price_sources=lambda: [(PROVIDER, ASSET, "primary"), (FEED, ASSET, "fallback")],
+        ignore_senders=[OURS], **kwargs
+    )
+    watcher.watch_liquidations(LENDING_POOL)
+    return watcher
+
+
+class FakeWebSocket:
+    """Node without the full-transaction flag: rejects it, then sends hashes"""
+
+    def __init__(self, hashes):
+        self.messages = [
+            json.dumps({"jsonrpc": "2.0", "id": 1, "error": {"code": -32602, "message": "invalid params"}}),
+            json.dumps({"jsonrpc": "2.0", "id": 2, "result": "0xsub"}),
+        ] + [json.dumps({"method": "eth_subscription", "params": {"result": h}}) for h in hashes]
+        self.sent = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def recv(self, timeout=None):
+        if self.messages:
+            return self.messages.pop(0)
+        time.sleep(timeout or 0)
+        raise TimeoutError
+
+
+class TestDecoding:
+
+    def test_pending_set_price_on_provider_and_feed(self):
+        on_price = Mock()
+        watcher = make_watcher(on_price=on_price)
+
+        watcher.handle_transaction({"hash": "0x01", "from": RIVAL, "to": PROVIDER, "input": SET_PRICE.encode_input([1900 * USD])})
+        watcher.handle_transaction({"hash": "0x02", "from": RIVAL, "to": FEED, "input": SET_PRICE.encode_input([-1])})
+        # Same selector on an unrelated contract
+        watcher.handle_transaction({"hash": "0x03", "from": RIVAL, "to": "0x" + "4" * 40, "input": SET_PRICE.encode_input([1])})
+
+        assert [c.args for c in on_price.call_args_list] == [(ASSET, "primary", 1900 * USD), (ASSET, "fallback", -1)]
+        assert watcher.stats()["price_updates"] == 2
+
+    def test_competitor_liquidation_only(self):
+        on_liquidation = Mock()
+        watcher = make_watcher(on_liquidation=on_liquidation)
+        calldata = LENDING_POOL.functions["liquidate"].encode_input([USER])
+
+        watcher.handle_transaction({"hash": "0x01", "from": OURS.upper().replace("0X", "0x"), "to": POOL, "input": calldata})
+        call = watcher.handle_transaction({"hash": "0x02", "from": RIVAL, "to": POOL, "input": calldata})
+
+        on_liquidation.assert_called_once_with(USER)
+        assert call.name == "liquidate" and call.args == [USER]
+
+    def test_hash_only_subscription_fetches_each_transaction_once(self):
+        on_price = Mock()
+        tx = {"hash": "0xaa", "from": RIVAL, "to": PROVIDER, "input": SET_PRICE.encode_input([2100 * USD])}
+        ws = FakeWebSocket(["0xaa", "0xaa"])
+        watcher = make_watcher(on_price=on_price, connect=lambda url: ws, reconnect_seconds=0.01)
+        watcher.fetch_transaction = Mock(return_value=tx)
+
+        watcher.start()
+        try:
+            assert wait_until(lambda: watcher.connected and on_price.called)
+        finally:
+            watcher.stop()
+
+        assert ws.sent[0]["params"] == ["newPendingTransactions", True]
+        assert ws.sent[1]["params"] == ["newPendingTransactions"]
+        watcher.fetch_transaction.assert_called_once_with("0xaa")
+        on_price.assert_called_once_with(ASSET, "primary", 2100 * USD)
+
+
+def test_contested_user_is_not_liquidated():
+    web3_client = Mock()
+    web3_client.oracle_watcher.emergency_mode = False
+    liquidator = Liquidator(web3_client, ProfitCalculator(web3_client))
+
+    liquidator.mark_contested(USER, ttl=60)
+
+    assert not liquidator.attempt_liquidation(Position(USER, "0.9", 0, 0, "ACTIVE"))
+    web3_client.get_position_snapshot.assert_not_called()
+    assert liquidator.warm_presigned([(USER, 10**18)], 10**9) == 0
+
+    liquidator.mark_contested(USER, ttl=0)
+    assert not liquidator.is_contested(USER)
+
+
+@pytest.mark.skipif(not os.getenv("ANVIL_WS_URL"), reason="needs a local anvil node (ANVIL_WS_URL, ANVIL_RPC_URL)")
+def test_sees_pending_set_price_on_anvil():
+    """anvil --no-mining: the transaction stays pending for the watcher to pick up"""
+    from web3 import Web3
+
+    w3 = Web3(Web3.HTTPProvider(os.getenv("ANVIL_RPC_URL", "http://127.0.0.1:8545")))
+    sender = w3.eth.accounts[0]
+    provider = w3.eth.accounts[1]  # Any address works: only the calldata is decoded
+    on_price = Mock()
+    watcher = MempoolWatcher(
+        os.environ["ANVIL_WS_URL"],
+        fetch_transaction=lambda tx_hash: w3.provider.make_request("eth_getTransactionByHash", [tx_hash]).get("result"),
+        on_price=on_price,
+        price_sources=lambda: [(provider, ASSET, "primary")]
+    )
+    watcher.start()
+    try:
+        assert wait_until(lambda: watcher.connected, timeout=5)
+        w3.eth.send_transaction({"from": sender, "to": provider, "data": SET_PRICE.encode_input([1234 * USD])})
+        assert wait_until(lambda: on_price.called, timeout=5)
+    finally:
+        watcher.stop()
+
+    on_price.assert_called_once_with(ASSET, "primary", 1234 * USD)
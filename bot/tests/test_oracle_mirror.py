@@ -0,0 +1,105 @@
+# bot/tests/test_oracle_mirror.py - OracleAggregator price selection replica
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config
+from models.address import Address
+from models.position_book import PositionBook
+from services.oracle_mirror import (
+    OracleMirror, calculate_deviation, select_price,
+    SOURCE_PRIMARY, SOURCE_DEVIATION, SOURCE_CRITICAL, SOURCE_PRIMARY_FAILED, ROLE_PRIMARY,
+)
+
+ETH = Config.ETH_ADDRESS
+USDC = Address("0x" + "5" * 40)
+USD = 10**8
+
+
+class TestSelectPrice:
+
+    def test_deviation_matches_contract_rounding(self):
+        assert calculate_deviation(2000 * USD, 2099_99000000) == 499  # 4.9995% truncated
+        assert calculate_deviation(2000 * USD, 0) == 10000
+
+    @pytest.mark.parametrize("fallback, source, price, emergency", [
+        (2090 * USD, SOURCE_PRIMARY, 2000 * USD, False),  # 4.5%
+        (2100 * USD, SOURCE_PRIMARY, 2000 * USD, False),  # exactly 5%: not > MAX_DEVIATION
+        (2101 * USD, SOURCE_DEVIATION, 2101 * USD, False),
+        (2200 * USD, SOURCE_CRITICAL, 2200 * USD, True),  # exactly 10%: >= CRITICAL_DEVIATION
+    ])
+    def test_deviation_branches(self, fallback, source, price, emergency):
+        prediction = select_price(ETH, 2000 * USD, fallback)
+        assert (prediction.source, prediction.price, prediction.triggers_emergency) == (source, price, emergency)
+
+    def test_failures_and_disabled_checks(self):
+        assert select_price(ETH, 2000 * USD, 3000 * USD, deviation_checks_enabled=False).price == 2000 * USD
+        assert select_price(ETH, -1, 1990 * USD).source == SOURCE_PRIMARY_FAILED
+        assert select_price(ETH, None, None).reverts
+
+
+class FakeCaller:
+    """Answers call_many from {(address, function): result}"""
+
+    def __init__(self, answers):
+        self.answers = answers
+
+    def call_many(self, calls, block_identifier="latest", return_exceptions=False):
+        results = []
+        for contract, name, args in calls:
+            key = (contract.address, name, tuple(args))
+            result = self.answers.get(key, self.answers.get((contract.address, name)))
+            results.append(result if result is not None else ValueError("execution reverted"))
+        return results
+
+
+class TestOracleMirror:
+
+    def test_predict_batches_providers_and_projects_health(self, monkeypatch):
+        monkeypatch.setattr(Config, "PRICE_REGISTRY_ADDRESS", "0x" + "a" * 40)
+        registry, aggregator = "0x" + "a" * 40, "0x" + "b" * 40
+        eth_primary, eth_fallback, usdc_primary = "0x" + "1" * 40, "0x" + "2" * 40, "0x" + "3" * 40
+
+        web3_client = SimpleNamespace(fast_oracle_aggregator=SimpleNamespace(address=aggregator))
+        mirror = OracleMirror(web3_client, assets=[ETH, USDC])
+        web3_client.fast_oracle_aggregator = mirror.registry.at(aggregator)
+        web3_client.fast_caller = FakeCaller({
+            (registry, "getPrimaryProvider", (ETH,)): eth_primary,
+            (registry, "getFallbackProvider", (ETH,)): eth_fallback,
+            (registry, "getPrimaryProvider", (USDC,)): usdc_primary,
+            (registry, "getFallbackProvider", (USDC,)): "0x" + "0" * 40,
+            (aggregator, "emergencyMode"): False,
+            (aggregator, "deviationChecksEnabled"): True,
+            (eth_primary, "getPrice"): 2000 * USD,
+            (eth_fallback, "getPrice"): 1880 * USD,  # 6%: fallback wins
+            (usdc_primary, "getPrice"): USD,
+        })
+
+        predictions = mirror.predict(block_identifier=7)
+
+        assert predictions[ETH].source == SOURCE_DEVIATION and predictions[ETH].price == 1880 * USD
+        assert predictions[USDC].source == SOURCE_PRIMARY and predictions[USDC].block_number == 7
+        assert mirror.emergency_mode is False
+
+        monkeypatch.setitem(Config.COLLATERAL_CONFIGS, USDC, {"symbol": "USDC", "decimals": 6})
+        book = PositionBook()
+        row = book.upsert("0x" + "9" * 40, borrowed_wei=10**18)
+        book.set_collateral(row, ETH, 10**18)
+        book.set_collateral(row, USDC, 400 * 10**6)
+        # (1880 + 400) * 0.83 / 1880 = 1.0065 -> 100
+        assert mirror.project_health_factors(book, mirror.predicted_prices()) == {row: 100}
+
+        # A pending primary setPrice(1900) brings ETH back within 5% of the fallback
+        mirror.apply_pending(ETH, ROLE_PRIMARY, 1900 * USD)
+        assert mirror.predict(block_identifier=8)[ETH].price == 1900 * USD
+        assert mirror.stats()["pending_prices"] == 1
+
+        # Landed: the on-chain price matches and the override is dropped
+        web3_client.fast_caller.answers[(eth_primary, "getPrice")] = 1900 * USD
+        mirror.predict(block_identifier=9)
+        assert mirror.stats()["pending_prices"] == 0
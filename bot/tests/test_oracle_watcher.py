@@ -0,0 +1,181 @@
+# bot/tests/test_oracle_watcher.py - OracleAggregator event feed and targeted re-evaluation
+
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+from eth_abi import encode
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.abi_fastpath import ContractFastPath
+from clients.oracle_watcher import OracleEventWatcher
+from config import Config
+from models.position_snapshot import PositionSnapshot
+from services.position_monitor import PositionMonitor
+from models.address import Address
+
+ORACLE = "0x" + "a" * 40
+USDC = Address("0x" + "5" * 40)
+USER_ETH_ONLY = Address("0x" + "1" * 40)
+USER_USDC = Address("0x" + "2" * 40)
+ETH = 10**18
+USD = 10**8
+
+oracle = ContractFastPath.from_abi_file(ORACLE, str(Path(__file__).parent.parent / "abis" / "OracleAggregator.json"))
+
+
+def topic_address(address):
+    return "0x" + "0" * 24 + address[2:]
+
+
+def make_log(name, block, index, topics=(), types=(), values=()):
+    return {
+        "address": ORACLE,
+        "topics": oracle.event_topics(name) + list(topics),
+        "data": "0x" + encode(list(types), list(values)).hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "transactionHash": "0x" + "f" * 64,
+    }
+
+
+class LogProvider:
+    def __init__(self):
+        self.logs = []
+        self.requests = []
+
+    def make_request(self, method, params):
+        self.requests.append(params[0])
+        return {"jsonrpc": "2.0", "id": 1, "result": self.logs}
+
+
+class TestOracleEventWatcher:
+
+    def test_events_update_state_and_report_changed_assets(self):
+        provider = LogProvider()
+        changed = []
+        watcher = OracleEventWatcher(provider, oracle, on_assets_changed=changed.append)
+
+        assert watcher.on_head(100) == set()  # Starting point only
+        assert watcher.is_live and provider.requests == []
+
+        provider.logs = [
+            # Out of order on purpose: applied in (block, logIndex) order
+            make_log("EmergencyModeSet", 101, 3, types=("bool", "string"), values=(True, "Critical price deviation detected")),
+            make_log("PriceUpdated", 101, 1, [topic_address(USDC)], ("int256", "string", "uint256"), (99_000_000, "Mock USDC", 1_700_000_000)),
+            make_log("DeviationWarning", 101, 0, [topic_address(USDC)], ("int256", "int256", "uint256"), (USD, 99_000_000, 600)),
+        ]
+        assert watcher.on_head(101) == {USDC}
+
+        request = provider.requests[0]
+        assert (request["fromBlock"], request["toBlock"]) == ("0x65", "0x65")
+        assert watcher.price_of(USDC).price == 99_000_000
+        assert watcher.price_of(USDC.upper().replace("0X", "0x")).block_number == 101
+        assert watcher.deviations[USDC] == 600
+        assert watcher.emergency_mode is True
+        assert changed == [{USDC}]
+
+        # Same head again: nothing re-fetched
+        watcher.on_head(101)
+        assert len(provider.requests) == 1
+
+    def test_emergency_mode_seeded_on_chain_at_start_and_after_a_gap(self):
+        provider = LogProvider()
+        read = Mock(return_value=True)  # Already in emergency before the bot started
+        watcher = OracleEventWatcher(provider, oracle, read_emergency_mode=read)
+
+        watcher.on_head(100)
+        assert watcher.emergency_mode is True
+        watcher.on_head(101)
+        assert read.call_count == 1  # Events keep it current from here
+
+        provider.make_request = Mock(side_effect=ConnectionError("down"))
+        try:
+            watcher.on_head(102)
+        except ConnectionError:
+            pass
+        provider.make_request = LogProvider().make_request
+        read.return_value = False
+        watcher.on_head(103)
+        assert read.call_count == 2 and watcher.emergency_mode is False
+
+    def test_fresh_price_only_while_live_and_within_cache_window(self):
+        provider = LogProvider()
+        watcher = OracleEventWatcher(provider, oracle)
+        watcher.on_head(100)
+        provider.logs = [
+            make_log("PriceUpdated", 101, 0, [topic_address(USDC)], ("int256", "string", "uint256"), (USD, "Mock USDC", int(time.time()))),
+            make_log("PriceUpdated", 101, 1, [topic_address(Config.ETH_ADDRESS)], ("int256", "string", "uint256"), (2_000 * USD, "Chainlink", 1_700_000_000)),
+        ]
+        watcher.on_head(101)
+
+        assert watcher.fresh_price(USDC) == USD
+        assert watcher.fresh_price(Config.ETH_ADDRESS) is None  # Older than the aggregator's cache window
+
+
+class TestTargetedReevaluation:
+
+    def test_only_exposed_users_are_reread(self):
+        web3_client = Mock()
+        liquidator = Mock()
+        monitor = PositionMonitor(Mock(), web3_client, liquidator)
+
+        for user in (USER_ETH_ONLY, USER_USDC):
+            row = monitor.book.upsert(user, health_factor=120, borrowed_wei=ETH)
+            monitor.book.set_collateral(row, Config.ETH_ADDRESS, ETH)
+        monitor.book.set_collateral(monitor.book.row_of(USER_USDC), USDC, 1_000 * 10**6)
+
+        web3_client.get_position_snapshot.return_value = None
+        monitor.reevaluate_exposed({USDC})
+        assert [c.args[0] for c in web3_client.get_position_snapshot.call_args_list] == [USER_USDC]
+
+        # ETH moves every borrower (debt is ETH); an underwater one is liquidated
+        web3_client.get_position_snapshot.reset_mock()
+        web3_client.get_position_snapshot.side_effect = lambda user: PositionSnapshot(
+            user, 7, ETH, 2_000 * USD if user == USER_USDC else 3_000 * USD, (), 2_000 * USD, 10**9
+        )
+        monitor._plan_liquidations = lambda positions: positions
+        liquidator.attempt_liquidation.return_value = True
+
+        assert monitor.reevaluate_exposed({Config.ETH_ADDRESS}) == 1
+        assert web3_client.get_position_snapshot.call_count == 2
+        liquidated = liquidator.attempt_liquidation.call_args.args[0]
+        assert liquidated.user_address == USER_USDC
+        assert monitor.book.health_factor[monitor.book.row_of(USER_USDC)] == 83
+
+    def test_liquidation_in_flight_does_not_block_reevaluation(self):
+        web3_client = Mock()
+        liquidator = Mock()
+        monitor = PositionMonitor(Mock(), web3_client, liquidator)
+        monitor._plan_liquidations = lambda positions: positions
+        for user in (USER_ETH_ONLY, USER_USDC):
+            monitor.book.upsert(user, health_factor=120, borrowed_wei=ETH)
+        monitor.book.set_collateral(monitor.book.row_of(USER_USDC), USDC, 1_000 * 10**6)
+        web3_client.get_position_snapshot.side_effect = lambda user: PositionSnapshot(
+            user, 7, ETH, 2_000 * USD, (), 2_000 * USD, 10**9
+        )
+
+        sending, receipt = threading.Event(), threading.Event()
+
+        def attempt_liquidation(position):
+            if position.user_address == USER_ETH_ONLY:
+                sending.set()
+                receipt.wait(5)
+            return True
+
+        liquidator.attempt_liquidation.side_effect = attempt_liquidation
+        cycle = threading.Thread(target=monitor._reevaluate_users, args=([USER_ETH_ONLY], "Cycle"))
+        cycle.start()
+        assert sending.wait(5)
+
+        # The first liquidation still waits for its receipt; a price event gets through anyway
+        result = []
+        event = threading.Thread(target=lambda: result.append(monitor.reevaluate_exposed({USDC})))
+        event.start()
+        event.join(2)
+        receipt.set()
+        cycle.join(5)
+        assert result == [1]
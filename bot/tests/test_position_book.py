@@ -0,0 +1,133 @@
+# bot/tests/test_position_book.py - Compact Position / PositionBook tests
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.address import Address
+from models.position import Position
+from models.position_book import (
+    PositionBook, PositionView, HF_INFINITE, parse_health_factor
+)
+
+USER_A = Address("0x" + "a" * 40)
+USER_B = Address("0x" + "b" * 40)
+USER_C = Address("0x" + "c" * 40)
+ETH = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+
+
+def graph_entity(user, hf="1.5", collateral="200000000000", borrowed="100000000000000000"):
+    return {
+        "user": {"id": user},
+        "totalCollateralUSD": collateral,
+        "borrowed": borrowed,
+        "healthFactor": hf,
+        "status": "ACTIVE"
+    }
+
+
+class TestPosition:
+
+    def test_slots_no_instance_dict(self):
+        position = Position(USER_A, 1, 2, Decimal("1.5"), "ACTIVE")
+        assert not hasattr(position, "__dict__")
+        with pytest.raises(AttributeError):
+            position.unknown_field = 1
+
+    def test_health_factor_parsed_lazily(self):
+        position = Position.from_graph_response(graph_entity(USER_A, hf="0.95"))
+        assert position._health_factor == "0.95"
+        assert position.health_factor == Decimal("0.95")
+        assert position.is_liquidatable()
+
+    def test_equality_matches_dataclass_semantics(self):
+        a = Position(USER_A, 1, 2, Decimal("1.5"), "ACTIVE")
+        b = Position(USER_A, 1, 2, "1.5", "ACTIVE")
+        assert a == b
+        b.is_profitable = True
+        assert a != b
+
+
+class TestPositionBook:
+
+    def test_parse_health_factor(self):
+        assert parse_health_factor("1.2345") == 123
+        assert parse_health_factor("0.9") == 90
+        assert parse_health_factor("2") == 200
+        assert parse_health_factor("1" + "0" * 80) == HF_INFINITE
+
+    def test_ingest_and_lookup(self):
+        book = PositionBook.from_graph_response([
+            graph_entity(USER_A, hf="0.80"),
+            graph_entity(USER_B.upper().replace("0X", "0x"), hf="1.50"),
+        ])
+
+        assert len(book) == 2
+        assert USER_B in book
+        assert book.row_of(USER_A) == 0
+        assert book.liquidatable_rows() == [0]
+
+        view = book.view(0)
+        assert view.user_address == USER_A
+        assert view.health_factor == Decimal("0.8")
+        assert view.is_liquidatable()
+
+    def test_uint256_values_overflow_without_promoting_the_column(self):
+        book = PositionBook()
+        huge_wei = 50 * 10**18  # Does not fit in int64
+        book.upsert(USER_A, borrowed_wei=10**18)
+        assert book.borrowed_wei.is_compact
+        assert isinstance(book.column("borrowed_wei"), memoryview)
+
+        book.upsert(USER_B, borrowed_wei=huge_wei)
+        book.upsert(USER_C, borrowed_wei=2 * 10**18)
+        assert not book.borrowed_wei.is_compact
+        assert isinstance(book.column("borrowed_wei"), memoryview)  # Still the int64 buffer
+        assert list(book.column("borrowed_wei")) == [10**18, 2**63 - 1, 2 * 10**18]
+        assert book.view(1).borrowed_wei == huge_wei
+        assert list(book.borrowed_wei) == [10**18, huge_wei, 2 * 10**18]
+
+        # Rows move with their exact value; the overflow goes with the row
+        book.remove(USER_A)
+        assert book.borrowed_wei[book.row_of(USER_B)] == huge_wei
+        book.remove(USER_B)
+        assert book.borrowed_wei.is_compact and list(book.borrowed_wei) == [2 * 10**18]
+
+    def test_remove_keeps_rows_dense(self):
+        book = PositionBook()
+        for user in (USER_A, USER_B, USER_C):
+            row = book.upsert(user, health_factor=90, borrowed_wei=1)
+            book.set_collateral(row, ETH, row + 1)
+
+        assert book.remove(USER_A)
+        assert len(book) == 2
+        assert book.row_of(USER_C) == 0
+        assert book.collateral_column(ETH)[0] == 3
+        assert not book.remove(USER_A)
+
+    def test_graph_row_round_trips_to_position(self):
+        entity = graph_entity(USER_A, hf="0.95", borrowed="12000000000000000000")
+        position = PositionBook.from_graph_response([entity]).view(0).to_position()
+        expected = Position.from_graph_response(entity)
+        assert position.borrowed == expected.borrowed == 12 * 10**18  # Subgraph Wei, not an unset USD 0
+        assert (position.collateral_amount, position.health_factor, position.status) == (
+            expected.collateral_amount, expected.health_factor, expected.status
+        )
+
+    def test_view_compatibility_shim(self):
+        book = PositionBook()
+        book.upsert(USER_A, health_factor=95, collateral_usd=1000, borrowed_usd=900, borrowed_wei=1)
+
+        view = next(iter(book))
+        assert isinstance(view, PositionView)
+
+        position = view.to_position()
+        assert isinstance(position, Position)
+        assert position.user_address == USER_A
+        assert position.health_factor == Decimal("0.95")
+        assert position.borrowed == 900
+        assert book.to_positions()[0] == position
@@ -0,0 +1,81 @@
+# bot/tests/test_position_snapshot.py - Pinned-block snapshot used by Liquidator
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config
+from models.position import Position
+from models.position_snapshot import PositionSnapshot, calculate_health_factor, HF_MAX
+from clients.web3_client import LiquidationSimulation
+from services.liquidator import Liquidator
+from services.profit_calculator import ProfitCalculator
+from models.address import Address
+
+ETH = 10**18
+USD = 10**8
+USER = Address("0x" + "1" * 40)
+
+
+def snapshot(borrowed_wei=ETH, collateral_usd=2_300 * USD, eth_price=2_000 * USD):
+    return PositionSnapshot(
+        user_address=USER,
+        block_number=123,
+        borrowed_wei=borrowed_wei,
+        collateral_usd=collateral_usd,
+        collaterals=((Config.ETH_ADDRESS, ETH),),
+        eth_price=eth_price,
+        gas_price_wei=10 * 10**9
+    )
+
+
+class TestPositionSnapshot:
+
+    def test_health_factor_matches_contract_math(self):
+        # (2300 * 83 / 100) * 100 / 2000 = 95
+        assert snapshot().health_factor == 95
+        assert snapshot().is_liquidatable()
+        assert calculate_health_factor(1_000 * USD, 0) == HF_MAX
+
+    def test_healthy_and_debt_free_are_not_liquidatable(self):
+        assert not snapshot(collateral_usd=3_000 * USD).is_liquidatable()
+        assert not snapshot(borrowed_wei=0).is_liquidatable()
+
+
+class TestLiquidatorUsesSnapshot:
+
+    def make_liquidator(self, snap):
+        web3_client = Mock()
+        web3_client.get_position_snapshot.return_value = snap
+        web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+        web3_client.execute_liquidation.return_value = "0xabc"
+        web3_client.simulate_liquidation.return_value = LiquidationSimulation(USER, 123, reverted=False)
+        return Liquidator(web3_client, ProfitCalculator(web3_client)), web3_client
+
+    def test_single_read_between_detection_and_broadcast(self):
+        snap = snapshot()
+        liquidator, web3_client = self.make_liquidator(snap)
+
+        assert liquidator.attempt_liquidation(Position(USER, "0.83", 0, 0, "ACTIVE"))
+
+        web3_client.get_position_snapshot.assert_called_once_with(USER)
+        web3_client.execute_liquidation.assert_called_once_with(USER, ETH, snap.gas_price_wei)
+        for method in (
+            "get_health_factor", "get_user_collaterals", "get_collateral_value_usd",
+            "get_position_onchain", "get_asset_price", "estimate_gas_price",
+        ):
+            getattr(web3_client, method).assert_not_called()
+
+    def test_healthy_snapshot_aborts_before_profit(self):
+        liquidator, web3_client = self.make_liquidator(snapshot(collateral_usd=3_000 * USD))
+
+        assert not liquidator.attempt_liquidation(Position(USER, "0.83", 0, 0, "ACTIVE"))
+        web3_client.execute_liquidation.assert_not_called()
+
+    def test_failed_snapshot_aborts(self):
+        liquidator, web3_client = self.make_liquidator(None)
+
+        assert not liquidator.attempt_liquidation(Position(USER, "0.83", 0, 0, "ACTIVE"))
+        assert liquidator.get_metrics()["failed"] == 1
@@ -0,0 +1,85 @@
+# bot/tests/test_position_store.py - SQLite snapshot round trip for warm restarts
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.position_book import PositionBook
+from services.position_store import PositionStore
+
+ALICE = "0x" + "1" * 40
+BOB = "0x" + "2" * 40
+WETH = "0x" + "e" * 40
+ETH = 10**18
+USD = 10**8
+
+
+def test_book_and_state_survive_a_restart(tmp_path):
+    path = str(tmp_path / "state" / "bot.db")
+    book = PositionBook()
+    row = book.upsert(ALICE, health_factor=95, collateral_usd=2_000 * USD, borrowed_usd=1_900 * USD,
+                      borrowed_wei=2**255, status="ACTIVE", block=100)
+    book.set_collateral(row, WETH, 3 * ETH)
+    book.upsert(BOB, health_factor=150, borrowed_wei=ETH, block=101)
+
+    store = PositionStore(path)
+    state = {"nonce": 7, "pending_txs": {"0xab": {"nonce": 6, "raw": "f86b", "sent_at": 1.5}}}
+    store.save(book, 120, state)
+    store.close()
+
+    reopened = PositionStore(path)
+    restored = PositionBook()
+    assert reopened.load_book(restored) == 2
+    assert reopened.checkpoint_block == 120
+    assert reopened.load_state() == state
+
+    row = restored.row_of(ALICE)
+    assert restored.borrowed_wei[row] == 2**255
+    assert (restored.health_factor[row], restored.block[row]) == (95, 100)
+    assert restored.collateral_column(WETH)[row] == 3 * ETH
+    assert restored.liquidatable_rows() == [row]
+
+
+def test_save_replaces_previous_snapshot(tmp_path):
+    store = PositionStore(str(tmp_path / "bot.db"))
+    book = PositionBook()
+    book.upsert(ALICE, health_factor=95, borrowed_wei=ETH)
+    store.save(book, 10, {})
+
+    book.remove(ALICE)
+    store.save(book, None, {"nonce": 1})
+
+    restored = PositionBook()
+    assert store.load_book(restored) == 0
+    assert store.checkpoint_block == 10
+    assert store.stats()["saves"] == 2
+
+
+def test_save_writes_only_changed_rows(tmp_path):
+    store = PositionStore(str(tmp_path / "bot.db"))
+    book = PositionBook()
+    alice = book.upsert(ALICE, health_factor=95, borrowed_wei=ETH, block=1)
+    book.set_collateral(alice, WETH, ETH)
+    book.upsert(BOB, health_factor=150, borrowed_wei=ETH, block=1)
+    store.save(book, 1, {})
+    assert store.stats()["last_save_rows"] == 2
+
+    # Same values re-read next cycle: nothing to write
+    book.upsert(ALICE, health_factor=95, borrowed_wei=ETH, block=1)
+    store.save(book, 2, {})
+    assert store.stats()["last_save_rows"] == 0
+
+    book.upsert(BOB, health_factor=120, block=2)
+    book.set_collateral(alice, WETH, 2 * ETH)
+    store.save(book, 3, {})
+    assert store.stats()["last_save_rows"] == 2
+
+    book.remove(ALICE)
+    store.save(book, 4, {})
+
+    restored = PositionBook()
+    assert store.load_book(restored) == 1
+    assert restored.health_factor[restored.row_of(BOB)] == 120
+    assert ALICE not in restored
+    assert store.stats()["last_save_rows"] == 0
@@ -0,0 +1,157 @@
+# bot/tests/test_position_watcher.py - LendingPool Liquidated / Repaid feed and stale candidate removal
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+from eth_abi import encode
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.abi_fastpath import ContractFastPath
+from clients.position_watcher import PositionEventWatcher
+from clients.web3_client import LiquidationSimulation
+from models.position import Position
+from models.position_snapshot import PositionSnapshot
+from services.liquidator import Liquidator
+from services.position_monitor import PositionMonitor
+from services.profit_calculator import ProfitCalculator
+from models.address import Address
+
+POOL = "0x" + "3" * 40
+OURS = "0x" + "a" * 40
+RIVAL = "0x" + "b" * 40
+POOL_WALLET = "0x" + "c" * 40
+LIQUIDATED = Address("0x" + "1" * 40)
+REPAID = Address("0x" + "2" * 40)
+PARTIAL = Address("0x" + "4" * 40)
+ETH = 10**18
+USD = 10**8
+
+pool = ContractFastPath.from_abi_file(POOL, str(Path(__file__).parent.parent / "abis" / "LendingPool.json"))
+
+
+def topic_address(address):
+    return "0x" + "0" * 24 + address[2:]
+
+
+def make_log(name, block, index, topics, types, values):
+    return {
+        "address": POOL,
+        "topics": pool.event_topics(name) + [topic_address(t) for t in topics],
+        "data": "0x" + encode(list(types), list(values)).hex(),
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "transactionHash": "0x" + "f" * 64,
+    }
+
+
+class LogProvider:
+    def __init__(self):
+        self.logs = []
+
+    def make_request(self, method, params):
+        return {"jsonrpc": "2.0", "id": 1, "result": self.logs}
+
+
+def test_closed_positions_leave_book_and_presigned_cache():
+    provider = LogProvider()
+    monitor = PositionMonitor(Mock(), Mock(), Mock())
+    watcher = PositionEventWatcher(
+        provider, pool,
+        on_position_closed=monitor.drop_closed_position,
+        on_debt_changed=monitor.apply_repayment,
+        our_addresses=[OURS, POOL_WALLET]
+    )
+    for user in (LIQUIDATED, REPAID, PARTIAL):
+        monitor.book.upsert(user, health_factor=90, borrowed_usd=2_000 * USD, borrowed_wei=ETH)
+
+    watcher.on_head(100)
+    provider.logs = [
+        # Liquidated(msg.sender, user, ...): the liquidator sits in the "user" topic
+        make_log("Liquidated", 101, 0, [RIVAL, LIQUIDATED], ("uint256", "uint256"), (ETH, 2_200 * USD)),
+        make_log("Repaid", 101, 1, [REPAID], ("uint256", "uint256"), (ETH, 0)),
+        make_log("Repaid", 101, 2, [PARTIAL], ("uint256", "uint256"), (ETH // 4, 3 * ETH // 4)),
+    ]
+    assert watcher.on_head(101) == 3
+
+    assert LIQUIDATED not in monitor.book and REPAID not in monitor.book
+    discarded = [c.args[0] for c in monitor.liquidator.presigned.discard.call_args_list]
+    assert discarded == [LIQUIDATED, REPAID, PARTIAL]  # PARTIAL: HF 90 -> 120, out of range
+
+    row = monitor.book.row_of(PARTIAL)
+    assert (monitor.book.health_factor[row], monitor.book.borrowed_wei[row]) == (120, 3 * ETH // 4)
+    assert watcher.is_closed(LIQUIDATED) and watcher.stats()["liquidations_by_others"] == 1
+
+    # Borrowing again reopens the position
+    provider.logs = [make_log("Borrowed", 102, 0, [REPAID], ("uint256", "uint256"), (ETH, 150))]
+    watcher.on_head(102)
+    assert not watcher.is_closed(REPAID)
+
+
+def test_liquidations_from_any_pool_wallet_are_ours():
+    provider = LogProvider()
+    watcher = PositionEventWatcher(provider, pool, our_addresses=[OURS, POOL_WALLET])
+    watcher.on_head(100)
+    provider.logs = [
+        make_log("Liquidated", 101, 0, [OURS, LIQUIDATED], ("uint256", "uint256"), (ETH, 2_200 * USD)),
+        make_log("Liquidated", 101, 1, [POOL_WALLET, REPAID], ("uint256", "uint256"), (ETH, 2_200 * USD)),
+    ]
+    watcher.on_head(101)
+    assert (watcher.liquidations_seen, watcher.liquidations_by_others) == (2, 0)
+
+
+
+def test_catch_up_after_checkpoint_is_paged_not_dropped():
+    class RangeProvider:
+        def __init__(self, logs):
+            self.logs, self.ranges = logs, []
+
+        def make_request(self, method, params):
+            low, high = int(params[0]["fromBlock"], 16), int(params[0]["toBlock"], 16)
+            self.ranges.append((low, high))
+            return {"result": [log for log in self.logs if low <= int(log["blockNumber"], 16) <= high]}
+
+    provider = RangeProvider([
+        make_log("Repaid", 1_500, 0, [REPAID], ("uint256", "uint256"), (ETH, 0)),
+        make_log("Liquidated", 5_500, 0, [RIVAL, LIQUIDATED], ("uint256", "uint256"), (ETH, 2_200 * USD)),
+    ])
+    watcher = PositionEventWatcher(provider, pool)
+    watcher.log_watcher.resume_from(1_000)
+
+    assert watcher.on_head(6_000) == 2
+    assert provider.ranges == [(1_001, 3_000), (3_001, 5_000), (5_001, 6_000)]
+    assert watcher.is_closed(REPAID) and watcher.is_closed(LIQUIDATED)
+
+class TestWastedAttempts:
+
+    def make_liquidator(self, snapshot):
+        web3_client = Mock()
+        web3_client.oracle_watcher.emergency_mode = False
+        web3_client.position_watcher.is_closed.return_value = False
+        web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+        web3_client.get_position_snapshot.return_value = snapshot
+        return Liquidator(web3_client, ProfitCalculator(web3_client)), web3_client
+
+    def test_closed_position_is_refused_without_rpc(self):
+        liquidator, web3_client = self.make_liquidator(None)
+        web3_client.position_watcher.is_closed.return_value = True
+
+        assert not liquidator.attempt_liquidation(Position(LIQUIDATED, "0.9", 0, 0, "ACTIVE"))
+        web3_client.get_position_snapshot.assert_not_called()
+        assert liquidator.get_metrics()["avoided_attempts"] == 1
+
+    def test_attempt_on_already_cleared_debt_counts_as_wasted(self):
+        snapshot = PositionSnapshot(LIQUIDATED, 5, 0, 0, (), 2_000 * USD, 10**9)
+        liquidator, _ = self.make_liquidator(snapshot)
+        assert not liquidator.attempt_liquidation(Position(LIQUIDATED, "0.9", 0, 0, "ACTIVE"))
+
+        snapshot = PositionSnapshot(LIQUIDATED, 5, ETH, 1_000 * USD, (), 2_000 * USD, 10**9)
+        liquidator.web3_client.get_position_snapshot.return_value = snapshot
+        liquidator.web3_client.simulate_liquidation.return_value = LiquidationSimulation(
+            LIQUIDATED, 5, reverted=True, reason="Paused"
+        )
+        assert not liquidator.attempt_liquidation(Position(LIQUIDATED, "0.5", 0, 0, "ACTIVE"))
+
+        metrics = liquidator.get_metrics()
+        assert (metrics["wasted_attempts"], metrics["wasted_attempt_rate"]) == (1, 0.5)
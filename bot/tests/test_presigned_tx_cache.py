@@ -0,0 +1,169 @@
+# bot/tests/test_presigned_tx_cache.py - Warm liquidation transaction cache tests
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.nonce_manager import NonceManager
+from clients.web3_client import LiquidationSimulation
+from clients.presigned_tx_cache import FeeTiers, PresignedTxCache
+from models.position import Position
+from models.position_snapshot import PositionSnapshot
+from services.liquidator import Liquidator
+from services.profit_calculator import ProfitCalculator
+
+ETH = 10**18
+USD = 10**8
+GWEI = 10**9
+USER = "0x" + "1" * 40
+OTHER = "0x" + "2" * 40
+
+
+def mock_web3_client(nonce=7):
+    web3_client = Mock()
+    web3_client.nonce_manager = NonceManager(lambda: nonce)
+    web3_client.sign_liquidation_tx.side_effect = lambda user, debt, gas, n: SimpleNamespace(
+        raw_transaction=f"{user}:{debt}:{gas}:{n}".encode()
+    )
+    return web3_client
+
+
+class TestFeeTiers:
+
+    def test_tier_price_covers_gas_price(self):
+        tiers = FeeTiers(GWEI, 1.125)
+        for gas_price in (1, GWEI, GWEI + 1, 7 * GWEI, 123 * GWEI):
+            tier = tiers.tier_of(gas_price)
+            assert tiers.price_of(tier) >= gas_price
+            assert tier == 0 or tiers.price_of(tier - 1) < gas_price
+
+    def test_small_moves_stay_in_tier(self):
+        tiers = FeeTiers(GWEI, 1.125)
+        assert tiers.tier_of(int(10.0 * GWEI)) == tiers.tier_of(int(10.5 * GWEI))
+
+
+class TestPresignedTxCache:
+
+    def test_warm_signs_once_until_something_changes(self):
+        web3_client = mock_web3_client()
+        cache = PresignedTxCache(web3_client, FeeTiers(GWEI, 1.125))
+
+        first = cache.warm(USER, ETH, 10 * GWEI)
+        assert cache.warm(USER, ETH, 10 * GWEI) is first
+        assert web3_client.sign_liquidation_tx.call_count == 1
+        assert first.nonce == 7 and first.gas_price_wei >= 10 * GWEI
+
+        # Debt change and fee tier change both re-sign, keeping one entry per user
+        cache.warm(USER, 2 * ETH, 10 * GWEI)
+        cache.warm(USER, 2 * ETH, 30 * GWEI)
+        assert web3_client.sign_liquidation_tx.call_count == 3
+        assert len(cache) == 1
+
+    def test_nonce_advance_invalidates_lookup(self):
+        web3_client = mock_web3_client()
+        cache = PresignedTxCache(web3_client, FeeTiers(GWEI, 1.125))
+        cache.warm(USER, ETH, 10 * GWEI)
+
+        assert cache.get(USER, ETH, 10 * GWEI) is not None
+        assert cache.get(USER, 2 * ETH, 10 * GWEI) is None
+
+        web3_client.nonce_manager.advance(7)
+        assert cache.get(USER, ETH, 10 * GWEI) is None
+
+    def test_retain_drops_users_outside_band(self):
+        cache = PresignedTxCache(mock_web3_client(), FeeTiers(GWEI, 1.125))
+        cache.warm(USER, ETH, 10 * GWEI)
+        cache.warm(OTHER, ETH, 10 * GWEI)
+
+        cache.retain([OTHER])
+
+        assert cache.get(USER, ETH, 10 * GWEI) is None
+        assert cache.get(OTHER, ETH, 10 * GWEI) is not None
+
+    def test_nothing_signed_or_taken_over_the_gas_cap(self):
+        cache = PresignedTxCache(mock_web3_client(), FeeTiers(GWEI, 1.125), max_gas_price_wei=50 * GWEI)
+        assert cache.warm(USER, ETH, 10 * GWEI) is not None
+        # 49 gwei is under the cap, the tier covering it is not
+        assert cache.fee_tiers.price_of(cache.fee_tiers.tier_of(49 * GWEI)) > 50 * GWEI
+
+        assert cache.warm(USER, ETH, 49 * GWEI) is None
+        assert len(cache) == 0
+
+        cache.max_gas_price_wei = None
+        cache.warm(USER, ETH, 49 * GWEI)
+        cache.max_gas_price_wei = 50 * GWEI
+        assert cache.take(USER) is None and len(cache) == 0
+
+
+class TestLiquidatorHotPath:
+
+    def test_warm_transaction_is_sent_as_is(self):
+        web3_client = mock_web3_client()
+        web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+        web3_client.send_signed_liquidation.return_value = "0xabc"
+        web3_client.simulate_liquidation.return_value = LiquidationSimulation(USER, 1, reverted=False)
+        web3_client.get_position_snapshot.return_value = PositionSnapshot(
+            user_address=USER,
+            block_number=1,
+            borrowed_wei=ETH,
+            collateral_usd=2_300 * USD,
+            collaterals=(("0x" + "e" * 40, ETH),),
+            eth_price=2_000 * USD,
+            gas_price_wei=10 * GWEI
+        )
+        liquidator = Liquidator(web3_client, ProfitCalculator(web3_client))
+
+        assert liquidator.warm_presigned([(USER, ETH)], 10 * GWEI) == 1
+        assert liquidator.attempt_liquidation(Position(USER, "0.95", 0, 0, "ACTIVE"))
+
+        raw, nonce = web3_client.send_signed_liquidation.call_args.args
+        assert nonce == 7 and raw.startswith(USER.encode())
+        web3_client.execute_liquidation.assert_not_called()
+        assert len(liquidator.presigned) == 0
+
+    def test_flagged_position_is_sent_before_any_read(self):
+        web3_client = mock_web3_client()
+        web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+        web3_client.send_signed_liquidation.return_value = "0xabc"
+        web3_client.last_gas_price_wei = 10 * GWEI
+        liquidator = Liquidator(web3_client, ProfitCalculator(web3_client))
+        liquidator.warm_presigned([(USER, ETH)], 10 * GWEI)
+
+        # Scored profitable by the monitor cycle that warmed it: no snapshot, no eth_call
+        flagged = Position(USER, "0.95", 0, 0, "ACTIVE", is_profitable=True)
+        assert liquidator.attempt_liquidation(flagged)
+        web3_client.get_position_snapshot.assert_not_called()
+        web3_client.simulate_liquidation.assert_not_called()
+        raw, nonce = web3_client.send_signed_liquidation.call_args.args
+        assert nonce == 7 and raw.startswith(f"{USER}:{ETH}:".encode())
+        assert liquidator.wallets.primary.sent == 1
+
+    def test_stale_warm_transaction_falls_back_to_cold_path(self):
+        web3_client = mock_web3_client()
+        web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+        web3_client.get_position_snapshot.return_value = None
+        web3_client.last_gas_price_wei = 40 * GWEI  # gas rose past the signed tier
+        liquidator = Liquidator(web3_client, ProfitCalculator(web3_client))
+        liquidator.warm_presigned([(USER, ETH)], 10 * GWEI)
+
+        assert not liquidator.attempt_liquidation(Position(USER, "0.95", 0, 0, "ACTIVE", is_profitable=True))
+        web3_client.get_position_snapshot.assert_called_once()
+        web3_client.send_signed_liquidation.assert_not_called()
+
+    def test_hot_path_enforces_the_gas_price_cap(self):
+        web3_client = mock_web3_client()
+        web3_client.get_wallet_balance_wei.return_value = 10 * ETH
+        web3_client.get_position_snapshot.return_value = None
+        web3_client.last_gas_price_wei = 10 * GWEI
+        liquidator = Liquidator(web3_client, ProfitCalculator(web3_client))
+        liquidator.warm_presigned([(USER, ETH)], 10 * GWEI)
+        liquidator.profit_calculator.check_gas_price_acceptable = Mock(return_value=False)
+
+        assert not liquidator.attempt_liquidation(Position(USER, "0.95", 0, 0, "ACTIVE", is_profitable=True))
+        liquidator.profit_calculator.check_gas_price_acceptable.assert_called_once_with(
+            liquidator.presigned.fee_tiers.price_of(liquidator.presigned.fee_tiers.tier_of(10 * GWEI))
+        )
+        web3_client.send_signed_liquidation.assert_not_called()
@@ -0,0 +1,126 @@
+# bot/tests/test_profit_fixed_point.py - Integer fixed-point profit math tests
+
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from models.position_book import PositionBook
+from services.profit_calculator import (
+    ProfitCalculator, FeeQuote, SCORE_DTYPE, max_scored_eth, usd_from_gwei_array, usd_from_wei, liquidation_bonus_usd, gas_cost_usd, usd_from_float
+)
+
+ETH = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
+ETH_PRICE = 2000 * 10**8  # $2000
+GAS_PRICE = 20 * 10**9  # 20 gwei
+
+
+@pytest.fixture
+def calculator():
+    web3_client = Mock()
+    web3_client.get_asset_price.return_value = ETH_PRICE
+    web3_client.estimate_gas_price.return_value = GAS_PRICE
+    return ProfitCalculator(web3_client)
+
+
+def test_contract_math_helpers():
+    # 0.5 ETH at $2000 = $1000
+    assert usd_from_wei(5 * 10**17, ETH_PRICE) == 1000 * 10**8
+    # Solidity truncation: (999 * 10) / 100 = 99
+    assert liquidation_bonus_usd(999) == 99
+    # 350k gas * 20 gwei = 0.007 ETH = $14
+    assert gas_cost_usd(350000, GAS_PRICE, ETH_PRICE) == 14 * 10**8
+    assert usd_from_float(5.0) == 5 * 10**8
+
+
+def test_quote_exact_integers(calculator):
+    quote = calculator.quote("0x" + "1" * 40, 2000 * 10**8, 1500 * 10**8, 1, GAS_PRICE, ETH_PRICE)
+
+    assert quote.bonus_usd == 150 * 10**8
+    assert quote.seized_usd == 1650 * 10**8
+    assert quote.gas_cost_usd == 14 * 10**8
+    assert quote.net_profit_usd == 136 * 10**8
+    assert quote.is_profitable
+
+
+def test_quote_caps_bonus_to_collateral(calculator):
+    quote = calculator.quote("0x" + "1" * 40, 1020 * 10**8, 1000 * 10**8, 2, GAS_PRICE, ETH_PRICE)
+
+    assert quote.seized_usd == 1020 * 10**8
+    assert quote.bonus_usd == 20 * 10**8
+    assert quote.gas_cost_usd == 16 * 10**8
+    assert quote.net_profit_usd == 4 * 10**8
+    assert not quote.is_profitable
+
+
+class TestScoreBatch:
+
+    @staticmethod
+    def build_book(rows):
+        book = PositionBook()
+        for i, (hf, collateral_usd, borrowed_wei) in enumerate(rows):
+            book.upsert(
+                "0x" + f"{i + 1:040x}",
+                health_factor=hf,
+                collateral_usd=collateral_usd,
+                borrowed_wei=borrowed_wei
+            )
+        return book
+
+    def test_matches_scalar_quote_and_ranks(self, calculator):
+        book = self.build_book([
+            (90, 1100 * 10**8, 5 * 10**17),  # $1000 debt, bonus capped at $100
+            (80, 5000 * 10**8, 2 * 10**18),  # $4000 debt, $400 bonus
+            (150, 5000 * 10**8, 10**18),  # Healthy - not a candidate
+        ])
+
+        scores = calculator.score_batch(book, {ETH: ETH_PRICE}, FeeQuote(GAS_PRICE))
+
+        assert list(scores["row"]) == [1, 0]
+        for score in scores:
+            view = book.view(int(score["row"]))
+            quote = calculator.quote(
+                view.user_address, view.collateral_amount,
+                usd_from_wei(view.borrowed_wei, ETH_PRICE), 1, GAS_PRICE, ETH_PRICE
+            )
+            assert score["net_profit_usd"] == quote.net_profit_usd
+            assert score["seized_usd"] == quote.seized_usd
+            assert score["is_profitable"] == quote.is_profitable
+
+    def test_asset_count_from_collateral_columns(self, calculator):
+        book = self.build_book([(90, 5000 * 10**8, 10**18)])
+        book.set_collateral(0, ETH, 10**18)
+        book.set_collateral(0, "0x" + "d" * 40, 10**9)
+
+        scores = calculator.score_batch(book, {ETH.lower(): ETH_PRICE}, FeeQuote(GAS_PRICE))
+
+        assert scores["asset_count"][0] == 2
+        assert scores["gas_cost_usd"][0] == gas_cost_usd(400000, GAS_PRICE, ETH_PRICE)
+
+    def test_large_debts_stay_int64(self, calculator):
+        # $20B of debt: Wei overflows int64 and so would the debt * 10 bonus product
+        book = self.build_book([(50, 3 * 10**18, 10**25), (90, 1100 * 10**8, 5 * 10**17)])
+        assert not book.borrowed_wei.is_compact
+
+        scores = calculator.score_batch(book, {ETH: ETH_PRICE}, FeeQuote(GAS_PRICE))
+
+        assert scores.dtype == SCORE_DTYPE
+        debt = usd_from_wei(10**25, ETH_PRICE)
+        assert scores["debt_usd"][0] == debt
+        assert scores["bonus_usd"][0] == debt // 10
+        assert scores["debt_usd"][1] == 1000 * 10**8
+
+    def test_debt_beyond_scoring_range_is_refused_not_saturated(self, calculator):
+        limit = max_scored_eth(ETH_PRICE)
+        last = (limit - 1) * 10**9 + 10**9 - 1  # Largest scorable debt, in gwei
+        assert usd_from_gwei_array(np.array([last]), ETH_PRICE)[0] == last * ETH_PRICE // 10**9
+        with pytest.raises(OverflowError):
+            usd_from_gwei_array(np.array([limit * 10**9]), ETH_PRICE)
+
+        book = self.build_book([(50, 10**18, limit * 10**18), (90, 1100 * 10**8, 5 * 10**17)])
+        scores = calculator.score_batch(book, {ETH: ETH_PRICE}, FeeQuote(GAS_PRICE))
+        assert list(scores["row"]) == [1]
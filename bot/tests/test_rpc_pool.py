@@ -0,0 +1,171 @@
+# bot/tests/test_rpc_pool.py - Multi-endpoint RPC routing, hedging, failover and broadcast
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from web3 import Web3
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.rpc_pool import RpcPool
+
+
+class FakeProvider:
+    """Stands in for an HTTPProvider: fixed delay, optional failure"""
+
+    def __init__(self, name, delay=0.0, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = []
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError(f"{self.name} down")
+        return {"jsonrpc": "2.0", "id": 1, "result": self.name}
+
+    def is_connected(self, show_traceback=False):
+        return not self.fail
+
+
+def make_pool(providers, **kwargs):
+    by_url = {f"https://{p.name}/key": p for p in providers}
+    return RpcPool(list(by_url), provider_factory=by_url.__getitem__, **kwargs)
+
+
+class TestRpcPool:
+
+    def test_routes_to_fastest_endpoint(self):
+        slow, fast = FakeProvider("slow", delay=0.02), FakeProvider("fast")
+        pool = make_pool([slow, fast], hedge_after_ms=0)
+
+        # Both get sampled while untried, then the fast one takes the traffic
+        for _ in range(5):
+            pool.make_request("eth_blockNumber", [])
+        slow.calls.clear()
+        fast.calls.clear()
+        for _ in range(5):
+            assert pool.make_request("eth_blockNumber", [])["result"] == "fast"
+
+        assert slow.calls == []
+        assert pool.stats()[0]["endpoint"] == "slow"
+
+    def test_hedges_slow_read(self):
+        stuck, backup = FakeProvider("stuck", delay=0.5), FakeProvider("backup")
+        pool = make_pool([stuck, backup], hedge_after_ms=20)
+
+        start = time.monotonic()
+        response = pool.make_request("eth_call", [])
+
+        assert response["result"] == "backup"
+        assert time.monotonic() - start < 0.4
+
+    def test_queued_read_is_not_hedged(self):
+        a, b = FakeProvider("a"), FakeProvider("b")
+        pool = make_pool([a, b], hedge_after_ms=20)
+        # Every read worker busy: the primary waits well past hedge_after before it starts
+        busy = [pool._executor.submit(time.sleep, 0.2) for _ in range(pool._executor._max_workers)]
+
+        pool.make_request("eth_call", [])
+
+        assert len(a.calls) + len(b.calls) == 1
+        for future in busy:
+            future.result()
+
+    def test_broadcast_methods_are_not_hedged(self):
+        stuck, backup = FakeProvider("stuck", delay=0.05), FakeProvider("backup")
+        pool = make_pool([stuck, backup], hedge_after_ms=1)
+
+        assert pool.make_request("eth_sendRawTransaction", ["0x"])["result"] == "stuck"
+        assert backup.calls == []
+
+    def test_failover_and_ejection(self):
+        down, up = FakeProvider("down", fail=True), FakeProvider("up")
+        pool = make_pool([down, up], hedge_after_ms=0, max_consecutive_errors=2, eject_seconds=60)
+
+        for _ in range(3):
+            assert pool.make_request("eth_blockNumber", [])["result"] == "up"
+
+        assert pool.stats()[0]["ejected"]
+        assert pool.ranked()[-1].provider is down
+        assert len(down.calls) == 2
+
+    def test_ejected_endpoint_is_reprobed(self):
+        flaky, up = FakeProvider("flaky", fail=True), FakeProvider("up")
+        pool = make_pool([flaky, up], hedge_after_ms=0, max_consecutive_errors=1, eject_seconds=60)
+        pool.make_request("eth_blockNumber", [])
+        assert pool.endpoints[0].is_ejected(time.monotonic())
+
+        flaky.fail = False
+        pool.endpoints[0].ejected_until = time.monotonic() - 1
+        pool.make_request("eth_blockNumber", [])
+        pool._executor.shutdown(wait=True)
+
+        assert pool.endpoints[0].ejected_until == 0.0
+        assert not pool.stats()[0]["ejected"]
+
+    def test_all_endpoints_down_raises(self):
+        pool = make_pool([FakeProvider("a", fail=True), FakeProvider("b", fail=True)], hedge_after_ms=10)
+        with pytest.raises(ConnectionError):
+            pool.make_request("eth_blockNumber", [])
+
+
+class RejectingProvider(FakeProvider):
+    def __init__(self, name, message, delay=0.0):
+        super().__init__(name, delay)
+        self.message = message
+
+    def make_request(self, method, params):
+        self.calls.append(method)
+        time.sleep(self.delay)
+        return {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": self.message}}
+
+
+class TestBroadcast:
+
+    def test_sends_everywhere_and_returns_first_acceptance(self):
+        slow, fast = FakeProvider("slow", delay=0.3), FakeProvider("fast", delay=0.01)
+        pool = make_pool([slow, fast])
+
+        start = time.monotonic()
+        tx_hash = pool.broadcast_raw_transaction(b"\x01\x02")
+
+        assert time.monotonic() - start < 0.25
+        assert tx_hash == Web3.keccak(b"\x01\x02")
+        pool._broadcast_executor.shutdown(wait=True)
+        assert slow.calls == fast.calls == ["eth_sendRawTransaction"]
+
+        pool.record_inclusion(tx_hash)
+        stats = {s["endpoint"]: s for s in pool.stats()}
+        assert stats["fast"]["broadcast_wins"] == stats["fast"]["inclusion_wins"] == 1
+        assert stats["slow"]["broadcast_wins"] == 0
+
+    def test_broadcast_does_not_queue_behind_slow_reads(self):
+        class SlowReads(FakeProvider):
+            def make_request(self, method, params):
+                self.calls.append(method)
+                if method == "eth_call":
+                    time.sleep(0.5)
+                return {"jsonrpc": "2.0", "id": 1, "result": self.name}
+
+        pool = make_pool([SlowReads("a"), SlowReads("b")], hedge_after_ms=None)
+        reads = [pool._executor.submit(pool.make_request, "eth_call", []) for _ in range(8)]
+
+        start = time.monotonic()
+        pool.broadcast_raw_transaction(b"\x01")
+        assert time.monotonic() - start < 0.25
+        for read in reads:
+            read.result()
+
+    def test_already_known_counts_as_accepted(self):
+        pool = make_pool([RejectingProvider("a", "already known"), FakeProvider("b", fail=True)])
+        assert pool.broadcast_raw_transaction(b"\x01") == Web3.keccak(b"\x01")
+
+    def test_rejected_everywhere_raises_node_error(self):
+        pool = make_pool([RejectingProvider("a", "nonce too low"), FakeProvider("b", fail=True)])
+        with pytest.raises(ValueError, match="nonce too low"):
+            pool.broadcast_raw_transaction(b"\x01")
@@ -0,0 +1,88 @@
+# bot/tests/test_shard_pool.py - Sharded evaluation: address-hash split, worker rows and candidates, coordinator book
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config
+from models.address import Address, address_to_bytes
+from models.position import Position
+from models.position_snapshot import PositionSnapshot
+from services.position_monitor import PositionMonitor
+from services.shard_pool import ShardedEvaluation, ShardedEvaluator, ShardRows, shard_of
+
+ETH_PRICE = 2_000 * 10**8
+USERS = [Address("0x" + f"{i:040x}") for i in range(1, 41)]
+
+
+class FakeClient:
+    """Worker-side client: user i holds $(60 + 2i) against $100 of ETH debt"""
+
+    def __init__(self):
+        self.w3 = SimpleNamespace(eth=SimpleNamespace(block_number=7))
+
+    def estimate_gas_price(self):
+        return 10**9
+
+    def get_position_snapshot(self, user, block_identifier=None, gas_price_wei=None):
+        index = int(user, 16)
+        if index == 13:
+            return None  # read failure
+        collateral_usd = (60 + 2 * index) * 10**8
+        return PositionSnapshot(user, block_identifier, 10**17 // 2, collateral_usd, ((Config.ETH_ADDRESS, 1),),
+                                ETH_PRICE, gas_price_wei)
+
+
+def test_workers_return_every_row_and_candidates_below_the_band():
+    evaluator = ShardedEvaluator(2, client_factory=FakeClient)
+    try:
+        shards = evaluator.split(USERS)
+        assert all(shard_of(user, 2) == i for i, shard in enumerate(shards) for user in shard)
+        assert sorted(shards[0] + shards[1], key=address_to_bytes) == USERS and all(shards)
+        result = evaluator.evaluate(USERS, band=105)
+        tight = evaluator.evaluate(USERS, band=100)
+    finally:
+        evaluator.close()
+
+    # HF = (60 + 2i) * 0.83 is below 1.05 up to user 33 and below 1.00 up to user 30
+    read = [user for user in USERS if user != USERS[12]]
+    users = sorted((candidate[0] for candidate in result.candidates), key=address_to_bytes)
+    assert result.failed == [USERS[12]]
+    assert users == read[:32]
+    assert {candidate[6] for candidate in result.candidates} == {7}
+    # The band narrows the candidates, never the rows
+    assert sorted((candidate[0] for candidate in tight.candidates), key=address_to_bytes) == read[:29]
+    for evaluation in (result, tight):
+        assert sorted(evaluation.rows.users, key=address_to_bytes) == read and set(evaluation.rows.block) == {7}
+    assert result.checked == len(USERS) and len(result.shard_ms) == 2
+
+
+def test_coordinator_upserts_every_row_and_plans_candidates_only():
+    web3_client = MagicMock()
+    web3_client.position_watcher.log_watcher = None
+    monitor = PositionMonitor(MagicMock(), web3_client, MagicMock())
+    stale, failed, healthy, underwater = USERS[:4]
+    for user in (stale, failed):
+        monitor.book.upsert(user, health_factor=90, borrowed_wei=1)
+
+    rows = ShardRows()
+    for user, collateral_usd in ((healthy, 400 * 10**8), (underwater, 96 * 10**8)):
+        rows.append(user, PositionSnapshot(user, 7, 10**17 // 2, collateral_usd, ((Config.ETH_ADDRESS, 1),),
+                                           ETH_PRICE, 10**9), 7)
+    evaluator = MagicMock(shards=2)
+    evaluator.evaluate.return_value = ShardedEvaluation(rows, [rows.candidate(1)], [failed], 4, [1.0, 1.0], 2.0)
+    monitor.attach_sharded(evaluator)
+    positions = [Position(user, 0, 0, 0, "ACTIVE") for user in (stale, failed, healthy, underwater)]
+
+    liquidatable, seen = monitor._evaluate_sharded(positions)
+    monitor._prune_book(seen)
+
+    assert [p.user_address for p in liquidatable] == [underwater]
+    assert monitor.book.row_of(stale) is None and monitor.book.row_of(failed) is not None
+    assert monitor.book.health_factor[monitor.book.row_of(underwater)] == rows.health_factor[1] < 100
+    healthy_row = monitor.book.row_of(healthy)
+    assert monitor.book.health_factor[healthy_row] == rows.health_factor[0] > 100
+    assert monitor.book.collateral_column(Config.ETH_ADDRESS)[healthy_row] == 1
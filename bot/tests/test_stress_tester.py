@@ -0,0 +1,72 @@
+# bot/tests/test_stress_tester.py - Price-shock grid over the position book vs per-row contract math
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config
+from models.position_book import GWEI, PositionBook
+from models.position_snapshot import calculate_health_factor
+from services.stress_tester import StressTester, shock_price
+
+ETH = Config.ETH_ADDRESS
+ETH_PRICE = 2_000 * 10**8
+USERS = ["0x" + f"{i:040x}" for i in range(1, 5)]
+
+
+def make_book():
+    book = PositionBook()
+    # (collateral ETH, debt ETH): HF 1.66, 1.20, 1.03 and 0.83
+    for user, (collateral, debt) in zip(USERS, [(2, 1), (3, 2), (5, 4), (1, 1)]):
+        row = book.upsert(user, borrowed_wei=debt * 10**18)
+        book.set_collateral(row, ETH, collateral * 10**18)
+    book.upsert("0x" + "f" * 40, borrowed_wei=0)  # no debt: never liquidatable
+    return book
+
+
+def test_eth_collateral_against_eth_debt_is_shock_neutral():
+    tester = StressTester(make_book(), {ETH: ETH_PRICE}, gas_price_wei=10**9)
+    down, flat = tester.run_grid({"ETH": [-30, 0]})
+
+    assert (down.liquidatable, flat.liquidatable, down.newly_liquidatable) == (1, 1, 0)
+    assert (flat.bad_debt_positions, flat.expected_bonus_usd) == (0, 0)  # collateral == debt: no bonus left
+    assert flat.required_capital_wei == 10**18 + 350_000 * 10**9
+
+
+def test_shocked_rows_match_contract_math():
+    usdc = "0x" + "5" * 40
+    book = PositionBook()
+    debts = [10**18, 3 * 10**18, 2**70]  # last one beyond int64
+    for i, debt in enumerate(debts):
+        row = book.upsert(USERS[i], borrowed_wei=debt)
+        book.set_collateral(row, usdc, (4_000 + 2_000 * i) * 10**18)  # 18 decimals by fallback
+
+    tester = StressTester(book, {ETH: ETH_PRICE, usdc: 10**8})
+    result = tester.run({ETH: 30, usdc: -10})
+
+    eth, usd = shock_price(ETH_PRICE, 30), shock_price(10**8, -10)
+    expected = []
+    for i, debt in enumerate(debts):
+        hf = calculate_health_factor((4_000 + 2_000 * i) * usd, debt * eth // 10**18)
+        expected.append(hf < 100)
+    assert result.liquidatable == sum(expected) == 2
+    # Debt is scored from the gwei column
+    assert result.debt_at_risk_usd == sum(d // GWEI * eth // GWEI for d, e in zip(debts, expected) if e)
+
+
+def test_real_sized_book_stays_int64():
+    book = PositionBook()
+    for i in range(1_000):
+        row = book.upsert("0x" + f"{i + 1:040x}", borrowed_wei=10**18)
+        book.set_collateral(row, ETH, 10**20)  # 100 ETH: beyond int64 in Wei
+    book.upsert("0x" + "e" * 40, borrowed_wei=2**70)  # 1180 ETH of debt, no collateral
+
+    tester = StressTester(book, {ETH: ETH_PRICE})
+    collateral, debt, liquidatable, _ = tester._evaluate({ETH: -50})
+
+    assert collateral.dtype == debt.dtype == np.int64
+    assert collateral[0] == 100 * ETH_PRICE // 2 and debt[0] == ETH_PRICE // 2
+    assert liquidatable.sum() == 1 and tester.run({ETH: -50}).required_capital_wei == 2**70 // GWEI * GWEI
@@ -0,0 +1,87 @@
+# bot/tests/test_wallet_dispatcher.py - Liquidator wallet pool: lane selection and parallel sends
+
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from clients.nonce_manager import NonceManager
+from clients.web3_client import LiquidationSimulation
+from models.position import Position
+from models.position_snapshot import PositionSnapshot
+from services.liquidator import Liquidator
+from services.profit_calculator import ProfitCalculator
+from services.wallet_dispatcher import WalletDispatcher, WalletLane
+from services.wallet_ledger import WalletLedger
+
+ETH = 10**18
+USD = 10**8
+GWEI = 10**9
+USERS = ["0x" + "1" * 40, "0x" + "2" * 40]
+
+
+def lane(balance_eth, name):
+    client = SimpleNamespace(account=SimpleNamespace(address=name), nonce_manager=NonceManager(lambda: 0))
+    return WalletLane(client, WalletLedger(lambda: balance_eth * ETH, max_age_seconds=3600))
+
+
+def test_reserve_prefers_idle_then_richest_lane():
+    small, large = lane(2, "small"), lane(5, "large")
+    wallets = WalletDispatcher([small, large])
+
+    first = wallets.reserve(ETH)
+    second = wallets.reserve(ETH)
+    assert (first, second) == (large, small)  # large is busy after the first reservation
+    assert wallets.reserve(3 * ETH) is large  # only one wallet can fund it, busy or not
+    assert wallets.reserve(6 * ETH) is None  # 7 ETH in total, but no single wallet has it
+
+    wallets.release(small, ETH, sent=False)
+    assert small.ledger.available_wei() == 2 * ETH and small.in_flight == 0
+    wallets.release(large, ETH, sent=True)
+    assert large.ledger.available_wei() == ETH and large.sent == 1
+
+
+def test_reserve_uses_the_planned_lane_while_it_can_fund():
+    small, large = lane(2, "small"), lane(5, "large")
+    wallets = WalletDispatcher([small, large])
+
+    assert wallets.lane_balances() == [2 * ETH, 5 * ETH]
+    assert wallets.reserve(ETH, preferred=0) is small
+    assert wallets.reserve(2 * ETH, preferred=0) is large  # small has 1 ETH left
+
+
+def client_for(address, barrier):
+    """Wallet client whose sends only complete once both lanes are sending at the same time"""
+    client = Mock()
+    client.account.address = address
+    client.nonce_manager = NonceManager(lambda: 0)
+    client.get_wallet_balance_wei.return_value = 10 * ETH
+    client.simulate_liquidation.side_effect = lambda user, debt, block: LiquidationSimulation(user, block, False)
+
+    def execute_liquidation(user, debt, gas):
+        barrier.wait()  # BrokenBarrierError if the other lane is not sending too
+        return "0x" + user[-4:]
+
+    client.execute_liquidation.side_effect = execute_liquidation
+    return client
+
+
+def test_simultaneous_liquidations_go_out_on_separate_wallets():
+    barrier = threading.Barrier(2, timeout=5)
+    web3_client = client_for("0x" + "a" * 40, barrier)
+    web3_client.oracle_watcher.emergency_mode = False
+    web3_client.position_watcher.is_closed.return_value = False
+    web3_client.get_position_snapshot.side_effect = lambda user: PositionSnapshot(
+        user, 1, ETH, 2_300 * USD, (("0x" + "e" * 40, ETH),), 2_000 * USD, 10 * GWEI
+    )
+    extra = client_for("0x" + "b" * 40, barrier)
+
+    liquidator = Liquidator(web3_client, ProfitCalculator(web3_client), [extra])
+    results = liquidator.attempt_liquidations([Position(user, "0.95", 0, 0, "ACTIVE") for user in USERS])
+
+    assert results == [True, True]
+    assert web3_client.execute_liquidation.call_count == extra.execute_liquidation.call_count == 1
+    assert [lane.in_flight for lane in liquidator.wallets.lanes] == [0, 0]